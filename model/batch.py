@@ -0,0 +1,449 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+import os
+import traceback
+import pandas as pd
+import matrix
+import profiler
+import scenarios
+import solvers
+import writer
+
+
+_SHARED = None
+
+
+def get_jobs(scenario_list=None, overrides=None):
+    """
+    Parameters
+    ----------
+    scenario_list : List, required
+        Scenario short tags (gg, gm, dgg, or elek). The default is None.
+    overrides : Dict, optional
+        Parameter overrides applied to all scenarios. The default is None.
+
+    Returns
+    -------
+    jobs : List
+        One job (name, scenario, overrides) per scenario.
+
+    """
+    jobs = []
+    for _scenario in scenario_list:
+        _name = _scenario
+        if overrides:
+            _name += "-" + "-".join(
+                "{}={}".format(_key, _value) for _key, _value in sorted(overrides.items())
+            )
+        jobs.append({"name": _name, "scenario": _scenario, "overrides": overrides})
+    return jobs
+
+
+def _init_worker(shared, memory=None):
+    # THE SHARED INPUTS ARE TRANSFERRED ONCE PER WORKER PROCESS, NOT ONCE PER JOB.
+    global _SHARED
+    _SHARED = shared
+    # THE PROFILER OF THE PARENT IS ONLY INHERITED BY FORKED WORKERS (MEMORY IS NONE IF IT IS DISABLED)
+    if (memory is not None) and not profiler.is_enabled():
+        profiler.enable(memory=memory)
+
+
+def _run_job(
+    job,
+    threads,
+    path,
+    output_format,
+    builder,
+    horizon,
+    dispatch_years,
+    temporal,
+    reduce_network,
+    decompose,
+    solver,
+    profile,
+    warm_start,
+    fixing,
+    eliminate,
+    export,
+    incremental_build,
+):
+    # THE RECORDS OF THE JOB ARE RETURNED TO THE SESSION PROFILE OF THE PARENT (SEE RUN_BATCH)
+    _records = len(profiler.get_records())
+    _result = scenarios.run_scenario(
+        shared=_SHARED,
+        threads=threads,
+        path=path,
+        output_format=output_format,
+        builder=builder,
+        horizon=horizon,
+        dispatch_years=dispatch_years,
+        temporal=temporal,
+        reduce_network=reduce_network,
+        decompose=decompose,
+        solver=solver,
+        profile=profile,
+        warm_start=warm_start,
+        fixing=fixing,
+        eliminate=eliminate,
+        export=export,
+        incremental_build=incremental_build,
+        **job
+    )
+    return {**_result, "records": profiler.get_records()[_records:]}
+
+
+def _run_jobs_persistent(
+    jobs, threads, path, output_format, horizon, dispatch_years, temporal, reduce_network, profile
+):
+    _records = len(profiler.get_records())
+    _results = scenarios.run_scenarios_persistent(
+        jobs=jobs,
+        shared=_SHARED,
+        threads=threads,
+        path=path,
+        output_format=output_format,
+        horizon=horizon,
+        dispatch_years=dispatch_years,
+        temporal=temporal,
+        reduce_network=reduce_network,
+        profile=profile,
+    )
+    return _results, profiler.get_records()[_records:]
+
+
+def run_batch(
+    jobs=None,
+    workers=1,
+    threads=12,
+    path="data",
+    persistent=False,
+    output_format="xlsx",
+    builder="pyomo",
+    horizon="full",
+    dispatch_years=None,
+    temporal=12,
+    reduce_network=False,
+    decompose=0,
+    solver="gurobi",
+    profile=None,
+    warm_start=None,
+    fixing=None,
+    eliminate=False,
+    export=None,
+    incremental_build=False,
+):
+    """
+    Runs several scenarios (and sensitivities) without user interaction. The shared inputs are read once;
+    only the scenario-specific inputs are read per job.
+
+    Parameters
+    ----------
+    jobs : List, required
+        Includes one dictionary per run with the keys scenario, and optionally name and overrides
+        (see get_jobs). The default is None.
+    workers : int, optional
+        Number of worker processes that build and solve models in parallel. The default is 1.
+    threads : int, optional
+        Number of solver threads (and output file writers, see scenarios.run_scenario) per model. The
+        default is 12.
+    path : String, optional
+        Directory of the Excel input files. The default is "data".
+    persistent : bool, optional
+        If True, each worker builds one model with mutable scenario parameters and solves its jobs
+        in sequence with a persistent solver (see scenarios.run_scenarios_persistent). Overrides are
+        then limited to mutable parameters. The default is False.
+    output_format : String, optional
+        File format of the output files: "xlsx", "csv", or "parquet". The default is "xlsx".
+    builder : String, optional
+        "pyomo" or "matrix" (see scenarios.build_model); the persistent mode requires "pyomo". The
+        default is "pyomo".
+    horizon : String, optional
+        Modeling of the years after the objective function: "full", "drop", or "terminal" (see
+        utils.add_time_horizon). The default is "full".
+    dispatch_years : List, optional
+        Years with a modeled dispatch; the other years are interpolated (see utils.add_time_horizon).
+        The default is None (all years).
+    temporal : integer, optional
+        Number of time slices per year; fewer time slices combine months with a similar demand (see
+        utils.get_time_slices). The default is 12 (months).
+    reduce_network : bool, optional
+        If True, the radial branches of the mid-pressure level are folded (see
+        utils.add_network_reduction); requires the pyomo builder. The default is False.
+    decompose : integer, optional
+        Number of worker processes per job that solve the cluster subproblems (see
+        decomposition.solve_by_clusters); requires the matrix builder. The default is 0 (no
+        decomposition).
+    solver : String, optional
+        "gurobi", "highs", "cbc", or "scip" (see solvers.SOLVERS); the matrix builder supports
+        "gurobi" and "highs", the persistent mode "gurobi". The default is "gurobi".
+    profile : Dict, optional
+        Includes the gap, time limit, and emphasis of the solver (see solvers.get_profile). The default
+        is None (solvers.SOLVER_PROFILE).
+    warm_start : String, optional
+        Name of the run whose stored solution is the start of all jobs (see
+        scenarios.run_scenario). The default is None (the previous solution of each job, if any).
+    fixing : float, optional
+        Tolerance of the LP relaxation fixing heuristic (see solvers.solve_with_fixing); requires the
+        pyomo builder and no persistent mode. The default is None (no fixing).
+    eliminate : bool, optional
+        If True, constraints that only pin a variable are eliminated (see
+        utils.eliminate_fixed_variables); requires the pyomo builder and no persistent mode. The
+        default is False.
+    export : Dict, optional
+        Includes the format and labels of the model file written per job (see
+        scenarios.run_scenario); requires no persistent mode. The default is None (no model file).
+    incremental_build : bool, optional
+        If True, each job loads its model from the previous run with the same scenario and options and
+        only recomputes the parameters of the changed input files (see
+        scenarios.build_model_incremental); requires the pyomo builder without elimination and no
+        persistent mode. The default is False.
+
+    Raises
+    ------
+    ValueError
+        If a scenario is unknown, the persistent mode or the network reduction is combined with the
+        matrix builder, the decomposition with the pyomo builder, the fixing heuristic, the
+        elimination, or the incremental build with the matrix builder or the persistent mode, the
+        export with the persistent mode, the solver is not supported, or the export format is unknown.
+
+    Returns
+    -------
+    results : List
+        Includes one dictionary (name, scenario, objective, path, or error) per job.
+
+    """
+    for _job in jobs:
+        if _job["scenario"] not in scenarios.SCENARIO_NAMES:
+            raise ValueError("Unknown scenario: {}".format(_job["scenario"]))
+    if persistent and builder != "pyomo":
+        raise ValueError("The persistent mode requires the pyomo builder")
+    if reduce_network and builder != "pyomo":
+        raise ValueError("The network reduction requires the pyomo builder")
+    if decompose and builder != "matrix":
+        raise ValueError("The decomposition requires the matrix builder")
+    if (fixing is not None) and (persistent or builder != "pyomo"):
+        raise ValueError("The relaxation fixing requires the pyomo builder without persistent mode")
+    if eliminate and (persistent or builder != "pyomo"):
+        raise ValueError(
+            "The elimination of fixed variables requires the pyomo builder without persistent mode"
+        )
+    if incremental_build and (persistent or eliminate or builder != "pyomo"):
+        raise ValueError(
+            "The incremental build requires the pyomo builder without elimination and persistent mode"
+        )
+    if (export is not None) and persistent:
+        raise ValueError("The model export requires no persistent mode")
+    if (export is not None) and export["format"] not in writer.FORMATS:
+        raise ValueError("Unknown model file format: {}".format(export["format"]))
+    if persistent and solver != "gurobi":
+        raise ValueError("The persistent mode requires gurobi")
+    if solver not in (matrix.SOLVERS if builder == "matrix" else solvers.SOLVERS):
+        raise ValueError("Solver {} is not supported by the {} builder".format(solver, builder))
+    solvers.get_profile(profile)
+
+    shared = scenarios.read_shared_inputs(path=path)
+    # THE WORKERS RECORD THEIR JOBS LIKE THE PARENT (NONE IF THE PROFILER IS DISABLED)
+    _memory = profiler.traces_memory() if profiler.is_enabled() else None
+
+    results = []
+    if persistent:
+        # JOBS ARE DEALT ROUND-ROBIN TO THE WORKERS; EACH WORKER KEEPS ONE MODEL AND SOLVER.
+        _chunks = [jobs[_i::workers] for _i in range(max(workers, 1)) if jobs[_i::workers]]
+        if len(_chunks) <= 1:
+            results = scenarios.run_scenarios_persistent(
+                jobs=jobs,
+                shared=shared,
+                threads=threads,
+                path=path,
+                output_format=output_format,
+                horizon=horizon,
+                dispatch_years=dispatch_years,
+                temporal=temporal,
+                reduce_network=reduce_network,
+                profile=profile,
+            )
+        else:
+            with ProcessPoolExecutor(
+                max_workers=len(_chunks), initializer=_init_worker, initargs=(shared, _memory)
+            ) as pool:
+                _futures = {
+                    pool.submit(
+                        _run_jobs_persistent,
+                        _chunk,
+                        threads,
+                        path,
+                        output_format,
+                        horizon,
+                        dispatch_years,
+                        temporal,
+                        reduce_network,
+                        profile,
+                    ): _chunk
+                    for _chunk in _chunks
+                }
+                for _future in as_completed(_futures):
+                    try:
+                        _results, _records = _future.result()
+                        results.extend(_results)
+                        profiler.add_records(_records)
+                    except Exception as _error:
+                        for _job in _futures[_future]:
+                            print("Job {} failed: {!r}".format(_job.get("name"), _error))
+                            results.append({**_job, "error": repr(_error)})
+    elif workers <= 1:
+        for _job in jobs:
+            try:
+                results.append(
+                    scenarios.run_scenario(
+                        shared=shared,
+                        threads=threads,
+                        path=path,
+                        output_format=output_format,
+                        builder=builder,
+                        horizon=horizon,
+                        dispatch_years=dispatch_years,
+                        temporal=temporal,
+                        reduce_network=reduce_network,
+                        decompose=decompose,
+                        solver=solver,
+                        profile=profile,
+                        warm_start=warm_start,
+                        fixing=fixing,
+                        eliminate=eliminate,
+                        export=export,
+                        incremental_build=incremental_build,
+                        **_job
+                    )
+                )
+            except Exception as _error:
+                traceback.print_exc()
+                results.append({**_job, "error": repr(_error)})
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(shared, _memory)
+        ) as pool:
+            _futures = {
+                pool.submit(
+                    _run_job,
+                    _job,
+                    threads,
+                    path,
+                    output_format,
+                    builder,
+                    horizon,
+                    dispatch_years,
+                    temporal,
+                    reduce_network,
+                    decompose,
+                    solver,
+                    profile,
+                    warm_start,
+                    fixing,
+                    eliminate,
+                    export,
+                    incremental_build,
+                ): _job
+                for _job in jobs
+            }
+            for _future in as_completed(_futures):
+                _job = _futures[_future]
+                try:
+                    _result = _future.result()
+                    profiler.add_records(_result.pop("records"))
+                    results.append(_result)
+                except Exception as _error:
+                    print("Job {} failed: {!r}".format(_job.get("name"), _error))
+                    results.append({**_job, "error": repr(_error)})
+
+    print("Batch summary:")
+    for _result in results:
+        if "error" in _result:
+            print("  {}: FAILED ({})".format(_result.get("name"), _result["error"]))
+        else:
+            print(
+                "  {}: objective = {:.0f}, output = {}".format(
+                    _result["name"], _result["objective"], _result["path"]
+                )
+            )
+    return results
+
+
+def run_benchmark(
+    jobs=None,
+    solver_list=None,
+    threads=12,
+    path="data",
+    profile=None,
+    horizon="full",
+    dispatch_years=None,
+    temporal=12,
+    reduce_network=False,
+    eliminate=False,
+):
+    """
+    Builds the (Pyomo) model of each job once and compares the time to gap of several solvers on it
+    (see solvers.benchmark_solvers). The table is written to solution/benchmark-<time>.csv.
+
+    Parameters
+    ----------
+    jobs : List, required
+        Includes one dictionary per run with the keys scenario, and optionally name and overrides
+        (see get_jobs). The default is None.
+    solver_list : List, optional
+        Solver names (see solvers.SOLVERS). The default is None (all solvers).
+    threads : int, optional
+        Number of solver threads. The default is 12.
+    path : String, optional
+        Directory of the Excel input files. The default is "data".
+    profile : Dict, optional
+        Includes the gap, time limit, and emphasis of the solvers (see solvers.get_profile). The default
+        is None (solvers.SOLVER_PROFILE).
+    horizon : String, optional
+        "full", "drop", or "terminal" (see utils.add_time_horizon). The default is "full".
+    dispatch_years : List, optional
+        Years with a modeled dispatch (see utils.add_time_horizon). The default is None (all years).
+    temporal : integer, optional
+        Number of time slices per year (see utils.get_time_slices). The default is 12 (months).
+    reduce_network : bool, optional
+        If True, the radial branches of the mid-pressure level are folded (see
+        utils.add_network_reduction). The default is False.
+    eliminate : bool, optional
+        If True, constraints that only pin a variable are eliminated (see
+        utils.eliminate_fixed_variables). The default is False.
+
+    Returns
+    -------
+    table : pandas.DataFrame
+        Includes one row per job and solver (see solvers.benchmark_solvers).
+
+    """
+    shared = scenarios.read_shared_inputs(path=path)
+    _tables = []
+    for _job in jobs:
+        _name = _job.get("name") or _job["scenario"]
+        model = scenarios.build_model(
+            scenario=_job["scenario"],
+            shared=shared,
+            inputs=scenarios.read_scenario_inputs(scenario=_job["scenario"], path=path),
+            overrides=_job.get("overrides"),
+            horizon=horizon,
+            dispatch_years=dispatch_years,
+            temporal=temporal,
+            reduce_network=reduce_network,
+            eliminate=eliminate,
+        )
+        _table = solvers.benchmark_solvers(
+            model=model, solver_list=solver_list, profile=profile, threads=threads
+        )
+        _table.insert(0, "name", _name)
+        _tables.append(_table)
+    table = pd.concat(_tables, ignore_index=True)
+
+    if not os.path.exists("solution"):
+        os.makedirs("solution")
+    table.to_csv(
+        os.path.join("solution", "benchmark-{}.csv".format(datetime.now().strftime("%Y%m%dT%H%M"))),
+        index=False,
+    )
+    print(table.to_string(index=False))
+    return table
@@ -0,0 +1,1029 @@
+import argparse
+import gc
+import os
+from datetime import datetime
+from pathlib import Path
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyomo.environ as py
+from shapely.geometry import LineString
+import matrix
+import profiler
+import report
+import scenarios
+import solvers
+import utils
+import writer
+
+
+# NUMBER OF LINES OF THE SYNTHETIC NETWORKS (SEE RUN_BENCHMARK)
+BENCHMARK_SIZES = [100, 300, 1000, 3000, 10000, 50000]
+# SHARE OF THE LINES PER NETWORK LEVEL
+LINE_SHARES = {"transmission": 0.02, "high": 0.23, "mid": 0.75}
+# TYPE OF THE LINES IN THE SHAPEFILES AND IN THE PIPELINE TABLES PER NETWORK LEVEL
+LINE_TYPES = {
+    "transmission": ("Transmission line", "Transmission"),
+    "high": ("High-Pressure", "High-Pressure"),
+    "mid": ("Mid-Pressure", "Mid-Pressure"),
+}
+# NODES THE MODEL REFERS TO BY NAME: IMPORT (FIRST) AND TRANSIT EXPORT AT THE TRANSMISSION LEVEL, AND
+# THE MID-PRESSURE NODES OF THE DISPATCH REPORT
+TRANSMISSION_NODES = ["Baumgarten", "Kittsee", "Arnoldstein", "Straß in Steiermark"]
+REPORT_NODES = ["Hohenberg", "Lilienfeld"]
+# CLUSTERS WHOSE CAPACITIES ARE FREED FOR HYDROGEN (SEE CONSTRAINTS.C_NO_EARLY_DECOM_HIGH_30 ETC.)
+HYDROGEN_CLUSTERS = {"high": [20, 25], "mid": [55, 90]}
+# LARGEST REPLACEMENT INVESTMENT PER LINE IN MW (SEE CONSTRAINTS.LINK_BDV_AND_CAP_TRA ETC.)
+REPLACEMENT_CAPACITY = {"transmission": 60000, "high": 30000, "mid": 15000}
+# HOURS PER MONTH: THE PIPELINE CAPACITIES (MW) BOUND THE MONTHLY FLOWS (MWH) DIVIDED BY THE HOURS
+# (SEE UTILS.INIT_TOTAL_PEAK_REL_FACTOR)
+HOURS_PER_MONTH = 720
+# ONE STORAGE PER STORAGE_SPACING HIGH-PRESSURE NODES
+STORAGE_SPACING = 50
+# CONSECUTIVE LINES PER CLUSTER
+CLUSTER_SIZE = 10
+# STANDARD DEVIATION OF THE DISTANCE (M) BETWEEN CONNECTED NODES PER NETWORK LEVEL
+NODE_SPREAD = {"transmission": 60000, "high": 15000, "mid": 4000}
+# SHARE OF THE NEW NODES PER NETWORK LEVEL THAT ARE CONNECTED TO THE LEVEL ABOVE (SHORT BRANCHES KEEP
+# THE CAPACITIES OF THE LINES CLOSE TO THE ROOTS WITHIN THE RANGE OF THE REAL NETWORK)
+ROOT_SHARE = {"transmission": 0.05, "high": 0.3, "mid": 0.3}
+# MGI / AUSTRIA LAMBERT
+CRS = "EPSG:31287"
+# MONTHLY TRANSIT EXPORT PER BORDER NODE IN 2021
+TRANSIT_EXPORT = 20000
+# SHARE OF THE HIGH- AND MID-PRESSURE NODES WITH LOCAL SOURCES
+LOCAL_SHARE = 0.3
+SCENARIO_FACTORS = {"gg": 1.0, "gm": 1.2, "dgg": 0.8, "elek": 0.5}
+# MONTHLY DEMAND RELATIVE TO THE AVERAGE (MONTHS 0-11 AS IN THE INPUT DATA)
+SEASONALITY = [1.45, 1.35, 1.15, 0.9, 0.7, 0.6, 0.55, 0.55, 0.7, 0.95, 1.2, 1.4]
+DEMAND_YEARS = list(range(2021, 2051))
+TRANSIT_YEARS = [2021, 2030, 2035, 2040]
+PRICE_YEARS = list(range(2021, 2066))
+EXCEL_ROWS = 1048576
+# STAGES OF THE SCALING TABLE (SEE GET_STAGE_TIMES)
+# NUMBER OF LINES OF THE INSTANCE ON WHICH THE BUILDERS ARE COMPARED (SEE CHECK_BUILDERS)
+CHECK_SIZE = 40
+STAGES = ["generate", "read", "utils", "constraints.add", "matrix.build_problem", "solve", "report"]
+
+
+def _get_line_counts(lines):
+    if lines < 20:
+        raise ValueError("A synthetic network needs at least 20 lines")
+    _transmission = max(3, round(lines * LINE_SHARES["transmission"]))
+    _high = max(4, round(lines * LINE_SHARES["high"]))
+    return {"transmission": _transmission, "high": _high, "mid": lines - _transmission - _high}
+
+
+def _add_radial_lines(rng, roots, nodes, parents, positions, spread, root_share=0.05):
+    # NEW NODES ARE MOSTLY CONNECTED TO ONE OF THE LAST NODES (BRANCHES), SOMETIMES TO A ROOT NODE OF
+    # THE LEVEL ABOVE (DELIVERY POINTS)
+    _pool = []
+    for _node in nodes:
+        if (not _pool) or (rng.random() < root_share):
+            _parent = roots[rng.integers(len(roots))]
+        else:
+            _parent = _pool[max(len(_pool) - int(rng.geometric(0.3)), 0)]
+        parents[_node] = _parent
+        positions[_node] = positions[_parent] + rng.normal(0, spread, 2)
+        _pool.append(_node)
+    return [(parents[_node], _node) for _node in nodes]
+
+
+def _add_meshed_lines(rng, nodes, lines, count):
+    # LOOPS BETWEEN NEARBY NODES (BY ORDER OF CONNECTION) OF THE SAME LEVEL
+    _existing = set(lines) | set((_end, _start) for _start, _end in lines)
+    _meshed = []
+    while len(_meshed) < count:
+        _i = int(rng.integers(1, len(nodes)))
+        _j = max(_i - int(rng.integers(2, 20)), 0)
+        _line = (nodes[_j], nodes[_i])
+        if _line in _existing:
+            continue
+        _existing.update([_line, _line[::-1]])
+        _meshed.append(_line)
+    return _meshed
+
+
+def generate_network(lines=None, seed=0, meshing=0.05):
+    """
+    Generates a synthetic three-level network (transmission, high-pressure, and mid-pressure lines) with
+    the schema of the shapefiles. Each level is a radial network that hangs off the nodes of the level
+    above, plus a share of meshed lines. The nodes the model refers to by name (TRANSMISSION_NODES,
+    REPORT_NODES, and one node of utils.SWITCHED_NODES per level) are included.
+
+    Parameters
+    ----------
+    lines : int, required
+        Total number of lines (at least 20; split by LINE_SHARES). The default is None.
+    seed : int, optional
+        Seed of the random number generator. The default is 0.
+    meshing : float, optional
+        Share of the high- and mid-pressure lines that close loops. The default is 0.05.
+
+    Returns
+    -------
+    network : Dict
+        Includes the lines per level (GeoDataFrame with Start, End, Type, Length, cluster_km for the
+        high- and mid-pressure levels, and geometry), the nodes per level, and the parent of each node.
+
+    """
+    rng = np.random.default_rng(seed)
+    _counts = _get_line_counts(lines)
+    _nodes = {
+        "transmission": TRANSMISSION_NODES
+        + ["T{}".format(_i) for _i in range(_counts["transmission"] + 1 - len(TRANSMISSION_NODES))],
+        "high": [utils.SWITCHED_NODES[-1]]
+        + ["H{}".format(_i) for _i in range(1, _counts["high"] - round(_counts["high"] * meshing))],
+        "mid": REPORT_NODES
+        + [utils.SWITCHED_NODES[0]]
+        + ["M{}".format(_i) for _i in range(3, _counts["mid"] - round(_counts["mid"] * meshing))],
+    }
+    _parents = {TRANSMISSION_NODES[0]: None}
+    _positions = {TRANSMISSION_NODES[0]: np.array([400000.0, 430000.0])}
+    # HIGH-PRESSURE LINES DO NOT START AT NODES THAT ARE ISOLATED FROM THE TRANSMISSION NETWORK
+    _roots = {
+        "transmission": TRANSMISSION_NODES[:1],
+        "high": [_node for _node in _nodes["transmission"] if _node not in utils.ISOLATED_NODES],
+        "mid": _nodes["high"],
+    }
+
+    network = {"nodes": _nodes, "parents": _parents}
+    for _level in ["transmission", "high", "mid"]:
+        _new = _nodes[_level][1:] if _level == "transmission" else _nodes[_level]
+        _lines = _add_radial_lines(
+            rng,
+            _roots[_level],
+            _new,
+            _parents,
+            _positions,
+            NODE_SPREAD[_level],
+            root_share=ROOT_SHARE[_level],
+        )
+        _tree = len(_lines)
+        _lines += _add_meshed_lines(rng, _roots[_level] + _new, _lines, _counts[_level] - _tree)
+        _start, _end = zip(*_lines)
+        _geometry = [LineString([_positions[_a], _positions[_b]]) for _a, _b in _lines]
+        _frame = gpd.GeoDataFrame(
+            {
+                "Start": list(_start),
+                "End": list(_end),
+                "Type": LINE_TYPES[_level][0],
+                # ROUTES ARE LONGER THAN THE DISTANCE BETWEEN THE NODES
+                "Length": [
+                    max(_line.length / 1000 * rng.uniform(1.05, 1.3), 0.1) for _line in _geometry
+                ],
+            },
+            geometry=_geometry,
+            crs=CRS,
+        )
+        if _level in HYDROGEN_CLUSTERS:
+            _blocks = np.arange(len(_frame)) // CLUSTER_SIZE
+            _first = 1000 if _level == "high" else 2000
+            _clusters = _first + _blocks
+            for _block, _cluster in enumerate(HYDROGEN_CLUSTERS[_level]):
+                _clusters[_blocks == _block] = _cluster
+            _frame.insert(4, "cluster_km", _clusters)
+        network[_level] = _frame
+    return network
+
+
+def _get_demand_table(nodes, base, factor):
+    _years = np.array(DEMAND_YEARS)
+    _trend = np.maximum(0.2, 1 - (_years - 2021) / 40)
+    _season = np.array(SEASONALITY)
+    _frames = []
+    for _type, _base in zip(["High-Pressure", "Mid-Pressure"], base):
+        _values = (_base * factor)[:, None, None] * _trend[None, :, None] * _season[None, None, :]
+        _index = pd.MultiIndex.from_product(
+            [nodes, DEMAND_YEARS, list(range(12))], names=["Node", "Year", "Month"]
+        )
+        _frame = _index.to_frame(index=False)
+        _frame.insert(1, "Type", _type)
+        _frame["Value in MWh"] = _values.ravel()
+        _frames.append(_frame)
+    return pd.concat(_frames, ignore_index=True)
+
+
+def generate_instance(lines=None, seed=0, scenario_list=None, meshing=0.05):
+    """
+    Generates the inputs of a synthetic instance with the schema of the shapefiles and Excel input files
+    (see scenarios.read_shared_inputs and scenarios.read_scenario_inputs). Pipeline capacities (MW)
+    follow the peak monthly demand of the nodes behind each line, so that the instance remains
+    feasible without lost load.
+
+    Parameters
+    ----------
+    lines : int, required
+        Total number of lines (see generate_network). The default is None.
+    seed : int, optional
+        Seed of the random number generator. The default is 0.
+    scenario_list : List, optional
+        Scenario short tags with scenario-specific inputs. The default is None (gg).
+    meshing : float, optional
+        Share of the high- and mid-pressure lines that close loops. The default is 0.05.
+
+    Returns
+    -------
+    instance : Dict
+        Includes the lines per level (transmission, high, mid) and the input tables per Excel file name
+        (tables).
+
+    """
+    rng = np.random.default_rng(seed)
+    network = generate_network(lines=lines, seed=seed, meshing=meshing)
+    _parents = network["parents"]
+    _nodes = sorted(set(_parents) | set(utils.ISOLATED_NODES))
+    # MONTHLY DEMAND PER NODE IN 2021: HIGH-PRESSURE (INDUSTRY AT 30% OF THE NODES) AND MID-PRESSURE
+    # (HOUSEHOLDS); SMALL ENOUGH THAT THE BRANCHES FIT THE REPLACEMENT CAPACITIES
+    _base = (
+        np.minimum(rng.lognormal(np.log(300), 1.0, len(_nodes)), 3000)
+        * (rng.random(len(_nodes)) < 0.3),
+        np.minimum(rng.lognormal(np.log(100), 0.8, len(_nodes)), 1000),
+    )
+    _demand = dict(zip(_nodes, (_base[0] + _base[1]) * max(SEASONALITY)))
+
+    _total = sum(_demand.values())
+    _transmission = network["nodes"]["transmission"]
+    # EVERY TRANSMISSION NODE EXCEPT THE BORDER NODES IMPORTS (FROM THE TRANSIT PIPELINES), SO THAT THE
+    # FLOWS (AND COEFFICIENTS) PER LINE DO NOT GROW WITH THE SIZE OF THE NETWORK
+    _imports = [_node for _node in _transmission if _node not in utils.ISOLATED_NODES]
+    _transit = TRANSIT_EXPORT * max(SCENARIO_FACTORS.values())
+
+    # PEAK MONTHLY FLOW BEHIND EACH NODE OF THE RADIAL NETWORK: DEMAND OF THE HIGH- AND MID-PRESSURE
+    # BRANCHES, AND TRANSIT AT THE TRANSMISSION LEVEL; THE CAPACITIES ONLY CHANGE IN THE YEAR OF
+    # INVESTMENT, SO THAT THEY HAVE TO COVER THESE FLOWS FROM THE START
+    _behind = {_node: _demand.get(_node, 0.0) for _node in _parents}
+    _delivered = dict.fromkeys(_imports, 0.0)
+    _delivered[_imports[0]] = _transit * (len(TRANSMISSION_NODES) - 1)
+    for _node in TRANSMISSION_NODES[1:]:
+        _behind[_node] = _transit
+    for _node in reversed(list(_parents)):
+        _parent = _parents[_node]
+        if _parent is None:
+            continue
+        if (_parent in _delivered) and (_node not in _delivered):
+            _delivered[_parent] += _behind[_node]
+        else:
+            _behind[_parent] += _behind[_node]
+
+    _technical = []
+    _economic = []
+    for _level in ["transmission", "high", "mid"]:
+        _type = LINE_TYPES[_level][1]
+        for _start, _end in zip(network[_level].Start, network[_level].End):
+            if _parents.get(_end) == _start:
+                _flow = _behind[_end] * utils.PEAK_FACTOR * rng.uniform(1.2, 2.0)
+            else:
+                _flow = min(_behind[_start], _behind[_end]) * rng.uniform(0.3, 0.8)
+            # CAPACITY IN MW AS IN THE PIPELINE DATA (IN MWH PER MONTH, THE CAPACITIES AND BOOK VALUES
+            # WOULD BE 720 TIMES TOO LARGE, WITH ROW BOUNDS THAT SOME SOLVERS CANNOT HANDLE)
+            _capacity = max(_flow, 100.0) / HOURS_PER_MONTH
+            _built = int(rng.integers(1960, 2016))
+            if _capacity > REPLACEMENT_CAPACITY[_level]:
+                # TRUNK LINES ARE NOT REPLACED WITHIN THE HORIZON
+                _lifetime = int(rng.integers(2066 - _built, 2086 - _built))
+            else:
+                _lifetime = int(rng.integers(max(2026 - _built, 30), min(2064 - _built, 70) + 1))
+            _technical.append(
+                {
+                    "Start": _start,
+                    "End": _end,
+                    "Type": _type,
+                    "Capacity": _capacity,
+                    "Yr.-con.": _built,
+                    "Tec.-life": _lifetime,
+                }
+            )
+            _economic.append(
+                {
+                    "Start": _start,
+                    "End": _end,
+                    "Type": _type,
+                    "Inv.-cost": float(rng.uniform(30, 70)),
+                    "Amort.": int(rng.integers(30, 51)),
+                }
+            )
+
+    _storage = network["nodes"]["high"][::STORAGE_SPACING]
+    tables = {
+        "INPUT_Pipelines_Technical_NEW_v2.xlsx": pd.DataFrame(_technical),
+        "INPUT_Pipelines_Economic.xlsx": pd.DataFrame(_economic),
+        "INPUT_Refurbishment.xlsx": pd.DataFrame(
+            [
+                {"Type": _type, "Name": _name, "Costs": _costs}
+                for _type, _investment, _fixed in [
+                    ("Transmission", 400, 5),
+                    ("High-Pressure", 600, 8),
+                    ("Mid-Pressure", 900, 12),
+                ]
+                for _name, _costs in [
+                    ("Specific investment costs", _investment),
+                    ("Fixed costs", _fixed),
+                ]
+            ]
+        ),
+        "INPUT_Source.xlsx": pd.DataFrame(
+            {"Node": _imports, "Source": [_delivered[_node] * 12 * 2 for _node in _imports]}
+        ),
+        "INPUT_Storage_Technical.xlsx": pd.DataFrame(
+            {"Node": _storage, "Capacity": _total * 0.5 / len(_storage)}
+        ),
+        "INPUT_Time_Resolution.xlsx": pd.DataFrame({"Month": utils.MONTHS, "Factor": 1.0}),
+        "INPUT_Prices.xlsx": pd.DataFrame(
+            {"Year": PRICE_YEARS, "Price": 30.0 + 0.5 * (np.array(PRICE_YEARS) - 2021)}
+        ),
+        "INPUT_Value_of_Lost_Load.xlsx": pd.DataFrame(
+            [
+                {"Type": _type, "Year": _year, "Value in EUR per MWh": _value}
+                for _type, _value in [("High-Pressure", 150.0), ("Mid-Pressure", 200.0)]
+                for _year in PRICE_YEARS
+            ]
+        ),
+    }
+
+    # LOCAL SOURCES (E.G., BIOMETHANE) AT A SHARE OF THE HIGH- AND MID-PRESSURE NODES (THE VALUES PER
+    # NODE DO NOT GROW WITH THE SIZE OF THE NETWORK)
+    _local = [
+        _node
+        for _node in network["nodes"]["high"] + network["nodes"]["mid"]
+        if rng.random() < LOCAL_SHARE
+    ] or network["nodes"]["high"][:1]
+    # ABOUT THE ANNUAL DEMAND IN 2040, WHEN THE GREEN GAS SCENARIOS DECOUPLE THE TRANSMISSION LEVEL
+    _weights = rng.uniform(0.2, 1.0, len(_local))
+    _local_base = _weights / _weights.sum() * _total * 4.5
+    for _scenario in ["gg"] if scenario_list is None else scenario_list:
+        _factor = SCENARIO_FACTORS[_scenario]
+        tables["DEMAND_methane_MODELRUN_{}.xlsx".format(_scenario)] = _get_demand_table(
+            _nodes, _base, _factor
+        )
+        tables["TRANSIT_export_{}.xlsx".format(_scenario)] = pd.DataFrame(
+            [
+                {
+                    "Node": _node,
+                    "Drct.": "Export",
+                    "Year": _year,
+                    "Month": _month,
+                    "Value in MWh": TRANSIT_EXPORT * _factor * (1 - (_year - 2021) / 40),
+                }
+                for _node in TRANSMISSION_NODES[1:]
+                for _year in (TRANSIT_YEARS if _node != "Arnoldstein" else TRANSIT_YEARS[:1])
+                for _month in utils.MONTHS
+            ]
+        )
+        tables["SOURCE_methane_MODELRUN_FINAL{}.xlsx".format(_scenario)] = pd.DataFrame(
+            [
+                {
+                    "Node": _node,
+                    "Year": _year,
+                    "Value in MWh": _value * _factor * (_year - 2020) / 20,
+                }
+                for _node, _value in zip(_local, _local_base)
+                for _year in DEMAND_YEARS
+            ]
+        )
+        tables["TRANSIT_import_{}.xlsx".format(_scenario)] = pd.DataFrame(
+            # ANNUAL IMPORT IN 1000 MWH (SEE UTILS.INIT_TRA_NODE_PER_TYPE)
+            [
+                {"Node": _node, "Year": _year, "Value": _delivered[_node] * 12 * 2 / 1000}
+                for _node in _imports
+                for _year in PRICE_YEARS
+            ]
+        )
+
+    instance = {_level: network[_level] for _level in ["transmission", "high", "mid"]}
+    instance["tables"] = tables
+    return instance
+
+
+def write_instance(instance=None, path=None):
+    """
+    Writes a synthetic instance as shapefiles (path/transmission, path/high, path/mid) and Excel input
+    files (path/data), so that it can be read with scenarios.read_shared_inputs(path=path/data,
+    network_path=path).
+
+    Parameters
+    ----------
+    instance : Dict, required
+        Includes the lines and the input tables (see generate_instance). The default is None.
+    path : String or Path, required
+        Directory of the instance. The default is None.
+
+    Raises
+    ------
+    ValueError
+        If a table does not fit into an Excel sheet (e.g., the demand of more than about 1600 nodes).
+
+    Returns
+    -------
+    None.
+
+    """
+    _path = Path(path)
+    for _name, _table in instance["tables"].items():
+        if len(_table) >= EXCEL_ROWS:
+            raise ValueError(
+                "{} has {} rows and does not fit into an Excel sheet".format(_name, len(_table))
+            )
+    for _level in ["transmission", "high", "mid"]:
+        (_path / _level).mkdir(parents=True, exist_ok=True)
+        instance[_level].to_file(_path / _level / "{}.shp".format(_level), encoding="utf-8")
+    (_path / "data").mkdir(parents=True, exist_ok=True)
+    for _name, _table in instance["tables"].items():
+        _table.to_excel(_path / "data" / _name, index=False)
+    return
+
+
+def get_inputs(instance=None, scenario="gg"):
+    """
+    Parameters
+    ----------
+    instance : Dict, required
+        Includes the lines and the input tables (see generate_instance). The default is None.
+    scenario : String, optional
+        Scenario short tag. The default is "gg".
+
+    Returns
+    -------
+    Tuple
+        Shared and scenario-specific inputs as returned by scenarios.read_shared_inputs and
+        scenarios.read_scenario_inputs (without writing and reading the files).
+
+    """
+    _tables = instance["tables"]
+    shared = {
+        "transmission": instance["transmission"],
+        "high": instance["high"],
+        "mid": instance["mid"],
+        "nodes": utils.get_nodes_from_lines(
+            transmission=instance["transmission"],
+            high_pressure=instance["high"],
+            mid_pressure=instance["mid"],
+        ),
+        "pipeline_economic": _tables["INPUT_Pipelines_Economic.xlsx"],
+        "pipeline_technical": _tables["INPUT_Pipelines_Technical_NEW_v2.xlsx"],
+        "refurbishment": _tables["INPUT_Refurbishment.xlsx"],
+        "source": _tables["INPUT_Source.xlsx"],
+        "storage": _tables["INPUT_Storage_Technical.xlsx"],
+        "temporal_demand": _tables["INPUT_Time_Resolution.xlsx"],
+        "prices": _tables["INPUT_Prices.xlsx"],
+        "value_of_lost_load": _tables["INPUT_Value_of_Lost_Load.xlsx"],
+    }
+    _demand = _tables["DEMAND_methane_MODELRUN_{}.xlsx".format(scenario)]
+    inputs = {
+        "demand_high": _demand.loc[_demand.Type == "High-Pressure"],
+        "demand_mid": _demand.loc[_demand.Type == "Mid-Pressure"],
+        "demand_tra": _tables["TRANSIT_export_{}.xlsx".format(scenario)],
+        "generation": _tables["SOURCE_methane_MODELRUN_FINAL{}.xlsx".format(scenario)],
+        "feasible": _tables["TRANSIT_import_{}.xlsx".format(scenario)],
+    }
+    return shared, inputs
+
+
+def get_stage_times(records=None):
+    """
+    Parameters
+    ----------
+    records : List, required
+        Profiler records of one benchmark run (see profiler.get_records). The default is None.
+
+    Returns
+    -------
+    Dict
+        Seconds per stage (see STAGES); "utils" sums all build steps other than constraints.add and
+        matrix.build_problem.
+
+    """
+    _times = dict.fromkeys(STAGES, 0.0)
+    for _record in records:
+        if _record["parent"] is not None:
+            continue
+        if _record["stage"] == "build":
+            _stage = _record["component"] if _record["component"] in STAGES else "utils"
+        else:
+            _stage = _record["stage"]
+        if _stage in _times:
+            _times[_stage] += _record["seconds"]
+    return _times
+
+
+def get_model_size(model=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance (see scenarios.build_model). The default is None.
+
+    Returns
+    -------
+    Tuple
+        Number of variables and constraints (rows of the coefficient matrix for the matrix builder).
+
+    """
+    _variables = sum(len(_var) for _var in model.component_objects(py.Var, active=True))
+    if hasattr(model, "problem"):
+        return _variables, model.problem["matrix"].shape[0]
+    _constraints = sum(
+        len(_constraint) for _constraint in model.component_objects(py.Constraint, active=True)
+    )
+    return _variables, _constraints
+
+
+def get_scaling_exponents(frame=None):
+    """
+    Fits time = a * lines ^ b per stage (least squares on the logarithms).
+
+    Parameters
+    ----------
+    frame : pandas.DataFrame, required
+        Includes the seconds per stage and number of lines (see run_benchmark). The default is None.
+
+    Returns
+    -------
+    pandas.Series
+        Exponent b per stage (stages measured at less than two sizes are omitted).
+
+    """
+    _exponents = dict()
+    for _stage in STAGES + ["total"]:
+        _valid = frame.loc[frame[_stage] > 0]
+        if _valid.lines.nunique() >= 2:
+            _exponents[_stage] = np.polyfit(np.log(_valid.lines), np.log(_valid[_stage]), 1)[0]
+    return pd.Series(_exponents, name="exponent")
+
+
+def run_size(
+    lines=None,
+    seed=0,
+    scenario="gg",
+    path=None,
+    builder="pyomo",
+    solver="gurobi",
+    threads=1,
+    profile=None,
+    horizon="full",
+    dispatch_years=None,
+    temporal=12,
+    solve=True,
+    output_format="csv",
+):
+    """
+    Generates, builds, solves, and reports one synthetic instance and measures the time per stage.
+    The profiler is restarted for the run (see profiler.enable).
+
+    Parameters
+    ----------
+    lines : int, required
+        Total number of lines (see generate_network). The default is None.
+    seed : int, optional
+        Seed of the random number generator. The default is 0.
+    scenario : String, optional
+        Scenario short tag. The default is "gg".
+    path : String, optional
+        Directory in which the instance is written and read again (read stage); see write_instance.
+        The default is None (the inputs are passed in memory).
+    builder : String, optional
+        "pyomo" or "matrix" (see scenarios.build_model). The default is "pyomo".
+    solver : String, optional
+        Solver name (see solvers.SOLVERS and matrix.SOLVERS). The default is "gurobi".
+    threads : int, optional
+        Number of solver threads. The default is 1.
+    profile : Dict, optional
+        Includes the gap, time limit, and emphasis (see solvers.get_profile). The default is None.
+    horizon : String, optional
+        "full", "drop", or "terminal" (see utils.add_time_horizon). The default is "full".
+    dispatch_years : List, optional
+        Years with a modeled dispatch (see utils.add_time_horizon). The default is None (all years).
+    temporal : integer, optional
+        Number of time slices per year (see utils.get_time_slices). The default is 12.
+    solve : bool, optional
+        If False, the solve and report stages are skipped. The default is True.
+    output_format : String, optional
+        File format of the report (see report.OUTPUT_FORMATS). The default is "csv".
+
+    Returns
+    -------
+    Dict
+        Includes the number of lines, nodes, variables, and constraints, the seconds per stage, the
+        total, and the objective value.
+
+    """
+    profiler.enable(memory=False)
+    try:
+        with profiler.measure("generate"):
+            instance = generate_instance(lines=lines, seed=seed, scenario_list=[scenario])
+        if path is None:
+            shared, inputs = get_inputs(instance=instance, scenario=scenario)
+        else:
+            _path = Path(path) / "lines-{}".format(lines)
+            write_instance(instance=instance, path=_path)
+            shared = scenarios.read_shared_inputs(path=_path / "data", network_path=_path)
+            inputs = scenarios.read_scenario_inputs(scenario=scenario, path=_path / "data")
+        model = scenarios.build_model(
+            scenario=scenario,
+            shared=shared,
+            inputs=inputs,
+            builder=builder,
+            horizon=horizon,
+            dispatch_years=dispatch_years,
+            temporal=temporal,
+        )
+        _variables, _constraints = get_model_size(model)
+        _objective = None
+        if solve:
+            with profiler.measure("solve", solver):
+                if builder == "matrix":
+                    _values, _objective = matrix.solve_problem(
+                        problem=model.problem, solver=solver, threads=threads, profile=profile
+                    )
+                    matrix.load_solution(model=model, problem=model.problem, values=_values)
+                else:
+                    Solver = solvers.set_solver(solver, profile=profile, threads=threads)
+                    try:
+                        _results = solvers.solve_model(
+                            Solver=Solver, model=model, tee=False, warmstart=False
+                        )
+                    except RuntimeError:
+                        # NO SOLUTION WITHIN THE TIME LIMIT (NO REPORT)
+                        pass
+                    else:
+                        _objective = solvers.get_objective_value(_results)
+            if _objective is not None:
+                with profiler.measure("report"):
+                    report.write_results_to_folder(
+                        model, "benchmark-{}".format(lines), output_format=output_format
+                    )
+        _times = get_stage_times(profiler.get_records())
+    finally:
+        profiler.disable()
+    return {
+        "lines": lines,
+        "nodes": len(shared["nodes"]["High-Pressure"]) + len(shared["nodes"]["Mid-Pressure"]),
+        "variables": _variables,
+        "constraints": _constraints,
+        **_times,
+        "total": sum(_times.values()),
+        "objective": _objective,
+    }
+
+
+def get_problem_size(problem=None):
+    """
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the coefficient matrix and the objective (see matrix.build_problem and
+        writer.get_problem). The default is None.
+
+    Returns
+    -------
+    Dict
+        Number of rows with coefficients, columns with coefficients or costs, and coefficients.
+
+    """
+    _matrix = problem["matrix"].tocsr()
+    _columns = np.zeros(_matrix.shape[1], dtype=bool)
+    _columns[_matrix.indices] = True
+    _columns |= np.asarray(problem["objective"]) != 0
+    return {
+        "rows": int((np.diff(_matrix.indptr) > 0).sum()),
+        "columns": int(_columns.sum()),
+        "coefficients": int(_matrix.nnz),
+    }
+
+
+def _round(value, digits):
+    # + 0.0 TURNS -0.0 (NEGATED ZERO BOUNDS) INTO 0.0
+    return float("{:.{}g}".format(value, digits)) + 0.0
+
+
+def get_canonical_problem(problem=None, digits=10):
+    """
+    Canonical form of a problem that does not depend on the order of the rows and columns or the sign
+    of the rows: the rows are keyed by their terms (column name and coefficient, sorted by the name)
+    and their bounds, each row scaled by -1 if needed so that its first coefficient is positive.
+
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the coefficient matrix, bounds, integrality, objective, and the names of the columns and
+        rows (see writer.get_names). The default is None.
+    digits : int, optional
+        Significant digits of the coefficients, bounds, and costs. The default is 10.
+
+    Returns
+    -------
+    Tuple
+        Lower bound, upper bound, integrality, and cost per column name (only columns with coefficients
+        or costs), and the names of the rows per row key (only rows with coefficients).
+
+    """
+    _names = list(writer.get_names(problem=problem, axis="columns"))
+    _matrix = problem["matrix"].tocsr()
+    _used = np.zeros(_matrix.shape[1], dtype=bool)
+    _used[_matrix.indices] = True
+    _used |= np.asarray(problem["objective"]) != 0
+    _columns = {
+        _names[_j]: (
+            _round(problem["column_lower"][_j], digits),
+            _round(problem["column_upper"][_j], digits),
+            bool(problem["integer"][_j]),
+            _round(problem["objective"][_j], digits),
+        )
+        for _j in np.flatnonzero(_used)
+    }
+    _rows = dict()
+    for _i, _row in enumerate(writer.get_names(problem=problem, axis="rows")):
+        _start, _end = _matrix.indptr[_i], _matrix.indptr[_i + 1]
+        if _start == _end:
+            continue
+        _terms = sorted(
+            (_names[_j], _value)
+            for _j, _value in zip(_matrix.indices[_start:_end], _matrix.data[_start:_end])
+        )
+        _lower, _upper = problem["row_lower"][_i], problem["row_upper"][_i]
+        _sign = 1 if _terms[0][1] > 0 else -1
+        if _sign < 0:
+            _lower, _upper = -_upper, -_lower
+        _key = (
+            tuple((_name, _round(_sign * _value, digits)) for _name, _value in _terms),
+            _round(_lower, digits),
+            _round(_upper, digits),
+        )
+        _rows.setdefault(_key, []).append(_row)
+    return _columns, _rows
+
+
+def _format_row(key):
+    _terms = " ".join("{:+g} {}".format(_value, _name) for _name, _value in key[0])
+    return "{:g} <= {} <= {:g}".format(key[1], _terms, key[2])
+
+
+def compare_problems(problems=None):
+    """
+    Parameters
+    ----------
+    problems : Dict, required
+        Includes the canonical problem (see get_canonical_problem) per builder (two builders). The
+        default is None.
+
+    Raises
+    ------
+    ValueError
+        At the first column or row of one builder without an equal column or row of the other builder.
+
+    Returns
+    -------
+    None.
+
+    """
+    (_a, (_columns_a, _rows_a)), (_b, (_columns_b, _rows_b)) = problems.items()
+    for (_x, _columns_x), (_y, _columns_y) in [
+        ((_a, _columns_a), (_b, _columns_b)),
+        ((_b, _columns_b), (_a, _columns_a)),
+    ]:
+        for _name, _column in _columns_x.items():
+            if _name not in _columns_y:
+                raise ValueError("Column {} of the {} builder is missing in the {} builder".format(_name, _x, _y))
+            if _column != _columns_y[_name]:
+                raise ValueError(
+                    "Column {} differs (lower, upper, integer, cost): {} ({}) and {} ({})".format(
+                        _name, _column, _x, _columns_y[_name], _y
+                    )
+                )
+    for (_x, _rows_x), (_y, _rows_y) in [((_a, _rows_a), (_b, _rows_b)), ((_b, _rows_b), (_a, _rows_a))]:
+        for _key, _names in _rows_x.items():
+            _count = len(_rows_y.get(_key, []))
+            if _count < len(_names):
+                raise ValueError(
+                    "Row {} of the {} builder has no equal row in the {} builder: {}".format(
+                        _names[_count], _x, _y, _format_row(_key)
+                    )
+                )
+    return
+
+
+def check_builders(
+    lines=CHECK_SIZE,
+    seed=0,
+    scenario="gg",
+    solver="highs",
+    threads=1,
+    horizon="full",
+    dispatch_years=None,
+    temporal=12,
+    tolerance=1e-6,
+):
+    """
+    Builds one synthetic instance with both builders (see scenarios.BUILDERS) and compares the
+    problems row by row and column by column (see get_canonical_problem) and the objective values of
+    the LP relaxation and the MIP, since matrix.py repeats every constraint of constraints.py. The
+    Pyomo model is collected into a coefficient matrix (see writer.get_problem), so that both problems
+    are compared and solved the same way (see matrix.solve_problem).
+
+    Parameters
+    ----------
+    lines : int, optional
+        Total number of lines (see generate_network). The default is CHECK_SIZE.
+    seed : int, optional
+        Seed of the random number generator. The default is 0.
+    scenario : String, optional
+        Scenario short tag. The default is "gg".
+    solver : String, optional
+        Solver name (see matrix.SOLVERS). The default is "highs".
+    threads : int, optional
+        Number of solver threads. The default is 1.
+    horizon : String, optional
+        "full", "drop", or "terminal" (see utils.add_time_horizon). The default is "full".
+    dispatch_years : List, optional
+        Years with a modeled dispatch (see utils.add_time_horizon). The default is None (all years).
+    temporal : integer, optional
+        Number of time slices per year (see utils.get_time_slices). The default is 12.
+    tolerance : float, optional
+        Accepted relative difference of the objective values, also the MIP gap of the solves. The
+        default is 1e-6.
+
+    Raises
+    ------
+    ValueError
+        If a column, a row, or the objective values of the builders differ (see compare_problems).
+
+    Returns
+    -------
+    frame : pandas.DataFrame
+        Includes the number of rows, columns, and coefficients and the objective values of the LP
+        relaxation and the MIP per builder.
+
+    """
+    instance = generate_instance(lines=lines, seed=seed, scenario_list=[scenario])
+    shared, inputs = get_inputs(instance=instance, scenario=scenario)
+    _rows = dict()
+    _canonical = dict()
+    for _builder in scenarios.BUILDERS:
+        model = scenarios.build_model(
+            scenario=scenario,
+            shared=shared,
+            inputs=inputs,
+            builder=_builder,
+            horizon=horizon,
+            dispatch_years=dispatch_years,
+            temporal=temporal,
+        )
+        _problem = model.problem if _builder == "matrix" else writer.get_problem(model=model)
+        _row = get_problem_size(_problem)
+        _canonical[_builder] = get_canonical_problem(problem=_problem)
+        for _stage, _integer in (("lp", np.zeros_like(_problem["integer"])), ("mip", None)):
+            _values, _objective = matrix.solve_problem(
+                problem={**_problem, "integer": _problem["integer"] if _integer is None else _integer},
+                solver=solver,
+                threads=threads,
+                profile={"gap": tolerance},
+            )
+            _row[_stage] = _objective + _problem.get("offset", 0)
+        _rows[_builder] = _row
+        del model
+        gc.collect()
+    frame = pd.DataFrame.from_dict(_rows, orient="index")
+    print(frame.to_string(float_format="{:.3f}".format))
+
+    compare_problems(problems=_canonical)
+    _reference, _other = (_rows[_builder] for _builder in scenarios.BUILDERS)
+    for _key in ("lp", "mip"):
+        if abs(_reference[_key] - _other[_key]) > tolerance * max(abs(_reference[_key]), 1.0):
+            raise ValueError(
+                "The builders differ in the {} objective: {:.3f} and {:.3f}".format(
+                    _key.upper(), _reference[_key], _other[_key]
+                )
+            )
+    print("Builders: same rows, columns, and objective values ({} lines)".format(lines))
+    return frame
+
+
+def run_benchmark(sizes=None, path=None, **kwargs):
+    """
+    Runs the benchmark for several network sizes (see run_size) and writes the scaling curves to
+    solution/scaling-<time>.csv.
+
+    Parameters
+    ----------
+    sizes : List, optional
+        Numbers of lines. The default is None (BENCHMARK_SIZES).
+    path : String, optional
+        Directory of the written instances (see run_size). The default is None (in memory).
+    **kwargs
+        Passed to run_size (e.g., seed, builder, solver, or solve).
+
+    Returns
+    -------
+    frame : pandas.DataFrame
+        Includes one row per size (see run_size).
+
+    """
+    _rows = []
+    for _lines in BENCHMARK_SIZES if sizes is None else sizes:
+        print("Benchmark: {} lines".format(_lines))
+        _rows.append(run_size(lines=_lines, path=path, **kwargs))
+        print("Benchmark: {} lines; {:.1f} s".format(_lines, _rows[-1]["total"]))
+        # THE MODEL OF THE LAST SIZE IS RELEASED BEFORE THE NEXT ONE IS BUILT
+        gc.collect()
+    frame = pd.DataFrame(_rows)
+    _file = os.path.join(
+        "solution", "scaling-{}.csv".format(datetime.now().strftime("%Y%m%dT%H%M"))
+    )
+    os.makedirs("solution", exist_ok=True)
+    frame.to_csv(_file, index=False)
+    print(frame.to_string(index=False))
+    print("Scaling exponents (time ~ lines ^ b):")
+    print(get_scaling_exponents(frame).to_string())
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark of the model pipeline on synthetic gas grids of increasing size."
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=BENCHMARK_SIZES,
+        metavar="LINES",
+        help="Numbers of lines of the synthetic networks. Default: {}.".format(
+            " ".join(str(_size) for _size in BENCHMARK_SIZES)
+        ),
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic networks.")
+    parser.add_argument(
+        "--scenario",
+        choices=list(SCENARIO_FACTORS),
+        default="gg",
+        help="Scenario whose demand level is generated.",
+    )
+    parser.add_argument(
+        "--write-inputs",
+        default=None,
+        metavar="DIR",
+        help="Write each instance as shapefiles and Excel files to DIR/lines-<N> and read it again "
+        "(read stage); limited to about 1600 nodes by the rows of an Excel sheet.",
+    )
+    parser.add_argument("--builder", choices=scenarios.BUILDERS, default="pyomo")
+    parser.add_argument(
+        "--solver",
+        choices=list(solvers.SOLVERS),
+        default=None,
+        help="MIP solver. Default: gurobi, or highs for --check-builders (no licence needed).",
+    )
+    parser.add_argument("--threads", type=int, default=1, help="Number of solver threads.")
+    parser.add_argument("--gap", type=float, default=None, help="Relative MIP gap.")
+    parser.add_argument(
+        "--time-limit", type=float, default=None, help="Time limit of the solver in seconds."
+    )
+    parser.add_argument("--horizon", choices=utils.HORIZONS, default="full")
+    parser.add_argument("--dispatch-years", nargs="+", type=int, default=None, metavar="YEAR")
+    parser.add_argument("--time-slices", type=int, default=12)
+    parser.add_argument(
+        "--no-solve", action="store_true", help="Only generate and build the models."
+    )
+    parser.add_argument(
+        "--check-builders",
+        nargs="?",
+        type=int,
+        const=CHECK_SIZE,
+        default=None,
+        metavar="LINES",
+        help="Only compare the problem size and the LP and MIP objective values of the pyomo and "
+        "matrix builders on one instance (default: {} lines).".format(CHECK_SIZE),
+    )
+    args = parser.parse_args()
+
+    if args.check_builders is not None:
+        check_builders(
+            lines=args.check_builders,
+            seed=args.seed,
+            scenario=args.scenario,
+            solver="highs" if args.solver is None else args.solver,
+            threads=args.threads,
+            horizon=args.horizon,
+            dispatch_years=args.dispatch_years,
+            temporal=args.time_slices,
+        )
+        return
+
+    run_benchmark(
+        sizes=args.sizes,
+        path=args.write_inputs,
+        seed=args.seed,
+        scenario=args.scenario,
+        builder=args.builder,
+        solver="gurobi" if args.solver is None else args.solver,
+        threads=args.threads,
+        profile={"gap": args.gap, "time_limit": args.time_limit},
+        horizon=args.horizon,
+        dispatch_years=args.dispatch_years,
+        temporal=args.time_slices,
+        solve=not args.no_solve,
+    )
+    return
+
+
+if __name__ == "__main__":
+    main()
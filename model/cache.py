@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+import pandas as pd
+import profiler
+
+
+CACHE_DIR = Path("data") / ".cache"
+INDEX_FILE = "index.json"
+
+
+def get_content_hash(path=None):
+    """
+    Parameters
+    ----------
+    path : Path, required
+        Path to the file. The default is None.
+
+    Returns
+    -------
+    String
+        SHA-256 hash of the file content.
+
+    """
+    _hash = hashlib.sha256()
+    with open(path, "rb") as _file:
+        for _chunk in iter(lambda: _file.read(1 << 20), b""):
+            _hash.update(_chunk)
+    return _hash.hexdigest()
+
+
+def _read_index(cache_dir):
+    try:
+        with open(cache_dir / INDEX_FILE, "r", encoding="utf-8") as _file:
+            return json.load(_file)
+    except (OSError, ValueError):
+        return dict()
+
+
+def _write_index(cache_dir, index):
+    # WRITE TO A TEMPORARY FILE FIRST, SO THAT PARALLEL RUNS NEVER READ A HALF-WRITTEN INDEX.
+    _tmp = cache_dir / "{}.{}.tmp".format(INDEX_FILE, os.getpid())
+    with open(_tmp, "w", encoding="utf-8") as _file:
+        json.dump(index, _file, indent=1)
+    os.replace(_tmp, cache_dir / INDEX_FILE)
+
+
+def _parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def read_excel(path=None, cache_dir=None, **kwargs):
+    """
+    Reads an Excel input file. On the first read, the workbook is converted to a parquet file in the
+    cache directory; later reads are served from the (memory-mapped) parquet file as long as the
+    path, modification time, and content hash of the workbook are unchanged.
+    Falls back to pandas.read_excel if pyarrow is not installed or the data cannot be stored as parquet.
+
+    Parameters
+    ----------
+    path : String or Path, required
+        Path to the Excel file. The default is None.
+    cache_dir : String or Path, optional
+        Directory of the cache. The default is None (CACHE_DIR).
+    **kwargs
+        Passed to pandas.read_excel (e.g., sheet_name) and part of the cache key.
+
+    Returns
+    -------
+    DataFrame
+        Includes the content of the Excel file.
+
+    """
+    with profiler.measure("read", Path(path).name):
+        return _read_excel(path=path, cache_dir=cache_dir, **kwargs)
+
+
+def _read_excel(path=None, cache_dir=None, **kwargs):
+    _path = Path(path)
+    if not _parquet_available():
+        return pd.read_excel(_path, **kwargs)
+
+    _cache_dir = Path(CACHE_DIR if cache_dir is None else cache_dir)
+    _cache_dir.mkdir(parents=True, exist_ok=True)
+
+    _options = json.dumps(kwargs, sort_keys=True, default=str)
+    _key = "{}|{}".format(_path.resolve(), _options)
+    _stat = _path.stat()
+    _index = _read_index(_cache_dir)
+    _entry = _index.get(_key)
+
+    if (
+        _entry is not None
+        and _entry["mtime_ns"] == _stat.st_mtime_ns
+        and _entry["size"] == _stat.st_size
+    ):
+        _content_hash = _entry["sha256"]
+    else:
+        _content_hash = get_content_hash(_path)
+
+    _suffix = hashlib.sha256(_options.encode("utf-8")).hexdigest()[:8]
+    _cache_file = _cache_dir / "{}-{}-{}.parquet".format(
+        _path.stem, _content_hash[:16], _suffix
+    )
+
+    if _cache_file.exists():
+        _data = pd.read_parquet(_cache_file, engine="pyarrow", memory_map=True)
+    else:
+        _data = pd.read_excel(_path, **kwargs)
+        _tmp = _cache_file.with_suffix(".{}.tmp".format(os.getpid()))
+        try:
+            _data.to_parquet(_tmp, engine="pyarrow")
+        except (ValueError, TypeError, NotImplementedError) as _error:
+            print("Input cache: {} not cached ({})".format(_path.name, _error))
+            if _tmp.exists():
+                _tmp.unlink()
+            return _data
+        os.replace(_tmp, _cache_file)
+        print("Input cache: {} cached".format(_path.name))
+
+    _new_entry = {
+        "mtime_ns": _stat.st_mtime_ns,
+        "size": _stat.st_size,
+        "sha256": _content_hash,
+        "file": _cache_file.name,
+    }
+    if _entry != _new_entry:
+        # REMOVE THE CACHED VERSION OF THE PREVIOUS CONTENT OF THIS WORKBOOK.
+        if _entry is not None and _entry.get("file") != _cache_file.name:
+            _old = _cache_dir / _entry["file"]
+            if _old.exists():
+                _old.unlink()
+        _index[_key] = _new_entry
+        _write_index(_cache_dir, _index)
+    return _data
@@ -1,4 +1,5 @@
 import pyomo.environ as py
+import utils
 
 
 def cal_capex_per_year(model, year):
@@ -143,6 +144,9 @@ def cal_book_value_mid_line(model, year, line):
 
 def cal_investment_costs_per_tra_line(model, line):
     _inv_year = model.par_year_of_inv_tra[line]
+    if _inv_year not in model.set_year:
+        # INVESTMENT PLANNED AFTER THE MODELED YEARS (SEE UTILS.ADD_TIME_HORIZON)
+        return model.var_pi_tra_line_inv[line] == 0
     return (
         model.var_pi_tra_line_inv[line]
         == model.par_ref_tra
@@ -153,6 +157,9 @@ def cal_investment_costs_per_tra_line(model, line):
 
 def cal_investment_costs_per_high_line(model, line):
     _inv_year = model.par_year_of_inv_hp[line]
+    if _inv_year not in model.set_year:
+        # INVESTMENT PLANNED AFTER THE MODELED YEARS (SEE UTILS.ADD_TIME_HORIZON)
+        return model.var_pi_high_line_inv[line] == 0
     return (
         model.var_pi_high_line_inv[line]
         == model.par_ref_high
@@ -163,6 +170,9 @@ def cal_investment_costs_per_high_line(model, line):
 
 def cal_investment_costs_per_mid_line(model, line):
     _inv_year = model.par_year_of_inv_mp[line]
+    if _inv_year not in model.set_year:
+        # INVESTMENT PLANNED AFTER THE MODELED YEARS (SEE UTILS.ADD_TIME_HORIZON)
+        return model.var_pi_mid_line_inv[line] == 0
     return (
         model.var_pi_mid_line_inv[line]
         == model.par_ref_mid
@@ -182,7 +192,7 @@ def set_bounds_of_gamma_inv_transmission(model, line, year):
     elif year > _inv_year:
         return (
             model.var_gamma_tra_line_inv[year, line]
-            == model.var_gamma_tra_line_inv[year - 1, line]
+            == model.var_gamma_tra_line_inv[model.set_year.prev(year), line]
         )
     else:
         return py.Constraint.Skip
@@ -199,7 +209,7 @@ def set_bounds_of_gamma_inv_high(model, line, year):
     elif year > _inv_year:
         return (
             model.var_gamma_high_line_inv[year, line]
-            == model.var_gamma_high_line_inv[year - 1, line]
+            == model.var_gamma_high_line_inv[model.set_year.prev(year), line]
         )
     else:
         return py.Constraint.Skip
@@ -216,7 +226,7 @@ def set_bounds_of_gamma_inv_mid(model, line, year):
     elif year > _inv_year:
         return (
             model.var_gamma_mid_line_inv[year, line]
-            == model.var_gamma_mid_line_inv[year - 1, line]
+            == model.var_gamma_mid_line_inv[model.set_year.prev(year), line]
         )
     else:
         return py.Constraint.Skip
@@ -232,15 +242,12 @@ def export_from_transmission_node(model, n, y, m):
     Return : Constraint (12) (Part 1)
     """
     # lines : alle leitungen die export richtung von knoten n haben
-    if n in model.tra_export_lines.keys():
-        lines = model.tra_export_lines[n]
-    else:
-        lines = []
+    lines = utils.get_lines_of_node(
+        adjacency=model.tra_adjacency, node=n, direction="export"
+    )
     _length = len(lines)
 
-    if _length == 0:
-        return model.var_export_tra[n, y, m] == 0
-    elif _length == 1:
+    if _length == 1:
         return (
             model.var_export_tra[n, y, m] == model.var_transported_tra[lines[0], y, m]
         )
@@ -259,15 +266,12 @@ def import_from_transmission_node(model, n, y, m):
 
     Return : Constraint (12) (Part 1)
     """
-    if n in model.tra_import_lines.keys():
-        lines = model.tra_import_lines[n]
-    else:
-        lines = []
+    lines = utils.get_lines_of_node(
+        adjacency=model.tra_adjacency, node=n, direction="import"
+    )
     _length = len(lines)
 
-    if _length == 0:
-        return model.var_import_tra[n, y, m] == 0
-    elif _length == 1:
+    if _length == 1:
         return (
             model.var_import_tra[n, y, m] == model.var_transported_tra[lines[0], y, m]
         )
@@ -278,15 +282,12 @@ def import_from_transmission_node(model, n, y, m):
 
 
 def export_from_high_node(model, n, y, m):
-    if n in model.high_export_lines.keys():
-        lines = model.high_export_lines[n]
-    else:
-        lines = []
+    lines = utils.get_lines_of_node(
+        adjacency=model.high_adjacency, node=n, direction="export"
+    )
     _length = len(lines)
 
-    if _length == 0:
-        return model.var_export_high[n, y, m] == 0
-    elif _length == 1:
+    if _length == 1:
         return (
             model.var_export_high[n, y, m] == model.var_transported_high[lines[0], y, m]
         )
@@ -305,15 +306,12 @@ def import_from_high_node(model, n, y, m):
 
     Return : Constraint (12) (Part 1)
     """
-    if n in model.high_import_lines.keys():
-        lines = model.high_import_lines[n]
-    else:
-        lines = []
+    lines = utils.get_lines_of_node(
+        adjacency=model.high_adjacency, node=n, direction="import"
+    )
     _length = len(lines)
 
-    if _length == 0:
-        return model.var_import_high[n, y, m] == 0
-    elif _length == 1:
+    if _length == 1:
         return (
             model.var_import_high[n, y, m] == model.var_transported_high[lines[0], y, m]
         )
@@ -324,21 +322,19 @@ def import_from_high_node(model, n, y, m):
 
 
 def export_from_mid_node(model, n, y, m):
-    if n in model.mid_export_lines.keys():
-        lines = model.mid_export_lines[n]
-    else:
-        lines = []
+    lines = utils.get_lines_of_node(
+        adjacency=model.mid_adjacency, node=n, direction="export"
+    )
     _length = len(lines)
 
-    if _length == 0:
-        return model.var_export_mid[n, y, m] == 0
-    elif _length == 1:
+    if _length == 1:
         return (
-            model.var_export_mid[n, y, m] == model.var_transported_mid[lines[0], y, m]
+            model.var_export_mid[n, y, m]
+            == utils.get_transported_mid(model=model, line=lines[0], year=y, month=m)
         )
     else:
         return model.var_export_mid[n, y, m] == sum(
-            model.var_transported_mid[line, y, m] for line in lines
+            utils.get_transported_mid(model=model, line=line, year=y, month=m) for line in lines
         )
 
 
@@ -351,21 +347,19 @@ def import_from_mid_node(model, n, y, m):
 
     Return : Constraint (12) (Part 1)
     """
-    if n in model.mid_import_lines.keys():
-        lines = model.mid_import_lines[n]
-    else:
-        lines = []
+    lines = utils.get_lines_of_node(
+        adjacency=model.mid_adjacency, node=n, direction="import"
+    )
     _length = len(lines)
 
-    if _length == 0:
-        return model.var_import_mid[n, y, m] == 0
-    elif _length == 1:
+    if _length == 1:
         return (
-            model.var_import_mid[n, y, m] == model.var_transported_mid[lines[0], y, m]
+            model.var_import_mid[n, y, m]
+            == utils.get_transported_mid(model=model, line=lines[0], year=y, month=m)
         )
     else:
         return model.var_import_mid[n, y, m] == sum(
-            model.var_transported_mid[line, y, m] for line in lines
+            utils.get_transported_mid(model=model, line=line, year=y, month=m) for line in lines
         )
 
 
@@ -374,17 +368,19 @@ def positive_bound_per_tra_line(model, p, y, m):
 
 
 def positive_bound_per_high_line(model, p, y, m):
-    if (m == 1) or (m == 12):
-        return 1.1 * model.var_transported_high[p, y, m] <= model.var_gamma_high_line[y, p]
-    else:
-        return model.var_transported_high[p, y, m] <= model.var_gamma_high_line[y, p]
+    # PEAK FLOWS IN JANUARY AND DECEMBER (SEE UTILS.INIT_PEAK_FACTOR)
+    return (
+        model.par_peak_factor[m] * model.var_transported_high[p, y, m]
+        <= model.var_gamma_high_line[y, p]
+    )
 
 
 def positive_bound_per_mid_line(model, p, y, m):
-    if (m == 1) or (m == 12):
-        return 1.1 * model.var_transported_mid[p, y, m] <= model.var_gamma_mid_line[y, p]
-    else:
-        return model.var_transported_mid[p, y, m] <= model.var_gamma_mid_line[y, p]
+    # PEAK FLOWS IN JANUARY AND DECEMBER (SEE UTILS.INIT_PEAK_FACTOR)
+    return (
+        model.par_peak_factor[m] * utils.get_transported_mid(model=model, line=p, year=y, month=m)
+        <= model.var_gamma_mid_line[y, p]
+    )
 
 
 def negative_bound_per_tra_line(model, p, y, m):
@@ -392,169 +388,106 @@ def negative_bound_per_tra_line(model, p, y, m):
 
 
 def negative_bound_per_high_line(model, p, y, m):
-    if (m == 1) or (m == 12):
-        return 1.1 * (-model.var_transported_high[p, y, m]) <= model.var_gamma_high_line[y, p]
-    else:
-        return -model.var_transported_high[p, y, m] <= model.var_gamma_high_line[y, p]
+    return (
+        model.par_peak_factor[m] * (-model.var_transported_high[p, y, m])
+        <= model.var_gamma_high_line[y, p]
+    )
 
 
 def negative_bound_per_mid_line(model, p, y, m):
-    if (m == 1) or (m == 12):
-        return 1.1 * (-model.var_transported_mid[p, y, m]) <= model.var_gamma_mid_line[y, p]
-    else:
-        return -model.var_transported_mid[p, y, m] <= model.var_gamma_mid_line[y, p]
+    return (
+        model.par_peak_factor[m]
+        * (-utils.get_transported_mid(model=model, line=p, year=y, month=m))
+        <= model.var_gamma_mid_line[y, p]
+    )
+
+
+def get_net_export(model, level, n, y, m):
+    """
+    model : pyomo.ConcreteModel
+    level : network level ("tra", "high", or "mid")
+    n : node
+    y : year
+    m : month
+
+    Return : Export - import of the node (0 for the directions without lines, see
+    utils.add_sparse_node_sets)
+    """
+    _export = model.component("var_export_" + level)
+    _import = model.component("var_import_" + level)
+    return utils.get_node_variable(
+        variable=_export, node=n, year=y, month=m
+    ) - utils.get_node_variable(variable=_import, node=n, year=y, month=m)
 
 
 def gas_balance_constraint_transmission(model, n, y, m):
-    if n not in model.set_delivery_tra_hp:
-        """Consequently, node n is only connected to the transmission network level"""
-        return (
-            model.var_source_tra[n, y, m]
-            - model.var_demand_tra[n, y, m]
-            - model.par_total_peak_factor[m]
-            * (model.var_export_tra[n, y, m] - model.var_import_tra[n, y, m])
-            == 0
-        )
-    else:
+    _balance = (
+        utils.get_node_variable(variable=model.var_source_tra, node=n, year=y, month=m)
+        - model.var_demand_tra[n, y, m]
+        - model.par_total_peak_factor[m] * get_net_export(model, "tra", n, y, m)
+    )
+    if n in model.set_delivery_tra_hp:
         """Node n is connected to both, the transmission and high-pressure network level"""
-        return (
-            model.var_source_tra[n, y, m]
-            - model.var_demand_tra[n, y, m]
-            - model.var_del_tra_high[n, y, m]
-            - model.par_total_peak_factor[m]
-            * (model.var_export_tra[n, y, m] - model.var_import_tra[n, y, m])
-            == 0
-        )
+        _balance -= model.var_del_tra_high[n, y, m]
+    return _balance == 0
 
 
 def gas_balance_con_high_pressure(model, n, y, m):
+    # THE TERMS OF NODES WITHOUT SOURCE, DEMAND, OR LINES IN ONE DIRECTION ARE 0 (SEE
+    # UTILS.ADD_SPARSE_NODE_SETS)
+    _balance = (
+        utils.get_node_variable(variable=model.var_source_high, node=n, year=y, month=m)
+        - utils.get_node_variable(variable=model.var_demand_high, node=n, year=y, month=m)
+        - model.par_total_peak_factor[m] * get_net_export(model, "high", n, y, m)
+    )
     # Knoten ist mit der Fernleitung verbunden! Fern & NE1
-    if (n in model.set_delivery_tra_hp) and (n not in model.set_delivery_hp_mp):
-        """
-        Node n is only connected to the transmission and high-pressure network level. 
-        Consequently, this node does not supply mid-pressure gas demand
-        """
-        if n in model.set_storage:
-            return (
-                model.var_source_high[n, y, m]
-                + model.var_del_tra_high[n, y, m]
-                - model.var_demand_high[n, y, m]
-                - model.par_total_peak_factor[m]
-                * (model.var_export_high[n, y, m] - model.var_import_high[n, y, m])
-                - model.var_storage_in_out[n, y, m]
-                == 0
-            )
-        else:
-            return (
-                model.var_source_high[n, y, m]
-                + model.var_del_tra_high[n, y, m]
-                - model.var_demand_high[n, y, m]
-                - model.par_total_peak_factor[m]
-                * (model.var_export_high[n, y, m] - model.var_import_high[n, y, m])
-                == 0
-            )
-    # Knoten ist nur an der Netzebene 1 angeschlossen! NE1
-    elif (n not in model.set_delivery_tra_hp) and (n not in model.set_delivery_hp_mp):
-        if n in model.set_storage:
-            return (
-                model.var_source_high[n, y, m]
-                - model.var_demand_high[n, y, m]
-                - model.par_total_peak_factor[m]
-                * (model.var_export_high[n, y, m] - model.var_import_high[n, y, m])
-                - model.var_storage_in_out[n, y, m]
-                == 0
-            )
-        else:
-            return (
-                model.var_source_high[n, y, m]
-                - model.var_demand_high[n, y, m]
-                - model.par_total_peak_factor[m]
-                * (model.var_export_high[n, y, m] - model.var_import_high[n, y, m])
-                == 0
-            )
-    # Knoten ist nur mit Netzebene 1 und Netzebene 2 verbunden! NE1 & NE2
-    elif (n not in model.set_delivery_tra_hp) and (n in model.set_delivery_hp_mp):
-        if n in model.set_storage:
-            return (
-                model.var_source_high[n, y, m]
-                - model.var_demand_high[n, y, m]
-                - model.var_del_high_mid[n, y, m]
-                - model.par_total_peak_factor[m]
-                * (model.var_export_high[n, y, m] - model.var_import_high[n, y, m])
-                - model.var_storage_in_out[n, y, m]
-                == 0
-            )
-        else:
-            return (
-                model.var_source_high[n, y, m]
-                - model.var_demand_high[n, y, m]
-                - model.var_del_high_mid[n, y, m]
-                - model.par_total_peak_factor[m]
-                * (model.var_export_high[n, y, m] - model.var_import_high[n, y, m])
-                == 0
-            )
-    # FERN & NE1 & NE2
-    else:
-        if n in model.set_storage:
-            return (
-                model.var_source_high[n, y, m]
-                + model.var_del_tra_high[n, y, m]
-                - model.var_demand_high[n, y, m]
-                - model.var_del_high_mid[n, y, m]
-                - model.par_total_peak_factor[m]
-                * (model.var_export_high[n, y, m] - model.var_import_high[n, y, m])
-                - model.var_storage_in_out[n, y, m]
-                == 0
-            )
-        else:
-            return (
-                model.var_source_high[n, y, m]
-                + model.var_del_tra_high[n, y, m]
-                - model.var_demand_high[n, y, m]
-                - model.var_del_high_mid[n, y, m]
-                - model.par_total_peak_factor[m]
-                * (model.var_export_high[n, y, m] - model.var_import_high[n, y, m])
-                == 0
-            )
+    if n in model.set_delivery_tra_hp:
+        _balance += model.var_del_tra_high[n, y, m]
+    # Knoten ist mit Netzebene 1 und Netzebene 2 verbunden! NE1 & NE2
+    if n in model.set_delivery_hp_mp:
+        _balance -= model.var_del_high_mid[n, y, m]
+    if n in model.set_storage:
+        _balance -= model.var_storage_in_out[n, y, m]
+    if not py.is_potentially_variable(_balance):
+        # ISOLATED NODE WITHOUT SOURCE AND DEMAND
+        return py.Constraint.Skip
+    return _balance == 0
 
 
 def gas_balance_con_mid_pressure(model, n, y, m):
-    if n not in model.set_delivery_hp_mp:
-        """Node is only connected to the mid-pressure network level"""
-        return (
-            model.var_source_mid[n, y, m]
-            - model.var_demand_mid[n, y, m]
-            - model.par_total_peak_factor[m]
-            * (model.var_export_mid[n, y, m] - model.var_import_mid[n, y, m])
-            == 0
-        )
-    else:
-        return (
-            model.var_source_mid[n, y, m]
-            + model.var_del_high_mid[n, y, m]
-            - model.var_demand_mid[n, y, m]
-            - model.par_total_peak_factor[m]
-            * (model.var_export_mid[n, y, m] - model.var_import_mid[n, y, m])
-            == 0
-        )
+    _balance = (
+        utils.get_node_variable(variable=model.var_source_mid, node=n, year=y, month=m)
+        - utils.get_node_variable(variable=model.var_demand_mid, node=n, year=y, month=m)
+        - model.par_total_peak_factor[m] * get_net_export(model, "mid", n, y, m)
+    )
+    if n in model.set_delivery_hp_mp:
+        """Node is connected to the high-pressure network level"""
+        _balance += model.var_del_high_mid[n, y, m]
+    if not py.is_potentially_variable(_balance):
+        # ALL LINES ARE FOLDED AND NO NODE BEHIND THEM HAS SOURCE OR DEMAND
+        return py.Constraint.Skip
+    return _balance == 0
 
 
 """STORAGE CONSTRAINTS"""
 
 
 def gas_balance_con_storage(model, n, y, m):
-    if (y == 2025) and (m == 1):
+    # THE TIME SLICES ARE RUNS OF CONSECUTIVE MONTHS IN THE ORDER OF THE CALENDAR (SEE
+    # UTILS.GET_TIME_SLICES)
+    _first = model.set_time_unit.first()
+    if (y == model.set_dispatch_year.first()) and (m == _first):
         return model.var_storage_soc[n, y, m] == model.var_storage_in_out[n, y, m]
-    elif m != 1:
+    elif m != _first:
         return (
             model.var_storage_soc[n, y, m]
-            == model.var_storage_soc[n, y, m - 1]
+            == model.var_storage_soc[n, y, model.set_time_unit.prev(m)]
             + model.var_storage_in_out[n, y, m]
         )
-    elif m == 1:
+    elif m == _first:
         return (
             model.var_storage_soc[n, y, m]
-            == model.var_storage_soc[n, y - 1, 12]
+            == model.var_storage_soc[n, model.set_dispatch_year.prev(y), model.set_time_unit.last()]
             + model.var_storage_in_out[n, y, m]
         )
 
@@ -588,12 +521,12 @@ def revenues_mid_pressure_level(model, n, y, m):
 def revenues_per_year(model, y):
     _high = sum(
         model.var_revenues_high[n, y, m]
-        for n in model.set_node_hp
+        for n in model.set_node_hp_demand
         for m in model.set_time_unit
     )
     _mid = sum(
         model.var_revenues_mid[n, y, m]
-        for n in model.set_node_mp
+        for n in model.set_node_mp_demand
         for m in model.set_time_unit
     )
     return model.var_rev[y] == _high + _mid
@@ -706,11 +639,11 @@ def total_spendings_per_year(model, year):
 def total_value_of_lost_load(model, year):
     return model.var_value_of_lost_load[year] == sum(
         model.var_value_of_lost_load_high[node, year, month]
-        for node in model.set_node_hp
+        for node in model.set_node_hp_demand
         for month in model.set_time_unit
     ) + sum(
         model.var_value_of_lost_load_mid[node, year, month]
-        for node in model.set_node_mp
+        for node in model.set_node_mp_demand
         for month in model.set_time_unit
     )
 
@@ -733,31 +666,43 @@ def value_of_lost_load_mid(model, node, year, time):
 
 def lumpiness_tra(model, tra_line):
     _inv_year = model.par_year_of_inv_tra[tra_line]
+    if _inv_year not in model.set_year:
+        return py.Constraint.Skip
     return 13877 * model.lumpiness_tra[tra_line] <= model.var_gamma_tra_line_inv[_inv_year, tra_line]
 
 
 def link_bdv_and_cap_tra(model, tra_line):
     _inv_year = model.par_year_of_inv_tra[tra_line]
+    if _inv_year not in model.set_year:
+        return py.Constraint.Skip
     return model.var_gamma_tra_line_inv[_inv_year, tra_line] <= model.lumpiness_tra[tra_line] * 60000
 
 
 def lumpiness_high(model, hp_line):
     _inv_year = model.par_year_of_inv_hp[hp_line]
+    if _inv_year not in model.set_year:
+        return py.Constraint.Skip
     return 400 * model.lumpiness_high[hp_line] <= model.var_gamma_high_line_inv[_inv_year, hp_line]
 
 
 def link_bdv_and_cap_high(model, hp_line):
     _inv_year = model.par_year_of_inv_hp[hp_line]
+    if _inv_year not in model.set_year:
+        return py.Constraint.Skip
     return model.var_gamma_high_line_inv[_inv_year, hp_line] <= model.lumpiness_high[hp_line] * 30000
 
 
 def lumpiness_mid(model, mp_line):
     _inv_year = model.par_year_of_inv_mp[mp_line]
+    if _inv_year not in model.set_year:
+        return py.Constraint.Skip
     return 60 * model.lumpiness_mid[mp_line] <= model.var_gamma_mid_line_inv[_inv_year, mp_line]
 
 
 def link_bdv_and_cap_mid(model, mp_line):
     _inv_year = model.par_year_of_inv_mp[mp_line]
+    if _inv_year not in model.set_year:
+        return py.Constraint.Skip
     return model.var_gamma_mid_line_inv[_inv_year, mp_line] <= model.lumpiness_mid[mp_line] * 15000
 
 
@@ -820,8 +765,8 @@ def con_quantity_src_not_used_mp(model, node, year):
 
 
 def con_src_not_year(model, year):
-    _value = sum(model.var_VoLL_src_hp[node, year] for node in model.set_node_hp) + sum(
-        model.var_VoLL_src_mp[node1, year] for node1 in model.set_node_mp
+    _value = sum(model.var_VoLL_src_hp[node, year] for node in model.set_node_hp_source) + sum(
+        model.var_VoLL_src_mp[node1, year] for node1 in model.set_node_mp_source
     )
     return model.var_VoLL_SOURCE[year] == _value
 
@@ -1048,7 +993,11 @@ def c_completely_discharged_storage_2039(model, storage, year, month):
     #     return model.var_storage_soc[storage, year, month] == 0
     # else:
     #     return py.Constraint.Skip
-    if (year == 2039) and (month == 12):
+    # LAST DISPATCH YEAR BEFORE 2040 (I.E., 2039 IF THE DISPATCH IS MODELED IN EVERY YEAR), TIME SLICE
+    # OF DECEMBER
+    if (year == utils.get_dispatch_year_before(model=model, year=2040)) and (
+        month == utils.get_time_slice_of_month(model=model, month=12)
+    ):
         return model.var_storage_soc[storage, year, month] == 0
     else:
         return py.Constraint.Skip
@@ -1078,13 +1027,13 @@ def c_frei_werdende_kapazitäten_für_h2_von_netzebene2(model, line, year, month
 
     if _cluster in [55, 446, 143]:
         if year >= 2030:
-            return model.var_transported_mid[line, year, month] == 0
+            return utils.get_transported_mid(model=model, line=line, year=year, month=month) == 0
         else:
             return py.Constraint.Skip
 
     elif _cluster in [90, 341]:
         if year >= 2035:
-            return model.var_transported_mid[line, year, month] == 0
+            return utils.get_transported_mid(model=model, line=line, year=year, month=month) == 0
         else:
             return py.Constraint.Skip
     else:
@@ -1266,44 +1215,44 @@ def add(model=None):
     )
 
     model.con_total_export_per_tra_node = py.Constraint(
-        model.set_compressor,
-        model.set_year,
+        model.set_node_tra_export,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=export_from_transmission_node,
         doc="CHECKED: Transmission: Total export from one node (sum up all relevant pipelines).",
     )
     model.con_total_export_per_high_node = py.Constraint(
-        model.set_node_hp,
-        model.set_year,
+        model.set_node_hp_export,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=export_from_high_node,
         doc="CHECKED: High-Pressure: Total export from one node (sum up all relevant pipelines).",
     )
     model.con_total_export_per_mid_node = py.Constraint(
-        model.set_node_mp,
-        model.set_year,
+        model.set_node_mp_export,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=export_from_mid_node,
         doc="CHECKED: Mid-Pressure: Total export from one node (sum up all relevant pipelines).",
     )
 
     model.con_total_import_per_tra_node = py.Constraint(
-        model.set_compressor,
-        model.set_year,
+        model.set_node_tra_import,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=import_from_transmission_node,
         doc="CHECKED: Transmission: Total import to one node (sum up all relevant pipelines).",
     )
     model.con_total_import_per_high_node = py.Constraint(
-        model.set_node_hp,
-        model.set_year,
+        model.set_node_hp_import,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=import_from_high_node,
         doc="CHECKED: High-Pressure: Total import to one node (sum up all relevant pipelines).",
     )
     model.con_total_import_per_mid_node = py.Constraint(
-        model.set_node_mp,
-        model.set_year,
+        model.set_node_mp_import,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=import_from_mid_node,
         doc="CHECKED: Mid-Pressure: Total import to one node (sum up all relevant pipelines).",
@@ -1311,42 +1260,42 @@ def add(model=None):
 
     model.con_positive_capacity_bound_tra = py.Constraint(
         model.set_line_tra,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=positive_bound_per_tra_line,
         doc="CHECKED: Transmission: transported amount <= Pipeline capacity; Constraint 14.1; Direction 1.",
     )
     model.con_positive_capacity_bound_high = py.Constraint(
         model.set_line_high,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=positive_bound_per_high_line,
         doc="CHECKED: High-Pressure: transported amount <= Pipeline capacity; Constraint 14.2; Direction 1.",
     )
     model.con_positive_capacity_bound_mid = py.Constraint(
         model.set_line_mid,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=positive_bound_per_mid_line,
         doc="CHECKED: Mid-Pressure: transported amount <= Pipeline capacity; Constraint 14.3; Direction 1.",
     )
     model.con_negative_capacity_bound_tra = py.Constraint(
         model.set_line_tra,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=negative_bound_per_tra_line,
         doc="CHECKED: Transmission: transported <= Pipeline capacity; Constraint 15.1; Direction 2.",
     )
     model.con_negative_capacity_bound_high = py.Constraint(
         model.set_line_high,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=negative_bound_per_high_line,
         doc="CHECKED: High-Pressure: transported amount <= Pipeline capacity; Constraint 15.2; Direction 2.",
     )
     model.con_negative_capacity_bound_mid = py.Constraint(
         model.set_line_mid,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=negative_bound_per_mid_line,
         doc="CHECKED: Mid-Pressure: transported amount <= Pipeline capacity; Constraint 15.3; Direction 2.",
@@ -1354,21 +1303,21 @@ def add(model=None):
 
     model.c_gas_balance_tra = py.Constraint(
         model.set_compressor,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=gas_balance_constraint_transmission,
         doc="CHECKED: Transmission: Gas balance at one node; Constraint 16.1.",
     )
     model.c_gas_balance_hp = py.Constraint(
         model.set_node_hp,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=gas_balance_con_high_pressure,
         doc="CHECKED: High-Pressure: Gas balance at one node; Constraint 16.2.",
     )
     model.c_gas_balance_mp = py.Constraint(
-        model.set_node_mp,
-        model.set_year,
+        model.set_node_mp_flow,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=gas_balance_con_mid_pressure,
         doc="CHECKED: Mid-Pressure: Gas balance at one node; Constraint 16.3.",
@@ -1376,99 +1325,99 @@ def add(model=None):
 
     model.c_soc_upper_bound = py.Constraint(
         model.set_storage,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=state_of_charge_upper_bound,
         doc="CHECKED: High-Pressure: Max gas storage capacity at one node; Constraint 19b.",
     )
     model.c_soc_in_and_out = py.Constraint(
         model.set_storage,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=gas_balance_con_storage,
         doc="CHECKED: High-Pressure: State of charge for gas storage at one node; Constraint 19a.",
     )
 
     model.c_rev_high = py.Constraint(
-        model.set_node_hp,
-        model.set_year,
+        model.set_node_hp_demand,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=revenues_high_pressure_level,
         doc="CHECKED: High-Pressure: Revenues = (Supplied) Demand x Factor; Constraint 20.1.",
     )
     model.c_rev_mid = py.Constraint(
-        model.set_node_mp,
-        model.set_year,
+        model.set_node_mp_demand,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=revenues_mid_pressure_level,
         doc="CHECKED: Mid-Pressure: Revenues = (Supplied) Demand x Factor; Constraint 20.2.",
     )
     model.c_rev_year = py.Constraint(
-        model.set_year,
+        model.set_dispatch_year,
         rule=revenues_per_year,
         doc="CHECKED: Total Revenues = Sum(Revenues) for all pressure levels; Constraint 21.",
     )
     model.c_equal_tra_demand = py.Constraint(
         model.set_compressor,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=meet_tra_gas_demand,
         doc="CHECKED: Transmission: Gas demand must be covered.",
     )
     model.c_limit_high_demand = py.Constraint(
-        model.set_node_hp,
-        model.set_year,
+        model.set_node_hp_demand,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=demand_upper_bound_high,
         doc="CHECKED: Upper limit of the high-pressure gas demand covered is set by the corresponding input parameter.",
     )
     model.c_limit_mid_demand = py.Constraint(
-        model.set_node_mp,
-        model.set_year,
+        model.set_node_mp_demand,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=demand_upper_bound_mid,
         doc="CHECKED: Upper limit of the mid-pressure gas demand covered is set by the corresponding input parameter.",
     )
     model.c_limit_tra_source = py.Constraint(
-        model.set_compressor,
-        model.set_year,
+        model.set_node_tra_source,
+        model.set_dispatch_year,
         rule=max_annual_source_per_node_tra,
         doc="CHECKED: Transmission: Upper limit of annual gas injected at one node.",
     )
     model.c_limit_high_source = py.Constraint(
-        model.set_node_hp,
-        model.set_year,
+        model.set_node_hp_source,
+        model.set_dispatch_year,
         rule=max_annual_source_per_node_high,
         doc="CHECKED: High-Pressure: Upper limit of annual gas injected at one node.",
     )
     model.c_limit_mid_source = py.Constraint(
-        model.set_node_mp,
-        model.set_year,
+        model.set_node_mp_source,
+        model.set_dispatch_year,
         rule=max_annual_source_per_node_mid,
         doc="CHECKED: Mid-Pressure: Upper limit of annual gas injected at one node.",
     )
 
     model.c_gas_purchase = py.Constraint(
-        model.set_year,
+        model.set_dispatch_year,
         rule=total_spendings_per_year,
         doc="CHECKED: Costs for delivering gas from the transmission into the high-pressure network level.",
     )
 
     model.c_value_of_lost_load_per_year = py.Constraint(
-        model.set_year,
+        model.set_dispatch_year,
         rule=total_value_of_lost_load,
         doc="CHECKED: Total value of lost load for both high-pressure and mid-pressure gas demands per year.",
     )
     model.c_value_of_lost_load_high = py.Constraint(
-        model.set_node_hp,
-        model.set_year,
+        model.set_node_hp_demand,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=value_of_lost_load_high,
         doc="CHECKED: VoLL at High-Pressure per Node, Year, and Month = Cost Parameter x Gas Demand Not Supplied.",
     )
     model.c_value_of_lost_load_mid = py.Constraint(
-        model.set_node_mp,
-        model.set_year,
+        model.set_node_mp_demand,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=value_of_lost_load_mid,
         doc="CHECKED: VoLL at Mid-Pressure per Node, Year, and Month = Cost Parameter x Gas Demand Not Supplied.",
@@ -1483,26 +1432,26 @@ def add(model=None):
 
     model.c_green_gas = py.Constraint(
         model.set_delivery_tra_hp,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         rule=green_gas_constraint,
         doc='CHECKED'
     )
 
     model.con_VoLL_hp = py.Constraint(
-        model.set_node_hp,
-        model.set_year,
+        model.set_node_hp_source,
+        model.set_dispatch_year,
         rule=con_quantity_src_not_used_hp,
         doc="CHECKED: VoLL at High-Pressure [EUR / year] = 60 EUR / MWh * (Potential - Used)",
     )
     model.con_VoLL_mp = py.Constraint(
-        model.set_node_mp,
-        model.set_year,
+        model.set_node_mp_source,
+        model.set_dispatch_year,
         rule=con_quantity_src_not_used_mp,
         doc="CHECKED: VoLL at Mid-Pressure [EUR / year] = 60 EUR / MWh * (Potential - Used)",
     )
     model.con_cost_src_not_per_year = py.Constraint(
-        model.set_year, rule=con_src_not_year, doc='CHECKED'
+        model.set_dispatch_year, rule=con_src_not_year, doc='CHECKED'
     )
 
     """CONSTRAINTS FÜR FRÜHZEITIGE STILLLEGUNG"""
@@ -1564,23 +1513,23 @@ def add(model=None):
         model.set_line_mid, rule=mid_2040_cluster_and_line_equal, doc='CHECKED'
     )
     model.c_max_monthly_source_high_node = py.Constraint(
-        model.set_node_hp, model.set_year, model.set_time_unit, rule=max_monthly_source_high_node
+        model.set_node_hp_source, model.set_dispatch_year, model.set_time_unit, rule=max_monthly_source_high_node
     )
     model.c_max_monthly_source_mid_node = py.Constraint(
-        model.set_node_mp, model.set_year, model.set_time_unit, rule=max_monthly_source_mid_node
+        model.set_node_mp_source, model.set_dispatch_year, model.set_time_unit, rule=max_monthly_source_mid_node
     )
     model.c_completely_discharged_storage_2039 = py.Constraint(
-        model.set_storage, model.set_year, model.set_time_unit, rule=c_completely_discharged_storage_2039
+        model.set_storage, model.set_dispatch_year, model.set_time_unit, rule=c_completely_discharged_storage_2039
     )
     model.c_frei_werdende_kapazitäten_für_h2_von_netzebene1 = py.Constraint(
-        model.set_line_high, model.set_year, model.set_time_unit,
+        model.set_line_high, model.set_dispatch_year, model.set_time_unit,
         rule=c_frei_werdende_kapazitäten_für_h2_von_netzebene1
     )
     model.c_frei_werdende_kapazitäten_für_h2_von_netzebene2 = py.Constraint(
-        model.set_line_mid, model.set_year, model.set_time_unit, rule=c_frei_werdende_kapazitäten_für_h2_von_netzebene2
+        model.set_line_mid, model.set_dispatch_year, model.set_time_unit, rule=c_frei_werdende_kapazitäten_für_h2_von_netzebene2
     )
     model.c_freiwerdender_h2_speicher_gampern = py.Constraint(
-        model.set_node_hp, model.set_year, model.set_time_unit, rule=c_freiwerdender_h2_speicher_gampern,
+        model.set_node_hp, model.set_dispatch_year, model.set_time_unit, rule=c_freiwerdender_h2_speicher_gampern,
         doc='Methanspeicher GAMPERN wird ab 2030 für H2 verwendet.'
     )
     model.c_no_early_decom_high_30 = py.Constraint(model.set_high_cluster, rule=c_no_early_decom_high_30)
@@ -1590,14 +1539,14 @@ def add(model=None):
 
     # LIMIT THE METHANE DEMAND THAT IS NOT COVERED BY 40,000 MWH PER NODE AT MAX.
     model.c_limit_demand_not_supplied_high_2040 = py.Constraint(
-        model.set_node_hp,
-        model.set_year,
+        model.set_node_hp_demand,
+        model.set_dispatch_year,
         rule=limit_demand_not_supplied_high_2040,
         doc='Innsbruck excluded'
     )
     model.c_limit_demand_not_supplied_mid_2040 = py.Constraint(
-        model.set_node_mp,
-        model.set_year,
+        model.set_node_mp_demand,
+        model.set_dispatch_year,
         rule=limit_demand_not_supplied_mid_2040,
         doc='Innsbruck excluded.'
     )
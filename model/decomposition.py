@@ -0,0 +1,331 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import numpy as np
+import matrix
+import solvers
+
+
+_PROBLEM = None
+
+
+def get_cluster_groups(model=None, problem=None):
+    """
+    Assigns the integer columns of the coefficient matrix to the clusters (cluster_km) of the high- and
+    mid-pressure network levels: the early decommissioning decisions per cluster and the lumpiness of
+    the investments per line (via the cluster of the line).
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance the problem was built from. The default is None.
+    problem : Dict, required
+        Includes the column layout (see matrix.build_problem). The default is None.
+
+    Raises
+    ------
+    ValueError
+        If an integer variable is not indexed by clusters or lines of the high- or mid-pressure level.
+
+    Returns
+    -------
+    groups : Dict
+        Includes the integer columns (numpy.ndarray) per (network level, cluster).
+
+    """
+    _clusters = {
+        "set_high_cluster": ("high", None),
+        "set_mid_cluster": ("mid", None),
+        "set_line_high": ("high", model.high["cluster_km"]),
+        "set_line_mid": ("mid", model.mid["cluster_km"]),
+    }
+    groups = dict()
+    for _name, _block in problem["layout"]["variables"].items():
+        if not _block["integer"]:
+            continue
+        _set = model.component(_name).index_set().name
+        if _set not in _clusters:
+            raise ValueError("Integer variable {} is not assigned to a cluster".format(_name))
+        _level, _cluster_of_line = _clusters[_set]
+        _columns = matrix.get_columns(layout=problem["layout"], name=_name)
+        for _element, _column in zip(_block["sets"][0], _columns):
+            _cluster = _element if _cluster_of_line is None else _cluster_of_line[_element]
+            groups.setdefault((_level, _cluster), []).append(_column)
+    return {_key: np.array(_columns) for _key, _columns in groups.items()}
+
+
+def get_subproblem(problem=None, integer=None, fixed=None, values=None):
+    """
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the coefficient matrix, bounds, and objective (see matrix.build_problem). The default
+        is None.
+    integer : numpy.ndarray, optional
+        Integer columns that remain integer; all other integer columns are relaxed. The default is None
+        (all integer columns are relaxed).
+    fixed : numpy.ndarray, optional
+        Columns that are fixed to their (rounded) values. The default is None.
+    values : numpy.ndarray, optional
+        Values of the columns used for the fixed columns. The default is None.
+
+    Returns
+    -------
+    subproblem : Dict
+        Copy of the problem with the changed integrality and column bounds (the matrix is shared).
+
+    """
+    subproblem = dict(problem)
+    _integer = np.zeros_like(problem["integer"])
+    if integer is not None:
+        _integer[integer] = problem["integer"][integer]
+    subproblem["integer"] = _integer
+    if fixed is not None:
+        _values = np.round(values[fixed])
+        subproblem["column_lower"] = problem["column_lower"].copy()
+        subproblem["column_upper"] = problem["column_upper"].copy()
+        subproblem["column_lower"][fixed] = _values
+        subproblem["column_upper"][fixed] = _values
+    return subproblem
+
+
+def get_violation(problem=None, values=None):
+    """
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the coefficient matrix and bounds (see matrix.build_problem). The default is None.
+    values : numpy.ndarray, required
+        Values of the columns. The default is None.
+
+    Returns
+    -------
+    float
+        Largest violation of a row or column bound, relative to the bound (at least 1).
+
+    """
+    _activity = problem["matrix"] @ values
+    _violation = 0.0
+    for _values, _lower, _upper in (
+        (_activity, problem["row_lower"], problem["row_upper"]),
+        (values, problem["column_lower"], problem["column_upper"]),
+    ):
+        _finite_lower = np.isfinite(_lower)
+        _finite_upper = np.isfinite(_upper)
+        _below = (_lower - _values)[_finite_lower] / np.maximum(1, np.abs(_lower[_finite_lower]))
+        _above = (_values - _upper)[_finite_upper] / np.maximum(1, np.abs(_upper[_finite_upper]))
+        _violation = max(_violation, _below.max(initial=0), _above.max(initial=0))
+    return _violation
+
+
+def solve_subproblem(problem=None, solver="gurobi", threads=1, profile=None, tolerance=1e-5):
+    """
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the coefficient matrix, bounds, and objective (see get_subproblem). The default is None.
+    solver : String, optional
+        "gurobi" or "highs" (see matrix.solve_problem). The default is "gurobi".
+    threads : int, optional
+        Number of solver threads. The default is 1.
+    profile : Dict, optional
+        Includes the gap, time limit, and emphasis (see solvers.get_profile). The default is None.
+    tolerance : float, optional
+        Largest (relative) violation of a bound accepted as feasible. The default is 1e-5.
+
+    Returns
+    -------
+    Tuple
+        Values of the columns and objective value (None and infinity if no feasible solution is found).
+
+    """
+    try:
+        _values, _objective = matrix.solve_problem(
+            problem=problem, solver=solver, threads=threads, profile=profile
+        )
+    except Exception:
+        # E.G., GUROBI RAISES AN ERROR WHEN READING THE SOLUTION OF AN INFEASIBLE PROBLEM
+        return None, np.inf
+    _values = np.asarray(_values, dtype=float)
+    if (len(_values) != problem["layout"]["size"]) or (
+        get_violation(problem=problem, values=_values) > tolerance
+    ):
+        return None, np.inf
+    return _values, float(_objective)
+
+
+def _init_worker(problem):
+    # THE COEFFICIENT MATRIX IS TRANSFERRED ONCE PER WORKER PROCESS, NOT ONCE PER SUBPROBLEM.
+    global _PROBLEM
+    _PROBLEM = problem
+
+
+def _solve_group(integer, fixed, values, solver, threads, profile):
+    return solve_subproblem(
+        problem=get_subproblem(problem=_PROBLEM, integer=integer, fixed=fixed, values=values),
+        solver=solver,
+        threads=threads,
+        profile=profile,
+    )
+
+
+def _solve_groups(pool, tasks, solver, threads, profile):
+    # TASKS ARE (INTEGER, FIXED, VALUES) PER SUBPROBLEM
+    if pool is None:
+        return [_solve_group(*_task, solver, threads, profile) for _task in tasks]
+    _futures = [pool.submit(_solve_group, *_task, solver, threads, profile) for _task in tasks]
+    return [_future.result() for _future in _futures]
+
+
+def solve_by_clusters(
+    model=None,
+    problem=None,
+    solver="gurobi",
+    workers=1,
+    threads=1,
+    profile=None,
+    gap=None,
+    rounds=20,
+):
+    """
+    Decomposes the early decommissioning (and lumpiness) decisions by clusters. The clusters only
+    interact through the flows, so that each subproblem keeps the integer columns of one cluster and
+    fixes (or relaxes) all others. The subproblems are solved in parallel worker processes; the master
+    step combines their decisions:
+        1. LP relaxation of the problem: lower bound.
+        2. Start: per cluster, the integer columns of the other clusters are relaxed; the combined
+           decisions are fixed to obtain a feasible solution (if the combination is infeasible, the
+           clusters are fixed one after another).
+        3. Improvement (fix-and-optimize): per cluster, the integer columns of the other clusters are
+           fixed to the incumbent. The best decisions are accepted (all improving clusters together if
+           this is feasible and better) until the gap to the lower bound is reached or no cluster
+           improves.
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance the problem was built from. The default is None.
+    problem : Dict, required
+        Includes the coefficient matrix, bounds, and objective (see matrix.build_problem). The default
+        is None.
+    solver : String, optional
+        "gurobi" or "highs" (see matrix.solve_problem). The default is "gurobi".
+    workers : int, optional
+        Number of worker processes that solve subproblems in parallel. The default is 1.
+    threads : int, optional
+        Number of solver threads per subproblem. The default is 1.
+    profile : Dict, optional
+        Includes the gap, time limit, and emphasis of the solves (see solvers.get_profile). The default
+        is None.
+    gap : float, optional
+        Relative gap to the lower bound at which the improvement stops; the subproblems are solved
+        with a tenth of this gap. The default is None (gap of the profile).
+    rounds : int, optional
+        Maximum number of improvement rounds. The default is 20.
+
+    Raises
+    ------
+    RuntimeError
+        If the LP relaxation is infeasible or no feasible combination of decisions is found.
+
+    Returns
+    -------
+    Tuple
+        Values of the columns, objective value, and lower bound.
+
+    """
+    _profile = solvers.get_profile(profile)
+    _gap = _profile["gap"] if gap is None else gap
+    # A SUBPROBLEM SOLVED WITH THE TARGET GAP WOULD HIDE THE IMPROVEMENTS BELOW IT
+    _subprofile = dict(_profile, gap=_gap / 10)
+    _groups = get_cluster_groups(model=model, problem=problem)
+    _keys = list(_groups)
+    _integer = np.flatnonzero(problem["integer"])
+
+    """LOWER BOUND"""
+    _relaxed, _bound = solve_subproblem(
+        problem=get_subproblem(problem=problem),
+        solver=solver,
+        threads=threads * workers,
+        profile=_profile,
+    )
+    if _relaxed is None:
+        raise RuntimeError("The LP relaxation is infeasible")
+    print("Decomposition: {} clusters; lower bound {:.1f}".format(len(_keys), _bound))
+
+    _init_worker(problem)
+    _pool = None
+    if workers > 1:
+        # SPAWNED (NOT FORKED) WORKERS: A SOLVER THAT ALREADY RAN IN THIS PROCESS LEAVES THREAD STATE
+        # BEHIND THAT BREAKS THE SOLVES IN FORKED CHILDREN (HIGHS RETURNS AN EMPTY SOLUTION)
+        _pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(problem,),
+        )
+    try:
+        """START SOLUTION"""
+        _results = _solve_groups(
+            _pool, [(_groups[_key], None, None) for _key in _keys], solver, threads, _subprofile
+        )
+        _start = _relaxed.copy()
+        for _key, (_values, _) in zip(_keys, _results):
+            if _values is not None:
+                _start[_groups[_key]] = _values[_groups[_key]]
+        _values, _objective = solve_subproblem(
+            problem=get_subproblem(problem=problem, fixed=_integer, values=_start),
+            solver=solver,
+            threads=threads * workers,
+            profile=_profile,
+        )
+        if _values is None:
+            # CLUSTERS ARE FIXED ONE AFTER ANOTHER (THE REMAINING CLUSTERS ARE RELAXED)
+            _fixed = np.array([], dtype=int)
+            _values = _relaxed
+            for _key in _keys:
+                _values, _objective = _solve_group(
+                    _groups[_key], _fixed, _values, solver, threads, _subprofile
+                )
+                if _values is None:
+                    raise RuntimeError("No feasible decisions found for cluster {}".format(_key))
+                _fixed = np.concatenate([_fixed, _groups[_key]])
+        print("Decomposition: start solution {:.1f}".format(_objective))
+
+        """IMPROVEMENT (FIX-AND-OPTIMIZE)"""
+        for _round in range(rounds):
+            if _objective - _bound <= _gap * abs(_objective):
+                break
+            _tasks = [
+                (_groups[_key], np.setdiff1d(_integer, _groups[_key]), _values) for _key in _keys
+            ]
+            _results = _solve_groups(_pool, _tasks, solver, threads, _subprofile)
+            _improving = [
+                (_result, _key)
+                for _result, _key in zip(_results, _keys)
+                if _result[1] < _objective - 1e-9 * abs(_objective)
+            ]
+            if not _improving:
+                break
+            (_best_values, _best_objective), _ = min(_improving, key=lambda _x: _x[0][1])
+            if len(_improving) > 1:
+                _combined = _values.copy()
+                for (_result_values, _), _key in _improving:
+                    _combined[_groups[_key]] = _result_values[_groups[_key]]
+                _combined, _combined_objective = solve_subproblem(
+                    problem=get_subproblem(problem=problem, fixed=_integer, values=_combined),
+                    solver=solver,
+                    threads=threads * workers,
+                    profile=_profile,
+                )
+                if _combined_objective < _best_objective:
+                    _best_values, _best_objective = _combined, _combined_objective
+            _values, _objective = _best_values, _best_objective
+            print(
+                "Decomposition: round {}; objective {:.1f}; gap {:.2%}".format(
+                    _round + 1, _objective, (_objective - _bound) / abs(_objective)
+                )
+            )
+    finally:
+        if _pool is not None:
+            _pool.shutdown()
+    return _values, _objective, _bound
@@ -1,27 +1,76 @@
+import numpy as np
 import pandas as pd
 import geopandas as gpd
-from shapely.ops import nearest_points
-from shapely.geometry import Point, MultiPoint
+from shapely import STRtree
+from shapely.geometry import Point
 
 
-def get_nearest_node(origin=None, all_nodes=None, districts=None):
-    no = all_nodes.LAU_NAME.to_list()
-    
-    if origin in no:
-        # print('Enthalten: {}'.format(origin))
-        return all_nodes.loc[all_nodes.LAU_NAME == origin]['LAU_NAME'].item()
-    else:
-        # print('Nicht enthalten: {}'.format(origin))
-        origin_centroid = districts[districts['LAU_NAME']==origin].centroid.values[0]
-        # print('{}: x={}, y={}'.format(origin, origin_centroid.x, origin_centroid.y))
-        multipoint = MultiPoint(all_nodes.centroid.to_list())
-        # print(multipoint)
-        queried_geom, nearest_geom = nearest_points(origin_centroid, multipoint)
-        # print('Queried: {}, Nearest: {}'.format(queried_geom, nearest_geom))  
-        lau_name = all_nodes.loc[all_nodes.centroid == nearest_geom]
-        # print(lau_name)
-        # print('Solution node: {}'.format(lau_name.LAU_NAME.to_list()[0]))
-        return lau_name.LAU_NAME.to_list()[0]
+def get_nearest_node_index(all_nodes=None):
+    """
+    Builds the spatial index (STRtree) over the node centroids once, so that many districts can be
+    mapped to their nearest node (see get_nearest_nodes).
+
+    Parameters
+    ----------
+    all_nodes : GeoDataFrame, required
+        Includes the nodes (column LAU_NAME) and their geometries. The default is None.
+
+    Returns
+    -------
+    Dict
+        Includes the node names (in the order of all_nodes), their centroids, and the STRtree.
+
+    """
+    _centroids = np.asarray(all_nodes.centroid.values)
+    return {
+        "names": np.asarray(all_nodes.LAU_NAME.to_list(), dtype=object),
+        "lookup": set(all_nodes.LAU_NAME.to_list()),
+        "tree": STRtree(_centroids),
+    }
+
+
+def get_nearest_nodes(origins=None, districts=None, index=None):
+    """
+    Parameters
+    ----------
+    origins : List, required
+        Names (LAU_NAME) of the districts to be mapped to a node. The default is None.
+    districts : GeoDataFrame, required
+        Includes the districts (column LAU_NAME) and their geometries. The default is None.
+    index : Dict, required
+        Spatial index of the nodes (see get_nearest_node_index). The default is None.
+
+    Returns
+    -------
+    List
+        Name of the node per origin: the origin itself if it is a node, otherwise the node with the
+        nearest centroid (the first node in all_nodes if several nodes are equally near).
+
+    """
+    _origins = list(origins)
+    _result = [_origin if _origin in index["lookup"] else None for _origin in _origins]
+    _missing = [_origin for _origin, _node in zip(_origins, _result) if _node is None]
+    if not _missing:
+        return _result
+
+    # CENTROID OF THE FIRST DISTRICT WITH THE GIVEN NAME (AS IN THE ORIGINAL LOOKUP).
+    _districts = districts.drop_duplicates(subset="LAU_NAME").set_index("LAU_NAME")
+    _centroids = np.asarray(_districts.centroid.reindex(_missing).values)
+    _unknown = [_origin for _origin, _centroid in zip(_missing, _centroids) if _centroid is None]
+    if _unknown:
+        raise ValueError("Unknown district(s): {}".format(", ".join(map(str, _unknown))))
+
+    # ALL EQUALLY NEAR NODES ARE RETURNED; THE FIRST ONE IN all_nodes IS SELECTED.
+    _input, _tree = index["tree"].query_nearest(_centroids, all_matches=True)
+    _first = pd.Series(_tree).groupby(_input).min()
+    _nearest = iter(index["names"][_first.reindex(range(len(_missing))).to_numpy()])
+    return [_node if _node is not None else next(_nearest) for _node in _result]
+
+
+def get_nearest_node(origin=None, all_nodes=None, districts=None, index=None):
+    if index is None:
+        index = get_nearest_node_index(all_nodes=all_nodes)
+    return get_nearest_nodes(origins=[origin], districts=districts, index=index)[0]
 
 
 def shapefile_without_cluster_pipelines(cluster=None, pipelines=None, districts=None):
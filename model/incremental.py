@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+import pyomo.environ as py
+from pyomo.core.expr.visitor import identify_mutable_parameters
+import cache
+import profiler
+
+
+# INPUT TABLE -> MUTABLE PARAMETERS DERIVED FROM IT (SEE UTILS.UPDATE_SCENARIO_PARAMETERS). THE OTHER
+# TABLES (NETWORK, PIPELINES, REFURBISHMENT, STORAGE, AND TIME RESOLUTION) ALSO DEFINE SETS OR IMMUTABLE
+# PARAMETERS, SO THAT A CHANGE REQUIRES A FULL BUILD.
+PARAMETERS = {
+    "source": ["par_source_tra", "par_source_mp"],
+    "prices": ["par_gas_prices"],
+    "value_of_lost_load": ["par_value_of_lost_load_high", "par_value_of_lost_load_mid"],
+    "demand": ["par_demand_high", "par_demand_mid"],
+    "demand_tra": ["par_demand_tra"],
+    "generation": ["par_source_hp", "par_source_mp"],
+    "feasible": ["par_source_tra"],
+}
+# TABLES THAT ALSO DEFINE THE TIME SLICES IF THE MONTHS ARE CLUSTERED (SEE UTILS.GET_TIME_SLICES)
+TIME_SLICE_TABLES = ["demand"]
+STATE_FILE = "model-{}-{}.pkl"
+
+
+def get_input_hashes(files=None):
+    """
+    Parameters
+    ----------
+    files : Dict, required
+        Includes the paths of the files per input table (see scenarios.get_input_files). The default
+        is None.
+
+    Returns
+    -------
+    Dict
+        SHA-256 hash of the content of the files per input table.
+
+    """
+    _hashes = dict()
+    for _table, _paths in files.items():
+        _hash = hashlib.sha256()
+        for _path in _paths:
+            _hash.update(Path(_path).name.encode("utf-8"))
+            _hash.update(cache.get_content_hash(_path).encode("ascii"))
+        _hashes[_table] = _hash.hexdigest()
+    return _hashes
+
+
+def get_code_hash():
+    """
+    Returns
+    -------
+    String
+        SHA-256 hash of the source files of the model (a cached model state is only valid for the code
+        it was built with).
+
+    """
+    _hash = hashlib.sha256()
+    for _path in sorted(Path(__file__).resolve().parent.glob("*.py")):
+        _hash.update(_path.name.encode("utf-8"))
+        _hash.update(cache.get_content_hash(_path).encode("ascii"))
+    return _hash.hexdigest()
+
+
+def get_state_path(scenario=None, options=None, cache_dir=None):
+    """
+    Parameters
+    ----------
+    scenario : String, required
+        Scenario short tag (gg, gm, dgg, or elek). The default is None.
+    options : Dict, required
+        Includes the build options of the model (e.g., horizon and time slices). The default is None.
+    cache_dir : String or Path, optional
+        Directory of the cache. The default is None (cache.CACHE_DIR).
+
+    Returns
+    -------
+    Path
+        Path of the model state of the scenario, the build options, and the current code.
+
+    """
+    _key = json.dumps(options, sort_keys=True, default=str) + get_code_hash()
+    return Path(cache.CACHE_DIR if cache_dir is None else cache_dir) / STATE_FILE.format(
+        scenario, hashlib.sha256(_key.encode("utf-8")).hexdigest()[:16]
+    )
+
+
+def get_affected_parameters(changed=None, temporal=12):
+    """
+    Parameters
+    ----------
+    changed : List, required
+        Input tables whose files changed since the model state was stored. The default is None.
+    temporal : integer, optional
+        Number of time slices per year (see utils.get_time_slices). The default is 12 (months).
+
+    Returns
+    -------
+    List or None
+        Names of the parameters that are recomputed, or None if a changed table defines sets or
+        immutable parameters (full build).
+
+    """
+    _names = []
+    for _table in changed:
+        if (_table not in PARAMETERS) or (_table in TIME_SLICE_TABLES and temporal < 12):
+            return None
+        _names.extend(_name for _name in PARAMETERS[_table] if _name not in _names)
+    return _names
+
+
+def get_dependency_graph(model=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance built with mutable parameters. The default is None.
+
+    Returns
+    -------
+    graph : Dict
+        Names of the constraints (and the objective) whose expressions include the mutable parameter,
+        per parameter name. The coefficients and right-hand sides of these constraints follow the
+        values of the parameters, so that they are not rebuilt if the parameters are recomputed.
+
+    """
+    graph = dict()
+    for _component in model.component_objects((py.Constraint, py.Objective), active=True):
+        _names = set()
+        for _data in _component.values():
+            _names.update(
+                _param.parent_component().name for _param in identify_mutable_parameters(_data.expr)
+            )
+        for _name in sorted(_names):
+            graph.setdefault(_name, []).append(_component.name)
+    return graph
+
+
+def save_state(path=None, model=None, hashes=None, graph=None):
+    """
+    Stores the model (before overrides and the solve), the hashes of the input files it was built
+    from, and its dependency graph.
+
+    Parameters
+    ----------
+    path : Path, required
+        Path of the model state (see get_state_path). The default is None.
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    hashes : Dict, required
+        Hashes of the input files per input table (see get_input_hashes). The default is None.
+    graph : Dict, required
+        Constraints per mutable parameter (see get_dependency_graph). The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    _path = Path(path)
+    _path.parent.mkdir(parents=True, exist_ok=True)
+    with profiler.measure("build", "save_state"):
+        # WRITE TO A TEMPORARY FILE FIRST, SO THAT PARALLEL RUNS NEVER READ A HALF-WRITTEN STATE.
+        _tmp = _path.with_suffix(".{}.tmp".format(os.getpid()))
+        with open(_tmp, "wb") as _file:
+            pickle.dump(
+                {"model": model, "hashes": hashes, "graph": graph},
+                _file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(_tmp, _path)
+    return
+
+
+def load_state(path=None):
+    """
+    Parameters
+    ----------
+    path : Path, required
+        Path of the model state (see get_state_path); only states written by save_state are loaded
+        (pickle). The default is None.
+
+    Returns
+    -------
+    Dict or None
+        Includes the model, the hashes of the input files, and the dependency graph (see save_state),
+        or None if no (readable) state exists.
+
+    """
+    if not Path(path).exists():
+        return None
+    with profiler.measure("build", "load_state"):
+        try:
+            with open(path, "rb") as _file:
+                return pickle.load(_file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as _error:
+            print("Model state: {} not readable ({})".format(Path(path).name, _error))
+            return None
@@ -0,0 +1,1256 @@
+import numpy as np
+import pyomo.environ as py
+import scipy.sparse as sp
+from pyomo.core.base.component_namer import index_repr
+import report
+import solvers
+import utils
+
+
+# SOLVERS THAT RECEIVE THE COEFFICIENT MATRIX DIRECTLY (SEE SOLVE_PROBLEM)
+SOLVERS = ["gurobi", "highs"]
+
+
+def get_column_layout(model=None):
+    """
+    Assigns one column block to each decision variable of the model. The columns of a block follow the
+    order of the (product) index set, i.e., numpy.ravel_multi_index over the positions in the index sets.
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance (sets and decision variables). The default is None.
+
+    Returns
+    -------
+    layout : Dict
+        Includes per variable name the offset, shape, index sets, bounds, and integrality, and the total
+        number of columns (size).
+
+    """
+    layout = {"variables": dict(), "size": 0}
+    for _var in model.component_objects(py.Var, descend_into=False):
+        _sets = [list(_set) for _set in _var.index_set().subsets()]
+        _shape = tuple(len(_set) for _set in _sets)
+        _size = int(np.prod(_shape))
+        if _size != len(_var):
+            raise ValueError("Variable {} is not indexed by a full product set".format(_var.name))
+        # BOUNDS AND DOMAIN ARE THE SAME FOR ALL ELEMENTS OF A VARIABLE (SEE ADD_DECISION_VARIABLES);
+        # A VARIABLE OF AN EMPTY SPARSE NODE SET (SEE UTILS.ADD_SPARSE_NODE_SETS) HAS NO COLUMNS
+        _first = next(iter(_var.values()), None)
+        _lower, _upper = (None, None) if _first is None else (_first.lb, _first.ub)
+        layout["variables"][_var.name] = {
+            "offset": layout["size"],
+            "shape": _shape,
+            "sets": _sets,
+            "lower": -np.inf if _lower is None else _lower,
+            "upper": np.inf if _upper is None else _upper,
+            "integer": (_first is not None) and _first.is_integer(),
+        }
+        layout["size"] += _size
+    return layout
+
+
+def get_columns(layout=None, name=None):
+    """
+    Parameters
+    ----------
+    layout : Dict, required
+        Includes the column blocks of the variables (see get_column_layout). The default is None.
+    name : String, required
+        Name of the variable. The default is None.
+
+    Returns
+    -------
+    numpy.ndarray
+        Column numbers of the variable with one axis per index set.
+
+    """
+    _block = layout["variables"][name]
+    _size = int(np.prod(_block["shape"]))
+    return (_block["offset"] + np.arange(_size)).reshape(_block["shape"])
+
+
+def get_positions(values=None, index=None):
+    """
+    Parameters
+    ----------
+    values : List, required
+        Elements of a set (e.g., years). The default is None.
+    index : List, required
+        Elements to look up. The default is None.
+
+    Raises
+    ------
+    KeyError
+        If an element is not part of the set.
+
+    Returns
+    -------
+    numpy.ndarray
+        Position of each element of index in values.
+
+    """
+    _position = {_value: _i for _i, _value in enumerate(values)}
+    return np.array([_position[_value] for _value in index], dtype=np.int64)
+
+
+def get_previous_positions(values=None, mask=None):
+    """
+    Parameters
+    ----------
+    values : List, required
+        Elements of an ordered set (e.g., years, cf. pyomo.Set.prev). The default is None.
+    mask : numpy.ndarray, required
+        Elements (boolean per position) for which the previous element is needed. The default is None.
+
+    Raises
+    ------
+    IndexError
+        If the previous element of the first element is needed.
+
+    Returns
+    -------
+    numpy.ndarray
+        Position of the previous element, one per selected element.
+
+    """
+    _positions = np.flatnonzero(mask) - 1
+    if (_positions < 0).any():
+        raise IndexError("No previous element of {}".format(values[0]))
+    return _positions
+
+
+def create_problem(layout=None, inactive=None):
+    """
+    Parameters
+    ----------
+    layout : Dict, required
+        Includes the column blocks of the variables (see get_column_layout). The default is None.
+    inactive : List, optional
+        Names of the constraints that are not added (e.g., deactivated per scenario). The default is None.
+
+    Returns
+    -------
+    problem : Dict
+        Includes the coefficients (row, column, value), the row bounds, and the row blocks per constraint.
+
+    """
+    return {
+        "layout": layout,
+        "inactive": set(inactive or []),
+        "rows": [],
+        "columns": [],
+        "values": [],
+        "lower": [],
+        "upper": [],
+        "blocks": [],
+        "size": 0,
+        "objective": np.zeros(layout["size"]),
+    }
+
+
+def add_rows(problem=None, name=None, shape=None, terms=None, lower=-np.inf, upper=np.inf, mask=None):
+    """
+    Adds the rows of one constraint (all indices at once) to the problem. Each term is a tuple
+    (columns, coefficients) or (columns, coefficients, selector):
+        - columns with the row shape: one coefficient per row;
+        - columns with additional trailing axes: the terms are summed over these axes;
+        - selector: positions along the first row axis, one per entry of the first column axis
+          (e.g., the node of each line).
+
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the coefficient matrix under construction (see create_problem). The default is None.
+    name : String, required
+        Name of the constraint (same name as in constraints.add). The default is None.
+    shape : Tuple, required
+        Shape of the index of the constraint (e.g., nodes x years x months). The default is None.
+    terms : List, required
+        Includes the terms of the rows. The default is None.
+    lower : float or numpy.ndarray, optional
+        Lower bound of the rows. The default is -inf.
+    upper : float or numpy.ndarray, optional
+        Upper bound of the rows. The default is inf.
+    mask : numpy.ndarray, optional
+        Rows that are added (the others are skipped, cf. py.Constraint.Skip). The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    if name in problem["inactive"]:
+        return
+    _mask = np.broadcast_to(True if mask is None else mask, shape)
+    _count = int(np.count_nonzero(_mask))
+    _rows = np.full(shape, -1, dtype=np.int64)
+    _rows[_mask] = problem["size"] + np.arange(_count)
+
+    for _term in terms:
+        _columns = np.asarray(_term[0])
+        _selected = _rows if len(_term) == 2 else _rows[_term[2]]
+        _selected = _selected.reshape(
+            _selected.shape + (1,) * (_columns.ndim - _selected.ndim)
+        )
+        _selected, _columns, _values = np.broadcast_arrays(
+            _selected, _columns, np.asarray(_term[1], dtype=float)
+        )
+        _keep = (_selected >= 0) & (_values != 0)
+        problem["rows"].append(_selected[_keep])
+        problem["columns"].append(_columns[_keep])
+        problem["values"].append(_values[_keep])
+
+    problem["lower"].append(np.broadcast_to(np.asarray(lower, dtype=float), shape)[_mask])
+    problem["upper"].append(np.broadcast_to(np.asarray(upper, dtype=float), shape)[_mask])
+    problem["blocks"].append((name, problem["size"], _count))
+    problem["size"] += _count
+    return
+
+
+def get_matrix(problem=None):
+    """
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the coefficients of the rows (see add_rows). The default is None.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+        Coefficient matrix (rows x columns); duplicate entries are summed up.
+
+    """
+    _matrix = sp.coo_matrix(
+        (
+            np.concatenate(problem["values"]),
+            (np.concatenate(problem["rows"]), np.concatenate(problem["columns"])),
+        ),
+        shape=(problem["size"], problem["layout"]["size"]),
+    ).tocsr()
+    _matrix.sum_duplicates()
+    _matrix.eliminate_zeros()
+    return _matrix
+
+
+def get_bounds(problem=None):
+    """
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the column layout and the rows (see create_problem). The default is None.
+
+    Returns
+    -------
+    Dict
+        Includes the lower and upper bounds and the integrality of the columns and the lower and upper
+        bounds of the rows.
+
+    """
+    _layout = problem["layout"]
+    _lower = np.empty(_layout["size"])
+    _upper = np.empty(_layout["size"])
+    _integer = np.zeros(_layout["size"], dtype=bool)
+    for _name, _block in _layout["variables"].items():
+        _columns = get_columns(layout=_layout, name=_name).ravel()
+        _lower[_columns] = _block["lower"]
+        _upper[_columns] = _block["upper"]
+        _integer[_columns] = _block["integer"]
+    return {
+        "column_lower": _lower,
+        "column_upper": _upper,
+        "integer": _integer,
+        "row_lower": np.concatenate(problem["lower"]),
+        "row_upper": np.concatenate(problem["upper"]),
+    }
+
+
+def get_network_levels(model=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+
+    Returns
+    -------
+    List
+        Includes one dictionary per network level with the names of the sets, parameters, variables, and
+        constraints of this level.
+
+    """
+    return [
+        {
+            "level": "tra",
+            "lines": list(model.set_line_tra),
+            "nodes": list(model.set_compressor),
+            "export_nodes": list(model.set_node_tra_export),
+            "import_nodes": list(model.set_node_tra_import),
+            "source_nodes": list(model.set_node_tra_source),
+            "adjacency": model.tra_adjacency,
+            "scale": 200,
+            "lump": (13877, 60000),
+            "length": model.par_tra_length,
+            "capacity": model.par_tra_capacity,
+            "book_value": model.par_book_value_tra,
+            "depreciation": model.par_depreciation_tra,
+            "year_of_inv": model.par_year_of_inv_tra,
+            "ref": model.par_ref_tra,
+            "fixed": model.par_fixed_tra,
+            "peak_months": False,
+            "var_lambda": "var_lambda_tra",
+            "var_gamma": "var_gamma_tra",
+            "var_gamma_line": "var_gamma_tra_line",
+            "var_gamma_line_inv": "var_gamma_tra_line_inv",
+            "var_pi": "var_pi_tra",
+            "var_pi_line": "var_pi_tra_line",
+            "var_pi_line_inv": "var_pi_tra_line_inv",
+            "var_transported": "var_transported_tra",
+            "var_export": "var_export_tra",
+            "var_import": "var_import_tra",
+            "var_lumpiness": "lumpiness_tra",
+            "var_abschreibung": "v_tra_abschreibung",
+            "con_fixed": "con_fixed_tra",
+            "con_total_cap": "con_total_tra_cap",
+            "con_total_cap_line": "con_total_tra_cap_line",
+            "con_book_value": "con_book_value_tra",
+            "con_book_value_line": "con_book_value_tra_line",
+            "con_inv_line": "con_inv_tra_line",
+            "con_gamma_inv_bounds": "con_gamma_inv_tra_bounds",
+            "con_export": "con_total_export_per_tra_node",
+            "con_import": "con_total_import_per_tra_node",
+            "con_positive": "con_positive_capacity_bound_tra",
+            "con_negative": "con_negative_capacity_bound_tra",
+            "con_lump": "c_lump_tra",
+            "con_link": "link_bdv_and_cap_tra",
+            "con_abschreibung": "con_fernleitung_abschreibung",
+        },
+        {
+            "level": "high",
+            "lines": list(model.set_line_high),
+            "nodes": list(model.set_node_hp),
+            "export_nodes": list(model.set_node_hp_export),
+            "import_nodes": list(model.set_node_hp_import),
+            "source_nodes": list(model.set_node_hp_source),
+            "demand_nodes": list(model.set_node_hp_demand),
+            "adjacency": model.high_adjacency,
+            "scale": 150,
+            "lump": (400, 30000),
+            "length": model.par_high_length,
+            "capacity": model.par_high_capacity,
+            "book_value": model.par_book_value_high,
+            "depreciation": model.par_depreciation_high,
+            "year_of_inv": model.par_year_of_inv_hp,
+            "ref": model.par_ref_high,
+            "fixed": model.par_fixed_high,
+            "peak_months": True,
+            "var_lambda": "var_lambda_high",
+            "var_gamma": "var_gamma_high",
+            "var_gamma_line": "var_gamma_high_line",
+            "var_gamma_line_inv": "var_gamma_high_line_inv",
+            "var_pi": "var_pi_high",
+            "var_pi_line": "var_pi_high_line",
+            "var_pi_line_inv": "var_pi_high_line_inv",
+            "var_transported": "var_transported_high",
+            "var_export": "var_export_high",
+            "var_import": "var_import_high",
+            "var_lumpiness": "lumpiness_high",
+            "var_abschreibung": "v_hp_abschreibung",
+            "con_fixed": "con_fixed_high",
+            "con_total_cap": "con_total_high_cap",
+            "con_total_cap_line": "con_total_high_cap_line",
+            "con_book_value": "con_book_value_high",
+            "con_book_value_line": "con_book_value_high_line",
+            "con_inv_line": "con_inv_high_line",
+            "con_gamma_inv_bounds": "con_gamma_inv_high_bounds",
+            "con_export": "con_total_export_per_high_node",
+            "con_import": "con_total_import_per_high_node",
+            "con_positive": "con_positive_capacity_bound_high",
+            "con_negative": "con_negative_capacity_bound_high",
+            "con_lump": "c_lump_high",
+            "con_link": "link_bdv_and_cap_high",
+            "con_abschreibung": "con_high_abschreibung",
+            # EARLY DECOMMISSIONING AND CLUSTERS (HIGH- AND MID-PRESSURE LEVEL ONLY)
+            "data": model.high,
+            "clusters": list(model.set_high_cluster),
+            "tag": "hp",
+            "cluster_tag": "high",
+            "con_early_decom": "con_early_decom_hp_1",
+            "con_early_decom_sum": "con_early_decom_hp_2",
+            "con_early_to_zero": "c_set_early_20xx_high_to_zero",
+        },
+        {
+            "level": "mid",
+            "lines": list(model.set_line_mid),
+            "nodes": list(model.set_node_mp),
+            "export_nodes": list(model.set_node_mp_export),
+            "import_nodes": list(model.set_node_mp_import),
+            "source_nodes": list(model.set_node_mp_source),
+            "demand_nodes": list(model.set_node_mp_demand),
+            "adjacency": model.mid_adjacency,
+            "scale": 25,
+            "lump": (60, 15000),
+            "length": model.par_mid_length,
+            "capacity": model.par_mid_capacity,
+            "book_value": model.par_book_value_mid,
+            "depreciation": model.par_depreciation_mid,
+            "year_of_inv": model.par_year_of_inv_mp,
+            "ref": model.par_ref_mid,
+            "fixed": model.par_fixed_mid,
+            "peak_months": True,
+            "var_lambda": "var_lambda_mid",
+            "var_gamma": "var_gamma_mid",
+            "var_gamma_line": "var_gamma_mid_line",
+            "var_gamma_line_inv": "var_gamma_mid_line_inv",
+            "var_pi": "var_pi_mid",
+            "var_pi_line": "var_pi_mid_line",
+            "var_pi_line_inv": "var_pi_mid_line_inv",
+            "var_transported": "var_transported_mid",
+            "var_export": "var_export_mid",
+            "var_import": "var_import_mid",
+            "var_lumpiness": "lumpiness_mid",
+            "var_abschreibung": "v_mp_abschreibung",
+            "con_fixed": "con_fixed_mid",
+            "con_total_cap": "con_total_mid_cap",
+            "con_total_cap_line": "con_total_mid_cap_line",
+            "con_book_value": "con_book_value_mid",
+            "con_book_value_line": "con_book_value_mid_line",
+            "con_inv_line": "con_inv_mid_line",
+            "con_gamma_inv_bounds": "con_gamma_inv_mid_bounds",
+            "con_export": "con_total_export_per_mid_node",
+            "con_import": "con_total_import_per_mid_node",
+            "con_positive": "con_positive_capacity_bound_mid",
+            "con_negative": "con_negative_capacity_bound_mid",
+            "con_lump": "c_lump_mid",
+            "con_link": "link_bdv_and_cap_mid",
+            "con_abschreibung": "con_mid_abschreibung",
+            "data": model.mid,
+            "clusters": list(model.set_mid_cluster),
+            "tag": "mp",
+            "cluster_tag": "mid",
+            "con_early_decom": "con_early_decom_mp_1",
+            "con_early_decom_sum": "con_early_decom_mp_2",
+            "con_early_to_zero": "c_set_early_20xx_mid_to_zero",
+        },
+    ]
+
+
+def get_node_line_pairs(level=None, direction=None):
+    """
+    Parameters
+    ----------
+    level : Dict, required
+        Includes the nodes, lines, and adjacency of a network level (see get_network_levels). The default
+        is None.
+    direction : String, required
+        "export" or "import". The default is None.
+
+    Returns
+    -------
+    Tuple
+        Positions of the nodes (in the export or import nodes of the level) and of the lines, one entry
+        per pair (node, line).
+
+    """
+    _lines = {_line: _i for _i, _line in enumerate(level["lines"])}
+    _nodes = []
+    _pairs = []
+    for _i, _node in enumerate(level[direction + "_nodes"]):
+        for _line in utils.get_lines_of_node(
+            adjacency=level["adjacency"], node=_node, direction=direction
+        ):
+            _nodes.append(_i)
+            _pairs.append(_lines[_line])
+    return np.array(_nodes, dtype=np.int64), np.array(_pairs, dtype=np.int64)
+
+
+def get_members(values=None, subset=None):
+    """
+    Parameters
+    ----------
+    values : List, required
+        Elements of a set (e.g., nodes at the high-pressure level). The default is None.
+    subset : Iterable, required
+        Elements of another set (e.g., storage nodes). The default is None.
+
+    Returns
+    -------
+    Tuple
+        Positions in values and positions in subset of the elements that are part of both sets.
+
+    """
+    _subset = {_value: _i for _i, _value in enumerate(subset)}
+    _pairs = [(_i, _subset[_value]) for _i, _value in enumerate(values) if _value in _subset]
+    if not _pairs:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    _values, _positions = zip(*_pairs)
+    return np.array(_values, dtype=np.int64), np.array(_positions, dtype=np.int64)
+
+
+def add_cost_rows(problem=None, model=None, years=None, levels=None):
+    """
+    Adds the annual cost and book value balances and the constraints per line that are not indexed by
+    month (see constraints.add).
+
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the coefficient matrix under construction (see create_problem). The default is None.
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    years : List, required
+        Elements of model.set_year. The default is None.
+    levels : List, required
+        Includes one dictionary per network level (see get_network_levels). The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    _layout = problem["layout"]
+
+    def _x(name):
+        return get_columns(layout=_layout, name=name)
+
+    _shape = (len(years),)
+    _years = np.array(years, dtype=float)
+    add_rows(
+        problem, "con_capex", _shape,
+        [(_x("var_capex"), 1), (_x("var_pi"), -py.value(model.par_wacc))],
+        lower=0, upper=0,
+    )
+    add_rows(
+        problem, "con_fixed", _shape,
+        [(_x("var_opex"), 1)] + [(_x(_level["var_lambda"]), -1) for _level in levels],
+        lower=0, upper=0,
+    )
+    add_rows(
+        problem, "con_total_book_val", _shape,
+        [(_x("var_pi"), 1)] + [(_x(_level["var_pi"]), -1) for _level in levels],
+        lower=0, upper=0,
+    )
+    add_rows(
+        problem, "con_total_abschreibung", _shape,
+        [(_x("v_abschreibung"), 1)]
+        + [(_x(_level["var_abschreibung"]).T, -1) for _level in levels],
+        lower=0, upper=0,
+    )
+
+    for _level in levels:
+        _lines = _level["lines"]
+        _line_shape = (len(_lines), len(years))
+        _length = report.get_component_values(_level["length"], _lines)
+        _inv_year = report.get_component_values(_level["year_of_inv"], _lines)
+        # COLUMNS OF THE VARIABLES PER (YEAR, LINE) ARE TRANSPOSED TO (LINE, YEAR)
+        _gamma_line = _x(_level["var_gamma_line"]).T
+        _gamma_inv = _x(_level["var_gamma_line_inv"]).T
+        _pi_line = _x(_level["var_pi_line"])
+        _pi_inv = _x(_level["var_pi_line_inv"])
+
+        add_rows(
+            problem, _level["con_fixed"], _shape,
+            [(_x(_level["var_lambda"]), 1), (_x(_level["var_gamma"]), -py.value(_level["fixed"]))],
+            lower=0, upper=0,
+        )
+        add_rows(
+            problem, _level["con_total_cap"], _shape,
+            [(_x(_level["var_gamma"]), 1), (_gamma_line.T, -(_length / _level["scale"]))],
+            lower=0, upper=0,
+        )
+        _capacity = report.get_component_values(_level["capacity"], _lines, years)
+        _terms = [(_gamma_line, 1), (_gamma_inv, -1)]
+        if "tag" in _level:
+            _terms.append((_x("v_dec_early_" + _level["tag"]), 1))
+        add_rows(
+            problem, _level["con_total_cap_line"], _line_shape, _terms,
+            lower=_capacity, upper=_capacity,
+        )
+        add_rows(
+            problem, _level["con_book_value"], _shape,
+            [(_x(_level["var_pi"]), 1), (_pi_line.T, -1)],
+            lower=0, upper=0,
+        )
+        _book_value = report.get_component_values(_level["book_value"], _lines, years)
+        add_rows(
+            problem, _level["con_book_value_line"], _line_shape,
+            [
+                (_pi_line, 1),
+                (_pi_inv[:, None], -report.get_component_values(_level["depreciation"], _lines, years)),
+            ],
+            lower=_book_value, upper=_book_value,
+        )
+
+        # CAPACITY IN THE YEAR OF INVESTMENT (NO INVESTMENT IF PLANNED AFTER THE MODELED YEARS)
+        _inside = np.isin(_inv_year, years)
+        _gamma_at_inv = np.zeros_like(_pi_inv)
+        _gamma_at_inv[_inside] = _gamma_inv[
+            np.flatnonzero(_inside), get_positions(years, _inv_year[_inside])
+        ]
+        add_rows(
+            problem, _level["con_inv_line"], (len(_lines),),
+            [(_pi_inv, 1), (_gamma_at_inv, -py.value(_level["ref"]) * _length * _inside)],
+            lower=0, upper=0,
+        )
+        _before = _years[None, :] < _inv_year[:, None]
+        _after = _years[None, :] > _inv_year[:, None]
+        add_rows(
+            problem, _level["con_gamma_inv_bounds"], _line_shape,
+            [(_gamma_inv, 1)], lower=0, upper=0, mask=_before,
+        )
+        if _after.any():
+            _previous = get_previous_positions(years, _after.any(axis=0))
+            _gamma_previous = np.zeros_like(_gamma_inv)
+            _gamma_previous[:, _after.any(axis=0)] = _gamma_inv[:, _previous]
+            add_rows(
+                problem, _level["con_gamma_inv_bounds"], _line_shape,
+                [(_gamma_inv, 1), (_gamma_previous, -1)], lower=0, upper=0, mask=_after,
+            )
+
+        _low, _high = _level["lump"]
+        _lumpiness = _x(_level["var_lumpiness"])
+        add_rows(
+            problem, _level["con_lump"], (len(_lines),),
+            [(_lumpiness, _low), (_gamma_at_inv, -1)], upper=0, mask=_inside,
+        )
+        add_rows(
+            problem, _level["con_link"], (len(_lines),),
+            [(_gamma_at_inv, 1), (_lumpiness, -_high)], upper=0, mask=_inside,
+        )
+
+        # NEW INVESTMENTS ARE DEPRECIATED FOR 20 YEARS
+        _depreciated = (_years[None, :] > _inv_year[:, None]) & (
+            _years[None, :] <= _inv_year[:, None] + 20
+        )
+        add_rows(
+            problem, _level["con_abschreibung"], _line_shape,
+            [(_x(_level["var_abschreibung"]), 1), (_pi_inv[:, None], -_depreciated.astype(float) / 20)],
+            lower=0, upper=0,
+        )
+    return
+
+
+def add_early_decommissioning_rows(problem=None, model=None, years=None, level=None):
+    """
+    Adds the constraints of the early decommissioning and of the clusters of one network level
+    (high- or mid-pressure, see constraints.early_decom_hp).
+
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the coefficient matrix under construction (see create_problem). The default is None.
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    years : List, required
+        Elements of model.set_year. The default is None.
+    level : Dict, required
+        Includes the names of the network level (see get_network_levels). The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    _layout = problem["layout"]
+
+    def _x(name):
+        return get_columns(layout=_layout, name=name)
+
+    _lines = level["lines"]
+    _line_shape = (len(_lines), len(years))
+    _years = np.array(years, dtype=float)[None, :]
+    _inv_year = report.get_component_values(level["year_of_inv"], _lines)[:, None]
+    _capacity = report.get_component_values(level["capacity"], _lines, years)
+    _decom = _x("v_dec_early_" + level["tag"])
+    _binary = {
+        _year: _x("v_bd_early_{}_{}".format(level["tag"], _year)) for _year in (2030, 2035, 2040)
+    }
+
+    _early = _inv_year > 2040
+    _terms = [(_decom, 1)]
+    for _year, _until in ((2030, 2035), (2035, 2040), (2040, None)):
+        if _year not in years:
+            continue
+        # DECOMMISSIONED CAPACITY IS KEPT CONSTANT UNTIL THE NEXT DECISION (OR THE YEAR OF INVESTMENT)
+        _kept = _early & (_years > _year) & (
+            (_years <= _until) if _until is not None else (_years < _inv_year)
+        )
+        _terms.append((_decom[:, [years.index(_year)]], -1.0 * _kept))
+        _terms.append((_binary[_year][:, None], -_capacity * (_early & (_years == _year))))
+    add_rows(problem, level["con_early_decom"], _line_shape, _terms, lower=0, upper=0)
+
+    add_rows(
+        problem, level["con_early_decom_sum"], (len(_lines),),
+        [(_binary[_year], 1) for _year in (2030, 2035, 2040)], upper=1,
+    )
+    for _year in (2030, 2035, 2040):
+        if _year in years:
+            add_rows(
+                problem, level["con_early_to_zero"], (len(_lines),),
+                [(_binary[_year], 1)], lower=0, upper=0, mask=~_early[:, 0],
+            )
+
+    _cluster = get_positions(
+        level["clusters"], level["data"].loc[_lines, "cluster_km"].tolist()
+    )
+    for _year in (2030, 2035, 2040):
+        _name = "bd_cluster_{}_{}".format(level["cluster_tag"], _year)
+        add_rows(
+            problem, "c_{}_{}_cluster_and_line_equal".format(level["cluster_tag"], _year),
+            (len(_lines),),
+            [(_x(_name)[_cluster], 1), (_binary[_year], -1)],
+            lower=0, upper=0, mask=_early[:, 0],
+        )
+    return
+
+
+def add_operation_rows(problem=None, model=None, years=None, months=None, levels=None):
+    """
+    Adds the constraints per node or line, year, and month (flows, gas balances, storage, demand, and
+    sources; see constraints.add).
+
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the coefficient matrix under construction (see create_problem). The default is None.
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    years : List, required
+        Elements of model.set_dispatch_year. The default is None.
+    months : List, required
+        Elements of model.set_time_unit. The default is None.
+    levels : List, required
+        Includes one dictionary per network level (see get_network_levels). The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    _layout = problem["layout"]
+
+    def _x(name):
+        return get_columns(layout=_layout, name=name)
+
+    _years = np.array(years, dtype=float)[None, :, None]
+    _months = np.array(months, dtype=float)[None, None, :]
+    _peak = report.get_component_values(model.par_total_peak_factor, months)[None, None, :]
+    _peak_factor = report.get_component_values(model.par_peak_factor, months)[None, None, :]
+    # THE CAPACITIES ARE ANNUAL, THE DISPATCH IS ONLY MODELED IN THE DISPATCH YEARS
+    _annual = get_positions(list(model.set_year), years)
+
+    for _level in levels:
+        _shape = (len(_level["lines"]), len(years), len(months))
+        _transported = _x(_level["var_transported"])
+        _gamma_line = _x(_level["var_gamma_line"]).T[:, _annual, None]
+        _factor = _peak_factor if _level["peak_months"] else 1.0
+        add_rows(
+            problem, _level["con_positive"], _shape,
+            [(_transported, _factor), (_gamma_line, -1)], upper=0,
+        )
+        add_rows(
+            problem, _level["con_negative"], _shape,
+            [(_transported, -_factor), (_gamma_line, -1)], upper=0,
+        )
+        for _direction, _name in (("export", "con_export"), ("import", "con_import")):
+            _node_shape = (len(_level[_direction + "_nodes"]), len(years), len(months))
+            _nodes, _lines = get_node_line_pairs(level=_level, direction=_direction)
+            add_rows(
+                problem, _level[_name], _node_shape,
+                [(_x(_level["var_" + _direction]), 1), (_transported[_lines], -1, _nodes)],
+                lower=0, upper=0,
+            )
+
+    _tra, _high, _mid = levels
+    _delivery_tra_hp = list(model.set_delivery_tra_hp)
+    _delivery_hp_mp = list(model.set_delivery_hp_mp)
+    _storage = list(model.set_storage)
+
+    def _sparse(level, name, nodes, coefficient):
+        # TERM OF A VARIABLE OF A SPARSE NODE SET (SEE UTILS.ADD_SPARSE_NODE_SETS) IN THE ROWS OF ALL
+        # NODES OF THE LEVEL
+        _nodes, _positions = get_members(level["nodes"], level[nodes])
+        return (_x(name)[_positions], coefficient, _nodes)
+
+    """GAS BALANCES"""
+    _nodes, _delivery = get_members(_tra["nodes"], _delivery_tra_hp)
+    add_rows(
+        problem, "c_gas_balance_tra", (len(_tra["nodes"]), len(years), len(months)),
+        [
+            _sparse(_tra, "var_source_tra", "source_nodes", 1),
+            (_x("var_demand_tra"), -1),
+            _sparse(_tra, "var_export_tra", "export_nodes", -_peak),
+            _sparse(_tra, "var_import_tra", "import_nodes", _peak),
+            (_x("var_del_tra_high")[_delivery], -1, _nodes),
+        ],
+        lower=0, upper=0,
+    )
+    _terms = [
+        _sparse(_high, "var_source_high", "source_nodes", 1),
+        _sparse(_high, "var_demand_high", "demand_nodes", -1),
+        _sparse(_high, "var_export_high", "export_nodes", -_peak),
+        _sparse(_high, "var_import_high", "import_nodes", _peak),
+    ]
+    _nodes, _delivery = get_members(_high["nodes"], _delivery_tra_hp)
+    _terms.append((_x("var_del_tra_high")[_delivery], 1, _nodes))
+    _nodes, _delivery = get_members(_high["nodes"], _delivery_hp_mp)
+    _terms.append((_x("var_del_high_mid")[_delivery], -1, _nodes))
+    _nodes, _delivery = get_members(_high["nodes"], _storage)
+    _terms.append((_x("var_storage_in_out")[_delivery], -1, _nodes))
+    # ISOLATED NODES WITHOUT SOURCE AND DEMAND HAVE NO GAS BALANCE (CF. PY.CONSTRAINT.SKIP)
+    _balanced = np.isin(
+        _high["nodes"],
+        _high["source_nodes"] + _high["demand_nodes"] + _high["export_nodes"]
+        + _high["import_nodes"] + _delivery_tra_hp + _delivery_hp_mp + _storage,
+    )
+    add_rows(
+        problem, "c_gas_balance_hp", (len(_high["nodes"]), len(years), len(months)), _terms,
+        lower=0, upper=0, mask=_balanced[:, None, None],
+    )
+    _nodes, _delivery = get_members(_mid["nodes"], _delivery_hp_mp)
+    add_rows(
+        problem, "c_gas_balance_mp", (len(_mid["nodes"]), len(years), len(months)),
+        [
+            _sparse(_mid, "var_source_mid", "source_nodes", 1),
+            _sparse(_mid, "var_demand_mid", "demand_nodes", -1),
+            _sparse(_mid, "var_export_mid", "export_nodes", -_peak),
+            _sparse(_mid, "var_import_mid", "import_nodes", _peak),
+            (_x("var_del_high_mid")[_delivery], 1, _nodes),
+        ],
+        lower=0, upper=0,
+    )
+
+    """STORAGE CONSTRAINTS"""
+    _storage_shape = (len(_storage), len(years), len(months))
+    _capacity = model.storage.set_index("Node")["Capacity"]
+    if _capacity.index.duplicated().any():
+        raise ValueError("Storage nodes must be unique in the storage input data")
+    _soc = _x("var_storage_soc")
+    _in_out = _x("var_storage_in_out")
+    add_rows(
+        problem, "c_soc_upper_bound", _storage_shape, [(_soc, 1)],
+        upper=_capacity.loc[_storage].to_numpy(dtype=float)[:, None, None],
+    )
+    _first = (_years == years[0]) & (_months == months[0])
+    add_rows(
+        problem, "c_soc_in_and_out", _storage_shape, [(_soc, 1), (_in_out, -1)],
+        lower=0, upper=0, mask=_first,
+    )
+    # STATE OF CHARGE OF THE PREVIOUS TIME SLICE (OR OF THE LAST ONE OF THE PREVIOUS YEAR)
+    _later = _months[0, 0] != months[0]
+    _soc_previous = np.zeros_like(_soc)
+    _soc_previous[:, :, _later] = _soc[:, :, get_previous_positions(months, _later)]
+    add_rows(
+        problem, "c_soc_in_and_out", _storage_shape,
+        [(_soc, 1), (_soc_previous, -1), (_in_out, -1)],
+        lower=0, upper=0, mask=(_months != months[0]),
+    )
+    _january = (_months == months[0]) & ~_first
+    _years_january = _january.any(axis=2)[0]
+    _soc_previous = np.zeros_like(_soc)
+    _soc_previous[:, _years_january, :] = _soc[
+        :, get_previous_positions(years, _years_january), len(months) - 1
+    ][:, :, None]
+    add_rows(
+        problem, "c_soc_in_and_out", _storage_shape,
+        [(_soc, 1), (_soc_previous, -1), (_in_out, -1)],
+        lower=0, upper=0, mask=_january,
+    )
+    add_rows(
+        problem, "c_completely_discharged_storage_2039", _storage_shape, [(_soc, 1)],
+        lower=0, upper=0,
+        mask=(_years == utils.get_dispatch_year_before(model=model, year=2040))
+        & (_months == utils.get_time_slice_of_month(model=model, month=12)),
+    )
+    if "Gampern" in _high["nodes"]:
+        add_rows(
+            problem, "c_freiwerdender_h2_speicher_gampern", (1, len(years), len(months)),
+            [(_soc[[_storage.index("Gampern")]], 1)],
+            lower=0, upper=0, mask=(_years >= 2030),
+        )
+
+    """REVENUES AND DEMAND"""
+    for _level, _tag in ((_high, "high"), (_mid, "mid")):
+        _node_shape = (len(_level["demand_nodes"]), len(years), len(months))
+        add_rows(
+            problem, "c_rev_" + _tag, _node_shape, [(_x("var_revenues_" + _tag), 1)],
+            lower=0, upper=0,
+        )
+        _voll = report.get_component_values(
+            model.component("par_value_of_lost_load_" + _tag), years
+        )[None, :, None]
+        add_rows(
+            problem, "c_value_of_lost_load_" + _tag, _node_shape,
+            [
+                (_x("var_value_of_lost_load_" + _tag), 1),
+                (_x("var_demand_not_supplied_" + _tag), -_voll),
+            ],
+            lower=0, upper=0,
+        )
+    add_rows(
+        problem, "c_rev_year", (len(years),),
+        [(_x("var_rev"), 1)]
+        + [(_x("var_revenues_" + _tag).transpose(1, 0, 2), -1) for _tag in ("high", "mid")],
+        lower=0, upper=0,
+    )
+    add_rows(
+        problem, "c_value_of_lost_load_per_year", (len(years),),
+        [(_x("var_value_of_lost_load"), 1)]
+        + [
+            (_x("var_value_of_lost_load_" + _tag).transpose(1, 0, 2), -1)
+            for _tag in ("high", "mid")
+        ],
+        lower=0, upper=0,
+    )
+    _demand = report.get_component_values(model.par_demand_tra, _tra["nodes"], years, months)
+    add_rows(
+        problem, "c_equal_tra_demand", _demand.shape, [(_x("var_demand_tra"), 1)],
+        lower=_demand, upper=_demand,
+    )
+    _demand = report.get_component_values(
+        model.par_demand_high, _high["demand_nodes"], years, months
+    )
+    add_rows(
+        problem, "c_limit_high_demand", _demand.shape,
+        [(_x("var_demand_high"), 1), (_x("var_demand_not_supplied_high"), 1)],
+        lower=_demand, upper=_demand,
+    )
+    _demand = report.get_component_values(model.par_demand_mid, _mid["demand_nodes"], years, months)
+    _supplied = ~np.isin(_mid["demand_nodes"], ["Feldkirch", "Höchst"])[:, None, None]
+    add_rows(
+        problem, "c_limit_mid_demand", _demand.shape,
+        [(_x("var_demand_mid"), 1), (_x("var_demand_not_supplied_mid"), 1.0 * _supplied)],
+        lower=_demand, upper=_demand,
+    )
+    add_rows(
+        problem, "c_gas_purchase", (len(years),), [(_x("var_gas_purchase"), 1)],
+        lower=0, upper=0,
+    )
+    add_rows(
+        problem, "c_green_gas", (len(_delivery_tra_hp), len(years), len(months)),
+        [(_x("var_del_tra_high"), 1)], lower=0, upper=0, mask=(_years >= 2040),
+    )
+
+    """SOURCES"""
+    _source_tra = report.get_component_values(model.par_source_tra, _tra["source_nodes"], years)
+    add_rows(
+        problem, "c_limit_tra_source", _source_tra.shape, [(_x("var_source_tra"), 1)],
+        upper=_source_tra,
+    )
+    for _level, _tag, _parameter, _excluded in (
+        (_high, "hp", model.par_source_hp, []),
+        (_mid, "mp", model.par_source_mp, ["Hörbranz", "Kufstein", "Vils"]),
+    ):
+        _name = _level["level"]
+        _source = report.get_component_values(_parameter, _level["source_nodes"], years)
+        add_rows(
+            problem, "c_limit_{}_source".format(_name), _source.shape,
+            [(_x("var_source_" + _name), 1)], upper=_source,
+        )
+        add_rows(
+            problem, "c_max_monthly_source_{}_node".format(_name),
+            (len(_level["source_nodes"]), len(years), len(months)),
+            [(_x("var_source_" + _name), 1)], upper=_source[:, :, None],
+        )
+        # VALUE OF THE SOURCE POTENTIAL THAT IS NOT USED: 500 x (POTENTIAL - USED)
+        _used = ~np.isin(_level["source_nodes"], _excluded)[:, None]
+        add_rows(
+            problem, "con_VoLL_" + _tag, _source.shape,
+            [(_x("var_VoLL_src_" + _tag), 1), (_x("var_source_" + _name), 500.0 * _used[:, :, None])],
+            lower=500 * _source * _used, upper=500 * _source * _used,
+        )
+        _not_supplied = _x("var_demand_not_supplied_" + _name)
+        add_rows(
+            problem, "c_limit_demand_not_supplied_{}_2040".format(_name),
+            (len(_level["demand_nodes"]), len(years)),
+            [(_not_supplied, 1)], upper=40000,
+            mask=(np.array(years)[None, :] == 2040)
+            & ~np.isin(_level["demand_nodes"], ["Innsbruck"])[:, None],
+        )
+    add_rows(
+        problem, "con_cost_src_not_per_year", (len(years),),
+        [(_x("var_VoLL_SOURCE"), 1), (_x("var_VoLL_src_hp").T, -1), (_x("var_VoLL_src_mp").T, -1)],
+        lower=0, upper=0,
+    )
+
+    """CLUSTERS WITH CAPACITIES FOR HYDROGEN"""
+    for _level, _first_clusters, _second_clusters in (
+        (_high, [20], [25]),
+        (_mid, [55, 446, 143], [90, 341]),
+    ):
+        _clusters = _level["data"].loc[_level["lines"], "cluster_km"].to_numpy()[:, None, None]
+        _free = (np.isin(_clusters, _first_clusters) & (_years >= 2030)) | (
+            np.isin(_clusters, _second_clusters) & (_years >= 2035)
+        )
+        add_rows(
+            problem, "c_frei_werdende_kapazitäten_für_h2_von_netzebene{}".format(
+                1 if _level is _high else 2
+            ),
+            _free.shape[:1] + (len(years), len(months)),
+            [(_x(_level["var_transported"]), 1)], lower=0, upper=0, mask=_free,
+        )
+        for _year, _decommissioned in ((2030, _first_clusters), (2035, _second_clusters)):
+            _decided = np.isin(_level["clusters"], _decommissioned).astype(float)
+            add_rows(
+                problem, "c_no_early_decom_{}_{}".format(_level["cluster_tag"], str(_year)[2:]),
+                (len(_level["clusters"]),),
+                [(_x("bd_cluster_{}_{}".format(_level["cluster_tag"], _year)), 1)],
+                lower=_decided, upper=_decided,
+            )
+    return
+
+
+def add_objective(problem=None, model=None, years=None):
+    """
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the coefficient matrix under construction (see create_problem). The default is None.
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    years : List, required
+        Elements of model.set_year. The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    _layout = problem["layout"]
+    _dispatch_years = list(model.set_dispatch_year)
+    _i = py.value(model.par_i)
+    # SAME DISCOUNTED COSTS AS IN UTILS.OBJ_VALUE
+    for _year in range(2025, model.objective_year + 1, 1):
+        _discount = 1 / (1 + _i) ** (_year - 2025)
+        _position = years.index(_year)
+        for _name in ("var_capex", "var_opex", "v_abschreibung"):
+            problem["objective"][get_columns(layout=_layout, name=_name)[_position]] += _discount
+        for _dispatch, _share in model.dispatch_shares[_year]:
+            _position = _dispatch_years.index(_dispatch)
+            for _name, _sign in (
+                ("var_rev", -1),
+                ("var_gas_purchase", 1),
+                ("var_value_of_lost_load", 1),
+                ("var_VoLL_SOURCE", 1),
+            ):
+                _column = get_columns(layout=_layout, name=_name)[_position]
+                problem["objective"][_column] += _sign * _discount * _share
+    return
+
+
+def build_problem(model=None, inactive=None):
+    """
+    Builds the coefficient matrix, bounds, and objective of the model by index arithmetic on the sets
+    (instead of one Pyomo rule call per constraint index). The rows are the same as the ones of
+    constraints.add; the Pyomo model remains the reference and only provides sets, parameters, and
+    variables (constraints.add is not called).
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance with sets, parameters, and decision variables. The default is None.
+    inactive : List, optional
+        Names of the constraints that are not added (see scenarios.get_inactive_constraints). The
+        default is None.
+
+    Returns
+    -------
+    problem : Dict
+        Includes the column layout, the coefficient matrix (csr), the bounds, and the objective.
+
+    """
+    _years = list(model.set_year)
+    _months = list(model.set_time_unit)
+    _levels = get_network_levels(model=model)
+
+    problem = create_problem(layout=get_column_layout(model=model), inactive=inactive)
+    add_cost_rows(problem=problem, model=model, years=_years, levels=_levels)
+    for _level in _levels[1:]:
+        add_early_decommissioning_rows(problem=problem, model=model, years=_years, level=_level)
+    add_operation_rows(
+        problem=problem,
+        model=model,
+        years=list(model.set_dispatch_year),
+        months=_months,
+        levels=_levels,
+    )
+    add_objective(problem=problem, model=model, years=_years)
+
+    problem["matrix"] = get_matrix(problem=problem)
+    problem.update(get_bounds(problem=problem))
+    for _key in ("rows", "columns", "values", "lower", "upper"):
+        del problem[_key]
+    return problem
+
+
+def get_column_names(problem=None):
+    """
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the column layout (see build_problem). The default is None.
+
+    Returns
+    -------
+    List
+        Pyomo names of the columns (e.g., var_capex[2025]).
+
+    """
+    _names = []
+    for _name, _block in problem["layout"]["variables"].items():
+        for _index in np.ndindex(*_block["shape"]):
+            # SAME NAMES AS PYOMO (E.G., QUOTES AROUND NODES WITH SPECIAL CHARACTERS)
+            _key = tuple(_set[_i] for _set, _i in zip(_block["sets"], _index))
+            _names.append(_name + index_repr(_key if len(_key) > 1 else _key[0]))
+    return _names
+
+
+def solve_with_gurobi(problem=None, threads=12, path=None, profile=None):
+    """
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the coefficient matrix, bounds, and objective (see build_problem). The default is None.
+    threads : int, optional
+        Number of solver threads. The default is 12.
+    path : String, optional
+        If given, the problem is also written to this file (e.g., model.mps). The default is None.
+    profile : Dict, optional
+        Includes the gap, time limit, and emphasis (see solvers.get_profile). The default is None.
+
+    Returns
+    -------
+    Tuple
+        Values of the columns (numpy.ndarray) and objective value.
+
+    """
+    import gurobipy as gp
+
+    _model = gp.Model()
+    for _option, _value in solvers.get_solver_options("gurobi", profile=profile, threads=threads).items():
+        _model.setParam(_option, _value)
+    _x = _model.addMVar(
+        problem["matrix"].shape[1],
+        lb=problem["column_lower"],
+        ub=problem["column_upper"],
+        obj=problem["objective"],
+        vtype=np.where(problem["integer"], gp.GRB.INTEGER, gp.GRB.CONTINUOUS),
+    )
+    _lower, _upper = problem["row_lower"], problem["row_upper"]
+    _equal = _lower == _upper
+    _finite_lower = np.isfinite(_lower) & ~_equal
+    _finite_upper = np.isfinite(_upper) & ~_equal
+    _model.addMConstr(problem["matrix"][_equal], _x, "=", _lower[_equal])
+    _model.addMConstr(problem["matrix"][_finite_lower], _x, ">", _lower[_finite_lower])
+    _model.addMConstr(problem["matrix"][_finite_upper], _x, "<", _upper[_finite_upper])
+    _model.ModelSense = gp.GRB.MINIMIZE
+    if path is not None:
+        _model.write(str(path))
+    _model.optimize()
+    return _x.X, _model.ObjVal
+
+
+def solve_with_highs(problem=None, threads=12, path=None, profile=None):
+    """
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the coefficient matrix, bounds, and objective (see build_problem). The default is None.
+    threads : int, optional
+        Number of solver threads. The default is 12.
+    path : String, optional
+        If given, the problem is also written to this file (e.g., model.mps). The default is None.
+    profile : Dict, optional
+        Includes the gap, time limit, and emphasis (see solvers.get_profile). The default is None.
+
+    Returns
+    -------
+    Tuple
+        Values of the columns (numpy.ndarray) and objective value.
+
+    """
+    import highspy
+
+    _matrix = problem["matrix"].tocsc()
+    _lp = highspy.HighsLp()
+    _lp.num_col_ = _matrix.shape[1]
+    _lp.num_row_ = _matrix.shape[0]
+    _lp.col_cost_ = problem["objective"]
+    _lp.col_lower_ = problem["column_lower"]
+    _lp.col_upper_ = problem["column_upper"]
+    _lp.row_lower_ = problem["row_lower"]
+    _lp.row_upper_ = problem["row_upper"]
+    _lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    _lp.a_matrix_.start_ = _matrix.indptr
+    _lp.a_matrix_.index_ = _matrix.indices
+    _lp.a_matrix_.value_ = _matrix.data
+    _lp.integrality_ = [
+        highspy.HighsVarType.kInteger if _integer else highspy.HighsVarType.kContinuous
+        for _integer in problem["integer"]
+    ]
+
+    _highs = highspy.Highs()
+    for _option, _value in solvers.get_solver_options("highs", profile=profile, threads=threads).items():
+        _highs.setOptionValue(_option, _value)
+    _highs.passModel(_lp)
+    if path is not None:
+        _highs.writeModel(str(path))
+    _highs.run()
+    return np.array(_highs.getSolution().col_value), _highs.getInfo().objective_function_value
+
+
+def solve_problem(problem=None, solver="gurobi", threads=12, path=None, profile=None):
+    """
+    Passes the coefficient matrix directly to the solver (without writing a Pyomo model).
+
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the coefficient matrix, bounds, and objective (see build_problem). The default is None.
+    solver : String, optional
+        "gurobi" (gurobipy) or "highs" (highspy). The default is "gurobi".
+    threads : int, optional
+        Number of solver threads. The default is 12.
+    path : String, optional
+        If given, the problem is also written to this file (e.g., model.mps). The default is None.
+    profile : Dict, optional
+        Includes the gap, time limit, and emphasis (see solvers.get_profile). The default is None.
+
+    Returns
+    -------
+    Tuple
+        Values of the columns (numpy.ndarray) and objective value.
+
+    """
+    if solver == "gurobi":
+        return solve_with_gurobi(problem=problem, threads=threads, path=path, profile=profile)
+    elif solver == "highs":
+        return solve_with_highs(problem=problem, threads=threads, path=path, profile=profile)
+    raise ValueError("Unknown solver for the matrix path: {}".format(solver))
+
+
+def load_solution(model=None, problem=None, values=None):
+    """
+    Sets the values of the decision variables of the Pyomo model, e.g., to report the results with
+    report.write_results_to_folder.
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance the problem was built from. The default is None.
+    problem : Dict, required
+        Includes the column layout (see build_problem). The default is None.
+    values : numpy.ndarray, required
+        Values of the columns (see solve_problem). The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    for _name, _block in problem["layout"]["variables"].items():
+        _var = model.component(_name)
+        _columns = get_columns(layout=problem["layout"], name=_name).ravel()
+        _var.set_values(dict(zip(_var.index_set(), values[_columns].tolist())))
+    return
@@ -1,152 +1,271 @@
-import pandas as pd
-import utils
-import constraints
-import report
-from pathlib import Path
+import argparse
 import datetime
+import os
+import batch
+import profiler
+import report
+import scenarios
+import solvers
+import utils
+import writer
 
-print('Scenarios: [1] Grüne Gase; [2] Grünes Methan; [3] Dezentrale Grüne Gase; [4] Elektrifizierung')
-_x = input('Select Scenario: ')
-_key = int(_x)
-
-_dict = {
-    1: 'gg',
-    2: 'gm',
-    3: 'dgg',
-    4: 'elek'
-}
-
-_scenario = _dict[_key]
-print('Scenario short tag: {}'.format(_scenario))
-
-start_time = datetime.datetime.now()
-print(start_time.strftime("%A, %H:%M"))
-
-"""READ IN SHAPEFILES"""
-_trans = utils.read_shapefile(path="transmission", name="transmission.shp")
-_high = utils.read_shapefile(path="high", name="high.shp")
-_mid = utils.read_shapefile(path="mid", name="mid.shp")
-print("Done: Read in Shapefiles")
-
-"""READ IN DATA"""
-_path = Path("data")
-
-# This is a modification of the initial code for the project "Gas Studie 2040".
-_dem_str = "DEMAND_methane_MODELRUN_"+_scenario+".xlsx"
-_demand = pd.read_excel(_path / _dem_str)
-_demand_high = _demand.loc[_demand.Type == "High-Pressure"]
-_demand_mid = _demand.loc[_demand.Type == "Mid-Pressure"]
-_tra_dem_str = "TRANSIT_export_"+_scenario+".xlsx"
-_demand_tra = pd.read_excel(_path / _tra_dem_str)
-_pipeline_eco = pd.read_excel(_path / "INPUT_Pipelines_Economic.xlsx")
-_pipeline_tec = pd.read_excel(_path / "INPUT_Pipelines_Technical_NEW_v2.xlsx")
-_refurbishment = pd.read_excel(_path / "INPUT_Refurbishment.xlsx")
-_source = pd.read_excel(_path / "INPUT_Source.xlsx")
-_storage = pd.read_excel(_path / "INPUT_Storage_Technical.xlsx")
-_time_dev = pd.read_excel(_path / "INPUT_Time_Resolution.xlsx")
-_prices = pd.read_excel(_path / "INPUT_Prices.xlsx")
-
-# CHANGES IN THE CODE FOR "GAS-STUDIE-2040"
-_src_str = "SOURCE_methane_MODELRUN_FINAL"+_scenario+".xlsx"
-_local_gen = pd.read_excel(_path / _src_str)
-_imp_src = "TRANSIT_import_"+_scenario+".xlsx"
-_feasible = pd.read_excel(_path / _imp_src)
-
-"""NODES OF THE NETWORK"""
-_nodes = utils.get_nodes_from_lines(
-    transmission=_trans, high_pressure=_high, mid_pressure=_mid
-)
-print("Done: Create Nodes of Model")
-
-
-"""PYOMO.CONCRETEMODEL()"""
-model = utils.create_model()
-
-model.transmission = _trans
-model.high = _high
-model.mid = _mid
-
-utils.add_import_and_export_lines_per_node(model=model)
-
-model.demand_tra = _demand_tra
-model.demand_high = _demand_high
-model.demand_mid = _demand_mid
-model.pipeline_economic = _pipeline_eco
-model.pipeline_technical = _pipeline_tec
-model.refurbishment = _refurbishment
-model.source = _source
-model.storage = _storage
-model.temporal_demand = _time_dev
-model.prices = _prices
-model.generation = _local_gen
-model.feasible = _feasible
-utils.add_nodal_sets(model=model, nodes=_nodes)
-
-
-utils.add_line_sets(model=model, data=[_trans, _high, _mid])
-utils.add_time_horizon(model=model, year=2065, temporal=12)
-utils.add_cluster_sets(model=model)
-print("Done: Add Sets")
-
-# print('High-Pressure Nodes')
-list_high = []
-for element in model.set_node_hp:
-    list_high.append(element)
-# print('Mid-Pressure Nodes')
-list_mid = []
-for element in model.set_node_mp:
-    list_mid.append(element)
-
-
-series_high = pd.Series(list_high)
-series_mid = pd.Series(list_mid)
-df = pd.DataFrame({'High': series_high, 'Mid': series_mid})
-
-utils.add_decision_variables(model=model)
-print("Done: Add Decision Variables")
 
-utils.add_parameter_to_model(model=model)
-print("Done: Add Parameters")
+def parse_override(text=None):
+    """
+    Parameters
+    ----------
+    text : String, required
+        Parameter override in the form PARAM=VALUE (e.g., par_wacc=0.06). The default is None.
 
-constraints.add(model=model)
-print("Done: Add Constraints")
-utils.add_objective_function(model=model)
-print("Done: Add Objective Function")
+    Returns
+    -------
+    Tuple
+        Name and (float) value of the parameter.
 
-model.c_limit_demand_not_supplied_high_2040.deactivate()
-model.c_limit_demand_not_supplied_mid_2040.deactivate()
+    """
+    _name, _separator, _value = text.partition("=")
+    if not _separator:
+        raise argparse.ArgumentTypeError("Override must be PARAM=VALUE: {}".format(text))
+    return _name.strip(), float(_value)
 
-if _scenario == 'gm':
-    print('Deactivate Green Gas Constraint!')
-    model.c_green_gas.deactivate()
 
-print('Done: Deactivate constraints')
+def main():
+    parser = argparse.ArgumentParser(
+        description="Modeling the Austrian national gas grid (batch run of scenarios)."
+    )
+    parser.add_argument(
+        "scenarios",
+        nargs="*",
+        help="Scenario short tags: {}. Asks for one scenario if omitted.".format(
+            ", ".join(scenarios.SCENARIO_NAMES)
+        ),
+    )
+    parser.add_argument(
+        "--set",
+        dest="overrides",
+        action="append",
+        type=parse_override,
+        default=[],
+        metavar="PARAM=VALUE",
+        help="Parameter override applied to all scenarios (e.g., par_wacc=0.06).",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Number of models built and solved in parallel."
+    )
+    parser.add_argument(
+        "--threads", type=int, default=12, help="Number of solver threads per model."
+    )
+    parser.add_argument(
+        "--persistent",
+        action="store_true",
+        help="Build the model once per worker and switch scenarios by updating mutable parameters "
+        "in a persistent solver (overrides are limited to mutable parameters).",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=report.OUTPUT_FORMATS,
+        default="xlsx",
+        help="File format of the result files (xlsx for analysts, csv or parquet for pipelines).",
+    )
+    parser.add_argument(
+        "--builder",
+        choices=scenarios.BUILDERS,
+        default="pyomo",
+        help="Model generation: Pyomo constraint rules (reference) or the coefficient matrix built "
+        "directly from the sets and parameters (requires gurobipy).",
+    )
+    parser.add_argument(
+        "--horizon",
+        choices=utils.HORIZONS,
+        default="full",
+        help="Years after the objective function (2051-2065): modeled (full), not modeled (drop), or "
+        "collapsed into one terminal year (terminal).",
+    )
+    parser.add_argument(
+        "--dispatch-years",
+        nargs="+",
+        type=int,
+        default=None,
+        metavar="YEAR",
+        help="Years with a modeled monthly dispatch (e.g., 2025 2030 2035 2039 2040 2045 2050); the "
+        "operation of the other years is interpolated. All years if omitted.",
+    )
+    parser.add_argument(
+        "--time-slices",
+        type=int,
+        default=12,
+        help="Time slices per year: 12 keeps the months; fewer time slices combine consecutive months "
+        "with a similar demand (k-means on the monthly demand profile) to reduce the model size.",
+    )
+    parser.add_argument(
+        "--reduce-network",
+        action="store_true",
+        help="Fold the radial branches of the mid-pressure network (no gas balance and flow variables "
+        "for the nodes behind them); the flows are expanded again in the results.",
+    )
+    parser.add_argument(
+        "--eliminate-fixed",
+        action="store_true",
+        help="Replace constraints that only pin a variable (e.g., zero capacity before the year of "
+        "investment) by fixed variables or bounds instead of passing them to the solver.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse the model of the previous run (stored in data/.cache) and only recompute the "
+        "parameters derived from the changed input files; tables that define sets (network, "
+        "pipelines, storage, time resolution) lead to a full build.",
+    )
+    parser.add_argument(
+        "--decompose",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Solve the matrix builder's problem by clusters in N worker processes (fix-and-optimize of "
+        "the early decommissioning decisions per cluster); 0 solves the problem as a whole.",
+    )
+    parser.add_argument(
+        "--solver",
+        choices=list(solvers.SOLVERS),
+        default="gurobi",
+        help="MIP solver (the matrix builder supports gurobi and highs, the persistent mode gurobi).",
+    )
+    parser.add_argument(
+        "--gap",
+        type=float,
+        default=None,
+        help="Relative MIP gap. Default: {}.".format(solvers.SOLVER_PROFILE["gap"]),
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=None,
+        help="Time limit of the solver in seconds. Default: {}.".format(
+            solvers.SOLVER_PROFILE["time_limit"]
+        ),
+    )
+    parser.add_argument(
+        "--emphasis",
+        choices=solvers.EMPHASES,
+        default=None,
+        help="Search emphasis of the solver: proving the bound (aggressive cuts), finding feasible "
+        "solutions (heuristics), or the solver defaults. Default: {}.".format(
+            solvers.SOLVER_PROFILE["emphasis"]
+        ),
+    )
+    parser.add_argument(
+        "--warm-start",
+        default=None,
+        metavar="NAME",
+        help="Start the solver from the stored solution of this run (e.g., a neighbouring scenario). "
+        "By default, each run starts from its own previous solution, if any.",
+    )
+    parser.add_argument(
+        "--relaxation-fixing",
+        nargs="?",
+        type=float,
+        const=solvers.FIXING_TOLERANCE,
+        default=None,
+        metavar="TOL",
+        help="Solve the LP relaxation first, fix the integer variables within TOL of an integer "
+        "(default: {}), solve the restricted MIP (with repair if infeasible), and then the full "
+        "MIP from its incumbent for the bound.".format(
+            solvers.FIXING_TOLERANCE
+        ),
+    )
+    parser.add_argument(
+        "--export",
+        choices=writer.FORMATS,
+        default=None,
+        metavar="FORMAT",
+        help="Write each model to solution/<name>.<FORMAT> before the solve, one of {} (streamed "
+        "without Pyomo's writers, e.g., for offline solvers or to diff model versions).".format(
+            ", ".join(writer.FORMATS)
+        ),
+    )
+    parser.add_argument(
+        "--labels",
+        choices=writer.LABELS,
+        default="integer",
+        help="Names in the exported model file: integer labels (x0, c0, ...) with the map to the "
+        "Pyomo names in solution/<name>.names.csv.gz, or the symbolic Pyomo names.",
+    )
+    parser.add_argument(
+        "--benchmark",
+        nargs="+",
+        choices=list(solvers.SOLVERS),
+        default=None,
+        metavar="SOLVER",
+        help="Instead of a batch run, build each scenario once and compare the time to gap of these "
+        "solvers (written to solution/benchmark-<time>.csv).",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["time", "memory"],
+        default=None,
+        help="Record the time (and memory) per input file, Pyomo component, build step, solve, and "
+        "report section; written to profile.csv/json per run and solution/profile-<time>.csv/json.",
+    )
+    args = parser.parse_args()
 
-# """PRINT AND DISPLAY THE MODEL"""
-# utils.print_model(model)
+    _scenarios = args.scenarios
+    if not _scenarios:
+        print('Scenarios: [1] Grüne Gase; [2] Grünes Methan; [3] Dezentrale Grüne Gase; [4] Elektrifizierung')
+        _x = input('Select Scenario: ')
+        _scenarios = [scenarios.SCENARIOS[int(_x)]]
 
+    for _scenario in _scenarios:
+        if _scenario not in scenarios.SCENARIO_NAMES:
+            parser.error("Unknown scenario: {}".format(_scenario))
 
-# DISPLAY TIME TO INITIALIZE THE MODEL
-initialize_time = datetime.datetime.now() - start_time
-print(
-    "Time to initialize the model in minutes: ",
-    int(initialize_time.total_seconds() / 60),
-)
+    start_time = datetime.datetime.now()
+    print(start_time.strftime("%A, %H:%M"))
 
-"""START TO SOLVE THE MODEL"""
-Solver = utils.set_solver_for_the_model(model)
-# eliminate_fixed_vars.apply_to(model)
-# print('DONE: eliminate_fixed_vars.apply_to(model)')
-# model.check_model()
-# print('DONE: model.check_model()')
-# model.validate_dual_unboundness()
-# print('DONE: model.validate_dual_unboundness()')
-solution = Solver.solve(model, tee=True, warmstart=True)
-solution.write()
-model.objective.display()
+    if args.profile:
+        profiler.enable(memory=args.profile == "memory")
+    _jobs = batch.get_jobs(scenario_list=_scenarios, overrides=dict(args.overrides))
+    _profile = {"gap": args.gap, "time_limit": args.time_limit, "emphasis": args.emphasis}
+    if args.benchmark:
+        batch.run_benchmark(
+            jobs=_jobs,
+            solver_list=args.benchmark,
+            threads=args.threads,
+            profile=_profile,
+            horizon=args.horizon,
+            dispatch_years=args.dispatch_years,
+            temporal=args.time_slices,
+            reduce_network=args.reduce_network,
+            eliminate=args.eliminate_fixed,
+        )
+        return
+    batch.run_batch(
+        jobs=_jobs,
+        workers=args.workers,
+        threads=args.threads,
+        persistent=args.persistent,
+        output_format=args.output_format,
+        builder=args.builder,
+        horizon=args.horizon,
+        dispatch_years=args.dispatch_years,
+        temporal=args.time_slices,
+        reduce_network=args.reduce_network,
+        decompose=args.decompose,
+        solver=args.solver,
+        profile=_profile,
+        warm_start=args.warm_start,
+        fixing=args.relaxation_fixing,
+        eliminate=args.eliminate_fixed,
+        export=None if args.export is None else {"format": args.export, "labels": args.labels},
+        incremental_build=args.incremental,
+    )
+    if args.profile:
+        profiler.write_profile(
+            path=os.path.join("solution", "profile-{}".format(start_time.strftime("%Y%m%dT%H%M")))
+        )
+        profiler.print_summary()
+        profiler.disable()
+    return
 
 
-"""REPORT RESULTS IN OUTPUT FILES"""
-report.write_results_to_folder(
-    model, _scenario
-)
+if __name__ == "__main__":
+    main()
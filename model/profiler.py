@@ -0,0 +1,302 @@
+import contextlib
+import csv
+import json
+import logging
+import os
+import time
+import tracemalloc
+
+
+_ENABLED = False
+_MEMORY = False
+_START = None
+_RECORDS = []
+# OPEN MEASUREMENTS (STAGE, COMPONENT, START TIME, START MEMORY, PEAK MEMORY)
+_STACK = []
+# START OF THE CURRENT LAP PER STAGE (TIME, MEMORY)
+_LAPS = dict()
+# MEMORY AFTER THE PREVIOUS PYOMO COMPONENT (MEMORY PER COMPONENT = DIFFERENCE TO IT)
+_LAST_MEMORY = 0
+_TIMING_LOGGER = "pyomo.common.timing"
+MB = 1024 * 1024
+FIELDS = ["stage", "component", "parent", "start", "seconds", "memory_mb", "peak_mb", "count"]
+
+
+def _get_memory():
+    if not _MEMORY:
+        return 0, 0
+    return tracemalloc.get_traced_memory()
+
+
+def _add_record(stage, component, seconds, memory=None, peak=None, count=None):
+    _RECORDS.append(
+        {
+            "stage": stage,
+            "component": component,
+            "parent": "/".join("{}:{}".format(_frame[0], _frame[1]) for _frame in _STACK) or None,
+            "start": round(time.perf_counter() - _START - seconds, 6),
+            "seconds": seconds,
+            "memory_mb": None if memory is None else memory / MB,
+            "peak_mb": None if peak is None else peak / MB,
+            "count": count,
+        }
+    )
+
+
+class _TimingHandler(logging.Handler):
+    # PYOMO REPORTS THE CONSTRUCTION OF EACH COMPONENT (SET, PARAM, VAR, CONSTRAINT) AND THE WRITERS
+    def emit(self, record):
+        global _LAST_MEMORY
+        _timer = record.msg
+        _current, _ = _get_memory()
+        _memory = (_current - _LAST_MEMORY) if _MEMORY else None
+        _LAST_MEMORY = _current
+        _obj = getattr(_timer, "obj", None)
+        if record.name.endswith("construction") and _obj is not None:
+            _add_record(
+                "construct",
+                "{} {}".format(_obj.ctype.__name__, _obj.name),
+                float(_timer.timer),
+                memory=_memory,
+                count=len(_obj) if _obj.is_indexed() else 1,
+            )
+        elif record.name.endswith("writer"):
+            _seconds = _timer.timer[0] if isinstance(_timer.timer, tuple) else _timer.timer
+            _message = record.getMessage().split("]", 1)[-1].strip()
+            _add_record("write", _message, float(_seconds), memory=_memory)
+
+
+_HANDLER = _TimingHandler()
+
+
+def enable(memory=True):
+    """
+    Starts a new profile. From now on, the stages measured with measure or lap and the construction
+    of every Pyomo component (via the Pyomo timing logger) are recorded.
+
+    Parameters
+    ----------
+    memory : bool, optional
+        If True, the memory allocated by Python (incl. numpy) is traced with tracemalloc; this slows
+        down the model build. The default is True.
+
+    Returns
+    -------
+    None.
+
+    """
+    global _ENABLED, _MEMORY, _START, _LAST_MEMORY
+    _RECORDS.clear()
+    _STACK.clear()
+    _LAPS.clear()
+    _ENABLED = True
+    _MEMORY = memory
+    _START = time.perf_counter()
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _LAST_MEMORY, _ = _get_memory()
+    _logger = logging.getLogger(_TIMING_LOGGER)
+    _logger.setLevel(logging.INFO)
+    # THE RECORDS ARE NOT PRINTED BY THE PYOMO LOGGERS
+    _logger.propagate = False
+    _logger.addHandler(_HANDLER)
+    return
+
+
+def disable():
+    """
+    Stops recording (the records are kept until the next enable).
+
+    Returns
+    -------
+    None.
+
+    """
+    global _ENABLED
+    _ENABLED = False
+    _logger = logging.getLogger(_TIMING_LOGGER)
+    _logger.removeHandler(_HANDLER)
+    _logger.setLevel(logging.NOTSET)
+    _logger.propagate = True
+    if _MEMORY and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return
+
+
+def is_enabled():
+    return _ENABLED
+
+
+def traces_memory():
+    return _ENABLED and _MEMORY
+
+
+@contextlib.contextmanager
+def measure(stage=None, component=None):
+    """
+    Measures the time, the change of the allocated memory, and the peak memory of a block of code.
+    Measurements can be nested; the records of the inner blocks name the outer ones as parent.
+
+    Parameters
+    ----------
+    stage : String, required
+        Stage of the pipeline (e.g., read, build, solve, report). The default is None.
+    component : String, required
+        Component within the stage (e.g., the name of an input file). The default is None.
+
+    Yields
+    ------
+    None.
+
+    """
+    if not _ENABLED:
+        yield
+        return
+    _current, _ = _get_memory()
+    if _MEMORY:
+        tracemalloc.reset_peak()
+    _frame = [stage, component, time.perf_counter(), _current, _current]
+    _STACK.append(_frame)
+    try:
+        yield
+    finally:
+        _seconds = time.perf_counter() - _frame[2]
+        _end, _peak = _get_memory()
+        _peak = max(_frame[4], _peak)
+        _STACK.pop()
+        if _STACK:
+            # THE PEAK OF AN INNER BLOCK IS ALSO A PEAK OF THE OUTER ONE (RESET_PEAK ABOVE)
+            _STACK[-1][4] = max(_STACK[-1][4], _peak)
+        _add_record(
+            stage,
+            component,
+            _seconds,
+            memory=(_end - _frame[3]) if _MEMORY else None,
+            peak=(_peak - _frame[3]) if _MEMORY else None,
+        )
+    return
+
+
+def lap(stage=None, component=None):
+    """
+    Records the time and the change of the allocated memory since the previous lap of the stage (for
+    sequential sections of one function, e.g., the report sections).
+
+    Parameters
+    ----------
+    stage : String, required
+        Stage of the pipeline. The default is None.
+    component : String, optional
+        Section that ends with this lap. The default is None (the lap only starts the stage).
+
+    Returns
+    -------
+    None.
+
+    """
+    if not _ENABLED:
+        return
+    _now = time.perf_counter()
+    _current, _ = _get_memory()
+    if (component is not None) and (stage in _LAPS):
+        _start, _memory = _LAPS[stage]
+        _memory = (_current - _memory) if _MEMORY else None
+        _add_record(stage, component, _now - _start, memory=_memory)
+    _LAPS[stage] = (time.perf_counter(), _current)
+    return
+
+
+def get_records():
+    """
+    Returns
+    -------
+    List
+        Includes one dictionary (see FIELDS) per measured block, lap, or Pyomo component.
+
+    """
+    return list(_RECORDS)
+
+
+def add_records(records=None):
+    """
+    Adds records of another process (e.g., a worker of a batch) to the profile.
+
+    Parameters
+    ----------
+    records : List, required
+        Records of the other process (see get_records). The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    if _ENABLED and records:
+        _RECORDS.extend(records)
+    return
+
+
+def write_profile(path=None, records=None):
+    """
+    Writes the records to a JSON and a CSV file.
+
+    Parameters
+    ----------
+    path : String, required
+        Path of the profile without suffix (e.g., solution/profile-gg). The default is None.
+    records : List, optional
+        Records to write (see get_records). The default is None (all records).
+
+    Returns
+    -------
+    None.
+
+    """
+    _records = _RECORDS if records is None else records
+    _folder = os.path.dirname(path)
+    if _folder and not os.path.exists(_folder):
+        os.makedirs(_folder)
+    with open(path + ".json", "w", encoding="utf-8") as _file:
+        json.dump({"memory": _MEMORY, "records": _records}, _file, indent=1)
+    with open(path + ".csv", "w", encoding="utf-8", newline="") as _file:
+        _writer = csv.DictWriter(_file, fieldnames=FIELDS)
+        _writer.writeheader()
+        _writer.writerows(_records)
+    return
+
+
+def print_summary(records=None, top=25):
+    """
+    Prints the total time per stage and the slowest records (Pyomo components, blocks, and laps).
+
+    Parameters
+    ----------
+    records : List, optional
+        Records to summarize (see get_records). The default is None (all records).
+    top : int, optional
+        Number of records printed. The default is 25.
+
+    Returns
+    -------
+    None.
+
+    """
+    _records = _RECORDS if records is None else records
+    _stages = dict()
+    for _record in _records:
+        if _record["parent"] is None and _record["stage"] not in ("construct", "write"):
+            _stages[_record["stage"]] = _stages.get(_record["stage"], 0) + _record["seconds"]
+    print("Profile: seconds per stage")
+    for _stage, _seconds in sorted(_stages.items(), key=lambda _x: -_x[1]):
+        print("  {:>10.2f}  {}".format(_seconds, _stage))
+    print("Profile: {} slowest of {} records".format(min(top, len(_records)), len(_records)))
+    for _record in sorted(_records, key=lambda _x: -_x["seconds"])[:top]:
+        print(
+            "  {:>10.2f}  {:>10}  {:<10} {}".format(
+                _record["seconds"],
+                "" if _record["memory_mb"] is None else "{:+.1f} MB".format(_record["memory_mb"]),
+                _record["stage"],
+                _record["component"],
+            )
+        )
+    return
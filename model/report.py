@@ -1,8 +1,18 @@
+import collections
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import itertools
 import os
 import pandas as pd
 import numpy as np
 import pyomo.environ as py
+import profiler
+import utils
+
+
+IAMC_COLUMNS = ["model", "scenario", "region", "variable", "unit", "year", "value"]
+
+OUTPUT_FORMATS = ["xlsx", "csv", "parquet"]
 
 
 def write_IAMC(output_df, model, scenario, region, variable, unit, time, values):
@@ -36,45 +46,390 @@ def write_IAMC(output_df, model, scenario, region, variable, unit, time, values)
     return output_df
 
 
+def add_IAMC(records, model, scenario, region, variable, unit, time, values):
+    """
+    Appends IAMC records to a list (in contrast to write_IAMC, without copying the output collected
+    so far). The DataFrame is built once per output file by get_IAMC_frame.
+
+    Parameters
+    ----------
+    records : List, required
+        Includes the IAMC records (tuples) collected so far.
+    model, scenario, region, variable, unit, time : required
+        Entries of the IAMC columns. Scalars are repeated if values is a list.
+    values : float or List, required
+        Value (or list of values) of the record(s).
+
+    Returns
+    -------
+    None.
+
+    """
+    if isinstance(values, list):
+        _columns = [model, scenario, region, variable, unit, time]
+        _columns = [
+            _column if isinstance(_column, list) else [_column] * len(values)
+            for _column in _columns
+        ]
+        records.extend(zip(*_columns, values))
+    else:
+        records.append((model, scenario, region, variable, unit, time, values))
+    return
+
+
+def get_IAMC_frame(records=None):
+    """
+    Parameters
+    ----------
+    records : List, required
+        Includes the IAMC records collected by add_IAMC. The default is None.
+
+    Returns
+    -------
+    DataFrame
+        Includes one row per record and the IAMC columns.
+
+    """
+    return pd.DataFrame.from_records(records, columns=IAMC_COLUMNS)
+
+
+def get_component_values(component, *index, default=None):
+    """
+    Reads all values of an indexed variable or parameter in one pass (instead of one py.value call
+    per element).
+
+    Parameters
+    ----------
+    component : pyomo.Var or pyomo.Param, required
+        Indexed component (e.g., model.var_transported_tra).
+    *index : List, required
+        One list of index values per dimension, in the order of the component's index sets.
+    default : float, optional
+        Value of the indices that are not part of the component, e.g., the nodes that are not part of
+        a sparse node set (see utils.add_sparse_node_sets). The default is None (KeyError).
+
+    Returns
+    -------
+    numpy.ndarray
+        Values with one axis per index list (NaN if a variable has no value).
+
+    """
+    _values = component.extract_values()
+    _index = [list(_i) for _i in index]
+    _keys = itertools.product(*_index) if len(_index) > 1 else _index[0]
+    if default is not None:
+        _values = collections.defaultdict(lambda: default, _values)
+    return np.array(
+        [_values[_key] for _key in _keys], dtype=float
+    ).reshape([len(_i) for _i in _index])
+
+
+def get_transported_values(model, component, lines, years, months):
+    """
+    Flows per line, year, and month. The flows of the folded lines at the mid-pressure level (see
+    utils.add_network_reduction) are expanded from the net demand of the nodes behind them.
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the solved model instance.
+    component : pyomo.Var, required
+        Flow variable of the network level (e.g., model.var_transported_mid).
+    lines : List, required
+        Lines of the network level.
+    years : List, required
+        Dispatch years.
+    months : List, required
+        Time slices.
+
+    Returns
+    -------
+    numpy.ndarray
+        Flows per (line, year, month).
+
+    """
+    _folded = model.mid_reduction["lines"] if component is model.var_transported_mid else dict()
+    if not _folded:
+        return get_component_values(component, lines, years, months)
+    _values = np.zeros((len(lines), len(years), len(months)))
+    _flow = [_i for _i, _line in enumerate(lines) if _line not in _folded]
+    if _flow:
+        _values[_flow] = get_component_values(component, [lines[_i] for _i in _flow], years, months)
+    _nodes = list(model.set_node_mp)
+    _node_position = {_node: _i for _i, _node in enumerate(_nodes)}
+    _net = get_component_values(
+        model.var_demand_mid, _nodes, years, months, default=0
+    ) - get_component_values(model.var_source_mid, _nodes, years, months, default=0)
+    _hours = get_component_values(model.par_total_peak_factor, months)
+    for _i, _line in enumerate(lines):
+        if _line in _folded:
+            _sign, _behind = _folded[_line]
+            _values[_i] = (
+                _sign * _net[[_node_position[_node] for _node in _behind]].sum(axis=0) / _hours
+            )
+    return _values
+
+
+def get_exchange_mid_values(model, direction, nodes, years, months):
+    """
+    Export or import per mid-pressure node, year, and month (incl. the folded nodes, see
+    utils.add_network_reduction).
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the solved model instance.
+    direction : String, required
+        "export" or "import".
+    nodes : List, required
+        Nodes at the mid-pressure network level.
+    years : List, required
+        Dispatch years.
+    months : List, required
+        Time slices.
+
+    Returns
+    -------
+    numpy.ndarray
+        Export or import per (node, year, month).
+
+    """
+    _component = model.var_export_mid if direction == "export" else model.var_import_mid
+    _folded = set(model.mid_reduction["nodes"])
+    if _folded.isdisjoint(nodes):
+        return get_component_values(_component, nodes, years, months, default=0)
+    _values = np.zeros((len(nodes), len(years), len(months)))
+    for _i, _node in enumerate(nodes):
+        if _node in _folded:
+            _lines = list(
+                utils.get_lines_of_node(
+                    adjacency=model.mid_adjacency, node=_node, direction=direction
+                )
+            )
+            _values[_i] = get_transported_values(
+                model, model.var_transported_mid, _lines, years, months
+            ).sum(axis=0)
+        else:
+            _values[_i] = get_component_values(_component, [_node], years, months, default=0)[0]
+    return _values
+
+
 def get_values_from_model(variable, index=None):
     value = []
     # key = dict()
     if type(index) == list:
-        if len(index) == 2:
-            for i1 in index[0]:
-                for i2 in index[1]:
-                    value.append(np.around(py.value(variable[i1, i2]), 3))
-                    # key[(i1, i2)] = np.around(py.value(variable[i1, i2]), 3)
-        elif len(index) == 3:
-            for i1 in index[0]:
-                for i2 in index[1]:
-                    for i3 in index[2]:
-                        value.append(np.around(py.value(variable[i1, i2, i3]), 3))
-                        # key[(i1, i2, i3)] = np.around(py.value(variable[i1, i2, i3]), 3)
+        if len(index) in [2, 3]:
+            value = list(np.around(get_component_values(variable, *index).ravel(), 3))
     return value
 
 
-def write_results_to_folder(model=None, scenario=None):
+def get_line_records(lines, years, values):
+    """
+    Parameters
+    ----------
+    lines : List, required
+        Lines (or nodes) of the records.
+    years : List, required
+        Years (or months) of the records.
+    values : numpy.ndarray, required
+        Values per line (first axis) and year (second axis).
+
+    Returns
+    -------
+    Tuple
+        Regions, years, and values of the records as lists (line by line, year by year).
+
+    """
+    _lines = np.empty(len(lines), dtype=object)
+    _lines[:] = list(lines)
+    _regions = np.repeat(_lines, len(years)).tolist()
+    _years = np.tile(np.array(list(years), dtype=object), len(lines)).tolist()
+    _values = np.asarray(values, dtype=object).ravel().tolist()
+    return _regions, _years, _values
+
+
+def write_output_file(frame=None, path=None, name=None, output_format="xlsx"):
+    """
+    Parameters
+    ----------
+    frame : DataFrame, required
+        Includes the IAMC records of the output file. The default is None.
+    path : String, required
+        Output folder. The default is None.
+    name : String, required
+        Name of the output file without extension. The default is None.
+    output_format : String, optional
+        File format: "xlsx", "csv", or "parquet". The default is "xlsx".
+
+    Returns
+    -------
+    String
+        Path of the written file.
+
+    """
+    _file = os.path.join(path, "{}.{}".format(name, output_format))
+    if output_format == "xlsx":
+        frame.to_excel(_file, index=False)
+    elif output_format == "csv":
+        frame.to_csv(_file, index=False)
+    elif output_format == "parquet":
+        # PARQUET NEEDS ONE TYPE PER COLUMN (E.G., REGIONS ARE LINE NUMBERS OR NODE NAMES).
+        _frame = frame.astype({_column: str for _column in IAMC_COLUMNS[:-1]})
+        _frame["value"] = pd.to_numeric(_frame["value"], errors="coerce").astype(float)
+        _frame.to_parquet(_file, index=False)
+    else:
+        raise ValueError("Unknown output format: {}".format(output_format))
+    return _file
+
+
+def write_output_files(files=None, path=None, output_format="xlsx", workers=1):
+    """
+    Writes the output files concurrently in a thread pool. No processes are started: forked children
+    of a process that already ran a solver are not safe, and spawned ones need seconds to import the
+    model modules. Excel files gain little from the threads (openpyxl holds the GIL, only the
+    compression runs in parallel); csv and parquet files are written in parallel.
+
+    Parameters
+    ----------
+    files : Dict, required
+        Includes one DataFrame per output file name (without extension). The default is None.
+    path : String, required
+        Output folder. The default is None.
+    output_format : String, optional
+        File format: "xlsx", "csv", or "parquet". The default is "xlsx".
+    workers : int, optional
+        Number of parallel writers (at most one per file), e.g., the threads of the run (see
+        scenarios.run_scenario). The default is 1 (sequential).
+
+    Returns
+    -------
+    None.
+
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError("Unknown output format: {}".format(output_format))
+    _workers = min(len(files), workers or 1)
+    if _workers <= 1:
+        for _name, _frame in files.items():
+            write_output_file(_frame, path, _name, output_format)
+        return
+
+    with ThreadPoolExecutor(max_workers=_workers) as pool:
+        _futures = [
+            pool.submit(write_output_file, _frame, path, _name, output_format)
+            for _name, _frame in files.items()
+        ]
+        for _future in _futures:
+            _future.result()
+    return
+
+
+def write_results_to_folder(model=None, scenario=None, output_format="xlsx", workers=1):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the solved model instance. The default is None.
+    scenario : String, required
+        Name of the run used in the output folder and files. The default is None.
+    output_format : String, optional
+        File format of the output files: "xlsx", "csv", or "parquet". The default is "xlsx".
+    workers : int, optional
+        Number of parallel file writers (see write_output_files). The default is 1.
+
+    Returns
+    -------
+    path : String
+        Output folder.
+
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError("Unknown output format: {}".format(output_format))
+
     time = datetime.now().strftime("%Y%m%dT%H%M")
     path = os.path.join("solution", "{}-{}".format(scenario, time))
 
     if not os.path.exists(path):
         os.makedirs(path)
 
-    df_out = pd.DataFrame()
+    # OUTPUT FILES ARE COLLECTED FIRST AND WRITTEN TOGETHER AT THE END.
+    _files = dict()
+    profiler.lap("report")
+
     _scenario = scenario
     _model = model.name
+    _years = list(model.set_year)
+    _months = list(model.set_time_unit)
+    # HOURS PER TIME SLICE (720 HOURS PER MONTH)
+    _hours = get_component_values(model.par_total_peak_factor, _months)
+    _position = {_year: _i for _i, _year in enumerate(_years)}
+    # THE DISPATCH OF A YEAR IS REPORTED FROM ITS (CLOSEST) DISPATCH YEAR (SEE UTILS.GET_DISPATCH_YEAR)
+    _dispatch_years = list(model.set_dispatch_year)
+    _dispatch_year = {_year: utils.get_dispatch_year(model=model, year=_year) for _year in _years}
+    _dispatch_position = {
+        _year: _dispatch_years.index(_dispatch_year[_year]) for _year in _years
+    }
+
+    # ALL VALUES OF THE DECISION VARIABLES USED IN THE REPORT ARE EXTRACTED ONCE.
+    _levels = []
+    for _name, _lines, _transported, _capacity, _length, _pi, _year_of_inv in [
+        (
+            "Transmission",
+            list(model.set_line_tra),
+            model.var_transported_tra,
+            model.var_gamma_tra_line,
+            model.par_tra_length,
+            model.var_pi_tra_line_inv,
+            model.par_year_of_inv_tra,
+        ),
+        (
+            "High-Pressure",
+            list(model.set_line_high),
+            model.var_transported_high,
+            model.var_gamma_high_line,
+            model.par_high_length,
+            model.var_pi_high_line_inv,
+            model.par_year_of_inv_hp,
+        ),
+        (
+            "Mid-Pressure",
+            list(model.set_line_mid),
+            model.var_transported_mid,
+            model.var_gamma_mid_line,
+            model.par_mid_length,
+            model.var_pi_mid_line_inv,
+            model.par_year_of_inv_mp,
+        ),
+    ]:
+        _levels.append(
+            {
+                "name": _name,
+                "lines": _lines,
+                # (LINE, YEAR, MONTH)
+                "transported": get_transported_values(
+                    model, _transported, _lines, _dispatch_years, _months
+                ),
+                # (LINE, YEAR)
+                "capacity": get_component_values(_capacity, _years, _lines).T,
+                "length": get_component_values(_length, _lines),
+                "pi": get_component_values(_pi, _lines),
+                "year_of_inv": [_year_of_inv[_l] for _l in _lines],
+            }
+        )
+    _tra = _levels[0]
+
+    df_out = []
     # (1) ZIELFUNKTIONSWERT; (2) KALKULATORISCHE ZINSEN; (3) LAUFENDE KOSTEN; (4) BUCHWERT; (5) INVESTITIONEN
     _value = np.around(py.value(model.objective), 0)
-    df_out = write_IAMC(
+    add_IAMC(
         df_out, _model, _scenario, "Österreich", "NPV", "EUR", "2025", _value
     )
 
-    for year in model.set_year:
-        _capital = np.around(model.var_capex[year](), 1)
-        _opex = np.around(model.var_opex[year](), 1)
-        _buchwert = np.around(model.var_pi[year](), 1)
-        df_out = write_IAMC(
+    _capital = np.around(get_component_values(model.var_capex, _years), 1)
+    _opex = np.around(get_component_values(model.var_opex, _years), 1)
+    _buchwert = np.around(get_component_values(model.var_pi, _years), 1)
+    for _i, year in enumerate(_years):
+        add_IAMC(
             df_out,
             _model,
             _scenario,
@@ -82,9 +437,9 @@ def write_results_to_folder(model=None, scenario=None):
             "Kapitalkosten (Buchwerte x WACC)",
             "EUR",
             year,
-            _capital,
+            _capital[_i],
         )
-        df_out = write_IAMC(
+        add_IAMC(
             df_out,
             _model,
             _scenario,
@@ -92,9 +447,9 @@ def write_results_to_folder(model=None, scenario=None):
             "Opex (Fixkosten)",
             "EUR",
             year,
-            _opex,
+            _opex[_i],
         )
-        df_out = write_IAMC(
+        add_IAMC(
             df_out,
             _model,
             _scenario,
@@ -102,596 +457,311 @@ def write_results_to_folder(model=None, scenario=None):
             "Buchwert (Gesamt)",
             "EUR",
             year,
-            _buchwert,
+            _buchwert[_i],
         )
-    for _l in model.set_line_tra:
-        _y = model.par_year_of_inv_tra[_l]
-        _value = model.var_pi_tra_line_inv[_l]()
-        df_out = write_IAMC(
+    for _level in _levels:
+        add_IAMC(
             df_out,
             _model,
             _scenario,
-            _l,
-            "Transmission|Investitionskosten",
+            _level["lines"],
+            _level["name"] + "|Investitionskosten",
             "EUR",
-            _y,
-            _value,
+            _level["year_of_inv"],
+            _level["pi"].tolist(),
         )
-    for _l in model.set_line_high:
-        _y = model.par_year_of_inv_hp[_l]
-        _value = model.var_pi_high_line_inv[_l]()
-        df_out = write_IAMC(
-            df_out,
-            _model,
-            _scenario,
-            _l,
-            "High-Pressure|Investitionskosten",
-            "EUR",
-            _y,
-            _value,
-        )
-    for _l in model.set_line_mid:
-        _y = model.par_year_of_inv_mp[_l]
-        _value = model.var_pi_mid_line_inv[_l]()
-        df_out = write_IAMC(
-            df_out,
-            _model,
-            _scenario,
-            _l,
-            "Mid-Pressure|Investitionskosten",
-            "EUR",
-            _y,
-            _value,
-        )
-    df_out.to_excel(os.path.join(path, "Values.xlsx"), index=False)
+    _files["Values"] = get_IAMC_frame(df_out)
+    profiler.lap("report", "Values")
     #
     #
     #
     #
     # DISPATCH VON DREI REPRÄSENTATIVEN GEMEINDEN: (1) TIMELKAM; (2) DESSELBRUNN; (3) GAMPERN
-    output_iamc = pd.DataFrame()
+    output_iamc = []
     _region = ["Hohenberg", "Lilienfeld"]
     year = [2040]
-    for _re in _region:
-        for _y in year:
-            for _m in model.set_time_unit:
-                _demand = model.var_demand_mid[_re, _y, _m]()
-                output_iamc = write_IAMC(
-                    output_iamc,
-                    _model,
-                    _y,
-                    _re,
-                    "METHANE|DEMAND SUPPLIED",
-                    "MWh",
-                    _m,
-                    _demand,
-                )
-                _not_supplied = model.var_demand_not_supplied_mid[_re, _y, _m]()
-                output_iamc = write_IAMC(
-                    output_iamc,
-                    _model,
-                    _y,
-                    _re,
-                    "METHANE|DEMAND NOT SUPPLIED",
-                    "MWh",
-                    _m,
-                    _not_supplied,
-                )
-                source = model.var_source_mid[_re, _y, _m]()
-                output_iamc = write_IAMC(
-                    output_iamc,
-                    _model,
-                    _y,
-                    _re,
-                    "METHANE|SOURCE|LOCAL|USED",
-                    "MWh",
-                    _m,
-                    source,
-                )
-                var_import = (
-                    model.var_import_mid[_re, _y, _m]()
-                    * model.par_total_peak_factor[_m]
-                )
-                output_iamc = write_IAMC(
-                    output_iamc,
-                    _model,
-                    _y,
-                    _re,
-                    "METHANE|IMPORT",
-                    "MWh",
-                    _m,
-                    var_import,
-                )
-                var_export = (
-                    model.var_export_mid[_re, _y, _m]()
-                    * model.par_total_peak_factor[_m]
-                )
-                output_iamc = write_IAMC(
-                    output_iamc,
-                    _model,
-                    _y,
-                    _re,
-                    "METHANE|EXPORT",
-                    "MWh",
-                    _m,
-                    var_export,
-                )
-    output_iamc.to_excel(
-        os.path.join(path, "Dispatch_from_Mid_Node_Hohenberg.xlsx"), index=False
-    )
+    _year_dispatch = [_dispatch_year[_y] for _y in year]
+    _peak = get_component_values(model.par_total_peak_factor, _months)
+    _dispatch = [
+        (
+            "METHANE|DEMAND SUPPLIED",
+            get_component_values(model.var_demand_mid, _region, _year_dispatch, _months, default=0),
+        ),
+        (
+            "METHANE|DEMAND NOT SUPPLIED",
+            get_component_values(
+                model.var_demand_not_supplied_mid, _region, _year_dispatch, _months, default=0
+            ),
+        ),
+        (
+            "METHANE|SOURCE|LOCAL|USED",
+            get_component_values(model.var_source_mid, _region, _year_dispatch, _months, default=0),
+        ),
+        (
+            "METHANE|IMPORT",
+            get_exchange_mid_values(model, "import", _region, _year_dispatch, _months) * _peak,
+        ),
+        (
+            "METHANE|EXPORT",
+            get_exchange_mid_values(model, "export", _region, _year_dispatch, _months) * _peak,
+        ),
+    ]
+    for _r, _re in enumerate(_region):
+        for _i, _y in enumerate(year):
+            for _t, _m in enumerate(_months):
+                for _variable, _values in _dispatch:
+                    add_IAMC(
+                        output_iamc,
+                        _model,
+                        _y,
+                        _re,
+                        _variable,
+                        "MWh",
+                        _m,
+                        _values[_r, _i, _t],
+                    )
+    _files["Dispatch_from_Mid_Node_Hohenberg"] = get_IAMC_frame(output_iamc)
+    profiler.lap("report", "Dispatch_from_Mid_Node_Hohenberg")
     #
     #
     #
     #
     # MAX. TRANSPORT CAPACITY PER TRANSMISSION, HIGH-, AND MID-PRESSURE NETWORK LEVEL
     """WRITE LINE CAPACITIES TO IAMC FORMAT"""
-    df_out = pd.DataFrame()
-    for tline in model.set_line_tra:
-        for year in model.set_year:
-            df_out = write_IAMC(
-                df_out,
-                _model,
-                _scenario,
-                tline,
-                "Transmission|Pipeline capacity",
-                "MW",
-                year,
-                py.value(model.var_gamma_tra_line[year, tline]),
-            )
-    for hline in model.set_line_high:
-        for year in model.set_year:
-            df_out = write_IAMC(
-                df_out,
-                _model,
-                _scenario,
-                hline,
-                "High-Pressure|Pipeline capacity",
-                "MW",
-                year,
-                py.value(model.var_gamma_high_line[year, hline]),
-            )
-    for mline in model.set_line_mid:
-        for year in model.set_year:
-            df_out = write_IAMC(
-                df_out,
-                _model,
-                _scenario,
-                mline,
-                "Mid-Pressure|Pipeline capacity",
-                "MW",
-                year,
-                py.value(model.var_gamma_mid_line[year, mline]),
-            )
-    df_out.to_excel(os.path.join(path, "Pipelines_Capacity.xlsx"), index=False)
-
-    # # LEITUNGSLÄNGEN
-    # _out = pd.DataFrame()
-    # for tline in model.set_line_tra:
-    #     _out = write_IAMC(
-    #         _out,
-    #         _model,
-    #         _scenario,
-    #         tline,
-    #         "Transmission|Line length",
-    #         "Km",
-    #         2025,
-    #         model.par_tra_length[tline],
-    #     )
-    #
-    # for high_line in model.set_line_high:
-    #     _out = write_IAMC(
-    #         _out,
-    #         _model,
-    #         _scenario,
-    #         high_line,
-    #         "High-Pressure|Line length",
-    #         "Km",
-    #         2025,
-    #         model.par_high_length[high_line],
-    #     )
-    #
-    # for mid_line in model.set_line_mid:
-    #     _out = write_IAMC(
-    #         _out,
-    #         _model,
-    #         _scenario,
-    #         mid_line,
-    #         "Mid-Pressure|Line length",
-    #         "Km",
-    #         2025,
-    #         model.par_mid_length[mid_line],
-    #     )
-    #
-    # _out.to_excel(os.path.join(path, "PAR_LINELENGTH_in_KM.xlsx"), index=False)
+    df_out = []
+    for _level in _levels:
+        _regions, _time, _values = get_line_records(
+            _level["lines"], _years, _level["capacity"]
+        )
+        add_IAMC(
+            df_out,
+            _model,
+            _scenario,
+            _regions,
+            _level["name"] + "|Pipeline capacity",
+            "MW",
+            _time,
+            _values,
+        )
+    _files["Pipelines_Capacity"] = get_IAMC_frame(df_out)
+    profiler.lap("report", "Pipelines_Capacity")
 
     # BENCHMARKING OF THE WHOLE METHANE NETWORK (i.e., Gesamtnetz)
-    _out = pd.DataFrame()
+    # THE GWhkm ARE ACCUMULATED OVER LINES AND MONTHS; ONE RECORD PER LINE AND MONTH (RUNNING TOTAL).
+    _out = []
     for _year in [2030, 2035, 2040]:
-        _GWxhxkm_tra = 0
-        for tline in model.set_line_tra:
-            for month in model.set_time_unit:
-                _val = py.value(model.var_transported_tra[tline, _year, month])
-                _GWxhxkm_tra += np.absolute(_val) * model.par_tra_length[tline] * 720
-                _out = write_IAMC(
-                    _out,
-                    _model,
-                    _scenario,
-                    tline,
-                    "Transmission|GWhkm",
-                    "GW*h*km",
-                    _year,
-                    np.round(_GWxhxkm_tra / 1000, 0),
-                )
-        _GWxhxkm_high = 0
-        for hline in model.set_line_high:
-            for month in model.set_time_unit:
-                _val = py.value(model.var_transported_high[hline, _year, month])
-                _GWxhxkm_high += np.absolute(_val) * model.par_high_length[hline] * 720
-                _out = write_IAMC(
-                    _out,
-                    _model,
-                    _scenario,
-                    hline,
-                    "High-Pressure|GWhkm",
-                    "GW*h*km",
-                    _year,
-                    np.round(_GWxhxkm_high / 1000, 0),
-                )
-        _GWxhxkm_mid = 0
-        for mline in model.set_line_mid:
-            for month in model.set_time_unit:
-                _val = py.value(model.var_transported_mid[mline, _year, month])
-                _GWxhxkm_mid += np.absolute(_val) * model.par_mid_length[mline] * 720
-                _out = write_IAMC(
-                    _out,
-                    _model,
-                    _scenario,
-                    mline,
-                    "Mid-Pressure|GWhkm",
-                    "GW*h*km",
-                    _year,
-                    np.round(_GWxhxkm_mid / 1000, 0),
-                )
-    _out.to_excel(os.path.join(path, "Whole_Network_GWhkm.xlsx"), index=False)
-
-    # UTILIZATION RATE OF METHANE PIPELINES
-    _out = pd.DataFrame()
-    for _year in [2030, 2035, 2040]:
-        for t_line in model.set_line_tra:
-            full_value = py.value(model.var_gamma_tra_line[_year, t_line]) * 720 * 12
-            if full_value > 0:
-                _used = 0
-                for month in model.set_time_unit:
-                    _val = py.value(model.var_transported_tra[t_line, _year, month])
-                    _used += np.absolute(_val) * 720
-                _rate = np.round((_used / full_value) * 100, 1)
-            else:
-                _rate = None
-            _out = write_IAMC(
-                _out,
-                _model,
-                _scenario,
-                t_line,
-                "Transmission|Pipeline|Utilization",
-                "%",
-                _year,
-                _rate,
+        for _level in _levels:
+            _val = _level["transported"][:, _dispatch_position[_year], :]
+            _GWxhxkm = np.cumsum(
+                (np.absolute(_val) * _level["length"][:, np.newaxis] * _hours).ravel()
             )
-
-        for h_line in model.set_line_high:
-            full_value = py.value(model.var_gamma_high_line[_year, h_line]) * 720 * 12
-            if full_value > 0:
-                _used = 0
-                for month in model.set_time_unit:
-                    _val = py.value(model.var_transported_high[h_line, _year, month])
-                    _used += np.absolute(_val) * 720
-                _rate = np.round((_used / full_value) * 100, 1)
-            else:
-                _rate = None
-            _out = write_IAMC(
+            _regions, _time, _values = get_line_records(
+                _level["lines"], _months, np.round(_GWxhxkm / 1000, 0)
+            )
+            add_IAMC(
                 _out,
                 _model,
                 _scenario,
-                h_line,
-                "High-Pressure|Pipeline|Utilization",
-                "%",
+                _regions,
+                _level["name"] + "|GWhkm",
+                "GW*h*km",
                 _year,
-                _rate,
+                _values,
             )
+    _files["Whole_Network_GWhkm"] = get_IAMC_frame(_out)
+    profiler.lap("report", "Whole_Network_GWhkm")
 
-        for m_line in model.set_line_mid:
-            full_value = py.value(model.var_gamma_mid_line[_year, m_line]) * 720 * 12
-            if full_value > 0:
-                _used = 0
-                for month in model.set_time_unit:
-                    _val = py.value(model.var_transported_mid[m_line, _year, month])
-                    _used += np.absolute(_val) * 720
+    # UTILIZATION RATE OF METHANE PIPELINES
+    _out = []
+    for _year in [2030, 2035, 2040]:
+        for _level in _levels:
+            full_value = _level["capacity"][:, _position[_year]] * _hours.sum()
+            _used = (np.absolute(_level["transported"][:, _dispatch_position[_year], :]) * _hours).sum(
+                axis=1
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
                 _rate = np.round((_used / full_value) * 100, 1)
-            else:
-                _rate = None
-            _out = write_IAMC(
+            add_IAMC(
                 _out,
                 _model,
                 _scenario,
-                m_line,
-                "Mid-Pressure|Pipeline|Utilization",
+                _level["lines"],
+                _level["name"] + "|Pipeline|Utilization",
                 "%",
                 _year,
-                _rate,
+                [_r if _f > 0 else None for _r, _f in zip(_rate.tolist(), full_value)],
             )
-    _out.to_excel(
-        os.path.join(path, "Utilization_in_percent_per_year.xlsx"), index=False
-    )
+    _files["Utilization_in_percent_per_year"] = get_IAMC_frame(_out)
+    profiler.lap("report", "Utilization_in_percent_per_year")
 
     # Auslastung der Fernleitung auf Basis der Jahresdauerlinie
     for _year in [2030, 2035, 2040]:
-        _out = pd.DataFrame()
-        for t_line in model.set_line_tra:
-            full_value = py.value(model.var_gamma_tra_line[_year, t_line]) * 720
-            for month in model.set_time_unit:
-                if full_value > 0:
-                    _val = np.absolute(
-                        py.value(model.var_transported_tra[t_line, _year, month]) * 720
-                    )
-                    _rate = np.round((_val / full_value) * 100, 1)
-                else:
-                    _rate = None
-
-                _out = write_IAMC(
-                    _out,
-                    _model,
-                    _scenario,
-                    t_line,
-                    "Transmission|Pipeline|Utilization",
-                    "%",
-                    month,
-                    _rate,
-                )
-
-        _string = "720h_Blocks_Transmission_" + str(_year) + ".xlsx"
-        _out.to_excel(os.path.join(path, _string), index=False)
-
-    """WRITE MAXIMUM DISPATCH CAPACITY TO IAMC FORMAT"""
-    _out = pd.DataFrame()
-    for tline in model.set_line_tra:
-        _max = 0
-        for month in model.set_time_unit:
-            _val = py.value(model.var_transported_tra[tline, 2025, month])
-            if np.absolute(_val) > _max:
-                _max = np.absolute(_val)
-        _out = write_IAMC(
+        _out = []
+        full_value = _tra["capacity"][:, _position[_year]][:, np.newaxis] * _hours
+        _val = np.absolute(_tra["transported"][:, _dispatch_position[_year], :] * _hours)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            _rate = np.round((_val / full_value) * 100, 1)
+        _rate = np.where(full_value > 0, _rate.astype(object), None)
+        _regions, _time, _values = get_line_records(_tra["lines"], _months, _rate)
+        add_IAMC(
             _out,
             _model,
             _scenario,
-            tline,
-            "Transmission|Pipeline capacity|Max",
-            "MW",
-            2025,
-            _max,
+            _regions,
+            "Transmission|Pipeline|Utilization",
+            "%",
+            _time,
+            _values,
         )
 
-    for hline in model.set_line_high:
-        _max = 0
-        for month in model.set_time_unit:
-            _val = py.value(model.var_transported_high[hline, 2025, month])
-            if np.absolute(_val) > _max:
-                _max = np.absolute(_val)
-        _out = write_IAMC(
-            _out,
-            _model,
-            _scenario,
-            hline,
-            "High-Pressure|Pipeline capacity|Max",
-            "MW",
-            2025,
-            _max,
-        )
+        _string = "720h_Blocks_Transmission_" + str(_year)
+        _files[_string] = get_IAMC_frame(_out)
+        profiler.lap("report", _string)
 
-    for mline in model.set_line_mid:
-        _max = 0
-        for month in model.set_time_unit:
-            _val = py.value(model.var_transported_mid[mline, 2025, month])
-            if np.absolute(_val) > _max:
-                _max = np.absolute(_val)
-        _out = write_IAMC(
+    """WRITE MAXIMUM DISPATCH CAPACITY TO IAMC FORMAT"""
+    _out = []
+    for _level in _levels:
+        _max = np.absolute(_level["transported"][:, _dispatch_position[2025], :]).max(axis=1)
+        add_IAMC(
             _out,
             _model,
             _scenario,
-            mline,
-            "Mid-Pressure|Pipeline capacity|Max",
+            _level["lines"],
+            _level["name"] + "|Pipeline capacity|Max",
             "MW",
             2025,
-            _max,
+            _max.tolist(),
         )
-    _out.to_excel(os.path.join(path, "InitCapacities2025.xlsx"), index=False)
+    _files["InitCapacities2025"] = get_IAMC_frame(_out)
+    profiler.lap("report", "InitCapacities2025")
 
     #
     #
     #
     #
 
-    _out = pd.DataFrame()
-    for year in [2025, 2030, 2035, 2040, 2045]:
-        for node in model.set_node_hp:
-            _yearly = sum(
-                py.value(model.var_demand_not_supplied_high[node, year, month])
-                for month in model.set_time_unit
-            )
-            _out = write_IAMC(
-                _out,
-                _model,
-                _scenario,
-                node,
-                "High-Pressure|Not Supplied|Per Year",
-                "MWh",
-                year,
-                _yearly,
-            )
-        for node in model.set_node_mp:
-            _value = sum(
-                py.value(model.var_demand_not_supplied_mid[node, year, month])
-                for month in model.set_time_unit
-            )
-            _out = write_IAMC(
-                _out,
-                _model,
-                _scenario,
-                node,
-                "Mid-Pressure|Not Supplied|Per Year",
-                "MWh",
-                year,
-                _value,
-            )
-    _out.to_excel(
-        os.path.join(path, "methane_demand_not_supplied.xlsx"), index=False
-    )
+    _out = []
+    _report_years = [2025, 2030, 2035, 2040, 2045]
+    _report_dispatch = [_dispatch_year[_year] for _year in _report_years]
+    _nodes_hp = list(model.set_node_hp)
+    _nodes_mp = list(model.set_node_mp)
+    _not_supplied_high = get_component_values(
+        model.var_demand_not_supplied_high, _nodes_hp, _report_dispatch, _months, default=0
+    ).sum(axis=2)
+    _not_supplied_mid = get_component_values(
+        model.var_demand_not_supplied_mid, _nodes_mp, _report_dispatch, _months, default=0
+    ).sum(axis=2)
+    for _i, year in enumerate(_report_years):
+        add_IAMC(
+            _out,
+            _model,
+            _scenario,
+            _nodes_hp,
+            "High-Pressure|Not Supplied|Per Year",
+            "MWh",
+            year,
+            _not_supplied_high[:, _i].tolist(),
+        )
+        add_IAMC(
+            _out,
+            _model,
+            _scenario,
+            _nodes_mp,
+            "Mid-Pressure|Not Supplied|Per Year",
+            "MWh",
+            year,
+            _not_supplied_mid[:, _i].tolist(),
+        )
+    _files["methane_demand_not_supplied"] = get_IAMC_frame(_out)
+    profiler.lap("report", "methane_demand_not_supplied")
 
     """Obtain available capacities of methane network for hydrogen transportation."""
-    _out = pd.DataFrame()
-    for _lines, _variable, _name, _cap in [
-        (
-            model.set_line_tra,
-            model.var_transported_tra,
-            "Transmission|Capacity|Hydrogen",
-            model.var_gamma_tra_line,
-        ),
-        (
-            model.set_line_high,
-            model.var_transported_high,
-            "High-Pressure|Capacity|Hydrogen",
-            model.var_gamma_high_line,
-        ),
-        (
-            model.set_line_mid,
-            model.var_transported_mid,
-            "Mid-Pressure|Capacity|Hydrogen",
-            model.var_gamma_mid_line,
-        ),
-    ]:
+    _out = []
+    for _level in _levels:
         for _y in [2030, 2035, 2040]:
-            for _line in _lines:
-                _max = 0
-                for _month in model.set_time_unit:
-                    _val = py.value(_variable[_line, _y, _month])
-                    if np.absolute(_val) > _max:
-                        _max = np.absolute(_val)
-                _capacity = py.value(_cap[2025, _line])
-                _out = write_IAMC(
-                    _out, _model, _scenario, _line, _name, "MW", _y, _capacity - _max
-                )
-    _out.to_excel(
-        os.path.join(path, "Available_Hydrogen_Capacities_2030_35_40.xlsx"), index=False
-    )
-
-    """INDICATE PIPELINES THAT EXIST BUT ARE NOT USED ANYMORE!"""
-    """WRITE MAXIMUM DISPATCH CAPACITY TO IAMC FORMAT"""
-    _out = pd.DataFrame()
-    for year in [2030, 2031, 2032, 2033, 2034, 2035, 2036, 2037, 2038, 2039, 2040]:
-        for tline in model.set_line_tra:
-            _max = 0
-            for month in model.set_time_unit:
-                _val = py.value(model.var_transported_tra[tline, year, month])
-                if np.absolute(_val) > _max:
-                    _max = np.absolute(_val)
-            _out = write_IAMC(
+            _max = np.absolute(_level["transported"][:, _dispatch_position[_y], :]).max(axis=1)
+            _capacity = _level["capacity"][:, _position[2025]]
+            add_IAMC(
                 _out,
                 _model,
                 _scenario,
-                tline,
-                "Transmission|Methane Transported|Max",
+                _level["lines"],
+                _level["name"] + "|Capacity|Hydrogen",
                 "MW",
-                year,
-                _max,
+                _y,
+                (_capacity - _max).tolist(),
             )
+    _files["Available_Hydrogen_Capacities_2030_35_40"] = get_IAMC_frame(_out)
+    profiler.lap("report", "Available_Hydrogen_Capacities_2030_35_40")
 
-        for hline in model.set_line_high:
-            _max = 0
-            for month in model.set_time_unit:
-                _val = py.value(model.var_transported_high[hline, year, month])
-                if np.absolute(_val) > _max:
-                    _max = np.absolute(_val)
-            _out = write_IAMC(
-                _out,
-                _model,
-                _scenario,
-                hline,
-                "High-Pressure|Methane Transported|Max",
-                "MW",
-                year,
-                _max,
-            )
-
-        for mline in model.set_line_mid:
-            _max = 0
-            for month in model.set_time_unit:
-                _val = py.value(model.var_transported_mid[mline, year, month])
-                if np.absolute(_val) > _max:
-                    _max = np.absolute(_val)
-            _out = write_IAMC(
+    """INDICATE PIPELINES THAT EXIST BUT ARE NOT USED ANYMORE!"""
+    """WRITE MAXIMUM DISPATCH CAPACITY TO IAMC FORMAT"""
+    _out = []
+    for year in [2030, 2031, 2032, 2033, 2034, 2035, 2036, 2037, 2038, 2039, 2040]:
+        for _level in _levels:
+            _max = np.absolute(_level["transported"][:, _dispatch_position[year], :]).max(axis=1)
+            add_IAMC(
                 _out,
                 _model,
                 _scenario,
-                mline,
-                "Mid-Pressure|Methane Transported|Max",
+                _level["lines"],
+                _level["name"] + "|Methane Transported|Max",
                 "MW",
                 year,
-                _max,
+                _max.tolist(),
             )
-    _out.to_excel(os.path.join(path, "methane_transported_max.xlsx"), index=False)
+    _files["methane_transported_max"] = get_IAMC_frame(_out)
+    profiler.lap("report", "methane_transported_max")
 
     '''SOURCE-RELATED VALUE OF LOST LOAD TO OUTPUT FILE'''
-    _out = pd.DataFrame()
-    for year in [2025, 2030, 2035, 2040, 2045]:
-        for node in model.set_node_hp:
-            _source_per_year_var = sum(
-                py.value(model.var_source_high[node, year, month])
-                for month in model.set_time_unit
-            )
-            _source_per_year_par = model.par_source_hp[node, year]
-            _not_used_source = _source_per_year_par - _source_per_year_var
-            _out = write_IAMC(
-                _out,
-                _model,
-                _scenario,
-                node,
-                "High-Pressure|Methane|Source|Not Used",
-                "MWh",
-                year,
-                _not_used_source
-            )
-        for node in model.set_node_mp:
-            _source_per_year_var = sum(
-                py.value(model.var_source_mid[node, year, month])
-                for month in model.set_time_unit
-            )
-            _source_per_year_par = model.par_source_mp[node, year]
-            _not_used_source = _source_per_year_par - _source_per_year_var
-            _out = write_IAMC(
-                _out,
-                _model,
-                _scenario,
-                node,
-                "Mid-Pressure|Methane|Source|Not Used",
-                "MWh",
-                year,
-                _not_used_source
-            )
+    _out = []
+    _not_used_high = get_component_values(
+        model.par_source_hp, _nodes_hp, _report_dispatch
+    ) - get_component_values(
+        model.var_source_high, _nodes_hp, _report_dispatch, _months, default=0
+    ).sum(axis=2)
+    _not_used_mid = get_component_values(
+        model.par_source_mp, _nodes_mp, _report_dispatch
+    ) - get_component_values(
+        model.var_source_mid, _nodes_mp, _report_dispatch, _months, default=0
+    ).sum(axis=2)
+    for _i, year in enumerate(_report_years):
+        add_IAMC(
+            _out,
+            _model,
+            _scenario,
+            _nodes_hp,
+            "High-Pressure|Methane|Source|Not Used",
+            "MWh",
+            year,
+            _not_used_high[:, _i].tolist(),
+        )
+        add_IAMC(
+            _out,
+            _model,
+            _scenario,
+            _nodes_mp,
+            "Mid-Pressure|Methane|Source|Not Used",
+            "MWh",
+            year,
+            _not_used_mid[:, _i].tolist(),
+        )
 
-    _out.to_excel(
-        os.path.join(path, "methane_source_not_used.xlsx"), index=False
-    )
+    _files["methane_source_not_used"] = get_IAMC_frame(_out)
+    profiler.lap("report", "methane_source_not_used")
 
     # RE-COMPRESSION (2040)
-    _out = pd.DataFrame()
+    _out = []
     _year = 2040
-    for node in model.set_delivery_hp_mp:
-        _max = 0
-        for month in model.set_time_unit:
-            _value = py.value(model.var_del_high_mid[node, _year, month])
-            if _value < _max:
-                _max = _value
-        if _max != 0:
-            _out = write_IAMC(
+    _nodes = list(model.set_delivery_hp_mp)
+    _delivery = get_component_values(
+        model.var_del_high_mid, _nodes, [_dispatch_year[_year]], _months
+    )[:, 0, :]
+    # MOST NEGATIVE DELIVERY PER NODE (ONLY NODES WITH A NEGATIVE DELIVERY ARE REPORTED)
+    _max = _delivery.min(axis=1, initial=0)
+    for node, _value in zip(_nodes, _max.tolist()):
+        if _value != 0:
+            add_IAMC(
                 _out,
                 _model,
                 _scenario,
@@ -699,20 +769,11 @@ def write_results_to_folder(model=None, scenario=None):
                 "RE-COMPRESSION|MID-PRESSURE",
                 "MWh",
                 _year,
-                _max
+                _value
             )
-        else:
-            pass
-
-    _sum = 0
-    for node in model.set_delivery_hp_mp:
-        for month in model.set_time_unit:
-            _value = py.value(model.var_del_high_mid[node, _year, month])
-            if _value < 0:
-                _sum += _value
-            else:
-                pass
-    _out = write_IAMC(
+
+    _sum = _delivery[_delivery < 0].sum()
+    add_IAMC(
         _out,
         _model,
         _scenario,
@@ -723,6 +784,11 @@ def write_results_to_folder(model=None, scenario=None):
         _sum
     )
 
-    _out.to_excel(os.path.join(path, "max_recompression_per_month_in_2040_in_MWh.xlsx"), index=False)
+    _files["max_recompression_per_month_in_2040_in_MWh"] = get_IAMC_frame(_out)
+    profiler.lap("report", "max_recompression_per_month_in_2040_in_MWh")
 
-    return
+    with profiler.measure("report", "write_output_files"):
+        write_output_files(
+            files=_files, path=path, output_format=output_format, workers=workers
+        )
+    return path
@@ -0,0 +1,873 @@
+from pathlib import Path
+import datetime
+import traceback
+import pyomo.environ as py
+import cache
+import utils
+import constraints
+import decomposition
+import incremental
+import matrix
+import profiler
+import report
+import solvers
+import warmstart
+import writer
+
+
+SCENARIOS = {
+    1: "gg",
+    2: "gm",
+    3: "dgg",
+    4: "elek",
+}
+
+SCENARIO_NAMES = {
+    "gg": "Grüne Gase",
+    "gm": "Grünes Methan",
+    "dgg": "Dezentrale Grüne Gase",
+    "elek": "Elektrifizierung",
+}
+
+BUILDERS = ["pyomo", "matrix"]
+
+# SHAPEFILE FOLDERS (NETWORK LEVELS) AND EXCEL INPUT FILES PER INPUT TABLE ({} IS THE SCENARIO TAG)
+NETWORK_LEVELS = ["transmission", "high", "mid"]
+SHARED_FILES = {
+    "pipeline_economic": "INPUT_Pipelines_Economic.xlsx",
+    "pipeline_technical": "INPUT_Pipelines_Technical_NEW_v2.xlsx",
+    "refurbishment": "INPUT_Refurbishment.xlsx",
+    "source": "INPUT_Source.xlsx",
+    "storage": "INPUT_Storage_Technical.xlsx",
+    "temporal_demand": "INPUT_Time_Resolution.xlsx",
+    "prices": "INPUT_Prices.xlsx",
+    "value_of_lost_load": "INPUT_Value_of_Lost_Load.xlsx",
+}
+SCENARIO_FILES = {
+    "demand": "DEMAND_methane_MODELRUN_{}.xlsx",
+    "demand_tra": "TRANSIT_export_{}.xlsx",
+    # CHANGES IN THE CODE FOR "GAS-STUDIE-2040"
+    "generation": "SOURCE_methane_MODELRUN_FINAL{}.xlsx",
+    "feasible": "TRANSIT_import_{}.xlsx",
+}
+
+
+def read_shared_inputs(path="data", network_path="."):
+    """
+    Reads the inputs that are the same for all scenarios.
+
+    Parameters
+    ----------
+    path : String, optional
+        Directory of the Excel input files. The default is "data".
+    network_path : String, optional
+        Directory of the shapefile folders (transmission, high, and mid). The default is "." (working
+        directory).
+
+    Returns
+    -------
+    shared : Dict
+        Includes the shapefiles, the nodes of the network, and the scenario-independent input data.
+
+    """
+    """READ IN SHAPEFILES"""
+    _network_path = Path(network_path)
+    _trans = utils.read_shapefile(path=_network_path / "transmission", name="transmission.shp")
+    _high = utils.read_shapefile(path=_network_path / "high", name="high.shp")
+    _mid = utils.read_shapefile(path=_network_path / "mid", name="mid.shp")
+    print("Done: Read in Shapefiles")
+
+    _path = Path(path)
+    shared = {
+        "transmission": _trans,
+        "high": _high,
+        "mid": _mid,
+        "nodes": utils.get_nodes_from_lines(
+            transmission=_trans, high_pressure=_high, mid_pressure=_mid
+        ),
+    }
+    for _table, _file in SHARED_FILES.items():
+        shared[_table] = cache.read_excel(_path / _file)
+    print("Done: Read in shared input data")
+    return shared
+
+
+def read_scenario_inputs(scenario=None, path="data"):
+    """
+    Reads the scenario-specific inputs (demand, transit, and local sources).
+
+    Parameters
+    ----------
+    scenario : String, required
+        Scenario short tag (gg, gm, dgg, or elek). The default is None.
+    path : String, optional
+        Directory of the Excel input files. The default is "data".
+
+    Returns
+    -------
+    inputs : Dict
+        Includes the scenario-specific input data.
+
+    """
+    _path = Path(path)
+    # This is a modification of the initial code for the project "Gas Studie 2040".
+    _demand = cache.read_excel(_path / SCENARIO_FILES["demand"].format(scenario))
+    inputs = {
+        "demand_high": _demand.loc[_demand.Type == "High-Pressure"],
+        "demand_mid": _demand.loc[_demand.Type == "Mid-Pressure"],
+        "demand_tra": cache.read_excel(_path / SCENARIO_FILES["demand_tra"].format(scenario)),
+        "generation": cache.read_excel(_path / SCENARIO_FILES["generation"].format(scenario)),
+        "feasible": cache.read_excel(_path / SCENARIO_FILES["feasible"].format(scenario)),
+    }
+    print("Done: Read in input data of scenario {}".format(scenario))
+    return inputs
+
+
+def get_input_files(scenario=None, path="data", network_path="."):
+    """
+    Parameters
+    ----------
+    scenario : String, required
+        Scenario short tag (gg, gm, dgg, or elek). The default is None.
+    path : String, optional
+        Directory of the Excel input files. The default is "data".
+    network_path : String, optional
+        Directory of the shapefile folders. The default is "." (working directory).
+
+    Returns
+    -------
+    files : Dict
+        Includes the paths of the files (a shapefile consists of several files) per input table.
+
+    """
+    files = {
+        _level: sorted((Path(network_path) / _level).glob(_level + ".*"))
+        for _level in NETWORK_LEVELS
+    }
+    for _table, _file in SHARED_FILES.items():
+        files[_table] = [Path(path) / _file]
+    for _table, _file in SCENARIO_FILES.items():
+        files[_table] = [Path(path) / _file.format(scenario)]
+    return files
+
+
+def set_shared_inputs(model=None, shared=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    shared : Dict, required
+        Includes the scenario-independent inputs (see read_shared_inputs). The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    model.transmission = shared["transmission"]
+    model.high = shared["high"]
+    model.mid = shared["mid"]
+    model.pipeline_economic = shared["pipeline_economic"]
+    model.pipeline_technical = shared["pipeline_technical"]
+    model.refurbishment = shared["refurbishment"]
+    model.source = shared["source"]
+    model.storage = shared["storage"]
+    model.temporal_demand = shared["temporal_demand"]
+    model.prices = shared["prices"]
+    model.value_of_lost_load = shared["value_of_lost_load"]
+    return
+
+
+def set_scenario_inputs(model=None, inputs=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    inputs : Dict, required
+        Includes the scenario-specific inputs (see read_scenario_inputs). The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    model.demand_tra = inputs["demand_tra"]
+    model.demand_high = inputs["demand_high"]
+    model.demand_mid = inputs["demand_mid"]
+    model.generation = inputs["generation"]
+    model.feasible = inputs["feasible"]
+    return
+
+
+def get_inactive_constraints(scenario=None):
+    """
+    Parameters
+    ----------
+    scenario : String, required
+        Scenario short tag (gg, gm, dgg, or elek). The default is None.
+
+    Returns
+    -------
+    List
+        Names of the constraints that are deactivated in the scenario.
+
+    """
+    inactive = [
+        "c_limit_demand_not_supplied_high_2040",
+        "c_limit_demand_not_supplied_mid_2040",
+    ]
+    if scenario == "gm":
+        inactive.append("c_green_gas")
+    return inactive
+
+
+def set_scenario_constraints(model=None, scenario=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    scenario : String, required
+        Scenario short tag (gg, gm, dgg, or elek). The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    _inactive = get_inactive_constraints(scenario=scenario)
+    if "c_green_gas" in _inactive:
+        print("Deactivate Green Gas Constraint!")
+    else:
+        model.c_green_gas.activate()
+
+    for _name in _inactive:
+        model.component(_name).deactivate()
+
+    print("Done: Deactivate constraints")
+    return
+
+
+def build_model(
+    scenario=None,
+    shared=None,
+    inputs=None,
+    overrides=None,
+    mutable=False,
+    builder="pyomo",
+    horizon="full",
+    dispatch_years=None,
+    temporal=12,
+    reduce_network=False,
+    eliminate=False,
+):
+    """
+    Parameters
+    ----------
+    scenario : String, required
+        Scenario short tag (gg, gm, dgg, or elek). The default is None.
+    shared : Dict, required
+        Includes the scenario-independent inputs (see read_shared_inputs). The default is None.
+    inputs : Dict, required
+        Includes the scenario-specific inputs (see read_scenario_inputs). The default is None.
+    overrides : Dict, optional
+        Includes new values per parameter name (see utils.override_parameter). The default is None.
+    mutable : bool, optional
+        If True, the scenario-dependent parameters are mutable (see update_model). The default is False.
+    builder : String, optional
+        "pyomo" adds the constraints with Pyomo rules (reference); "matrix" builds the coefficient matrix
+        directly from the sets and parameters (see matrix.build_problem) and stores it as
+        model.problem. The default is "pyomo".
+    horizon : String, optional
+        Modeling of the years after the objective function: "full", "drop", or "terminal" (see
+        utils.add_time_horizon). The default is "full".
+    dispatch_years : List, optional
+        Years with a modeled dispatch (see utils.add_time_horizon). The default is None (all years).
+    temporal : integer, optional
+        Number of time slices per year (see utils.get_time_slices). The default is 12 (months).
+    reduce_network : bool, optional
+        If True, the radial branches of the mid-pressure level are folded (see
+        utils.add_network_reduction). The default is False.
+    eliminate : bool, optional
+        If True, constraints that only pin a variable are replaced by fixed variables or bounds (see
+        utils.eliminate_fixed_variables); requires the pyomo builder without mutable parameters. The
+        default is False.
+
+    Raises
+    ------
+    ValueError
+        If the builder, the horizon, a dispatch year, or the number of time slices is unknown, or the
+        network reduction or the elimination is combined with the matrix builder (or the elimination
+        with mutable parameters).
+
+    Returns
+    -------
+    model : pyomo.ConcreteModel
+        Includes the model instance ready to be solved.
+
+    """
+    if builder not in BUILDERS:
+        raise ValueError("Unknown builder: {}".format(builder))
+    if reduce_network and builder != "pyomo":
+        raise ValueError("The network reduction requires the pyomo builder")
+    if eliminate and (mutable or builder != "pyomo"):
+        raise ValueError(
+            "The elimination of fixed variables requires the pyomo builder (not mutable)"
+        )
+    start_time = datetime.datetime.now()
+
+    """PYOMO.CONCRETEMODEL()"""
+    model = utils.create_model()
+
+    set_shared_inputs(model=model, shared=shared)
+    set_scenario_inputs(model=model, inputs=inputs)
+
+    with profiler.measure("build", "add_import_and_export_lines_per_node"):
+        utils.add_import_and_export_lines_per_node(model=model)
+
+    with profiler.measure("build", "add_nodal_sets"):
+        utils.add_nodal_sets(model=model, nodes=shared["nodes"])
+
+    with profiler.measure("build", "add_line_sets"):
+        utils.add_line_sets(
+            model=model, data=[shared["transmission"], shared["high"], shared["mid"]]
+        )
+    with profiler.measure("build", "add_network_reduction"):
+        utils.add_network_reduction(model=model, reduce=reduce_network)
+    with profiler.measure("build", "add_time_horizon"):
+        utils.add_time_horizon(
+            model=model,
+            year=2065,
+            temporal=temporal,
+            horizon=horizon,
+            dispatch_years=dispatch_years,
+        )
+    with profiler.measure("build", "add_cluster_sets"):
+        utils.add_cluster_sets(model=model)
+    print("Done: Add Sets")
+
+    # THE PARAMETERS ARE ADDED FIRST: THE SPARSE NODE SETS OF THE VARIABLES DEPEND ON THEM
+    with profiler.measure("build", "add_parameter_to_model"):
+        utils.add_parameter_to_model(model=model, mutable=mutable)
+        utils.override_parameters(model=model, overrides=overrides)
+    print("Done: Add Parameters")
+
+    with profiler.measure("build", "add_sparse_node_sets"):
+        utils.add_sparse_node_sets(model=model)
+    with profiler.measure("build", "add_decision_variables"):
+        utils.add_decision_variables(model=model)
+    print("Done: Add Decision Variables")
+
+    if builder == "matrix":
+        # THE OBJECTIVE IS STILL ADDED TO EVALUATE THE SOLUTION LOADED INTO THE VARIABLES
+        with profiler.measure("build", "matrix.build_problem"):
+            model.problem = matrix.build_problem(
+                model=model, inactive=get_inactive_constraints(scenario=scenario)
+            )
+        print("Done: Build Coefficient Matrix")
+        with profiler.measure("build", "add_objective_function"):
+            utils.add_objective_function(model=model)
+        print("Done: Add Objective Function")
+    else:
+        with profiler.measure("build", "constraints.add"):
+            constraints.add(model=model)
+        print("Done: Add Constraints")
+        with profiler.measure("build", "add_objective_function"):
+            utils.add_objective_function(model=model)
+        print("Done: Add Objective Function")
+
+        set_scenario_constraints(model=model, scenario=scenario)
+        if eliminate:
+            with profiler.measure("build", "eliminate_fixed_variables"):
+                utils.eliminate_fixed_variables(model=model)
+
+    # DISPLAY TIME TO INITIALIZE THE MODEL
+    initialize_time = datetime.datetime.now() - start_time
+    print(
+        "Time to initialize the model in seconds: {:.1f}".format(initialize_time.total_seconds())
+    )
+    return model
+
+
+def check_mutable_overrides(model=None, overrides=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    overrides : Dict, optional
+        Includes new values per parameter name. The default is None.
+
+    Raises
+    ------
+    ValueError
+        If an override refers to a parameter that is not mutable.
+
+    Returns
+    -------
+    None.
+
+    """
+    for _name in overrides or dict():
+        _param = model.component(_name)
+        if (not isinstance(_param, py.Param)) or (not _param.mutable):
+            raise ValueError(
+                "Parameter {} is not mutable and cannot be changed without a rebuild".format(_name)
+            )
+    return
+
+
+def update_model(model=None, scenario=None, inputs=None, overrides=None):
+    """
+    Switches a model built with mutable parameters to another scenario. Only the values of the mutable
+    parameters and the active constraints change; sets, variables, and constraints are not rebuilt.
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance built with build_model(mutable=True). The default is None.
+    scenario : String, required
+        Scenario short tag (gg, gm, dgg, or elek). The default is None.
+    inputs : Dict, required
+        Includes the scenario-specific inputs (see read_scenario_inputs). The default is None.
+    overrides : Dict, optional
+        Includes new values per (mutable) parameter name. The default is None.
+
+    Raises
+    ------
+    ValueError
+        If an override refers to a parameter that is not mutable or the demands of the scenario lead
+        to other time slices than the ones the model was built with (see utils.check_time_slices).
+
+    Returns
+    -------
+    None.
+
+    """
+    start_time = datetime.datetime.now()
+
+    check_mutable_overrides(model=model, overrides=overrides)
+    set_scenario_inputs(model=model, inputs=inputs)
+    utils.update_scenario_parameters(model=model)
+    utils.override_parameters(model=model, overrides=overrides)
+    set_scenario_constraints(model=model, scenario=scenario)
+
+    update_time = datetime.datetime.now() - start_time
+    print("Time to update the model in seconds: ", int(update_time.total_seconds()))
+    return
+
+
+def build_model_incremental(
+    scenario=None,
+    shared=None,
+    inputs=None,
+    overrides=None,
+    path="data",
+    network_path=".",
+    horizon="full",
+    dispatch_years=None,
+    temporal=12,
+    reduce_network=False,
+):
+    """
+    Builds the model with mutable scenario parameters (see build_model) and stores it together with the
+    hashes of its input files (see incremental.save_state). A later run with the same scenario, build
+    options, and code loads the stored model and only recomputes the parameters derived from the input
+    tables that changed since (see incremental.PARAMETERS); the constraints that include them follow the
+    new values. A change of a table that defines sets or immutable parameters leads to a full build.
+
+    Parameters
+    ----------
+    scenario : String, required
+        Scenario short tag (gg, gm, dgg, or elek). The default is None.
+    shared : Dict, required
+        Includes the scenario-independent inputs (see read_shared_inputs). The default is None.
+    inputs : Dict, required
+        Includes the scenario-specific inputs (see read_scenario_inputs). The default is None.
+    overrides : Dict, optional
+        Includes new values per (mutable) parameter name; not part of the stored model. The default is
+        None.
+    path : String, optional
+        Directory of the Excel input files. The default is "data".
+    network_path : String, optional
+        Directory of the shapefile folders. The default is "." (working directory).
+    horizon : String, optional
+        "full", "drop", or "terminal" (see utils.add_time_horizon). The default is "full".
+    dispatch_years : List, optional
+        Years with a modeled dispatch (see utils.add_time_horizon). The default is None (all years).
+    temporal : integer, optional
+        Number of time slices per year (see utils.get_time_slices). The default is 12 (months).
+    reduce_network : bool, optional
+        If True, the radial branches of the mid-pressure level are folded (see
+        utils.add_network_reduction). The default is False.
+
+    Raises
+    ------
+    ValueError
+        If an override refers to a parameter that is not mutable.
+
+    Returns
+    -------
+    model : pyomo.ConcreteModel
+        Includes the model instance ready to be solved.
+
+    """
+    _options = {
+        "horizon": horizon,
+        "dispatch_years": dispatch_years,
+        "temporal": temporal,
+        "reduce_network": reduce_network,
+    }
+    _hashes = incremental.get_input_hashes(
+        files=get_input_files(scenario=scenario, path=path, network_path=network_path)
+    )
+    _path = incremental.get_state_path(scenario=scenario, options=_options)
+    _state = incremental.load_state(path=_path)
+    _changed = None
+    _names = None
+    if _state is not None:
+        _changed = [_table for _table in _hashes if _hashes[_table] != _state["hashes"].get(_table)]
+        _names = incremental.get_affected_parameters(changed=_changed, temporal=temporal)
+
+    if _names is None:
+        print(
+            "Incremental build: full build ({})".format(
+                "no model state" if _state is None else "changed: " + ", ".join(_changed)
+            )
+        )
+        model = build_model(
+            scenario=scenario,
+            shared=shared,
+            inputs=inputs,
+            mutable=True,
+            horizon=horizon,
+            dispatch_years=dispatch_years,
+            temporal=temporal,
+            reduce_network=reduce_network,
+        )
+        with profiler.measure("build", "get_dependency_graph"):
+            _graph = incremental.get_dependency_graph(model=model)
+        incremental.save_state(path=_path, model=model, hashes=_hashes, graph=_graph)
+    else:
+        model = _state["model"]
+        set_shared_inputs(model=model, shared=shared)
+        set_scenario_inputs(model=model, inputs=inputs)
+        if _names:
+            with profiler.measure("build", "update_scenario_parameters"):
+                utils.update_scenario_parameters(model=model, names=_names)
+            incremental.save_state(path=_path, model=model, hashes=_hashes, graph=_state["graph"])
+        print("Incremental build: changed: {}".format(", ".join(_changed) or "none"))
+        for _name in _names:
+            print(
+                "  {} -> {}".format(_name, ", ".join(_state["graph"].get(_name, [])) or "no constraint")
+            )
+
+    check_mutable_overrides(model=model, overrides=overrides)
+    utils.override_parameters(model=model, overrides=overrides)
+    return model
+
+
+def run_scenarios_persistent(
+    jobs=None,
+    shared=None,
+    threads=12,
+    path="data",
+    output_format="xlsx",
+    horizon="full",
+    dispatch_years=None,
+    temporal=12,
+    reduce_network=False,
+    profile=None,
+):
+    """
+    Builds the model once (with mutable scenario parameters) and solves all jobs in sequence with a
+    persistent solver. From the second job on, the solver only receives the updated coefficients and
+    right-hand sides and starts from the previous basis and solution. The first job starts from the
+    stored solution of its previous run (see warmstart.load_warm_start).
+
+    Parameters
+    ----------
+    jobs : List, required
+        Includes one dictionary per run with the keys scenario, and optionally name and overrides
+        (see batch.get_jobs). The default is None.
+    shared : Dict, required
+        Includes the scenario-independent inputs (see read_shared_inputs). The default is None.
+    threads : int, optional
+        Number of solver threads; also the number of output file writers after the solve (see
+        report.write_output_files). The default is 12.
+    path : String, optional
+        Directory of the Excel input files. The default is "data".
+    output_format : String, optional
+        File format of the output files: "xlsx", "csv", or "parquet". The default is "xlsx".
+    horizon : String, optional
+        "full", "drop", or "terminal" (see utils.add_time_horizon). The default is "full".
+    dispatch_years : List, optional
+        Years with a modeled dispatch (see utils.add_time_horizon). The default is None (all years).
+    temporal : integer, optional
+        Number of time slices per year (see utils.get_time_slices). The default is 12 (months).
+    reduce_network : bool, optional
+        If True, the radial branches of the mid-pressure level are folded (see
+        utils.add_network_reduction). The default is False.
+    profile : Dict, optional
+        Includes the gap, time limit, and emphasis of the (Gurobi) solver (see solvers.get_profile).
+        The default is None.
+
+    Returns
+    -------
+    results : List
+        Includes one dictionary (name, scenario, objective, path, or error) per job.
+
+    """
+    model = None
+    Solver = None
+    results = []
+    for _job in jobs:
+        _scenario = _job["scenario"]
+        _name = _job.get("name") or _scenario
+        print("Scenario short tag: {} ({})".format(_scenario, _name))
+        try:
+            inputs = read_scenario_inputs(scenario=_scenario, path=path)
+            if model is None:
+                # OVERRIDES ARE RESTRICTED TO MUTABLE PARAMETERS FOR ALL JOBS (INCL. THE FIRST ONE),
+                # OTHERWISE LATER JOBS WOULD INHERIT THE OVERRIDES OF THE FIRST JOB.
+                model = build_model(
+                    scenario=_scenario,
+                    shared=shared,
+                    inputs=inputs,
+                    mutable=True,
+                    horizon=horizon,
+                    dispatch_years=dispatch_years,
+                    temporal=temporal,
+                    reduce_network=reduce_network,
+                )
+                Solver = utils.set_persistent_solver_for_the_model(
+                    model, threads=threads, profile=profile
+                )
+                check_mutable_overrides(model=model, overrides=_job.get("overrides"))
+                utils.override_parameters(model=model, overrides=_job.get("overrides"))
+                if warmstart.load_warm_start(model=model, name=_name):
+                    Solver.set_instance(model)
+                    utils.set_mip_start(Solver=Solver, model=model)
+            else:
+                update_model(
+                    model=model,
+                    scenario=_scenario,
+                    inputs=inputs,
+                    overrides=_job.get("overrides"),
+                )
+                utils.set_mip_start(Solver=Solver, model=model)
+
+            """START TO SOLVE THE MODEL"""
+            with profiler.measure("solve", "gurobi (persistent)"):
+                Solver.solve(model)
+            model.objective.display()
+            warmstart.save_warm_start(model=model, name=_name)
+
+            """REPORT RESULTS IN OUTPUT FILES"""
+            # THE SOLVER THREADS OF THE RUN ARE REUSED BY THE FILE WRITERS
+            _folder = report.write_results_to_folder(
+                model, _name, output_format=output_format, workers=threads
+            )
+            results.append(
+                {
+                    "name": _name,
+                    "scenario": _scenario,
+                    "objective": py.value(model.objective),
+                    "path": _folder,
+                }
+            )
+        except Exception as _error:
+            traceback.print_exc()
+            results.append({**_job, "name": _name, "error": repr(_error)})
+    return results
+
+
+def run_scenario(
+    scenario=None,
+    shared=None,
+    overrides=None,
+    name=None,
+    threads=12,
+    path="data",
+    output_format="xlsx",
+    builder="pyomo",
+    horizon="full",
+    dispatch_years=None,
+    temporal=12,
+    reduce_network=False,
+    decompose=0,
+    solver="gurobi",
+    profile=None,
+    warm_start=None,
+    fixing=None,
+    eliminate=False,
+    export=None,
+    incremental_build=False,
+):
+    """
+    Builds, solves, and reports one scenario. The integer decisions and line investments of the
+    solution are stored as warm start for later runs (see warmstart.save_warm_start). If the profiler
+    is enabled, the profile of the run is written to its output folder (see profiler.write_profile).
+
+    Parameters
+    ----------
+    scenario : String, required
+        Scenario short tag (gg, gm, dgg, or elek). The default is None.
+    shared : Dict, required
+        Includes the scenario-independent inputs (see read_shared_inputs). The default is None.
+    overrides : Dict, optional
+        Includes new values per parameter name (see utils.override_parameter). The default is None.
+    name : String, optional
+        Name of the run used in the output files. The default is None (scenario short tag).
+    threads : int, optional
+        Number of solver threads; also the number of output file writers after the solve (see
+        report.write_output_files). The default is 12.
+    path : String, optional
+        Directory of the Excel input files. The default is "data".
+    output_format : String, optional
+        File format of the output files: "xlsx", "csv", or "parquet". The default is "xlsx".
+    builder : String, optional
+        "pyomo" or "matrix" (see build_model). The default is "pyomo".
+    horizon : String, optional
+        "full", "drop", or "terminal" (see utils.add_time_horizon). The default is "full".
+    dispatch_years : List, optional
+        Years with a modeled dispatch (see utils.add_time_horizon). The default is None (all years).
+    temporal : integer, optional
+        Number of time slices per year (see utils.get_time_slices). The default is 12 (months).
+    reduce_network : bool, optional
+        If True, the radial branches of the mid-pressure level are folded (see
+        utils.add_network_reduction). The default is False.
+    decompose : integer, optional
+        Number of worker processes that solve the cluster subproblems of the matrix builder (see
+        decomposition.solve_by_clusters); the solver threads are divided among them. The default is 0
+        (the problem is solved as a whole).
+    solver : String, optional
+        "gurobi", "highs", "cbc", or "scip" (see solvers.SOLVERS); the matrix builder supports
+        "gurobi" and "highs". The default is "gurobi".
+    profile : Dict, optional
+        Includes the gap, time limit, and emphasis of the solver (see solvers.get_profile). The default
+        is None (solvers.SOLVER_PROFILE).
+    warm_start : String, optional
+        Name of the run whose stored solution is passed to the solver as a start (pyomo builder; see
+        warmstart.load_warm_start). The default is None (the previous solution of this run, if any).
+    fixing : float, optional
+        Tolerance of the LP relaxation fixing heuristic (pyomo builder; see solvers.solve_with_fixing).
+        The default is None (the MIP is solved as a whole).
+    eliminate : bool, optional
+        If True, constraints that only pin a variable are eliminated (see build_model). The default is
+        False.
+    export : Dict, optional
+        Includes the format (see writer.FORMATS) and labels (see writer.get_labels) of a model file that
+        is written to solution/<name>.<format> before the solve (see writer.write_model). The default
+        is None (no model file).
+    incremental_build : bool, optional
+        If True, the model is loaded from the previous run and only the parameters of the changed input
+        files are recomputed (see build_model_incremental); requires the pyomo builder without
+        elimination. The default is False.
+
+    Raises
+    ------
+    ValueError
+        If the decomposition, the fixing heuristic, or the incremental build is combined with the wrong
+        builder or the elimination, or the solver is not supported by the builder.
+
+    Returns
+    -------
+    Dict
+        Includes the name, scenario, objective value, and output folder of the run.
+
+    """
+    if decompose and builder != "matrix":
+        raise ValueError("The decomposition requires the matrix builder")
+    if (fixing is not None) and builder != "pyomo":
+        raise ValueError("The relaxation fixing requires the pyomo builder")
+    if incremental_build and (eliminate or builder != "pyomo"):
+        raise ValueError("The incremental build requires the pyomo builder without elimination")
+    if solver not in (matrix.SOLVERS if builder == "matrix" else solvers.SOLVERS):
+        raise ValueError("Solver {} is not supported by the {} builder".format(solver, builder))
+    _name = scenario if name is None else name
+    print("Scenario short tag: {} ({})".format(scenario, _name))
+    _records = len(profiler.get_records())
+    inputs = read_scenario_inputs(scenario=scenario, path=path)
+    if incremental_build:
+        model = build_model_incremental(
+            scenario=scenario,
+            shared=shared,
+            inputs=inputs,
+            overrides=overrides,
+            path=path,
+            horizon=horizon,
+            dispatch_years=dispatch_years,
+            temporal=temporal,
+            reduce_network=reduce_network,
+        )
+    else:
+        model = build_model(
+            scenario=scenario,
+            shared=shared,
+            inputs=inputs,
+            overrides=overrides,
+            builder=builder,
+            horizon=horizon,
+            dispatch_years=dispatch_years,
+            temporal=temporal,
+            reduce_network=reduce_network,
+            eliminate=eliminate,
+        )
+    if export is not None:
+        with profiler.measure("export", export["format"]):
+            writer.write_model(
+                model=model,
+                path=str(Path("solution") / "{}.{}".format(_name, export["format"])),
+                labels=export.get("labels", "integer"),
+            )
+
+    """START TO SOLVE THE MODEL"""
+    with profiler.measure("solve", solver):
+        if builder == "matrix" and decompose:
+            _values, _objective, _bound = decomposition.solve_by_clusters(
+                model=model,
+                problem=model.problem,
+                solver=solver,
+                workers=decompose,
+                threads=max(1, threads // decompose),
+                profile=profile,
+            )
+            matrix.load_solution(model=model, problem=model.problem, values=_values)
+        elif builder == "matrix":
+            _values, _objective = matrix.solve_problem(
+                problem=model.problem, solver=solver, threads=threads, profile=profile
+            )
+            matrix.load_solution(model=model, problem=model.problem, values=_values)
+        else:
+            warmstart.load_warm_start(model=model, name=_name if warm_start is None else warm_start)
+            Solver = utils.set_solver_for_the_model(
+                model, threads=threads, solver=solver, profile=profile
+            )
+            if fixing is None:
+                solution = solvers.solve_model(Solver=Solver, model=model, tee=True, warmstart=True)
+            else:
+                solution, _ = solvers.solve_with_fixing(Solver=Solver, model=model, tolerance=fixing)
+            solution.write()
+    model.objective.display()
+    warmstart.save_warm_start(model=model, name=_name)
+
+    """REPORT RESULTS IN OUTPUT FILES"""
+    with profiler.measure("report", "write_results_to_folder"):
+        # THE SOLVER THREADS OF THE RUN ARE REUSED BY THE FILE WRITERS (WITHIN THE BUDGET OF A BATCH)
+        _folder = report.write_results_to_folder(
+            model, _name, output_format=output_format, workers=threads
+        )
+    if profiler.is_enabled():
+        # PROFILE OF THIS RUN (ALSO IN WORKER PROCESSES OF A BATCH)
+        _profile = profiler.get_records()[_records:]
+        profiler.write_profile(path=str(Path(_folder) / "profile"), records=_profile)
+        profiler.print_summary(records=_profile)
+    return {
+        "name": _name,
+        "scenario": scenario,
+        "objective": py.value(model.objective),
+        "path": _folder,
+    }
@@ -0,0 +1,467 @@
+import math
+import time
+import pyomo.environ as py
+import pandas as pd
+
+
+# PYOMO SOLVER INTERFACES PER SOLVER NAME
+SOLVERS = {
+    "gurobi": "gurobi",
+    "highs": "appsi_highs",
+    "cbc": "cbc",
+    "scip": "scip",
+}
+EMPHASES = ["bound", "feasibility", "balanced"]
+# DISTANCE OF A RELAXED VALUE TO THE NEXT INTEGER BELOW WHICH THE VARIABLE IS FIXED (SEE SOLVE_WITH_FIXING)
+FIXING_TOLERANCE = 0.01
+# SHARE OF THE FIXED VARIABLES THAT ARE RELEASED BY THE FIRST REPAIR; DOUBLED BY EVERY FURTHER REPAIR
+REPAIR_SHARE = 0.25
+# GAP AND TIME LIMIT OF THE ORIGINAL GUROBI SETTINGS; "BOUND" MATCHES MIPFOCUS 3 WITH AGGRESSIVE CUTS
+SOLVER_PROFILE = {
+    "gap": 0.05,
+    "time_limit": 48 * 60 * 60,
+    "emphasis": "bound",
+}
+# SOLVER OPTIONS PER EMPHASIS
+EMPHASIS_OPTIONS = {
+    "gurobi": {
+        "bound": {"MIPFocus": 3, "Cuts": 2, "Presolve": 2},
+        "feasibility": {"MIPFocus": 1, "Presolve": 2},
+        "balanced": {},
+    },
+    "highs": {
+        "bound": {"presolve": "on", "mip_heuristic_effort": 0.025},
+        "feasibility": {"presolve": "on", "mip_heuristic_effort": 0.3},
+        "balanced": {},
+    },
+    "cbc": {
+        "bound": {"cutsOnOff": "forceOn", "preprocess": "on"},
+        "feasibility": {"heuristicsOnOff": "on", "feasibilityPump": "on"},
+        "balanced": {},
+    },
+    "scip": {
+        "bound": {"separating/maxroundsroot": -1},
+        "feasibility": {"heuristics/feaspump/freq": 10, "heuristics/rins/freq": 10},
+        "balanced": {},
+    },
+}
+
+
+def get_profile(profile=None):
+    """
+    Parameters
+    ----------
+    profile : Dict, optional
+        Includes new values for the keys of SOLVER_PROFILE (gap, time_limit, emphasis). The default is
+        None.
+
+    Raises
+    ------
+    ValueError
+        If a key or the emphasis is unknown.
+
+    Returns
+    -------
+    Dict
+        Complete solver profile.
+
+    """
+    _profile = dict(SOLVER_PROFILE)
+    for _key, _value in (profile or {}).items():
+        if _key not in SOLVER_PROFILE:
+            raise ValueError("Unknown key of the solver profile: {}".format(_key))
+        if _value is not None:
+            _profile[_key] = _value
+    if _profile["emphasis"] not in EMPHASES:
+        raise ValueError("Unknown emphasis: {}".format(_profile["emphasis"]))
+    return _profile
+
+
+def get_solver_options(solver="gurobi", profile=None, threads=12):
+    """
+    Maps the solver profile to the option names of one solver.
+
+    Parameters
+    ----------
+    solver : String, optional
+        "gurobi", "highs", "cbc", or "scip". The default is "gurobi".
+    profile : Dict, optional
+        Includes the gap, time limit (in seconds), and emphasis (see get_profile). The default is None
+        (SOLVER_PROFILE).
+    threads : int, optional
+        Number of solver threads. The default is 12.
+
+    Raises
+    ------
+    ValueError
+        If the solver is unknown.
+
+    Returns
+    -------
+    Dict
+        Includes the solver options.
+
+    """
+    _profile = get_profile(profile)
+    if solver == "gurobi":
+        _options = {
+            "MIPGap": _profile["gap"],
+            "Threads": threads,
+            "TimeLimit": _profile["time_limit"],
+        }
+    elif solver == "highs":
+        _options = {
+            "mip_rel_gap": _profile["gap"],
+            "threads": threads,
+            "time_limit": float(_profile["time_limit"]),
+        }
+    elif solver == "cbc":
+        _options = {
+            "ratioGap": _profile["gap"],
+            "threads": threads,
+            "seconds": _profile["time_limit"],
+        }
+    elif solver == "scip":
+        # SCIP SOLVES THE TREE IN ONE THREAD; THE THREADS ARE USED BY THE LP SOLVER
+        _options = {
+            "limits/gap": _profile["gap"],
+            "lp/threads": threads,
+            "limits/time": _profile["time_limit"],
+        }
+    else:
+        raise ValueError("Unknown solver: {}".format(solver))
+    _options.update(EMPHASIS_OPTIONS[solver][_profile["emphasis"]])
+    return _options
+
+
+def set_solver(solver="gurobi", profile=None, threads=12):
+    """
+    Parameters
+    ----------
+    solver : String, optional
+        "gurobi", "highs", "cbc", or "scip". The default is "gurobi".
+    profile : Dict, optional
+        Includes the gap, time limit, and emphasis (see get_profile). The default is None.
+    threads : int, optional
+        Number of solver threads. The default is 12.
+
+    Raises
+    ------
+    ValueError
+        If the solver is unknown.
+
+    Returns
+    -------
+    Solver : pyomo.opt.SolverFactory
+        Solver interface with the options of the profile.
+
+    """
+    if solver not in SOLVERS:
+        raise ValueError("Unknown solver: {}".format(solver))
+    Solver = py.SolverFactory(SOLVERS[solver])
+    for _option, _value in get_solver_options(solver, profile=profile, threads=threads).items():
+        Solver.options[_option] = _value
+    return Solver
+
+
+def solve_model(Solver=None, model=None, tee=True, warmstart=True):
+    """
+    Parameters
+    ----------
+    Solver : pyomo.opt.SolverFactory, required
+        Solver interface (see set_solver). The default is None.
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    tee : bool, optional
+        If True, the solver log is printed. The default is True.
+    warmstart : bool, optional
+        If True, the current values of the variables are passed as a start (if the solver interface
+        supports it). The default is True.
+
+    Returns
+    -------
+    pyomo.opt.SolverResults
+        Results of the solve.
+
+    """
+    _warmstart = warmstart and Solver.warm_start_capable()
+    return Solver.solve(model, tee=tee, warmstart=_warmstart)
+
+
+def benchmark_solvers(model=None, solver_list=None, profile=None, threads=12):
+    """
+    Solves the same model instance with several solvers and measures the time to reach the gap of the
+    profile (or the time limit). No start values are passed, so that the solvers do not profit from
+    the solutions of the previous ones.
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    solver_list : List, optional
+        Solver names (see SOLVERS). The default is None (all solvers).
+    profile : Dict, optional
+        Includes the gap, time limit, and emphasis (see get_profile). The default is None.
+    threads : int, optional
+        Number of solver threads. The default is 12.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Includes the termination condition, objective value, bound, gap, and time in seconds per
+        solver. Solvers that are not installed are reported as "not available".
+
+    """
+    _rows = []
+    for _solver in list(SOLVERS) if solver_list is None else solver_list:
+        Solver = set_solver(_solver, profile=profile, threads=threads)
+        _row = {
+            "solver": _solver,
+            "termination": "not available",
+            "objective": None,
+            "bound": None,
+            "gap": None,
+            "seconds": None,
+        }
+        if Solver.available(exception_flag=False):
+            _start = time.perf_counter()
+            try:
+                _results = Solver.solve(model, tee=False, load_solutions=False)
+            except Exception as _error:
+                _row["termination"] = repr(_error)
+            else:
+                _row["seconds"] = time.perf_counter() - _start
+                _row["termination"] = str(_results.solver.termination_condition)
+                _upper = _results.problem.upper_bound
+                _lower = _results.problem.lower_bound
+                if (_upper is not None) and abs(_upper) < float("inf"):
+                    _row["objective"] = _upper
+                    _row["bound"] = _lower
+                    if (_lower is not None) and abs(_lower) < float("inf"):
+                        _row["gap"] = (_upper - _lower) / max(abs(_upper), 1e-10)
+        print("Benchmark {}: {}".format(_solver, _row["termination"]))
+        _rows.append(_row)
+    return pd.DataFrame(_rows)
+
+
+def get_objective_value(results=None):
+    """
+    Parameters
+    ----------
+    results : pyomo.opt.SolverResults, required
+        Results of a solve. The default is None.
+
+    Returns
+    -------
+    float
+        Objective value of the solution found (None if no feasible solution was found).
+
+    """
+    _value = results.problem.upper_bound
+    if (_value is None) or math.isinf(_value):
+        return None
+    return _value
+
+
+def get_objective_bound(results=None):
+    """
+    Parameters
+    ----------
+    results : pyomo.opt.SolverResults, required
+        Results of a solve. The default is None.
+
+    Returns
+    -------
+    float
+        Best bound of the objective value (None if the solver reports no finite bound).
+
+    """
+    _value = results.problem.lower_bound
+    if (_value is None) or math.isinf(_value):
+        return None
+    return _value
+
+
+def _get_gap(objective, bound):
+    if (objective is None) or (bound is None):
+        return None
+    return (objective - bound) / max(abs(objective), 1e-10)
+
+
+def _format(value, form="{:.1f}"):
+    return "-" if value is None else form.format(value)
+
+
+def _solve(Solver, model, tee, warmstart):
+    # NO SOLUTION (E.G., AN INFEASIBLE RESTRICTED MIP) IS RETURNED AS NONE
+    try:
+        _results = solve_model(Solver=Solver, model=model, tee=tee, warmstart=warmstart)
+    except RuntimeError:
+        return None, None
+    return _results, get_objective_value(_results)
+
+
+def solve_with_fixing(Solver=None, model=None, tolerance=None, repairs=2, mip_bound=True, tee=True):
+    """
+    Two-phase solve for good incumbents in short time:
+        1. LP relaxation of the model (integer variables are relaxed to their bounds): lower bound and
+           reduced costs.
+        2. Integer variables whose relaxed values are within the tolerance of an integer are fixed to
+           it; the restricted MIP is solved.
+        3. Repair: if the restricted MIP is infeasible, the least certain fixings are released and it is
+           solved again, at most repairs times. The first repair releases REPAIR_SHARE of the fixed
+           variables, every further repair twice as many. The fixings are ranked by the distance of
+           the relaxed value to the integer and, for equal distances, by the absolute reduced cost
+           (a variable at its bound with a small reduced cost is least certain). If all repairs fail,
+           the full MIP is solved.
+        4. Bound: the full MIP is solved from the incumbent of the restricted MIP (warm start) until
+           the gap or time limit of the solver options, so that the report includes the bound of the
+           full MIP.
+    The fixings are removed afterwards, so that the model keeps its integer variables and the values of
+    the solution.
+
+    Parameters
+    ----------
+    Solver : pyomo.opt.SolverFactory, required
+        Solver interface (see set_solver). The default is None.
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    tolerance : float, optional
+        Largest distance of a relaxed value to the next integer for fixing. The default is None
+        (FIXING_TOLERANCE).
+    repairs : int, optional
+        Maximum number of repair solves. The default is 2.
+    mip_bound : bool, optional
+        If True, the full MIP is solved from the incumbent of the restricted MIP (step 4). The default
+        is True.
+    tee : bool, optional
+        If True, the solver logs are printed. The default is True.
+
+    Raises
+    ------
+    RuntimeError
+        If the LP relaxation or the full MIP has no feasible solution.
+
+    Returns
+    -------
+    Tuple
+        Results of the last solve and a dictionary with the number of integer, fixed, and released
+        variables, the lower bound (LP relaxation), the incumbent and bound of the restricted MIP, the
+        bound of the full MIP, the gaps of the incumbent of the restricted MIP to the LP bound and to
+        the bound of the full MIP (i.e., the quality of the heuristic solution), and the objective
+        value with its gap to the best bound.
+
+    """
+    _tolerance = FIXING_TOLERANCE if tolerance is None else tolerance
+    _integer = [
+        _var
+        for _var in model.component_data_objects(py.Var, active=True)
+        if _var.is_integer() and (not _var.fixed)
+    ]
+
+    """LP RELAXATION"""
+    _domains = [(_var, _var.domain, _var.lb, _var.ub) for _var in _integer]
+    for _var, _, _lb, _ub in _domains:
+        _var.domain = py.Reals
+        _var.setlb(_lb)
+        _var.setub(_ub)
+    # REDUCED COSTS ARE ONLY IMPORTED IF THE MODEL HAS NO SUFFIX OF ITS OWN (SOLVERS WITHOUT REDUCED
+    # COSTS FOR THE RELAXATION LEAVE THE SUFFIX EMPTY)
+    _suffix = model.component("rc") is None
+    if _suffix:
+        model.rc = py.Suffix(direction=py.Suffix.IMPORT)
+    try:
+        _results, _bound = _solve(Solver, model, tee, False)
+        _relaxed = [(_var, _var.value, abs(model.rc.get(_var) or 0.0)) for _var in _integer]
+    finally:
+        if _suffix:
+            model.del_component("rc")
+        for _var, _domain, _lb, _ub in _domains:
+            _var.domain = _domain
+            _var.setlb(_lb)
+            _var.setub(_ub)
+    if _bound is None:
+        raise RuntimeError("The LP relaxation has no feasible solution")
+
+    """RESTRICTED MIP (WITH REPAIR)"""
+    # MOST CERTAIN FIXINGS FIRST: THE REPAIRS RELEASE THE FIXINGS FROM THE END
+    _candidates = sorted(
+        (
+            (_var, round(_value), abs(_value - round(_value)), _cost)
+            for _var, _value, _cost in _relaxed
+            if (_value is not None) and abs(_value - round(_value)) <= _tolerance
+        ),
+        key=lambda _candidate: (_candidate[2], -_candidate[3]),
+    )
+    _objective = None
+    _restricted = None
+    _fixed = []
+    for _attempt in range(repairs + 1):
+        _share = 0.0 if _attempt == 0 else min(1.0, REPAIR_SHARE * 2 ** (_attempt - 1))
+        _fixed = _candidates[: len(_candidates) - math.ceil(_share * len(_candidates))]
+        for _var, _value, _, _ in _fixed:
+            _var.fix(_value, skip_validation=True)
+        try:
+            _results, _objective = _solve(Solver, model, tee, True)
+        finally:
+            for _var, _, _, _ in _fixed:
+                _var.unfix()
+        print(
+            "Relaxation fixing: {} of {} integer variables fixed ({} released): {}".format(
+                len(_fixed),
+                len(_integer),
+                len(_candidates) - len(_fixed),
+                "infeasible" if _objective is None else "objective {:.1f}".format(_objective),
+            )
+        )
+        if _objective is not None:
+            _restricted = _results
+            break
+
+    """FULL MIP"""
+    _mip_bound = None
+    if _objective is None:
+        _fixed = []
+        _results, _objective = _solve(Solver, model, tee, True)
+        if _objective is None:
+            raise RuntimeError("The MIP has no feasible solution")
+        _mip_bound = get_objective_bound(_results)
+    elif mip_bound:
+        _full, _full_objective = _solve(Solver, model, tee, True)
+        if _full_objective is not None:
+            _mip_bound = get_objective_bound(_full)
+            if _full_objective <= _objective:
+                _results, _objective = _full, _full_objective
+
+    _restricted_objective = None if _restricted is None else get_objective_value(_restricted)
+    _report = {
+        "integer": len(_integer),
+        "fixed": len(_fixed),
+        "released": len(_candidates) - len(_fixed),
+        "bound": _bound,
+        "restricted_objective": _restricted_objective,
+        "restricted_bound": None if _restricted is None else get_objective_bound(_restricted),
+        "mip_bound": _mip_bound,
+        "objective": _objective,
+        "restricted_gap_lp": _get_gap(_restricted_objective, _bound),
+        "restricted_gap_mip": _get_gap(_restricted_objective, _mip_bound),
+        "gap": _get_gap(_objective, _bound if _mip_bound is None else max(_bound, _mip_bound)),
+    }
+    print(
+        "Relaxation fixing: restricted MIP {} (bound {}); LP bound {:.1f}; MIP bound {}".format(
+            _format(_restricted_objective),
+            _format(_report["restricted_bound"]),
+            _bound,
+            _format(_mip_bound),
+        )
+    )
+    print(
+        "Relaxation fixing: gap of the restricted MIP {} (LP bound), {} (MIP bound); "
+        "objective {:.1f}; gap {:.2%}".format(
+            _format(_report["restricted_gap_lp"], "{:.2%}"),
+            _format(_report["restricted_gap_mip"], "{:.2%}"),
+            _objective,
+            _report["gap"],
+        )
+    )
+    return _results, _report
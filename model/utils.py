@@ -2,8 +2,87 @@ from pathlib import Path
 import geopandas as gpd
 import pyomo.environ as py
 import pyomo
+from pyomo.contrib.appsi.solvers import Gurobi
+from pyomo.repn import generate_standard_repn
 import pandas as pd
 import numpy as np
+import profiler
+import solvers
+import writer
+
+
+HORIZONS = ["full", "drop", "terminal"]
+MONTHS = list(range(1, 13, 1))
+# DAILY PEAK DEMANDS IN JANUARY AND DECEMBER (HIGH- AND MID-PRESSURE LINES)
+PEAK_MONTHS = [1, 12]
+PEAK_FACTOR = 1.1
+# PARAMETERS THAT ARE MUTABLE IN A MODEL BUILT FOR SEVERAL SCENARIOS (SEE UPDATE_SCENARIO_PARAMETERS)
+SCENARIO_PARAMETERS = [
+    "par_source_mp",
+    "par_source_hp",
+    "par_source_tra",
+    "par_demand_high",
+    "par_demand_mid",
+    "par_demand_tra",
+    "par_gas_prices",
+    "par_value_of_lost_load_high",
+    "par_value_of_lost_load_mid",
+]
+# DERIVED PARAMETER -> PARAMETERS IT IS COMPUTED FROM (SEE ADD_DERIVED_PARAMETERS)
+DERIVED_PARAMETERS = {
+    "par_depreciation_tra": ["par_year_of_inv_tra"],
+    "par_depreciation_high": ["par_year_of_inv_hp"],
+    "par_depreciation_mid": ["par_year_of_inv_mp"],
+    "par_book_value_tra": ["par_tra_length"],
+    "par_book_value_high": ["par_high_length", "par_ref_high"],
+    "par_book_value_mid": ["par_mid_length", "par_ref_mid"],
+}
+# HIGH-PRESSURE NODES THAT ARE NOT CONNECTED TO THE TRANSMISSION NETWORK
+ISOLATED_NODES = [
+    "Hainburg a.d.Donau",
+    "Marchegg",
+    "Hartberg",
+    "Gabersdorf",
+    "Rosegg",
+    "Gänserndorf",
+    "Wolfsthal",
+    "Ludmannsdorf",
+    "Lambrechten",
+    "Heiligenkreuz am Waasen",
+    "Kittsee",
+    "Arnoldstein",
+    "Enzersfeld im Weinviertel",
+    "Wettmannstätten",
+    "Roßbach",
+    "Köttmannsdorf",
+    "Pinggau",
+    "Pillichsdorf",
+    "Schwand im Innkreis",
+    "Grafenstein",
+    "Neustift im Mühlkreis",
+    "Gralla",
+    "Mannsdorf an der Donau",
+    "Engelhartstetten",
+    "Berg",
+    "Schwanberg",
+    "Kirchheim im Innkreis",
+    "Ruden",
+    "Straß in Steiermark",
+    "Überackern",
+    "Bromberg",
+    "Leobendorf",
+    "Deutsch Jahrndorf",
+    "Enzersdorf an der Fischa",
+]
+# Knoten mit die von Netzebene 2 auf Netzebene 1 umgehängt werden.
+SWITCHED_NODES = [
+    'Schlierbach', 'Kremsmünster', 'Roitham am Traunfall', 'Wartberg an der Krems',
+    'Micheldorf in Oberösterreich', 'Gampern',
+    'Kapfenberg', 'Wiener Neustadt', 'Spital am Semmering',
+    'Gramatneusiedl', 'Natschbach-Loipersbach', 'Schottwien',
+    'Sankt Marein im Mürztal', 'Eggendorf', 'Ebenfurth', 'Ebreichsdorf',
+    'Krieglach', 'Breitenau', 'Kindberg', 'Mürzzuschlag', 'Pottendorf',
+]
 
 
 def read_shapefile(path=None, name=None):
@@ -22,7 +101,8 @@ def read_shapefile(path=None, name=None):
 
     """
     _path = Path(path)
-    _data = gpd.read_file(_path / name)
+    with profiler.measure("read", name):
+        _data = gpd.read_file(_path / name)
     return _data
 
 
@@ -98,59 +178,13 @@ def add_nodal_sets(model=None, nodes=None):
 
     """
     model.set_compressor = py.Set(initialize=nodes["Compressor"])
-    _isolated_nodes_from_transmission_network = [
-        "Hainburg a.d.Donau",
-        "Marchegg",
-        "Hartberg",
-        "Gabersdorf",
-        "Rosegg",
-        "Gänserndorf",
-        "Wolfsthal",
-        "Ludmannsdorf",
-        "Lambrechten",
-        "Heiligenkreuz am Waasen",
-        "Kittsee",
-        "Arnoldstein",
-        "Enzersfeld im Weinviertel",
-        "Wettmannstätten",
-        "Roßbach",
-        "Köttmannsdorf",
-        "Pinggau",
-        "Pillichsdorf",
-        "Schwand im Innkreis",
-        "Grafenstein",
-        "Neustift im Mühlkreis",
-        "Gralla",
-        "Mannsdorf an der Donau",
-        "Engelhartstetten",
-        "Berg",
-        "Schwanberg",
-        "Kirchheim im Innkreis",
-        "Ruden",
-        "Straß in Steiermark",
-        "Überackern",
-        "Bromberg",
-        "Leobendorf",
-        "Deutsch Jahrndorf",
-        "Enzersdorf an der Fischa",
-    ]
-    model.set_node_hp = py.Set(
-        initialize=nodes["High-Pressure"] + _isolated_nodes_from_transmission_network
-    )
+    model.set_node_hp = py.Set(initialize=nodes["High-Pressure"] + ISOLATED_NODES)
     model.set_node_mp = py.Set(initialize=nodes["Mid-Pressure"])
     model.set_delivery_tra_hp = py.Set(initialize=nodes["Delivery (transmission_high)"])
     model.set_delivery_hp_mp = py.Set(initialize=nodes["Delivery (high_mid)"])
     _storage = list(set(model.storage["Node"]))
     model.set_storage = py.Set(initialize=_storage)
-    # Knoten mit die von Netzebene 2 auf Netzebene 1 umgehängt werden.
-    list_of_nodes_switched = ['Schlierbach', 'Kremsmünster', 'Roitham am Traunfall', 'Wartberg an der Krems',
-                              'Micheldorf in Oberösterreich', 'Gampern',
-                              'Kapfenberg', 'Wiener Neustadt', 'Spital am Semmering',
-                              'Gramatneusiedl', 'Natschbach-Loipersbach', 'Schottwien',
-                              'Sankt Marein im Mürztal', 'Eggendorf', 'Ebenfurth', 'Ebreichsdorf',
-                              'Krieglach', 'Breitenau', 'Kindberg', 'Mürzzuschlag', 'Pottendorf',
-                              ]
-    model.set_nodes_switched = py.Set(initialize=list_of_nodes_switched)
+    model.set_nodes_switched = py.Set(initialize=SWITCHED_NODES)
     return
 
 
@@ -184,7 +218,411 @@ def add_line_sets(model=None, data=None):
     return
 
 
-def add_time_horizon(model=None, year=None, temporal=None):
+def get_radial_branches(data=None, fixed_nodes=None):
+    """
+    Detects the radial branches of a network level: a node that is connected by one line only (leaf) is
+    folded into its neighbour, repeatedly, so that chains of series pipes towards a leaf are folded as
+    well. The flow of a folded line follows from the net demand (demand - source) of the nodes behind
+    it; the nodes behind need no gas balance and no import or export variables.
+
+    Parameters
+    ----------
+    data : GeoDataFrame, required
+        Includes the lines (index) with their Start and End nodes. The default is None.
+    fixed_nodes : List, optional
+        Nodes that are never folded (e.g., connections to another network level or storage). The
+        default is None.
+
+    Returns
+    -------
+    reduction : Dict
+        Includes per folded line the sign of the flow from Start to End (+1 if the nodes behind are at
+        the End) and the nodes behind the line ("lines"), and the folded nodes ("nodes").
+
+    """
+    _fixed = set() if fixed_nodes is None else set(fixed_nodes)
+    _incident = dict()
+    for _line, _start, _end in zip(data.index, data.Start, data.End):
+        _incident.setdefault(_start, []).append(_line)
+        _incident.setdefault(_end, []).append(_line)
+    _degree = {_node: len(_lines) for _node, _lines in _incident.items()}
+    _behind = {_node: [_node] for _node in _incident}
+
+    reduction = {"lines": dict(), "nodes": []}
+    _leaves = [_n for _n in _incident if (_degree[_n] == 1) and (_n not in _fixed)]
+    while _leaves:
+        _node = _leaves.pop(0)
+        if _degree[_node] != 1:
+            # LAST NODE OF A RADIAL NETWORK (KEEPS ITS GAS BALANCE)
+            continue
+        _line = next(_l for _l in _incident[_node] if _l not in reduction["lines"])
+        _start, _end = data.at[_line, "Start"], data.at[_line, "End"]
+        _other = _start if _end == _node else _end
+        reduction["lines"][_line] = (1 if _end == _node else -1, _behind[_node])
+        reduction["nodes"].append(_node)
+        _behind[_other] = _behind[_other] + _behind[_node]
+        _degree[_node] = 0
+        _degree[_other] -= 1
+        if (_degree[_other] == 1) and (_other not in _fixed):
+            _leaves.append(_other)
+    return reduction
+
+
+def add_network_reduction(model=None, reduce=False):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance with the nodal and line sets. The default is None.
+    reduce : bool, optional
+        If True, the radial branches of the mid-pressure network level are folded (see
+        get_radial_branches); nodes connected to the high-pressure level or with storage are kept. The
+        investment decisions of all lines remain in the model. The default is False.
+
+    Returns
+    -------
+    None.
+
+    """
+    if reduce:
+        model.mid_reduction = get_radial_branches(
+            data=model.mid,
+            fixed_nodes=list(model.set_node_hp) + list(model.storage.Node),
+        )
+    else:
+        model.mid_reduction = {"lines": dict(), "nodes": []}
+    # LINES WITH A FLOW VARIABLE AND NODES WITH A GAS BALANCE
+    model.set_line_mid_flow = py.Set(
+        initialize=[_l for _l in model.set_line_mid if _l not in model.mid_reduction["lines"]]
+    )
+    _folded = set(model.mid_reduction["nodes"])
+    model.set_node_mp_flow = py.Set(
+        initialize=[_n for _n in model.set_node_mp if _n not in _folded]
+    )
+    return
+
+
+def get_transported_mid(model=None, line=None, year=None, month=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    line : integer, required
+        Line at the mid-pressure network level. The default is None.
+    year : integer, required
+        Dispatch year. The default is None.
+    month : integer, required
+        Time slice. The default is None.
+
+    Returns
+    -------
+    Variable or expression
+        Flow of the line; for a folded line (see add_network_reduction) the net demand of the nodes
+        behind the line divided by the hours of the time slice.
+
+    """
+    if line not in model.mid_reduction["lines"]:
+        return model.var_transported_mid[line, year, month]
+    _sign, _nodes = model.mid_reduction["lines"][line]
+    return (
+        _sign
+        * sum(
+            get_node_variable(variable=model.var_demand_mid, node=_node, year=year, month=month)
+            - get_node_variable(variable=model.var_source_mid, node=_node, year=year, month=month)
+            for _node in _nodes
+        )
+        / model.par_total_peak_factor[month]
+    )
+
+
+def get_node_variable(variable=None, node=None, year=None, month=None):
+    """
+    Parameters
+    ----------
+    variable : pyomo.Var, required
+        Variable indexed by a (sparse) node set, years, and optionally months (see
+        add_sparse_node_sets). The default is None.
+    node : String, required
+        Name of the node. The default is None.
+    year : integer, required
+        Dispatch year. The default is None.
+    month : integer, optional
+        Time slice. The default is None (variable per node and year).
+
+    Returns
+    -------
+    Variable or 0
+        Variable of the node; 0 if the node is not part of the index set (the variable would be 0).
+
+    """
+    _index = (node, year) if month is None else (node, year, month)
+    if _index in variable:
+        return variable[_index]
+    return 0
+
+
+def get_nodes_with_lines(adjacency=None, nodes=None, direction=None):
+    """
+    Parameters
+    ----------
+    adjacency : Dict, required
+        Adjacency of a network level (see get_adjacency). The default is None.
+    nodes : Iterable, required
+        Nodes of the network level. The default is None.
+    direction : String, required
+        "export" or "import". The default is None.
+
+    Returns
+    -------
+    List
+        Nodes with at least one line in the given direction (in the order of nodes).
+
+    """
+    _pointer, _ = adjacency[direction]
+    _position = adjacency["position"]
+    return [
+        _node
+        for _node in nodes
+        if (_node in _position) and (_pointer[_position[_node] + 1] > _pointer[_position[_node]])
+    ]
+
+
+def get_nodes_with_values(param=None, nodes=None):
+    """
+    Parameters
+    ----------
+    param : pyomo.Param, required
+        Parameter indexed by nodes (first index), years, and optionally months (e.g., par_source_hp).
+        The default is None.
+    nodes : Iterable, required
+        Nodes of the network level. The default is None.
+
+    Returns
+    -------
+    List
+        Nodes with a non-zero value in any year (in the order of nodes). If the parameter is mutable,
+        all nodes are returned, since the values may change with the scenario (see
+        update_scenario_parameters).
+
+    """
+    if param.mutable:
+        return list(nodes)
+    _used = set(_index[0] for _index, _value in param.extract_values().items() if _value != 0)
+    return [_node for _node in nodes if _node in _used]
+
+
+def get_monthly_demand_profile(model=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance with the scenario inputs (see scenarios.set_scenario_inputs). The
+        default is None.
+
+    Returns
+    -------
+    pandas.Series
+        Methane demand (high- and mid-pressure) per month (1-12) summed over all nodes and years, weighted
+        with the factors of INPUT_Time_Resolution.xlsx. The weights are optional: the sheet may include
+        one row per month with the columns Month (1-12) and Factor (weight of the month in the
+        clustering, see get_time_slices); without these columns (or for missing months), the weight is 1.
+
+    """
+    _demand = pd.concat([model.demand_high, model.demand_mid])
+    # INPUT DATA USES MONTHS 0-11, WHILE THE MODEL USES MONTHS 1-12.
+    _profile = _demand.groupby(_demand.Month + 1)["Value in MWh"].sum().reindex(MONTHS, fill_value=0)
+    _table = model.temporal_demand
+    if {"Month", "Factor"}.issubset(_table.columns):
+        _profile = _profile * _table.set_index("Month")["Factor"].reindex(MONTHS, fill_value=1)
+    return _profile
+
+
+def get_time_slices(profile=None, temporal=None, adjacent=True):
+    """
+    Clusters the months into time slices with k-means on the monthly demand profile. The profile is
+    one-dimensional, so that the k-means problem is solved exactly by dynamic programming over the
+    months in a fixed order (deterministic, no random initialisation):
+        - adjacent months: the order of the calendar, so that each time slice is a run of consecutive
+          months and the time slices follow each other in time (required by the state of charge of the
+          storages, see constraints.gas_balance_con_storage);
+        - otherwise: the order of the demand, so that months of the same season (e.g., January and
+          December) can share a time slice.
+
+    Parameters
+    ----------
+    profile : pandas.Series, required
+        Demand per month (see get_monthly_demand_profile). The default is None.
+    temporal : integer, required
+        Number of time slices (1-12); 12 keeps the months. The default is None.
+    adjacent : bool, optional
+        If True, only consecutive months are combined. The default is True.
+
+    Raises
+    ------
+    ValueError
+        If the number of time slices is not between 1 and the number of months.
+
+    Returns
+    -------
+    slices : Dict
+        Includes the months per time slice; the time slices are numbered (from 1) by their first month.
+
+    """
+    _n = len(profile)
+    if not 1 <= temporal <= _n:
+        raise ValueError("Number of time slices must be between 1 and {}".format(_n))
+    if adjacent:
+        _order = np.arange(_n)
+    else:
+        _order = np.argsort(profile.to_numpy(dtype=float), kind="stable")
+    _values = profile.to_numpy(dtype=float)[_order]
+    _sum = np.concatenate([[0], np.cumsum(_values)])
+    _squares = np.concatenate([[0], np.cumsum(_values**2)])
+
+    # SUM OF SQUARED ERRORS OF THE SORTED VALUES WITH THE POSITIONS FROM I TO J - 1
+    def _error(i, j):
+        return _squares[j] - _squares[i] - (_sum[j] - _sum[i]) ** 2 / (j - i)
+
+    _cost = np.full((temporal + 1, _n + 1), np.inf)
+    _cost[0, 0] = 0
+    _start = np.zeros((temporal + 1, _n + 1), dtype=int)
+    for _k in range(1, temporal + 1):
+        for _j in range(_k, _n + 1):
+            for _i in range(_k - 1, _j):
+                _value = _cost[_k - 1, _i] + _error(_i, _j)
+                if _value < _cost[_k, _j]:
+                    _cost[_k, _j] = _value
+                    _start[_k, _j] = _i
+
+    _clusters = []
+    _j = _n
+    for _k in range(temporal, 0, -1):
+        _i = _start[_k, _j]
+        _clusters.append(sorted(int(_month) for _month in profile.index[_order[_i:_j]]))
+        _j = _i
+    return {_slice: _months for _slice, _months in enumerate(sorted(_clusters), start=1)}
+
+
+def get_time_slice_of_month(model=None, month=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance (see add_time_horizon). The default is None.
+    month : integer, required
+        Month (1-12). The default is None.
+
+    Returns
+    -------
+    integer
+        Time slice that includes the month.
+
+    """
+    return next(_slice for _slice, _months in model.time_slices.items() if month in _months)
+
+
+def get_values_per_time_slice(model=None, values=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance (see add_time_horizon). The default is None.
+    values : numpy.ndarray, required
+        Values per month (1-12) along the last axis. The default is None.
+
+    Returns
+    -------
+    numpy.ndarray
+        Sums of the values per time slice along the last axis.
+
+    """
+    return np.stack(
+        [
+            values[..., np.array(_months) - 1].sum(axis=-1)
+            for _months in model.time_slices.values()
+        ],
+        axis=-1,
+    )
+
+
+def get_dispatch_shares(years=None, dispatch_years=None):
+    """
+    Shares of each year that are represented by the dispatch years: linear interpolation between the
+    neighbouring dispatch years (like the input data between the milestones), constant before the first
+    and after the last dispatch year.
+
+    Parameters
+    ----------
+    years : List, required
+        Modeled years. The default is None.
+    dispatch_years : List, required
+        Representative years with dispatch (sorted subset of years). The default is None.
+
+    Returns
+    -------
+    shares : Dict
+        Includes per year a list of (dispatch year, share) tuples; the shares of a year sum up to 1.
+
+    """
+    shares = dict()
+    for _year in years:
+        _before = [_d for _d in dispatch_years if _d <= _year]
+        _after = [_d for _d in dispatch_years if _d >= _year]
+        if not _before:
+            shares[_year] = [(_after[0], 1)]
+        elif (not _after) or (_before[-1] == _year):
+            shares[_year] = [(_before[-1], 1)]
+        else:
+            _share = (_year - _before[-1]) / (_after[0] - _before[-1])
+            shares[_year] = [(_before[-1], 1 - _share), (_after[0], _share)]
+    return shares
+
+
+def get_dispatch_year(model=None, year=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    year : integer, required
+        Modeled year. The default is None.
+
+    Returns
+    -------
+    integer
+        Dispatch year with the largest share of the year (the earlier one if both shares are equal).
+
+    """
+    return max(model.dispatch_shares[year], key=lambda _x: _x[1])[0]
+
+
+def get_dispatch_year_before(model=None, year=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    year : integer, required
+        Year. The default is None.
+
+    Returns
+    -------
+    integer
+        Last dispatch year before year (None if there is none).
+
+    """
+    return max((_d for _d in model.set_dispatch_year if _d < year), default=None)
+
+
+def add_time_horizon(
+    model=None,
+    year=None,
+    temporal=None,
+    horizon="full",
+    objective_year=2050,
+    dispatch_years=None,
+):
     """
     Parameters
     ----------
@@ -193,16 +631,73 @@ def add_time_horizon(model=None, year=None, temporal=None):
     year : integer, required
         Defines the final year of the modeling. The default is None.
     temporal : integer, required
-        Defines the time steps per year. The default is None.
+        Defines the time steps per year: 12 months, or fewer time slices that combine months with a
+        similar demand (see get_time_slices; only consecutive months if the model includes storages).
+        The default is None.
+    horizon : String, optional
+        Years after the final year of the objective function (bookkeeping only):
+            - "full": all years until year are modeled;
+            - "drop": these years are not modeled;
+            - "terminal": these years are collapsed into one terminal year (year) with the book values,
+              depreciation, and the investments planned after objective_year.
+        The default is "full".
+    objective_year : integer, optional
+        Defines the final year of the objective function. The default is 2050.
+    dispatch_years : List, optional
+        Representative years in which the dispatch (flows, sources, demand, and storage) is modeled,
+        e.g., the milestones of the input data. Investments and book values remain annual; the
+        operational costs of the other years are weighted in the objective function (see
+        get_dispatch_shares). The default is None (dispatch in every year).
+
+    Raises
+    ------
+    ValueError
+        If the horizon is unknown, objective_year is after year, a dispatch year is not modeled, or the
+        number of time slices is not between 1 and 12.
 
     Returns
     -------
     None.
 
     """
+    if horizon not in HORIZONS:
+        raise ValueError("Unknown horizon: {}".format(horizon))
+    if objective_year > year:
+        raise ValueError("The objective function ends after the final year of the modeling")
+
+    if horizon == "full":
+        _years = list(range(2025, year + 1, 1))
+    elif horizon == "drop":
+        _years = list(range(2025, objective_year + 1, 1))
+    else:
+        _years = list(range(2025, objective_year + 1, 1))
+        if year > objective_year:
+            _years.append(year)
 
-    model.set_year = py.Set(initialize=range(2025, year + 1, 1))
-    model.set_time_unit = py.Set(initialize=range(1, temporal + 1, 1))
+    if dispatch_years is None:
+        _dispatch_years = list(_years)
+    else:
+        _dispatch_years = sorted(set(dispatch_years))
+        for _year in _dispatch_years:
+            if _year not in _years:
+                raise ValueError("Dispatch year {} is not modeled".format(_year))
+
+    model.set_year = py.Set(initialize=_years)
+    model.set_dispatch_year = py.Set(initialize=_dispatch_years)
+    if temporal == len(MONTHS):
+        # THE MONTHS ARE KEPT: NO DEMAND PROFILE (AND NO WEIGHTS OF INPUT_TIME_RESOLUTION.XLSX) NEEDED
+        model.time_slices = {_month: [_month] for _month in MONTHS}
+    else:
+        # THE STATE OF CHARGE OF THE STORAGES LINKS CONSECUTIVE TIME SLICES
+        model.time_slices = get_time_slices(
+            profile=get_monthly_demand_profile(model=model),
+            temporal=temporal,
+            adjacent=len(model.storage) > 0,
+        )
+    model.set_time_unit = py.Set(initialize=list(model.time_slices))
+    model.horizon = horizon
+    model.objective_year = objective_year
+    model.dispatch_shares = get_dispatch_shares(years=_years, dispatch_years=_dispatch_years)
     return
 
 
@@ -218,280 +713,355 @@ def add_cluster_sets(model=None):
     return
 
 
-def transmission_line_capacity_per_year(model, line, year):
-    _line = model.transmission.loc[line]
-    _start = _line.Start
-    _end = _line.End
-    _type = "Transmission"
-    _data = model.pipeline_technical
-    _data = _data.loc[
-        (_data.Start == _start) & (_data.End == _end) & (_data.Type == _type)
-    ]
-    _start = _data["Yr.-con."].item()
-    _end = _start + _data["Tec.-life"].item()
-    if _end > year:
-        return _data.Capacity.item()
-    else:
-        return 0
+def get_pipeline_table(lines=None, technical=None, economic=None, pipeline_type=None):
+    """
+    Parameters
+    ----------
+    lines : GeoDataFrame, required
+        Includes the (pipe)lines of one network level (shapefile). The default is None.
+    technical : DataFrame, required
+        Includes the technical pipeline data (Capacity, Yr.-con., Tec.-life). The default is None.
+    economic : DataFrame, required
+        Includes the economic pipeline data (Inv.-cost, Amort.). The default is None.
+    pipeline_type : String, required
+        Type of the pipelines in the technical and economic data (e.g., "Transmission"). The default is None.
+
+    Raises
+    ------
+    ValueError
+        If a line is missing or duplicated in the technical or economic data.
 
+    Returns
+    -------
+    _table : DataFrame
+        Includes one row per line (same index as the shapefile) with the technical and economic data.
 
-def high_line_capacity_per_year(model, line, year):
-    _line = model.high.loc[line]
-    _start = _line.Start
-    _end = _line.End
-    _type = "High-Pressure"
-    _data = model.pipeline_technical
-    _data = _data.loc[
-        (_data.Start == _start) & (_data.End == _end) & (_data.Type == _type)
+    """
+    _key = ["Start", "End", "Type"]
+    _lines = pd.DataFrame(
+        {"Line": lines.index, "Start": lines.Start, "End": lines.End, "Type": pipeline_type}
+    )
+    _technical = technical.loc[
+        technical.Type == pipeline_type, _key + ["Capacity", "Yr.-con.", "Tec.-life"]
     ]
-    _start = _data["Yr.-con."].item()
-    _end = _start + _data["Tec.-life"].item()
-    if _end > year:
-        return _data.Capacity.item()
-    else:
-        return 0
-
+    _economic = economic.loc[
+        economic.Type == pipeline_type, _key + ["Inv.-cost", "Amort."]
+    ]
+    _table = _lines.merge(_technical, how="left", on=_key, indicator="_technical")
+    _table = _table.merge(_economic, how="left", on=_key, indicator="_economic")
 
-def mid_line_capacity_per_year(model, line, year):
-    _line = model.mid.loc[line]
-    _start = _line.Start
-    _end = _line.End
-    _type = "Mid-Pressure"
-    _data = model.pipeline_technical
-    _data = _data.loc[
-        (_data.Start == _start) & (_data.End == _end) & (_data.Type == _type)
+    _missing = _table.loc[
+        (_table._technical == "left_only") | (_table._economic == "left_only")
     ]
-    _start = _data["Yr.-con."].item()
-    _end = _start + _data["Tec.-life"].item()
-    if _end > year:
-        return _data.Capacity.item()
-    else:
-        return 0
+    _duplicated = _table.loc[_table.Line.duplicated(keep=False)]
+    if not _missing.empty or not _duplicated.empty:
+        _message = "{}: pipeline data does not match the lines of the shapefile.".format(
+            pipeline_type
+        )
+        if not _missing.empty:
+            _message += " Missing: {}.".format(
+                list(zip(_missing.Line, _missing.Start, _missing.End))
+            )
+        if not _duplicated.empty:
+            _duplicated = _duplicated.drop_duplicates("Line")
+            _message += " Duplicated: {}.".format(
+                list(zip(_duplicated.Line, _duplicated.Start, _duplicated.End))
+            )
+        raise ValueError(_message)
+
+    _table = _table.drop(columns=["_technical", "_economic"]).set_index("Line")
+    _table.index.name = lines.index.name
+    return _table
+
+
+def add_pipeline_tables(model=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
 
+    Returns
+    -------
+    None.
 
-def init_nodal_demand_at_high_pressure(model, node, year, time):
-    if node in model.set_nodes_switched:
-        if year < 2030:
-            if node in model.set_node_mp:
-                _data = model.demand_high
-                if year > 2050:
-                    return _data.loc[
-                        (_data.Node == node)
-                        & (_data.Year == 2050)
-                        & (_data.Month == (time - 1))
-                        ]["Value in MWh"].item()
-                else:
-                    return _data.loc[
-                        (_data.Node == node)
-                        & (_data.Year == year)
-                        & (_data.Month == (time - 1))
-                        ]["Value in MWh"].item()
-            else:
-                _data_h = model.demand_high
-                _data_m = model.demand_mid
-                if year > 2050:
-                    _val_h = _data_h.loc[
-                        (_data_h.Node == node)
-                        & (_data_h.Year == 2050)
-                        & (_data_h.Month == (time - 1))
-                        ]["Value in MWh"].item()
-                    _val_m = _data_m.loc[
-                        (_data_m.Node == node)
-                        & (_data_m.Year == 2050)
-                        & (_data_m.Month == (time - 1))
-                        ]["Value in MWh"].item()
-                    return _val_h + _val_m
-                else:
-                    _val_h = _data_h.loc[
-                        (_data_h.Node == node)
-                        & (_data_h.Year == year)
-                        & (_data_h.Month == (time - 1))
-                        ]["Value in MWh"].item()
-                    _val_m = _data_m.loc[
-                        (_data_m.Node == node)
-                        & (_data_m.Year == year)
-                        & (_data_m.Month == (time - 1))
-                        ]["Value in MWh"].item()
-                    return _val_h + _val_m
-        else:
-            _data_h = model.demand_high
-            _data_m = model.demand_mid
-            if year > 2050:
-                _val_h = _data_h.loc[
-                    (_data_h.Node == node)
-                    & (_data_h.Year == 2050)
-                    & (_data_h.Month == (time - 1))
-                    ]["Value in MWh"].item()
-                _val_m = _data_m.loc[
-                    (_data_m.Node == node)
-                    & (_data_m.Year == 2050)
-                    & (_data_m.Month == (time - 1))
-                    ]["Value in MWh"].item()
-                return _val_h + _val_m
-            else:
-                _val_h = _data_h.loc[
-                    (_data_h.Node == node)
-                    & (_data_h.Year == year)
-                    & (_data_h.Month == (time - 1))
-                    ]["Value in MWh"].item()
-                _val_m = _data_m.loc[
-                    (_data_m.Node == node)
-                    & (_data_m.Year == year)
-                    & (_data_m.Month == (time - 1))
-                    ]["Value in MWh"].item()
-                return _val_h + _val_m
-    else:
-        if node in model.set_node_mp:
-            _data = model.demand_high
-            if year > 2050:
-                return _data.loc[
-                    (_data.Node == node)
-                    & (_data.Year == 2050)
-                    & (_data.Month == (time - 1))
-                ]["Value in MWh"].item()
-            else:
-                return _data.loc[
-                    (_data.Node == node)
-                    & (_data.Year == year)
-                    & (_data.Month == (time - 1))
-                ]["Value in MWh"].item()
-        else:
-            _data_h = model.demand_high
-            _data_m = model.demand_mid
-            if year > 2050:
-                _val_h = _data_h.loc[
-                    (_data_h.Node == node)
-                    & (_data_h.Year == 2050)
-                    & (_data_h.Month == (time - 1))
-                ]["Value in MWh"].item()
-                _val_m = _data_m.loc[
-                    (_data_m.Node == node)
-                    & (_data_m.Year == 2050)
-                    & (_data_m.Month == (time - 1))
-                ]["Value in MWh"].item()
-                return _val_h + _val_m
-            else:
-                _val_h = _data_h.loc[
-                    (_data_h.Node == node)
-                    & (_data_h.Year == year)
-                    & (_data_h.Month == (time - 1))
-                ]["Value in MWh"].item()
-                _val_m = _data_m.loc[
-                    (_data_m.Node == node)
-                    & (_data_m.Year == year)
-                    & (_data_m.Month == (time - 1))
-                ]["Value in MWh"].item()
-                return _val_h + _val_m
-
-
-def init_nodal_demand_at_mid_pressure(model, node, year, time):
-    # methane demand is generally split into high-pressure (hp) and mid-pressure (mp).
-    # therefore, it has to be checked to which pressure levels a node is connected.
-    # in order to parametrize methane demands, first the mid-pressure nodes are used.
-    # consequently, if a node is connected to the mp but not to the hp level, all methane demands are handled as mp.
-    if node in model.set_nodes_switched:
-        if year < 2030:
-            if node in model.set_node_hp:
-                # dieser knoten ist mit der mitteldruck und hochdruck ebene verbunden
-                # daher können die verbräuche getrennt behandelt werden
-                _data = model.demand_mid
-                if year > 2050:
-                    # constant mid-pressure methane demand between 2050 and 2065.
-                    return _data.loc[
-                        (_data.Node == node)
-                        & (_data.Year == 2050)
-                        & (_data.Month == (time - 1))
-                        ]["Value in MWh"].item()
-                else:
-                    # return value accordingly to existing input data.
-                    return _data.loc[
-                        (_data.Node == node)
-                        & (_data.Year == year)
-                        & (_data.Month == (time - 1))
-                        ]["Value in MWh"].item()
-            else:
-                # der knoten ist nur mit der mitteldruckebene verbunden, nicht aber mit der hochdruckebene
-                # dementsprechend wird der gesamate methanverbrauch der mitteldruckebene zugeschrieben
-                _data_h = model.demand_high
-                _data_m = model.demand_mid
-                if year > 2050:
-                    # constant total methane demand (i.e., sum of mp and hp) between 2050 and 2065.
-                    _val_h = _data_h.loc[
-                        (_data_h.Node == node)
-                        & (_data_h.Year == 2050)
-                        & (_data_h.Month == (time - 1))
-                        ]["Value in MWh"].item()
-                    _val_m = _data_m.loc[
-                        (_data_m.Node == node)
-                        & (_data_m.Year == 2050)
-                        & (_data_m.Month == (time - 1))
-                        ]["Value in MWh"].item()
-                    return _val_h + _val_m
-                else:
-                    # return value accordingly to existing input data.
-                    _val_h = _data_h.loc[
-                        (_data_h.Node == node)
-                        & (_data_h.Year == year)
-                        & (_data_h.Month == (time - 1))
-                        ]["Value in MWh"].item()
-                    _val_m = _data_m.loc[
-                        (_data_m.Node == node)
-                        & (_data_m.Year == year)
-                        & (_data_m.Month == (time - 1))
-                        ]["Value in MWh"].item()
-                    return _val_h + _val_m
-        else:
-            return 0
+    """
+    model.pipeline_tra = get_pipeline_table(
+        lines=model.transmission,
+        technical=model.pipeline_technical,
+        economic=model.pipeline_economic,
+        pipeline_type="Transmission",
+    )
+    model.pipeline_high = get_pipeline_table(
+        lines=model.high,
+        technical=model.pipeline_technical,
+        economic=model.pipeline_economic,
+        pipeline_type="High-Pressure",
+    )
+    model.pipeline_mid = get_pipeline_table(
+        lines=model.mid,
+        technical=model.pipeline_technical,
+        economic=model.pipeline_economic,
+        pipeline_type="Mid-Pressure",
+    )
+    return
+
+
+def get_values_per_line_and_year(lines=None, years=None, values=None):
+    """
+    Parameters
+    ----------
+    lines : List, required
+        Lines (first dimension of values). The default is None.
+    years : List, required
+        Years (second dimension of values). The default is None.
+    values : numpy.ndarray, required
+        Matrix of values (lines x years). The default is None.
+
+    Returns
+    -------
+    Dict
+        Values per (line, year) to initialize a pyomo.Param.
+
+    """
+    _index = [(line, year) for line in lines for year in years]
+    return dict(zip(_index, values.ravel().tolist()))
+
+
+def get_pipeline_capacity_per_year(table=None, years=None):
+    """
+    Existing pipeline capacity per line and year (zero from the end of the technical lifetime onwards).
+
+    Parameters
+    ----------
+    table : DataFrame, required
+        Includes one row per line (see get_pipeline_table). The default is None.
+    years : List, required
+        Years of the modeling horizon. The default is None.
+
+    Returns
+    -------
+    Dict
+        Pipeline capacity per (line, year).
+
+    """
+    _years = np.array(years)
+    _end = (table["Yr.-con."] + table["Tec.-life"]).to_numpy()
+    _capacity = np.where(
+        _end[:, None] > _years[None, :], table.Capacity.to_numpy()[:, None], 0
+    )
+    return get_values_per_line_and_year(
+        lines=table.index.tolist(), years=years, values=_capacity
+    )
+
+
+def get_pipeline_year_of_inv(table=None):
+    """
+    Planned year of the refurbishment investment (i.e., end of the technical lifetime) per line.
+
+    Parameters
+    ----------
+    table : DataFrame, required
+        Includes one row per line (see get_pipeline_table). The default is None.
+
+    Returns
+    -------
+    Dict
+        Year of investment per line.
+
+    """
+    _end = table["Yr.-con."] + table["Tec.-life"]
+    return dict(zip(table.index.tolist(), _end.tolist()))
+
+
+def get_year_of_inv_in_horizon(model=None, year_of_inv=None):
+    """
+    In the terminal horizon, investments planned after the final year of the objective function are
+    shifted to the terminal year (see add_time_horizon).
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    year_of_inv : Dict, required
+        Year of investment per line (see get_pipeline_year_of_inv). The default is None.
+
+    Returns
+    -------
+    Dict
+        Year of investment per line within the modeled years.
+
+    """
+    if model.horizon != "terminal":
+        return year_of_inv
+    _terminal = model.set_year.last()
+    return {
+        _line: (_terminal if _year > model.objective_year else _year)
+        for _line, _year in year_of_inv.items()
+    }
+
+
+def get_pipeline_book_value_per_year(
+    table=None, years=None, length=None, specific_costs=None
+):
+    """
+    Book value of the existing pipelines per line and year (linear depreciation over the amortization period).
+
+    Parameters
+    ----------
+    table : DataFrame, required
+        Includes one row per line (see get_pipeline_table). The default is None.
+    years : List, required
+        Years of the modeling horizon. The default is None.
+    length : numpy.ndarray, required
+        Length per line (same order as table). The default is None.
+    specific_costs : numpy.ndarray or float, optional
+        Specific investment costs per MW and km. If None, the investment costs of the economic data are used.
+        The default is None.
+
+    Returns
+    -------
+    Dict
+        Book value per (line, year).
+
+    """
+    _years = np.array(years)[None, :]
+    _capacity = table.Capacity.to_numpy()
+    _con = table["Yr.-con."].to_numpy()[:, None]
+    _amo = table["Amort."].to_numpy()[:, None]
+    if specific_costs is None:
+        _value = _capacity * table["Inv.-cost"].to_numpy() * length
     else:
-        if node in model.set_node_hp:
-            # dieser knoten ist mit der mitteldruck und hochdruck ebene verbunden
-            # daher können die verbräuche getrennt behandelt werden
-            _data = model.demand_mid
-            if year > 2050:
-                # constant mid-pressure methane demand between 2050 and 2065.
-                return _data.loc[
-                    (_data.Node == node)
-                    & (_data.Year == 2050)
-                    & (_data.Month == (time - 1))
-                ]["Value in MWh"].item()
-            else:
-                # return value accordingly to existing input data.
-                return _data.loc[
-                    (_data.Node == node)
-                    & (_data.Year == year)
-                    & (_data.Month == (time - 1))
-                ]["Value in MWh"].item()
+        _value = _capacity * length * specific_costs
+    _book_value = np.where(
+        _years > _con + _amo, 0, _value[:, None] * (1 - (_years - _con) / _amo)
+    )
+    return get_values_per_line_and_year(
+        lines=table.index.tolist(), years=years, values=_book_value
+    )
+
+
+
+def get_demand_per_node_year_and_month(data=None, nodes=None, years=None, months=None):
+    """
+    Parameters
+    ----------
+    data : DataFrame, required
+        Includes the methane demand with the columns Node, Year, Month, and Value in MWh. The default is None.
+    nodes : List, required
+        Nodes for which the demand is looked up. The default is None.
+    years : List, required
+        Years of the modeling horizon. The default is None.
+    months : List, required
+        Time steps per year (1-12). The default is None.
+
+    Returns
+    -------
+    _values : numpy.ndarray
+        Demand per node, year, and month (flattened in this order). Years after 2050 are clamped to 2050.
+        Missing combinations are returned as NaN.
+
+    """
+    _index = pd.MultiIndex.from_product(
+        [nodes, years, months], names=["Node", "Year", "Month"]
+    )
+    # INPUT DATA ENDS IN 2050 AND USES MONTHS 0-11, WHILE THE MODEL USES MONTHS 1-12.
+    _lookup = pd.MultiIndex.from_arrays(
+        [
+            _index.get_level_values("Node"),
+            np.minimum(_index.get_level_values("Year"), 2050),
+            _index.get_level_values("Month") - 1,
+        ]
+    )
+    _data = data.set_index(["Node", "Year", "Month"])["Value in MWh"]
+    _duplicated = _data.index.duplicated(keep=False)
+    if _duplicated.any():
+        _ambiguous = _data.index[_duplicated].unique()
+        _ambiguous = _ambiguous[_ambiguous.isin(_lookup)]
+        if len(_ambiguous) > 0:
+            raise ValueError(
+                "Duplicated methane demand for (Node, Year, Month): {}".format(
+                    list(_ambiguous[:10])
+                )
+            )
+        _data = _data[~_duplicated]
+    return _data.reindex(_lookup).to_numpy(dtype=float)
+
+
+def init_nodal_demand_per_pressure_level(model=None):
+    """
+    Methane demand is generally split into high-pressure (hp) and mid-pressure (mp).
+    Therefore, it has to be checked to which pressure levels a node is connected:
+    - if a node is connected to both levels, the demands are handled separately.
+    - if a node is connected to one level only, the total demand (hp + mp) is handled at this level.
+    - nodes switched from the mid-pressure to the high-pressure level are handled at the high-pressure
+      level from 2030 onwards.
+    Demands between 2050 and 2065 are kept constant at the 2050 values. The monthly demands are summed
+    up per time slice (see get_time_slices).
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+
+    Returns
+    -------
+    demand_high : Dict
+        High-pressure methane demand per (node, year, time slice).
+    demand_mid : Dict
+        Mid-pressure methane demand per (node, year, time slice).
+
+    """
+    _years = list(model.set_year)
+    _months = MONTHS
+    _switched = set(model.set_nodes_switched)
+
+    _result = []
+    for _nodes, _other_level, _name in [
+        (list(model.set_node_hp), set(model.set_node_mp), "High-Pressure"),
+        (list(model.set_node_mp), set(model.set_node_hp), "Mid-Pressure"),
+    ]:
+        _high = get_demand_per_node_year_and_month(
+            data=model.demand_high, nodes=_nodes, years=_years, months=_months
+        )
+        _mid = get_demand_per_node_year_and_month(
+            data=model.demand_mid, nodes=_nodes, years=_years, months=_months
+        )
+        _shape = (len(_nodes), len(_years), len(_months))
+        _is_switched = pd.Index(_nodes).isin(_switched)[:, None, None]
+        _at_other_level = pd.Index(_nodes).isin(_other_level)[:, None, None]
+        _from_2030 = (np.array(_years) >= 2030)[None, :, None]
+        _is_switched = np.broadcast_to(_is_switched, _shape).ravel()
+        _at_other_level = np.broadcast_to(_at_other_level, _shape).ravel()
+        _from_2030 = np.broadcast_to(_from_2030, _shape).ravel()
+        _switched_from_2030 = _is_switched & _from_2030
+
+        if _name == "High-Pressure":
+            # only the high-pressure share if the node is also connected to the mid-pressure level.
+            # switched nodes take over the total demand from 2030 onwards.
+            _values = np.where(
+                _at_other_level & ~_switched_from_2030, _high, _high + _mid
+            )
         else:
-            # der knoten ist nur mit der mitteldruckebene verbunden, nicht aber mit der hochdruckebene
-            # dementsprechend wird der gesamate methanverbrauch der mitteldruckebene zugeschrieben
-            _data_h = model.demand_high
-            _data_m = model.demand_mid
-            if year > 2050:
-                # constant total methane demand (i.e., sum of mp and hp) between 2050 and 2065.
-                _val_h = _data_h.loc[
-                    (_data_h.Node == node)
-                    & (_data_h.Year == 2050)
-                    & (_data_h.Month == (time - 1))
-                ]["Value in MWh"].item()
-                _val_m = _data_m.loc[
-                    (_data_m.Node == node)
-                    & (_data_m.Year == 2050)
-                    & (_data_m.Month == (time - 1))
-                ]["Value in MWh"].item()
-                return _val_h + _val_m
-            else:
-                # return value accordingly to existing input data.
-                _val_h = _data_h.loc[
-                    (_data_h.Node == node)
-                    & (_data_h.Year == year)
-                    & (_data_h.Month == (time - 1))
-                ]["Value in MWh"].item()
-                _val_m = _data_m.loc[
-                    (_data_m.Node == node)
-                    & (_data_m.Year == year)
-                    & (_data_m.Month == (time - 1))
-                ]["Value in MWh"].item()
-                return _val_h + _val_m
+            # only the mid-pressure share if the node is also connected to the high-pressure level.
+            # switched nodes have no mid-pressure demand from 2030 onwards.
+            _values = np.where(_at_other_level, _mid, _high + _mid)
+            _values = np.where(_switched_from_2030, 0, _values)
+
+        _index = pd.MultiIndex.from_product([_nodes, _years, _months])
+        _missing = np.isnan(_values)
+        if _missing.any():
+            raise ValueError(
+                "Missing {} methane demand for (Node, Year, Month): {}".format(
+                    _name, list(_index[_missing][:10])
+                )
+            )
+        _values = get_values_per_time_slice(model=model, values=_values.reshape(_shape))
+        _index = pd.MultiIndex.from_product([_nodes, _years, list(model.set_time_unit)])
+        _result.append(dict(zip(_index, _values.ravel().tolist())))
+
+    demand_high, demand_mid = _result
+    return demand_high, demand_mid
 
 
 def init_nodal_demand_at_tra_pressure(model, node, year, time):
@@ -729,112 +1299,32 @@ def high_line_depreciation_factor_per_year(model, line, year):
         _val = 1 - ((year - _year) / 20)
         if _val >= 0:
             return _val
-        else:
-            return 0
-
-
-def tra_line_depreciation_factor_per_year(model, line, year):
-    _year = model.par_year_of_inv_tra[line]
-    if year < _year:
-        return 0
-    else:
-        _val = 1 - ((year - _year) / 20)
-        if _val >= 0:
-            return _val
-        else:
-            return 0
-
-
-def mid_line_depreciation_factor_per_year(model, line, year):
-    _year = model.par_year_of_inv_mp[line]
-    if year < _year:
-        return 0
-    else:
-        _val = 1 - ((year - _year) / 20)
-        if _val >= 0:
-            return _val
-        else:
-            return 0
-
-
-def tra_line_book_value(model, line, year):
-    _line = model.transmission.loc[line]
-    _start = _line.Start
-    _end = _line.End
-    _type = "Transmission"
-
-    _data = model.pipeline_technical
-    _data = _data.loc[
-        (_data.Start == _start) & (_data.End == _end) & (_data.Type == _type)
-    ]
-    _capacity = _data.Capacity.item()
-    _con = _data["Yr.-con."].item()
-
-    _data = model.pipeline_economic
-    _data = _data.loc[
-        (_data.Start == _start) & (_data.End == _end) & (_data.Type == _type)
-    ]
-    _c_inv = _data["Inv.-cost"].item()
-    _amo = _data["Amort."].item()
-    _l = model.par_tra_length[line]
-    if year > _con + _amo:
-        return 0
-    else:
-        return (_capacity * _c_inv * _l) * (1 - (year - _con) / _amo)
-
-
-def high_line_book_value(model, line, year):
-    _line = model.high.loc[line]
-    _start = _line.Start
-    _end = _line.End
-    _type = "High-Pressure"
+        else:
+            return 0
 
-    _data = model.pipeline_technical
-    _data = _data.loc[
-        (_data.Start == _start) & (_data.End == _end) & (_data.Type == _type)
-    ]
-    _capacity = _data.Capacity.item()
-    _con = _data["Yr.-con."].item()
 
-    _data = model.pipeline_economic
-    _data = _data.loc[
-        (_data.Start == _start) & (_data.End == _end) & (_data.Type == _type)
-    ]
-    # LENGTH
-    _l = model.par_high_length[line]
-    # SPECIFIC INVESTMENT COSTS
-    _specific = model.par_ref_high
-    _amo = _data["Amort."].item()
-    if year > _con + _amo:
+def tra_line_depreciation_factor_per_year(model, line, year):
+    _year = model.par_year_of_inv_tra[line]
+    if year < _year:
         return 0
     else:
-        return (_capacity * _l * _specific) * (1 - (year - _con) / _amo)
-
-
-def mid_line_book_value(model, line, year):
-    _line = model.mid.loc[line]
-    _start = _line.Start
-    _end = _line.End
-    _type = "Mid-Pressure"
+        _val = 1 - ((year - _year) / 20)
+        if _val >= 0:
+            return _val
+        else:
+            return 0
 
-    _data = model.pipeline_technical
-    _data = _data.loc[
-        (_data.Start == _start) & (_data.End == _end) & (_data.Type == _type)
-    ]
-    _capacity = _data.Capacity.item()
-    _con = _data["Yr.-con."].item()
 
-    _data = model.pipeline_economic
-    _data = _data.loc[
-        (_data.Start == _start) & (_data.End == _end) & (_data.Type == _type)
-    ]
-    _l = model.par_mid_length[line]
-    _specific = model.par_ref_mid
-    _amo = _data["Amort."].item()
-    if year > _con + _amo:
+def mid_line_depreciation_factor_per_year(model, line, year):
+    _year = model.par_year_of_inv_mp[line]
+    if year < _year:
         return 0
     else:
-        return (_capacity * _l * _specific) * (1 - (year - _con) / _amo)
+        _val = 1 - ((year - _year) / 20)
+        if _val >= 0:
+            return _val
+        else:
+            return 0
 
 
 def init_fixed_costs_tra(model):
@@ -858,65 +1348,32 @@ def init_fixed_costs_mid(model):
     return _costs.item()
 
 
-def init_year_of_inv_tra(model, line):
-    _line = model.transmission.loc[line]
-    _start = _line.Start
-    _end = _line.End
-    _type = "Transmission"
-    _data = model.pipeline_technical
-    _data = _data.loc[
-        (_data.Start == _start) & (_data.End == _end) & (_data.Type == _type)
-    ]
-    _start = _data["Yr.-con."].item()
-    _end = _start + _data["Tec.-life"].item()
-    return _end
-
-
-def init_year_of_inv_high(model, line):
-    _line = model.high.loc[line]
-    _start = _line.Start
-    _end = _line.End
-    _type = "High-Pressure"
-    _data = model.pipeline_technical
-    _data = _data.loc[
-        (_data.Start == _start) & (_data.End == _end) & (_data.Type == _type)
-    ]
-    _start = _data["Yr.-con."].item()
-    _end = _start + _data["Tec.-life"].item()
-    return _end
-
-
-def init_year_of_inv_mid(model, line):
-    _line = model.mid.loc[line]
-    _start = _line.Start
-    _end = _line.End
-    _type = "Mid-Pressure"
-    _data = model.pipeline_technical
-    _data = _data.loc[
-        (_data.Start == _start) & (_data.End == _end) & (_data.Type == _type)
-    ]
-    _start = _data["Yr.-con."].item()
-    _end = _start + _data["Tec.-life"].item()
-    return _end
-
-
 def init_total_peak_rel_factor(model, month):
     """
     So far, a constant factor between total and peak gas demand per month is implemented.
     However, this should be updated to improve the temporal resolution of the analysis.
     In principle, this factor influences the utilization rate of a pipeline per month.
+    The factor of a time slice is its duration (720 hours per month).
     """
 
     """
     Considering scaling factors (1.1) for both months January and December in order to consider daily gas peak demands.
     """
-    return 720
+    return 720 * len(model.time_slices[month])
     # if (month == 1) or (month == 12) or (month == 2):
     #     return 720 / 1.1
     # else:
     #     return 720
 
 
+def init_nodal_demand_at_tra_pressure_per_time_slice(model, node, year, time):
+    # sum of the monthly transmission demands of the time slice
+    return sum(
+        init_nodal_demand_at_tra_pressure(model, node, year, _month)
+        for _month in model.time_slices[time]
+    )
+
+
 def init_gas_prices_per_year_and_month(model, year, month):
     _data = model.prices
     _val_per_year = _data.loc[_data.Year == year]["Price"].item()
@@ -928,22 +1385,183 @@ def init_gas_prices_per_year_and_month(model, year, month):
         return _val_per_year
 
 
-def add_parameter_to_model(model=None):
+def init_gas_prices_per_year_and_time_slice(model, year, time):
+    # average of the monthly gas prices of the time slice
+    _months = model.time_slices[time]
+    return sum(init_gas_prices_per_year_and_month(model, year, _month) for _month in _months) / len(
+        _months
+    )
+
+
+def init_peak_factor(model, time):
+    """
+    Factor between the peak and the average flow of a time slice at the high- and mid-pressure lines:
+    PEAK_FACTOR in the months with daily gas peak demands (PEAK_MONTHS), and the ratio between the
+    highest and the average monthly demand if several months are combined into one time slice.
+    """
+    _months = model.time_slices[time]
+    _factor = np.where(np.isin(_months, PEAK_MONTHS), PEAK_FACTOR, 1.0)
+    if len(_months) == 1:
+        return float(_factor.max())
+    _profile = get_monthly_demand_profile(model=model).loc[_months].to_numpy(dtype=float)
+    if _profile.mean() <= 0:
+        return float(_factor.max())
+    return float((_factor * _profile).max() / _profile.mean())
+
+
+def get_value_of_lost_load_per_year(data=None, pressure_type=None, years=None):
+    """
+    Parameters
+    ----------
+    data : DataFrame, required
+        Includes the value of lost load per network level and year. The default is None.
+    pressure_type : String, required
+        Network level ("High-Pressure" or "Mid-Pressure"). The default is None.
+    years : List, optional
+        Modeled years (see add_time_horizon). The default is None (all years of the data).
+
+    Returns
+    -------
+    Dict
+        Value of lost load in EUR / MWh per year (first entry if a year is listed more than once).
+
+    """
+    _values = (
+        data[data.Type == pressure_type]
+        .groupby(["Year"])["Value in EUR per MWh"]
+        .apply(lambda x: x.iloc[0])
+        .to_dict()
+    )
+    if years is None:
+        return _values
+    return {_year: _values[_year] for _year in years}
+
+
+def add_derived_parameters(model=None, names=None):
+    """
+    Adds the parameters that are derived from other parameters (see DERIVED_PARAMETERS). Existing
+    parameters with the same names are replaced, so that the derived parameters follow overrides of
+    the parameters they depend on (see override_parameter).
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance with the pipeline tables and the parameters of DERIVED_PARAMETERS.
+        The default is None.
+    names : List, optional
+        Names of the derived parameters that are (re)built. The default is None (all).
+
+    Returns
+    -------
+    None.
+
+    """
+    _names = list(DERIVED_PARAMETERS) if names is None else list(names)
+    _years = list(model.set_year)
+    for _name in _names:
+        if model.component(_name) is not None:
+            model.del_component(_name)
+
+    if "par_depreciation_tra" in _names:
+        model.par_depreciation_tra = py.Param(
+            model.set_line_tra,
+            model.set_year,
+            initialize=tra_line_depreciation_factor_per_year,
+            within=py.NonNegativeReals,
+            doc="CHECKED: Depreciation factor of a refurbished transmission pipeline investment",
+        )
+
+    if "par_depreciation_high" in _names:
+        model.par_depreciation_high = py.Param(
+            model.set_line_high,
+            model.set_year,
+            initialize=high_line_depreciation_factor_per_year,
+            within=py.NonNegativeReals,
+            doc="CHECKED: Depreciation factor of a refurbished high-pressure pipeline investment",
+        )
+
+    if "par_depreciation_mid" in _names:
+        model.par_depreciation_mid = py.Param(
+            model.set_line_mid,
+            model.set_year,
+            initialize=mid_line_depreciation_factor_per_year,
+            within=py.NonNegativeReals,
+            doc="CHECKED: Depreciation factor of a refurbished mid-pressure pipeline investment",
+        )
+
+    if "par_book_value_tra" in _names:
+        model.par_book_value_tra = py.Param(
+            model.set_line_tra,
+            model.set_year,
+            initialize=get_pipeline_book_value_per_year(
+                table=model.pipeline_tra,
+                years=_years,
+                length=np.array(
+                    [model.par_tra_length[line] for line in model.pipeline_tra.index]
+                ),
+            ),
+            within=py.NonNegativeReals,
+            doc="CHECKED: Book value of a pipeline at the transmission network level in year y",
+        )
+
+    if "par_book_value_high" in _names:
+        model.par_book_value_high = py.Param(
+            model.set_line_high,
+            model.set_year,
+            initialize=get_pipeline_book_value_per_year(
+                table=model.pipeline_high,
+                years=_years,
+                length=np.array(
+                    [model.par_high_length[line] for line in model.pipeline_high.index]
+                ),
+                specific_costs=py.value(model.par_ref_high),
+            ),
+            within=py.NonNegativeReals,
+            doc="CHECKED: Book value of a pipeline at the high-pressure network level in year y",
+        )
+
+    if "par_book_value_mid" in _names:
+        model.par_book_value_mid = py.Param(
+            model.set_line_mid,
+            model.set_year,
+            initialize=get_pipeline_book_value_per_year(
+                table=model.pipeline_mid,
+                years=_years,
+                length=np.array(
+                    [model.par_mid_length[line] for line in model.pipeline_mid.index]
+                ),
+                specific_costs=py.value(model.par_ref_mid),
+            ),
+            within=py.NonNegativeReals,
+            doc="CHECKED: Book value of a pipeline at the mid-pressure network level in year y",
+        )
+    return
+
+
+def add_parameter_to_model(model=None, mutable=False):
     """
     Parameters
     ----------
     model : pyomo.ConcreteModel, required
         Includes the model instance. The default is None.
+    mutable : bool, optional
+        If True, the scenario-dependent parameters (demand, source, value of lost load, and gas prices)
+        are mutable and can be updated without rebuilding the model (see update_scenario_parameters).
+        The default is False.
 
     Returns
     -------
     None.
 
     """
+    # TECHNICAL AND ECONOMIC PIPELINE DATA ARE JOINED ONCE PER NETWORK LEVEL.
+    add_pipeline_tables(model=model)
+    _years = list(model.set_year)
+
     model.par_tra_capacity = py.Param(
         model.set_line_tra,
         model.set_year,
-        initialize=transmission_line_capacity_per_year,
+        initialize=get_pipeline_capacity_per_year(table=model.pipeline_tra, years=_years),
         within=py.NonNegativeReals,
         doc="CHECKED: Pipeline capacity at the transmission network level",
     )
@@ -951,7 +1569,7 @@ def add_parameter_to_model(model=None):
     model.par_high_capacity = py.Param(
         model.set_line_high,
         model.set_year,
-        initialize=high_line_capacity_per_year,
+        initialize=get_pipeline_capacity_per_year(table=model.pipeline_high, years=_years),
         within=py.NonNegativeReals,
         doc="CHECKED: Pipeline capacity at the high-pressure network level",
     )
@@ -959,7 +1577,7 @@ def add_parameter_to_model(model=None):
     model.par_mid_capacity = py.Param(
         model.set_line_mid,
         model.set_year,
-        initialize=mid_line_capacity_per_year,
+        initialize=get_pipeline_capacity_per_year(table=model.pipeline_mid, years=_years),
         within=py.NonNegativeReals,
         doc="CHECKED: Pipeline capacity at the mid-pressure network level",
     )
@@ -968,6 +1586,7 @@ def add_parameter_to_model(model=None):
         model.set_node_mp,
         model.set_year,
         initialize=init_mp_node_per_type,
+        mutable=mutable,
         within=py.NonNegativeReals,
         doc="CHECKED: Mid-pressure gas source at node n in year y",
     )
@@ -976,24 +1595,33 @@ def add_parameter_to_model(model=None):
         model.set_node_hp,
         model.set_year,
         initialize=init_hp_node_per_type,
+        mutable=mutable,
         within=py.NonNegativeReals,
         doc="CHECKED: High-pressure gas source at node n in year y",
     )
 
     # Überprüfen ob Quellen und Verbrauch 2040 richtig parametrisiert sind.
     # 2) Einspeisung|2040|High
-    _par_source_hp = sum(model.par_source_hp[node, 2040] for node in model.set_node_hp)
+    _par_source_hp = py.value(
+        sum(model.par_source_hp[node, 2040] for node in model.set_node_hp)
+    )
     print("Source|2040|High: ", np.around(_par_source_hp, 0))
 
-    _par_source_mp = sum(model.par_source_mp[node, 2040] for node in model.set_node_mp)
+    _par_source_mp = py.value(
+        sum(model.par_source_mp[node, 2040] for node in model.set_node_mp)
+    )
     print("Source|2040|Mid: ", np.around(_par_source_mp, 0))
     #
 
+    # DEMANDS ARE LOOKED UP ONCE FOR ALL NODES, YEARS, AND MONTHS.
+    _demand_high, _demand_mid = init_nodal_demand_per_pressure_level(model=model)
+
     model.par_demand_mid = py.Param(
         model.set_node_mp,
         model.set_year,
         model.set_time_unit,
-        initialize=init_nodal_demand_at_mid_pressure,
+        initialize=_demand_mid,
+        mutable=mutable,
         within=py.NonNegativeReals,
         doc="CHECKED: Mid-pressure gas demand at node n in year y and month m",
     )
@@ -1002,24 +1630,29 @@ def add_parameter_to_model(model=None):
         model.set_node_hp,
         model.set_year,
         model.set_time_unit,
-        initialize=init_nodal_demand_at_high_pressure,
+        initialize=_demand_high,
+        mutable=mutable,
         within=py.NonNegativeReals,
         doc="CHECKED: High-pressure gas demand at node n in year y and month m",
     )
 
     # Überprüfen ob Quellen und Verbrauch 2040 richtig parametrisiert sind.
     # 1) Verbrauch|2040|High
-    _demand_2040_high_ = sum(
-        model.par_demand_high[node, 2040, month]
-        for node in model.set_node_hp
-        for month in model.set_time_unit
+    _demand_2040_high_ = py.value(
+        sum(
+            model.par_demand_high[node, 2040, month]
+            for node in model.set_node_hp
+            for month in model.set_time_unit
+        )
     )
     print("Demand|2040|High: ", np.around(_demand_2040_high_, 0))
 
-    _demand_2040_mid = sum(
-        model.par_demand_mid[node, 2040, month]
-        for node in model.set_node_mp
-        for month in model.set_time_unit
+    _demand_2040_mid = py.value(
+        sum(
+            model.par_demand_mid[node, 2040, month]
+            for node in model.set_node_mp
+            for month in model.set_time_unit
+        )
     )
     print("Demand|2040|Mid: ", np.around(_demand_2040_mid, 0))
     #
@@ -1028,7 +1661,8 @@ def add_parameter_to_model(model=None):
         model.set_compressor,
         model.set_year,
         model.set_time_unit,
-        initialize=init_nodal_demand_at_tra_pressure,
+        initialize=init_nodal_demand_at_tra_pressure_per_time_slice,
+        mutable=mutable,
         within=py.NonNegativeReals,
         doc="CHECKED: Nodal gas demand at the transmission network level in year y and month m",
     )
@@ -1072,150 +1706,449 @@ def add_parameter_to_model(model=None):
         doc="CHECKED: Specific mid-pressure pipeline refurbishment investment costs per MW and km",
     )
 
-    model.par_wacc = py.Param(
-        initialize=0.05, doc="CHECKED: Weighted average cost of capital"
-    )
+    model.par_wacc = py.Param(
+        initialize=0.05, doc="CHECKED: Weighted average cost of capital"
+    )
+
+    model.par_source_tra = py.Param(
+        model.set_compressor,
+        model.set_year,
+        initialize=init_tra_node_per_type,
+        mutable=mutable,
+        within=py.NonNegativeReals,
+        doc="CHECKED: Nodal gas source at the transmission network level in year y",
+    )
+
+    model.par_year_of_inv_tra = py.Param(
+        model.set_line_tra,
+        initialize=get_year_of_inv_in_horizon(
+            model=model, year_of_inv=get_pipeline_year_of_inv(table=model.pipeline_tra)
+        ),
+        within=py.NonNegativeReals,
+        doc="CHECKED: Planned year of refurbishment investment per transmission line",
+    )
+
+    model.par_year_of_inv_hp = py.Param(
+        model.set_line_high,
+        initialize=get_year_of_inv_in_horizon(
+            model=model, year_of_inv=get_pipeline_year_of_inv(table=model.pipeline_high)
+        ),
+        within=py.NonNegativeReals,
+        doc="CHECKED: Planned year of refurbishment investment per high-pressure line",
+    )
+
+    model.par_year_of_inv_mp = py.Param(
+        model.set_line_mid,
+        initialize=get_year_of_inv_in_horizon(
+            model=model, year_of_inv=get_pipeline_year_of_inv(table=model.pipeline_mid)
+        ),
+        within=py.NonNegativeReals,
+        doc="CHECKED: Planned year of refurbishment investment per mid-pressure line",
+    )
+
+    # PARAMETERS DERIVED FROM OTHER PARAMETERS (REBUILT IF THESE ARE OVERRIDDEN)
+    add_derived_parameters(model=model)
+
+    model.par_i = py.Param(initialize=0.015, doc="Interest rate: 1.5%")
+
+    model.par_fixed_tra = py.Param(
+        initialize=init_fixed_costs_tra,
+        within=py.NonNegativeReals,
+        doc="CHECKED: Specific fixed costs per transmission pipeline capacity",
+    )
+
+    model.par_fixed_high = py.Param(
+        initialize=init_fixed_costs_high,
+        within=py.NonNegativeReals,
+        doc="CHECKED: Specific fixed costs per high-pressure pipeline capacity",
+    )
+
+    model.par_fixed_mid = py.Param(
+        initialize=init_fixed_costs_mid,
+        within=py.NonNegativeReals,
+        doc="CHECKED: Specific fixed costs per mid-pressure pipeline capacity",
+    )
+
+    model.par_total_peak_factor = py.Param(
+        model.set_time_unit,
+        initialize=init_total_peak_rel_factor,
+        within=py.NonNegativeReals,
+        doc="CHECKED: Transforming monthly demand values to max capacity values and vice versa.",
+    )
+
+    model.par_peak_factor = py.Param(
+        model.set_time_unit,
+        initialize=init_peak_factor,
+        within=py.NonNegativeReals,
+        doc="Peak flow relative to the average flow per time slice (high- and mid-pressure lines)",
+    )
+
+    model.par_gas_prices = py.Param(
+        model.set_year,
+        model.set_time_unit,
+        initialize=init_gas_prices_per_year_and_time_slice,
+        mutable=mutable,
+        within=py.NonNegativeReals,
+        doc="CHECKED: Gas price per year and month in order to include seasonal storage into the system.",
+    )
+
+    """VALUE OF LOST LOAD / KOSTEN EINER ALTERNATIVEN VERSORGUNG"""
+
+    _VoLL_High = get_value_of_lost_load_per_year(
+        data=model.value_of_lost_load,
+        pressure_type="High-Pressure",
+        years=list(model.set_year),
+    )
+    _VoLL_Mid = get_value_of_lost_load_per_year(
+        data=model.value_of_lost_load,
+        pressure_type="Mid-Pressure",
+        years=list(model.set_year),
+    )
+    model.par_value_of_lost_load_high = py.Param(
+        model.set_year,
+        initialize=_VoLL_High,
+        mutable=mutable,
+        within=py.NonNegativeReals,
+        doc="CHECKED: Cost parameter for not supplying high-pressure gas demands per year in EUR / MWh.",
+    )
+    model.par_value_of_lost_load_mid = py.Param(
+        model.set_year,
+        initialize=_VoLL_Mid,
+        mutable=mutable,
+        within=py.NonNegativeReals,
+        doc="CHECKED: Cost parameter for not supplying mid-pressure gas demands per year in EUR / MWh.",
+    )
+
+    return
+
+
+def get_values_from_rule(model=None, param=None, rule=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    param : pyomo.Param, required
+        Indexed parameter whose index set is evaluated. The default is None.
+    rule : function, required
+        Initialization rule of the parameter (e.g., init_hp_node_per_type). The default is None.
+
+    Returns
+    -------
+    Dict
+        Value of the rule per index of the parameter.
+
+    """
+    return {_index: rule(model, *_index) for _index in param.index_set()}
+
+
+def check_time_slices(model=None, tolerance=1e-9):
+    """
+    The time slices and the peak factors are derived from the demand profile of the scenario the model
+    was built for (see add_time_horizon). Demands of another scenario can only be stored in the
+    mutable parameters if its profile leads to the same time slices and peak factors. A model with 12
+    time slices (the months) does not depend on the profile.
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance with the new scenario inputs (see
+        scenarios.set_scenario_inputs). The default is None.
+    tolerance : float, optional
+        Accepted difference of the peak factors. The default is 1e-9.
+
+    Raises
+    ------
+    ValueError
+        If the time slices or the peak factors of the new demand profile differ from the ones of the
+        model (i.e., the model has to be rebuilt).
+
+    Returns
+    -------
+    None.
+
+    """
+    if len(model.time_slices) == len(MONTHS):
+        # MONTHS: INDEPENDENT OF THE DEMAND PROFILE
+        return
+    _slices = get_time_slices(
+        profile=get_monthly_demand_profile(model=model),
+        temporal=len(model.time_slices),
+        adjacent=len(model.storage) > 0,
+    )
+    if _slices != model.time_slices:
+        raise ValueError(
+            "The demand profile leads to other time slices ({} instead of {}); rebuild the model "
+            "(e.g., without persistent mode)".format(_slices, model.time_slices)
+        )
+    for _slice in model.set_time_unit:
+        if abs(init_peak_factor(model, _slice) - py.value(model.par_peak_factor[_slice])) > tolerance:
+            raise ValueError(
+                "The demand profile leads to another peak factor of time slice {}; rebuild the "
+                "model (e.g., without persistent mode)".format(_slice)
+            )
+    return
+
+
+def update_scenario_parameters(model=None, names=None):
+    """
+    Recomputes the scenario-dependent parameters from the input data that is currently attached to the
+    model (e.g., model.demand_high or model.generation) and stores the values in the mutable parameters.
+    The sets, variables, and constraints of the model are not touched, so that a persistent solver only
+    receives updated coefficients and right-hand sides.
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance built with add_parameter_to_model(mutable=True). The default is None.
+    names : List, optional
+        Names of the parameters that are recomputed (see SCENARIO_PARAMETERS). The default is None (all
+        scenario-dependent parameters).
+
+    Raises
+    ------
+    ValueError
+        If the scenario-dependent parameters of the model are not mutable, a name is not one of them,
+        or the demands lead to other time slices (see check_time_slices).
+
+    Returns
+    -------
+    None.
+
+    """
+    if not model.par_demand_high.mutable:
+        raise ValueError("Scenario parameters are not mutable: build the model with mutable=True")
+    _names = set(SCENARIO_PARAMETERS if names is None else names)
+    if not _names.issubset(SCENARIO_PARAMETERS):
+        raise ValueError(
+            "Not a scenario parameter: {}".format(", ".join(sorted(_names - set(SCENARIO_PARAMETERS))))
+        )
+    if _names.intersection(["par_demand_high", "par_demand_mid"]):
+        # CHECKED BEFORE ANY PARAMETER IS CHANGED
+        check_time_slices(model=model)
+
+    if "par_source_mp" in _names:
+        model.par_source_mp.store_values(
+            get_values_from_rule(model=model, param=model.par_source_mp, rule=init_mp_node_per_type)
+        )
+    if "par_source_hp" in _names:
+        model.par_source_hp.store_values(
+            get_values_from_rule(model=model, param=model.par_source_hp, rule=init_hp_node_per_type)
+        )
+    if "par_source_tra" in _names:
+        model.par_source_tra.store_values(
+            get_values_from_rule(
+                model=model, param=model.par_source_tra, rule=init_tra_node_per_type
+            )
+        )
+
+    if _names.intersection(["par_demand_high", "par_demand_mid"]):
+        _demand_high, _demand_mid = init_nodal_demand_per_pressure_level(model=model)
+        model.par_demand_high.store_values(_demand_high)
+        model.par_demand_mid.store_values(_demand_mid)
+    if "par_demand_tra" in _names:
+        model.par_demand_tra.store_values(
+            get_values_from_rule(
+                model=model,
+                param=model.par_demand_tra,
+                rule=init_nodal_demand_at_tra_pressure_per_time_slice,
+            )
+        )
+
+    if "par_gas_prices" in _names:
+        model.par_gas_prices.store_values(
+            get_values_from_rule(
+                model=model,
+                param=model.par_gas_prices,
+                rule=init_gas_prices_per_year_and_time_slice,
+            )
+        )
+    if "par_value_of_lost_load_high" in _names:
+        model.par_value_of_lost_load_high.store_values(
+            get_value_of_lost_load_per_year(
+                data=model.value_of_lost_load,
+                pressure_type="High-Pressure",
+                years=list(model.set_year),
+            )
+        )
+    if "par_value_of_lost_load_mid" in _names:
+        model.par_value_of_lost_load_mid.store_values(
+            get_value_of_lost_load_per_year(
+                data=model.value_of_lost_load,
+                pressure_type="Mid-Pressure",
+                years=list(model.set_year),
+            )
+        )
+    return
+
+
+def override_parameter(model=None, name=None, value=None):
+    """
+    The parameters derived from an overridden immutable parameter (see DERIVED_PARAMETERS) are
+    rebuilt with the new values.
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    name : String, required
+        Name of the parameter (e.g., "par_wacc"). The default is None.
+    value : float or Dict, required
+        New value of the parameter. A float is used for all indices of an indexed parameter,
+        a dictionary only replaces the values of the given indices. The default is None.
+
+    Raises
+    ------
+    ValueError
+        If the model has no parameter with the given name.
+
+    Returns
+    -------
+    None.
+
+    """
+    _param = model.component(name)
+    if not isinstance(_param, py.Param):
+        raise ValueError("Unknown parameter: {}".format(name))
+
+    if _param.is_indexed():
+        if isinstance(value, dict):
+            _values = {**_param.extract_values(), **value}
+        else:
+            _values = {index: value for index in _param}
+    else:
+        _values = value
+
+    if _param.mutable:
+        if _param.is_indexed():
+            _param.store_values(_values)
+        else:
+            _param.set_value(_values)
+        return
+
+    # IMMUTABLE PARAMETERS ARE REPLACED BY A NEW PARAMETER WITH THE SAME INDEX SETS.
+    # THEREFORE, OVERRIDES HAVE TO BE APPLIED BEFORE THE CONSTRAINTS ARE ADDED.
+    _sets = list(_param.index_set().subsets()) if _param.is_indexed() else []
+    model.del_component(_param)
+    model.add_component(
+        name,
+        py.Param(*_sets, initialize=_values, within=_param.domain, doc=_param.doc),
+    )
+    # THE PARAMETERS DERIVED FROM IT WOULD OTHERWISE KEEP THE OLD VALUES
+    _derived = get_derived_parameters(name=name)
+    if _derived:
+        add_derived_parameters(model=model, names=_derived)
+    return
 
-    model.par_source_tra = py.Param(
-        model.set_compressor,
-        model.set_year,
-        initialize=init_tra_node_per_type,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Nodal gas source at the transmission network level in year y",
-    )
 
-    model.par_year_of_inv_tra = py.Param(
-        model.set_line_tra,
-        initialize=init_year_of_inv_tra,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Planned year of refurbishment investment per transmission line",
-    )
+def get_derived_parameters(name=None):
+    """
+    Parameters
+    ----------
+    name : String, required
+        Name of the parameter (e.g., "par_year_of_inv_tra"). The default is None.
 
-    model.par_year_of_inv_hp = py.Param(
-        model.set_line_high,
-        initialize=init_year_of_inv_high,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Planned year of refurbishment investment per high-pressure line",
-    )
+    Returns
+    -------
+    List
+        Names of the parameters derived from the parameter (see DERIVED_PARAMETERS).
 
-    model.par_year_of_inv_mp = py.Param(
-        model.set_line_mid,
-        initialize=init_year_of_inv_mid,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Planned year of refurbishment investment per mid-pressure line",
-    )
+    """
+    return [_derived for _derived, _names in DERIVED_PARAMETERS.items() if name in _names]
 
-    model.par_depreciation_tra = py.Param(
-        model.set_line_tra,
-        model.set_year,
-        initialize=tra_line_depreciation_factor_per_year,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Depreciation factor of a refurbished transmission pipeline investment",
-    )
 
-    model.par_depreciation_high = py.Param(
-        model.set_line_high,
-        model.set_year,
-        initialize=high_line_depreciation_factor_per_year,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Depreciation factor of a refurbished high-pressure pipeline investment",
-    )
+def override_parameters(model=None, overrides=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    overrides : Dict, optional
+        Includes the new values per parameter name (see override_parameter). Overrides of derived
+        parameters (see DERIVED_PARAMETERS) are applied last, so that they are not replaced when the
+        parameters they depend on are overridden. The default is None.
 
-    model.par_depreciation_mid = py.Param(
-        model.set_line_mid,
-        model.set_year,
-        initialize=mid_line_depreciation_factor_per_year,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Depreciation factor of a refurbished mid-pressure pipeline investment",
-    )
+    Returns
+    -------
+    None.
 
-    model.par_book_value_tra = py.Param(
-        model.set_line_tra,
-        model.set_year,
-        initialize=tra_line_book_value,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Book value of a pipeline at the transmission network level in year y",
+    """
+    _overrides = sorted(
+        (overrides or dict()).items(), key=lambda _item: _item[0] in DERIVED_PARAMETERS
     )
+    for _name, _value in _overrides:
+        override_parameter(model=model, name=_name, value=_value)
+        print("Override: {} = {}".format(_name, _value))
+    return
 
-    model.par_book_value_high = py.Param(
-        model.set_line_high,
-        model.set_year,
-        initialize=high_line_book_value,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Book value of a pipeline at the high-pressure network level in year y",
-    )
 
-    model.par_book_value_mid = py.Param(
-        model.set_line_mid,
-        model.set_year,
-        initialize=mid_line_book_value,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Book value of a pipeline at the mid-pressure network level in year y",
-    )
+def add_sparse_node_sets(model=None):
+    """
+    Adds the node sets of the variables that can only be non-zero at some nodes, derived from the
+    topology and the parameters:
+        - export and import per network level: nodes with lines in this direction;
+        - sources: nodes with a source potential;
+        - demand (high- and mid-pressure level): nodes with a demand (incl. the demand not supplied).
+    The variables and constraints of the other nodes are not created; get_node_variable returns 0 for
+    them.
 
-    model.par_i = py.Param(initialize=0.015, doc="Interest rate: 1.5%")
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance with the nodal sets, the adjacency, and the parameters. The default
+        is None.
 
-    model.par_fixed_tra = py.Param(
-        initialize=init_fixed_costs_tra,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Specific fixed costs per transmission pipeline capacity",
-    )
+    Returns
+    -------
+    None.
 
-    model.par_fixed_high = py.Param(
-        initialize=init_fixed_costs_high,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Specific fixed costs per high-pressure pipeline capacity",
+    """
+    model.set_node_tra_export = py.Set(
+        initialize=get_nodes_with_lines(
+            adjacency=model.tra_adjacency, nodes=model.set_compressor, direction="export"
+        )
     )
-
-    model.par_fixed_mid = py.Param(
-        initialize=init_fixed_costs_mid,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Specific fixed costs per mid-pressure pipeline capacity",
+    model.set_node_tra_import = py.Set(
+        initialize=get_nodes_with_lines(
+            adjacency=model.tra_adjacency, nodes=model.set_compressor, direction="import"
+        )
     )
-
-    model.par_total_peak_factor = py.Param(
-        model.set_time_unit,
-        initialize=init_total_peak_rel_factor,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Transforming monthly demand values to max capacity values and vice versa.",
+    model.set_node_hp_export = py.Set(
+        initialize=get_nodes_with_lines(
+            adjacency=model.high_adjacency, nodes=model.set_node_hp, direction="export"
+        )
     )
-
-    model.par_gas_prices = py.Param(
-        model.set_year,
-        model.set_time_unit,
-        initialize=init_gas_prices_per_year_and_month,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Gas price per year and month in order to include seasonal storage into the system.",
+    model.set_node_hp_import = py.Set(
+        initialize=get_nodes_with_lines(
+            adjacency=model.high_adjacency, nodes=model.set_node_hp, direction="import"
+        )
+    )
+    model.set_node_mp_export = py.Set(
+        initialize=get_nodes_with_lines(
+            adjacency=model.mid_adjacency, nodes=model.set_node_mp_flow, direction="export"
+        )
+    )
+    model.set_node_mp_import = py.Set(
+        initialize=get_nodes_with_lines(
+            adjacency=model.mid_adjacency, nodes=model.set_node_mp_flow, direction="import"
+        )
     )
 
-    """VALUE OF LOST LOAD / KOSTEN EINER ALTERNATIVEN VERSORGUNG"""
-
-    _Value_of_Lost_Load = pd.read_excel("data/INPUT_Value_of_Lost_Load.xlsx")
-    _VoLL_High = (
-        _Value_of_Lost_Load[_Value_of_Lost_Load.Type == "High-Pressure"]
-        .groupby(["Year"])["Value in EUR per MWh"]
-        .apply(lambda x: x.iloc[0])
-        .to_dict()
+    model.set_node_tra_source = py.Set(
+        initialize=get_nodes_with_values(param=model.par_source_tra, nodes=model.set_compressor)
     )
-    _VoLL_Mid = (
-        _Value_of_Lost_Load[_Value_of_Lost_Load.Type == "Mid-Pressure"]
-        .groupby(["Year"])["Value in EUR per MWh"]
-        .apply(lambda x: x.iloc[0])
-        .to_dict()
+    model.set_node_hp_source = py.Set(
+        initialize=get_nodes_with_values(param=model.par_source_hp, nodes=model.set_node_hp)
     )
-    model.par_value_of_lost_load_high = py.Param(
-        model.set_year,
-        initialize=_VoLL_High,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Cost parameter for not supplying high-pressure gas demands per year in EUR / MWh.",
+    model.set_node_mp_source = py.Set(
+        initialize=get_nodes_with_values(param=model.par_source_mp, nodes=model.set_node_mp)
     )
-    model.par_value_of_lost_load_mid = py.Param(
-        model.set_year,
-        initialize=_VoLL_Mid,
-        within=py.NonNegativeReals,
-        doc="CHECKED: Cost parameter for not supplying mid-pressure gas demands per year in EUR / MWh.",
+    model.set_node_hp_demand = py.Set(
+        initialize=get_nodes_with_values(param=model.par_demand_high, nodes=model.set_node_hp)
+    )
+    model.set_node_mp_demand = py.Set(
+        initialize=get_nodes_with_values(param=model.par_demand_mid, nodes=model.set_node_mp)
     )
-
     return
 
 
@@ -1247,7 +2180,7 @@ def add_decision_variables(model=None):
     )
 
     model.var_rev = py.Var(
-        model.set_year, domain=py.NonNegativeReals, doc="REV: revenues (per year)"
+        model.set_dispatch_year, domain=py.NonNegativeReals, doc="REV: revenues (per year)"
     )
 
     model.var_pi = py.Var(
@@ -1406,24 +2339,24 @@ def add_decision_variables(model=None):
 
     """SOURCE AT THE NODAL AND NETWORK LEVEL"""
     model.var_source_tra = py.Var(
-        model.set_compressor,
-        model.set_year,
+        model.set_node_tra_source,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.NonNegativeReals,
         doc="Source of natural gas at the transmission network level at a node",
     )
 
     model.var_source_high = py.Var(
-        model.set_node_hp,
-        model.set_year,
+        model.set_node_hp_source,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.NonNegativeReals,
         doc="Source of natural gas at the high-pressure network level at a node",
     )
 
     model.var_source_mid = py.Var(
-        model.set_node_mp,
-        model.set_year,
+        model.set_node_mp_source,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.NonNegativeReals,
         doc="Source of natural gas at the mid-pressure network level at a node",
@@ -1432,7 +2365,7 @@ def add_decision_variables(model=None):
     """TRANSPORTATION AT THE PIPELINES"""
     model.var_transported_tra = py.Var(
         model.set_line_tra,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.Reals,
         doc="Gas amount transported at a transmission pipeline (per year and month)",
@@ -1440,15 +2373,15 @@ def add_decision_variables(model=None):
 
     model.var_transported_high = py.Var(
         model.set_line_high,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.Reals,
         doc="Gas amount transported at a high-pressure pipeline (per year and month)",
     )
 
     model.var_transported_mid = py.Var(
-        model.set_line_mid,
-        model.set_year,
+        model.set_line_mid_flow,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.Reals,
         doc="Gas amount transported at a mid-pressure pipeline (per year and month)",
@@ -1457,21 +2390,21 @@ def add_decision_variables(model=None):
     """(SUPPLIED) NODAL DEMAND"""
     model.var_demand_tra = py.Var(
         model.set_compressor,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.NonNegativeReals,
         doc="Gas demand at the transmission network level that is covered (per year and month)",
     )
     model.var_demand_high = py.Var(
-        model.set_node_hp,
-        model.set_year,
+        model.set_node_hp_demand,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.NonNegativeReals,
         doc="Gas demand at the high-pressure network level that is covered (per year and month)",
     )
     model.var_demand_mid = py.Var(
-        model.set_node_mp,
-        model.set_year,
+        model.set_node_mp_demand,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.NonNegativeReals,
         doc="Gas demand at the mid-pressure network level that is covered (per year and month)",
@@ -1482,117 +2415,117 @@ def add_decision_variables(model=None):
     - only at the high-pressure level
     """
     model.var_storage_in_out = py.Var(
-        model.set_storage, model.set_year, model.set_time_unit, domain=py.Reals
+        model.set_storage, model.set_dispatch_year, model.set_time_unit, domain=py.Reals
     )
     model.var_storage_soc = py.Var(
         model.set_storage,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.NonNegativeReals,
     )
 
     """IMPORT & EXPORT"""
     model.var_export_tra = py.Var(
-        model.set_compressor, model.set_year, model.set_time_unit, domain=py.Reals
+        model.set_node_tra_export, model.set_dispatch_year, model.set_time_unit, domain=py.Reals
     )
     model.var_export_high = py.Var(
-        model.set_node_hp, model.set_year, model.set_time_unit, domain=py.Reals
+        model.set_node_hp_export, model.set_dispatch_year, model.set_time_unit, domain=py.Reals
     )
     model.var_export_mid = py.Var(
-        model.set_node_mp, model.set_year, model.set_time_unit, domain=py.Reals
+        model.set_node_mp_export, model.set_dispatch_year, model.set_time_unit, domain=py.Reals
     )
     model.var_import_tra = py.Var(
-        model.set_compressor, model.set_year, model.set_time_unit, domain=py.Reals
+        model.set_node_tra_import, model.set_dispatch_year, model.set_time_unit, domain=py.Reals
     )
     model.var_import_high = py.Var(
-        model.set_node_hp, model.set_year, model.set_time_unit, domain=py.Reals
+        model.set_node_hp_import, model.set_dispatch_year, model.set_time_unit, domain=py.Reals
     )
     model.var_import_mid = py.Var(
-        model.set_node_mp, model.set_year, model.set_time_unit, domain=py.Reals
+        model.set_node_mp_import, model.set_dispatch_year, model.set_time_unit, domain=py.Reals
     )
 
     """REVENUES"""
     model.var_revenues_high = py.Var(
-        model.set_node_hp,
-        model.set_year,
+        model.set_node_hp_demand,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.NonNegativeReals,
     )
     model.var_revenues_mid = py.Var(
-        model.set_node_mp,
-        model.set_year,
+        model.set_node_mp_demand,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.NonNegativeReals,
     )
 
     """SPENDING FOR GAS PURCHASE"""
-    model.var_gas_purchase = py.Var(model.set_year, domain=py.NonNegativeReals)
+    model.var_gas_purchase = py.Var(model.set_dispatch_year, domain=py.NonNegativeReals)
 
     # THIS CONSTRAINT IS MODIFIED FOR THE GREEN GAS ("GG") SCENARIO.
     """DELIVERY BETWEEN TRANSMISSION AND HIGH-PRESSURE NETWORK LEVEL"""
     model.var_del_tra_high = py.Var(
         model.set_delivery_tra_hp,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.NonNegativeReals,
     )
 
     model.var_del_high_mid = py.Var(
         model.set_delivery_hp_mp,
-        model.set_year,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.Reals,
     )
 
     # ADDING DECISION VARIABLES FOR SUPPLY THAT IS NOT SUPPLIED.
     model.var_demand_not_supplied_high = py.Var(
-        model.set_node_hp,
-        model.set_year,
+        model.set_node_hp_demand,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.NonNegativeReals,
     )
     model.var_demand_not_supplied_mid = py.Var(
-        model.set_node_mp,
-        model.set_year,
+        model.set_node_mp_demand,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.NonNegativeReals,
     )
     # IMPLEMENTATION OF VALUE OF LOST LOAD
     model.var_value_of_lost_load = py.Var(
-        model.set_year,
+        model.set_dispatch_year,
         domain=py.NonNegativeReals,
         doc="Total costs resulting from not supplying gas demands per year",
     )
     model.var_value_of_lost_load_high = py.Var(
-        model.set_node_hp,
-        model.set_year,
+        model.set_node_hp_demand,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.NonNegativeReals,
         doc="Costs resulting from not supplying high-pressure gas demands",
     )
     model.var_value_of_lost_load_mid = py.Var(
-        model.set_node_mp,
-        model.set_year,
+        model.set_node_mp_demand,
+        model.set_dispatch_year,
         model.set_time_unit,
         domain=py.NonNegativeReals,
         doc="Costs resulting from not supplying mid-pressure gas demands",
     )
     model.var_VoLL_SOURCE = py.Var(
-        model.set_year,
+        model.set_dispatch_year,
         domain=py.NonNegativeReals,
         doc="Source-related Value of Lost Load per Year.",
     )
 
     # EXTENSION OF THE VALUE OF LOST LOAD RELATED TO GREEN METHANE PRODUCTION AT THE LOCAL LEVELS.
     model.var_VoLL_src_hp = py.Var(
-        model.set_node_hp,
-        model.set_year,
+        model.set_node_hp_source,
+        model.set_dispatch_year,
         domain=py.NonNegativeReals,
         doc="Quantity of the local green methane potential / production that is not used at the high-pressure level.",
     )
     model.var_VoLL_src_mp = py.Var(
-        model.set_node_mp,
-        model.set_year,
+        model.set_node_mp_source,
+        model.set_dispatch_year,
         domain=py.NonNegativeReals,
         doc="Quantity of the local green methane potential / production that is not used at the mid-pressure level.",
     )
@@ -1716,21 +2649,25 @@ def obj_value(model=None):
     -------
     Expression of the objective function
         SUM [ (1/(1+i)^(year-2025)) * (Capex + Opex - Revenues) ]
+        The operational costs of a year are taken from its dispatch years (see get_dispatch_shares).
 
     """
-
+    _years = range(2025, model.objective_year + 1, 1)
     return sum(
         (1 / (1 + model.par_i) ** (year - 2025))
+        * (model.var_capex[year] + model.var_opex[year] + model.v_abschreibung[year])
+        for year in _years
+    ) + sum(
+        (1 / (1 + model.par_i) ** (year - 2025))
+        * _share
         * (
-            model.var_capex[year]
-            + model.var_opex[year]
-            - model.var_rev[year]
-            + model.var_gas_purchase[year]
-            + model.var_value_of_lost_load[year]
-            + model.var_VoLL_SOURCE[year]
-            + model.v_abschreibung[year]
+            -model.var_rev[_dispatch]
+            + model.var_gas_purchase[_dispatch]
+            + model.var_value_of_lost_load[_dispatch]
+            + model.var_VoLL_SOURCE[_dispatch]
         )
-        for year in range(2025, 2051, 1)
+        for year in _years
+        for _dispatch, _share in model.dispatch_shares[year]
     )
 
 
@@ -1754,61 +2691,301 @@ def add_objective_function(model=None):
     return
 
 
+def get_adjacency(data=None):
+    """
+    Builds the adjacency of a network level once (compressed sparse row format): per node, the lines
+    that start (export) and end (import) at the node.
+
+    Parameters
+    ----------
+    data : GeoDataFrame, required
+        Includes the lines (index) with their Start and End nodes. The default is None.
+
+    Returns
+    -------
+    Dict
+        Includes the nodes, the position per node, and per direction ("export", "import") the pointer
+        array and the line array: the lines of the node at position i are
+        lines[pointer[i]:pointer[i + 1]] (in the order of data).
+
+    """
+    _codes, _nodes = pd.factorize(pd.concat([data.Start, data.End], ignore_index=True))
+    _lines = np.asarray(data.index)
+    adjacency = {
+        "nodes": list(_nodes),
+        "position": {_node: _i for _i, _node in enumerate(_nodes)},
+    }
+    for _direction, _node_codes in [
+        ("export", _codes[: len(data)]),
+        ("import", _codes[len(data) :]),
+    ]:
+        # STABLE SORTING KEEPS THE ORDER OF THE LINES PER NODE.
+        _order = np.argsort(_node_codes, kind="stable")
+        _pointer = np.zeros(len(_nodes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(_node_codes, minlength=len(_nodes)), out=_pointer[1:])
+        adjacency[_direction] = (_pointer, _lines[_order])
+    return adjacency
+
+
+def get_lines_of_node(adjacency=None, node=None, direction=None):
+    """
+    Parameters
+    ----------
+    adjacency : Dict, required
+        Adjacency of a network level (see get_adjacency). The default is None.
+    node : String, required
+        Name of the node. The default is None.
+    direction : String, required
+        "export" (lines starting at the node) or "import" (lines ending at the node). The default is None.
+
+    Returns
+    -------
+    List
+        Lines of the node in the given direction (empty if the node has none).
+
+    """
+    _position = adjacency["position"].get(node)
+    if _position is None:
+        return []
+    _pointer, _lines = adjacency[direction]
+    return _lines[_pointer[_position] : _pointer[_position + 1]].tolist()
+
+
 def add_import_and_export_lines_per_node(model=None):
     """TRANSMISSION NETWORK LEVEL"""
-    _data = model.transmission
-    _dict = dict()
-    for node in _data.Start:
-        _dict[node] = list(_data.loc[_data.Start == node].index)
-    model.tra_export_lines = _dict
-    _dict = dict()
-    for node in _data.End:
-        _dict[node] = list(_data.loc[_data.End == node].index)
-    model.tra_import_lines = _dict
+    model.tra_adjacency = get_adjacency(data=model.transmission)
 
     """HIGH-PRESSURE NETWORK LEVEL"""
-    _data = model.high
-    _dict = dict()
-    for node in _data.Start:
-        _dict[node] = list(_data.loc[_data.Start == node].index)
-    model.high_export_lines = _dict
-    _dict = dict()
-    for node in _data.End:
-        _dict[node] = list(_data.loc[_data.End == node].index)
-    model.high_import_lines = _dict
+    model.high_adjacency = get_adjacency(data=model.high)
 
     """MID-PRESSURE NETWORK LEVEL"""
-    _data = model.mid
-    _dict = dict()
-    for node in _data.Start:
-        _dict[node] = list(_data.loc[_data.Start == node].index)
-    model.mid_export_lines = _dict
-    _dict = dict()
-    for node in _data.End:
-        _dict[node] = list(_data.loc[_data.End == node].index)
-    model.mid_import_lines = _dict
+    model.mid_adjacency = get_adjacency(data=model.mid)
 
     return
 
 
-def print_model(model=None):
+def print_model(model=None, path="CANCEL.lp", labels="symbolic", dump=False):
+    """
+    Writes the model to an LP or MPS file with the streaming writer (see writer.write_model) instead of
+    Pyomo's LP writer, which needs several times the memory of the model.
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    path : String, optional
+        Path of the model file (see writer.FORMATS). The default is "CANCEL.lp".
+    labels : String, optional
+        "integer" or "symbolic" (see writer.get_labels). The default is "symbolic".
+    dump : bool, optional
+        If True, the model is also printed to CANCEL.txt (pyomo pprint; only for small instances). The
+        default is False.
+
+    Returns
+    -------
+    None.
 
-    model.write("CANCEL.lp", io_options={"symbolic_solver_labels": True})
+    """
+    writer.write_model(model=model, path=path, labels=labels)
 
     """PRINT MODEL TO .TXT FILE"""
-    _file = open("CANCEL.txt", "w", encoding="utf-8")
-    model.pprint(ostream=_file, verbose=False, prefix="")
-    _file.close()
+    if dump:
+        with open("CANCEL.txt", "w", encoding="utf-8") as _file:
+            model.pprint(ostream=_file, verbose=False, prefix="")
     return
 
 
-def set_solver_for_the_model(model=None):
-    Solver = pyomo.opt.SolverFactory("gurobi")
-    Solver.options["mipgap"] = 0.05
-    Solver.options["MIPFocus"] = 3
-    Solver.options['threads'] = 12
+def _get_free_terms(constraint):
+    # LINEAR TERMS OF THE NOT FIXED VARIABLES (FIXED VARIABLES ARE PART OF THE CONSTANT)
+    _repn = generate_standard_repn(constraint.body, compute_values=True, quadratic=False)
+    if not _repn.is_linear():
+        return None, None
+    _terms = [
+        (_var, _coef)
+        for _var, _coef in zip(_repn.linear_vars, _repn.linear_coefs)
+        if _coef != 0
+    ]
+    return _terms, _repn.constant
+
+
+def eliminate_fixed_variables(model=None, tolerance=1e-9):
+    """
+    Replaces constraints that only pin a variable (e.g., var_gamma_*_line_inv == 0 before the year of
+    investment, v_dec_early_* == 0, the fixed cluster decisions, depreciation == 0, revenues == var * 0)
+    by Var.fix() or variable bounds and deactivates them. Equalities between two variables propagate
+    the fixed values (e.g., from the clusters to the lines), so that the elimination is repeated until
+    no further variable is fixed. Constraints without free variables are deactivated if they hold.
+    The model must not have mutable parameters, as the fixed values would not follow later updates.
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance with its (scenario-specific) active constraints. The default is
+        None.
+    tolerance : float, optional
+        Absolute tolerance for bound conflicts and constraints without free variables. The default is
+        1e-9.
+
+    Raises
+    ------
+    ValueError
+        If a fixed value violates a bound or another fixing, or a constraint without free variables is
+        violated (infeasible model).
+
+    Returns
+    -------
+    Dict
+        Number of fixed variables, tightened bounds, and deactivated constraints.
+
+    """
+    _fixed = 0
+    _bounds = 0
+    _deactivated = 0
+    # CONSTRAINTS WITH TWO FREE VARIABLES PER VARIABLE (CANDIDATES ONCE ONE OF THEM IS FIXED)
+    _links = dict()
+    _queue = list(model.component_data_objects(py.Constraint, active=True))
+    while _queue:
+        _next = []
+        for _con in _queue:
+            if not _con.active:
+                continue
+            _terms, _constant = _get_free_terms(_con)
+            if _terms is None:
+                continue
+            if len(_terms) == 2:
+                for _var, _ in _terms:
+                    _links.setdefault(id(_var), []).append(_con)
+            if len(_terms) > 1:
+                continue
+            _lower = None if _con.lower is None else py.value(_con.lower) - _constant
+            _upper = None if _con.upper is None else py.value(_con.upper) - _constant
+            if not _terms:
+                if ((_lower is not None) and (_lower > tolerance)) or (
+                    (_upper is not None) and (_upper < -tolerance)
+                ):
+                    raise ValueError("Constraint {} is violated".format(_con.name))
+                _con.deactivate()
+                _deactivated += 1
+                continue
+            _var, _coef = _terms[0]
+            if _coef < 0:
+                _lower, _upper = _upper, _lower
+            _lower = None if _lower is None else _lower / _coef
+            _upper = None if _upper is None else _upper / _coef
+            if _con.equality:
+                _value = _lower
+                if _var.is_integer():
+                    _value = round(_value)
+                if ((_var.lb is not None) and (_value < _var.lb - tolerance)) or (
+                    (_var.ub is not None) and (_value > _var.ub + tolerance)
+                ):
+                    raise ValueError(
+                        "Constraint {} fixes {} outside its bounds".format(_con.name, _var.name)
+                    )
+                _var.fix(_value, skip_validation=True)
+                _fixed += 1
+                _next.extend(_links.pop(id(_var), []))
+            else:
+                if (_lower is not None) and ((_var.lb is None) or (_lower > _var.lb)):
+                    _var.setlb(_lower)
+                    _bounds += 1
+                if (_upper is not None) and ((_var.ub is None) or (_upper < _var.ub)):
+                    _var.setub(_upper)
+                    _bounds += 1
+                if (
+                    (_var.lb is not None)
+                    and (_var.ub is not None)
+                    and (_var.lb > _var.ub + tolerance)
+                ):
+                    raise ValueError(
+                        "Constraint {} empties the bounds of {}".format(_con.name, _var.name)
+                    )
+            _con.deactivate()
+            _deactivated += 1
+        _queue = _next
+    print(
+        "Eliminated: {} fixed variables, {} bounds, {} deactivated constraints".format(
+            _fixed, _bounds, _deactivated
+        )
+    )
+    return {"fixed": _fixed, "bounds": _bounds, "deactivated": _deactivated}
+
+
+def set_solver_for_the_model(model=None, threads=12, solver="gurobi", profile=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    threads : int, optional
+        Number of solver threads. The default is 12.
+    solver : String, optional
+        "gurobi", "highs", "cbc", or "scip" (see solvers.SOLVERS). The default is "gurobi".
+    profile : Dict, optional
+        Includes the gap, time limit, and emphasis (see solvers.get_profile). The default is None
+        (solvers.SOLVER_PROFILE).
+
+    Returns
+    -------
+    Solver : pyomo.opt.SolverFactory
+        Solver interface with the options of the profile.
+
+    """
+    Solver = solvers.set_solver(solver=solver, profile=profile, threads=threads)
     # Solver.options["LogFile"] = str(model.name) + ".log"
-    Solver.options['Cuts'] = 2
-    Solver.options['Presolve'] = 2
-    Solver.options['TimeLimit'] = 48 * 60 * 60
     return Solver
+
+
+def set_persistent_solver_for_the_model(model=None, threads=12, profile=None):
+    """
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance (built with mutable scenario parameters). The default is None.
+    threads : int, optional
+        Number of solver threads. The default is 12.
+    profile : Dict, optional
+        Includes the gap, time limit, and emphasis (see solvers.get_profile). The default is None.
+
+    Returns
+    -------
+    Solver : pyomo.contrib.appsi.solvers.Gurobi
+        Persistent Gurobi interface. After the first solve, changes of mutable parameters and
+        (de)activated constraints are passed to the Gurobi model as updates; Gurobi keeps the basis
+        and the previous solution as a start.
+
+    """
+    Solver = Gurobi()
+    Solver.gurobi_options.update(
+        solvers.get_solver_options("gurobi", profile=profile, threads=threads)
+    )
+    Solver.config.stream_solver = True
+    # ONLY PARAMETERS AND ACTIVE CONSTRAINTS CHANGE BETWEEN SCENARIOS.
+    Solver.update_config.check_for_new_or_removed_vars = False
+    Solver.update_config.update_vars = False
+    Solver.update_config.update_constraints = False
+    Solver.update_config.update_named_expressions = False
+    return Solver
+
+
+def set_mip_start(Solver=None, model=None):
+    """
+    Passes the current values of the integer and binary variables to a persistent Gurobi interface
+    as a MIP start.
+
+    Parameters
+    ----------
+    Solver : pyomo.contrib.appsi.solvers.Gurobi, required
+        Persistent Gurobi interface that was used to solve the model before. The default is None.
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    for _var in model.component_data_objects(py.Var, active=True):
+        if _var.is_integer() and (_var.value is not None) and (not _var.fixed):
+            Solver.set_var_attr(_var, "Start", round(_var.value))
+    return
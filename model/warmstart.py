@@ -0,0 +1,144 @@
+import gzip
+import json
+import os
+from pathlib import Path
+import pyomo.environ as py
+
+
+WARMSTART_DIR = Path("solution") / "warmstart"
+# INTEGER DECISIONS AND THE LINE INVESTMENTS THEY DEPEND ON (ENOUGH FOR THE SOLVER TO COMPLETE THE START)
+WARMSTART_PREFIXES = ("lumpiness_", "v_bd_early_", "bd_cluster_")
+WARMSTART_LINE_INVESTMENTS = ("var_gamma_", "_line_inv")
+
+
+def is_warm_start_variable(name=None):
+    """
+    Parameters
+    ----------
+    name : String, required
+        Name of the variable. The default is None.
+
+    Returns
+    -------
+    bool
+        True if the values of the variable are stored as warm start.
+
+    """
+    _prefix, _suffix = WARMSTART_LINE_INVESTMENTS
+    return name.startswith(WARMSTART_PREFIXES) or (
+        name.startswith(_prefix) and name.endswith(_suffix)
+    )
+
+
+def _get_key(index):
+    # INDICES ARE STORED AS LISTS OF PLAIN PYTHON VALUES (NUMPY INTEGERS ARE NOT JSON SERIALIZABLE)
+    _index = index if isinstance(index, tuple) else (index,)
+    return [_value.item() if hasattr(_value, "item") else _value for _value in _index]
+
+
+def get_warm_start_file(name=None, directory=None):
+    """
+    Parameters
+    ----------
+    name : String, required
+        Name of the run (see scenarios.run_scenario). The default is None.
+    directory : String or Path, optional
+        Directory of the warm start files. The default is None (WARMSTART_DIR).
+
+    Returns
+    -------
+    Path
+        Path to the (gzip-compressed JSON) warm start file of the run.
+
+    """
+    return Path(WARMSTART_DIR if directory is None else directory) / "{}.json.gz".format(name)
+
+
+def save_warm_start(model=None, name=None, directory=None):
+    """
+    Stores the values of the integer decisions (lumpiness, early decommissioning) and line investments
+    of a solved model by variable name and index.
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the solved model instance. The default is None.
+    name : String, required
+        Name of the run. The default is None.
+    directory : String or Path, optional
+        Directory of the warm start files. The default is None (WARMSTART_DIR).
+
+    Returns
+    -------
+    path : Path
+        Path to the warm start file.
+
+    """
+    _variables = dict()
+    for _var in model.component_objects(py.Var, active=True):
+        if not is_warm_start_variable(_var.name):
+            continue
+        _variables[_var.name] = [
+            [_get_key(_index), _data.value]
+            for _index, _data in _var.items()
+            if _data.value is not None
+        ]
+
+    path = get_warm_start_file(name=name, directory=directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # WRITE TO A TEMPORARY FILE FIRST, SO THAT PARALLEL RUNS NEVER READ A HALF-WRITTEN FILE.
+    _tmp = path.with_suffix(".{}.tmp".format(os.getpid()))
+    with gzip.open(_tmp, "wt", encoding="utf-8") as _file:
+        json.dump({"model": model.name, "variables": _variables}, _file)
+    os.replace(_tmp, path)
+    return path
+
+
+def load_warm_start(model=None, name=None, directory=None):
+    """
+    Sets the values of the variables of a new model instance to those stored for a run (see
+    save_warm_start), matching by variable name and index. Variables or indices that do not exist in
+    the new model (e.g., after a change of the sets) are skipped; integer values are rounded and all
+    values are clipped to the bounds of the new model.
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    name : String, required
+        Name of the run whose values are loaded. The default is None.
+    directory : String or Path, optional
+        Directory of the warm start files. The default is None (WARMSTART_DIR).
+
+    Returns
+    -------
+    count : int
+        Number of variable values set (0 if no warm start file exists).
+
+    """
+    path = get_warm_start_file(name=name, directory=directory)
+    if not path.exists():
+        return 0
+    with gzip.open(path, "rt", encoding="utf-8") as _file:
+        _stored = json.load(_file)
+
+    count = 0
+    for _name, _values in _stored["variables"].items():
+        _var = model.component(_name)
+        if (_var is None) or (not isinstance(_var, py.Var)):
+            continue
+        _data = {tuple(_get_key(_index)): _item for _index, _item in _var.items()}
+        for _key, _value in _values:
+            _item = _data.get(tuple(_key))
+            if (_item is None) or _item.fixed:
+                continue
+            if _item.is_integer():
+                _value = round(_value)
+            if _item.lb is not None:
+                _value = max(_value, _item.lb)
+            if _item.ub is not None:
+                _value = min(_value, _item.ub)
+            _item.set_value(_value, skip_validation=True)
+            count += 1
+    print("Warm start: {} values of {} loaded".format(count, name))
+    return count
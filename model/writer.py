@@ -0,0 +1,510 @@
+import array
+import csv
+import gzip
+import os
+import numpy as np
+import pyomo.environ as py
+import scipy.sparse as sp
+from pyomo.core.base.component_namer import index_repr
+from pyomo.core.base.label import cpxlp_label_from_name
+from pyomo.repn import generate_standard_repn
+
+
+FORMATS = ["lp", "mps", "lp.gz", "mps.gz"]
+LABELS = ["integer", "symbolic"]
+# ROWS (LP) OR COLUMNS (MPS) PER WRITE CALL
+CHUNK_SIZE = 10000
+# TERMS PER LINE OF THE LP FORMAT (CPLEX READS AT MOST 510 CHARACTERS PER LINE)
+TERMS_PER_LINE = 4
+# GZIP LEVEL 9 (DEFAULT) IS SEVERAL TIMES SLOWER FOR LITTLE GAIN ON MODEL FILES
+COMPRESSION = 6
+
+
+def get_problem(model=None, tolerance=1e-9):
+    """
+    Collects the coefficient matrix, bounds, and objective of the active constraints of a Pyomo model
+    one constraint at a time (without Pyomo's writers). The columns are the variables that are not
+    fixed, in the order of their first appearance (objective first); fixed variables are part of the
+    right-hand sides. Constraints without free variables are skipped.
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance with one active objective. The default is None.
+    tolerance : float, optional
+        Violation up to which a constraint without free variables is accepted. The default is 1e-9.
+
+    Raises
+    ------
+    ValueError
+        If the objective or a constraint is not linear or a constraint without free variables is
+        violated.
+
+    Returns
+    -------
+    problem : Dict
+        Includes the coefficient matrix (csr), the bounds, the integrality, and the objective (same
+        keys as matrix.build_problem), the objective constant (offset) and sense, and the variables and
+        constraints of the columns and rows.
+
+    """
+    _columns = dict()
+    _variables = []
+
+    def _get_column(var):
+        _column = _columns.get(id(var))
+        if _column is None:
+            _column = _columns[id(var)] = len(_variables)
+            _variables.append(var)
+        return _column
+
+    _objective = next(model.component_data_objects(py.Objective, active=True))
+    _repn = generate_standard_repn(_objective.expr, compute_values=True, quadratic=False)
+    if not _repn.is_linear():
+        raise ValueError("Objective {} is not linear".format(_objective.name))
+    _costs = {_get_column(_var): _coef for _var, _coef in zip(_repn.linear_vars, _repn.linear_coefs)}
+    _offset = _repn.constant
+
+    # COEFFICIENTS AND ROW BOUNDS ARE COLLECTED IN TYPED ARRAYS (8 BYTES PER ENTRY)
+    _rows = array.array("q")
+    _entries = array.array("q")
+    _values = array.array("d")
+    _lower = array.array("d")
+    _upper = array.array("d")
+    _constraints = []
+    for _constraint in model.component_data_objects(py.Constraint, active=True):
+        _repn = generate_standard_repn(_constraint.body, compute_values=True, quadratic=False)
+        if not _repn.is_linear():
+            raise ValueError("Constraint {} is not linear".format(_constraint.name))
+        _lb = -np.inf if _constraint.lb is None else _constraint.lb - _repn.constant
+        _ub = np.inf if _constraint.ub is None else _constraint.ub - _repn.constant
+        if not _repn.linear_vars:
+            if _lb > tolerance or _ub < -tolerance:
+                raise ValueError("Constraint {} is infeasible".format(_constraint.name))
+            continue
+        _row = len(_constraints)
+        for _var, _coef in zip(_repn.linear_vars, _repn.linear_coefs):
+            _rows.append(_row)
+            _entries.append(_get_column(_var))
+            _values.append(_coef)
+        _lower.append(_lb)
+        _upper.append(_ub)
+        _constraints.append(_constraint)
+
+    _matrix = sp.csr_matrix(
+        (
+            np.frombuffer(_values),
+            (np.frombuffer(_rows, dtype=np.int64), np.frombuffer(_entries, dtype=np.int64)),
+        ),
+        shape=(len(_constraints), len(_variables)),
+    )
+    _matrix.sum_duplicates()
+    _matrix.eliminate_zeros()
+    _objective_row = np.zeros(len(_variables))
+    _objective_row[list(_costs)] = list(_costs.values())
+    return {
+        "matrix": _matrix,
+        "objective": _objective_row,
+        "offset": _offset,
+        "sense": "max" if _objective.sense == py.maximize else "min",
+        "column_lower": np.array([-np.inf if _var.lb is None else _var.lb for _var in _variables]),
+        "column_upper": np.array([np.inf if _var.ub is None else _var.ub for _var in _variables]),
+        "integer": np.array([_var.is_integer() for _var in _variables], dtype=bool),
+        "row_lower": np.frombuffer(_lower),
+        "row_upper": np.frombuffer(_upper),
+        "variables": _variables,
+        "constraints": _constraints,
+    }
+
+
+def get_names(problem=None, axis="columns"):
+    """
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the variables and constraints (see get_problem) or the column layout and row blocks
+        (see matrix.build_problem). The default is None.
+    axis : String, optional
+        "columns" or "rows". The default is "columns".
+
+    Yields
+    ------
+    String
+        Pyomo name of each column (e.g., var_capex[2025]) or row. The rows of the matrix builder are
+        named by constraint and position among the rows of the constraint (e.g., con_capex[0]).
+
+    """
+    if axis == "columns" and "variables" in problem:
+        for _var in problem["variables"]:
+            yield _var.name
+    elif axis == "columns":
+        for _name, _block in problem["layout"]["variables"].items():
+            for _index in np.ndindex(*_block["shape"]):
+                # SAME NAMES AS PYOMO (E.G., QUOTES AROUND NODES WITH SPECIAL CHARACTERS)
+                _key = tuple(_set[_i] for _set, _i in zip(_block["sets"], _index))
+                yield _name + index_repr(_key if len(_key) > 1 else _key[0])
+    elif "constraints" in problem:
+        for _constraint in problem["constraints"]:
+            yield _constraint.name
+    else:
+        # SOME CONSTRAINTS ARE ADDED IN SEVERAL BLOCKS (E.G., PER NETWORK LEVEL)
+        _positions = dict()
+        for _name, _offset, _count in problem["blocks"]:
+            _first = _positions.get(_name, 0)
+            for _position in range(_first, _first + _count):
+                yield "{}[{}]".format(_name, _position)
+            _positions[_name] = _first + _count
+
+
+def get_labels(problem=None, labels="integer"):
+    """
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the coefficient matrix and the names of the columns and rows (see get_names). The
+        default is None.
+    labels : String, optional
+        "integer" (x0, x1, ... and c0, c1, ...) or "symbolic" (Pyomo names in the LP/MPS alphabet,
+        e.g., var_capex(2025)). The default is "integer".
+
+    Raises
+    ------
+    ValueError
+        If the labels are unknown or two symbolic labels coincide.
+
+    Returns
+    -------
+    Tuple
+        Labels of the columns and of the rows (Lists).
+
+    """
+    if labels == "integer":
+        return (
+            ["x{}".format(_j) for _j in range(problem["matrix"].shape[1])],
+            ["c{}".format(_i) for _i in range(problem["matrix"].shape[0])],
+        )
+    if labels != "symbolic":
+        raise ValueError("Unknown labels: {}".format(labels))
+    _columns = [cpxlp_label_from_name(_name) for _name in get_names(problem=problem, axis="columns")]
+    _rows = [cpxlp_label_from_name(_name) for _name in get_names(problem=problem, axis="rows")]
+    if len(set(_columns).union(_rows)) < len(_columns) + len(_rows):
+        raise ValueError("Symbolic labels are not unique; use integer labels")
+    return _columns, _rows
+
+
+def get_format(path=None):
+    """
+    Parameters
+    ----------
+    path : String, required
+        Path of the model file (e.g., solution/gg.mps.gz). The default is None.
+
+    Raises
+    ------
+    ValueError
+        If the suffix is not one of FORMATS.
+
+    Returns
+    -------
+    String
+        File format (one of FORMATS).
+
+    """
+    for _format in sorted(FORMATS, key=len, reverse=True):
+        if str(path).endswith("." + _format):
+            return _format
+    raise ValueError("Unknown model file format: {} (use {})".format(path, ", ".join(FORMATS)))
+
+
+def _open(path):
+    _folder = os.path.dirname(path)
+    if _folder and not os.path.exists(_folder):
+        os.makedirs(_folder)
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=COMPRESSION)
+    return open(path, "w", encoding="utf-8")
+
+
+def _number(value):
+    # SHORTEST REPRESENTATION THAT IS READ BACK AS THE SAME FLOAT
+    return repr(float(value))
+
+
+def _get_terms(columns=None, values=None, labels=None):
+    _terms = [
+        "{} {} {}".format("-" if _value < 0 else "+", _number(abs(_value)), labels[_column])
+        for _column, _value in zip(columns, values)
+    ]
+    if not _terms:
+        _terms = ["0 {}".format(labels[0])]
+    return "\n   ".join(
+        " ".join(_terms[_k : _k + TERMS_PER_LINE]) for _k in range(0, len(_terms), TERMS_PER_LINE)
+    )
+
+
+def _write_lp(file=None, problem=None, columns=None, rows=None, chunk_size=CHUNK_SIZE):
+    _matrix = problem["matrix"]
+    _lower, _upper = problem["row_lower"], problem["row_upper"]
+    _objective = problem["objective"]
+    _nonzero = np.flatnonzero(_objective)
+    file.write("maximize\n" if problem.get("sense") == "max" else "minimize\n")
+    file.write(" obj: {}".format(_get_terms(_nonzero.tolist(), _objective[_nonzero].tolist(), columns)))
+    if problem.get("offset"):
+        file.write(" {} {}".format("-" if problem["offset"] < 0 else "+", _number(abs(problem["offset"]))))
+    file.write("\nsubject to\n")
+    for _start in range(0, _matrix.shape[0], chunk_size):
+        _lines = []
+        for _i in range(_start, min(_start + chunk_size, _matrix.shape[0])):
+            _slice = slice(_matrix.indptr[_i], _matrix.indptr[_i + 1])
+            _terms = _get_terms(
+                _matrix.indices[_slice].tolist(), _matrix.data[_slice].tolist(), columns
+            )
+            _lb, _ub = _lower[_i], _upper[_i]
+            if _lb == _ub:
+                _lines.append(" {}: {} = {}\n".format(rows[_i], _terms, _number(_lb)))
+            elif np.isfinite(_lb) and np.isfinite(_ub):
+                # RANGED ROWS ARE SPLIT INTO TWO ROWS (AS BY PYOMO'S LP WRITER)
+                _lines.append(" {}_lo: {} >= {}\n".format(rows[_i], _terms, _number(_lb)))
+                _lines.append(" {}_hi: {} <= {}\n".format(rows[_i], _terms, _number(_ub)))
+            elif np.isfinite(_lb):
+                _lines.append(" {}: {} >= {}\n".format(rows[_i], _terms, _number(_lb)))
+            elif np.isfinite(_ub):
+                _lines.append(" {}: {} <= {}\n".format(rows[_i], _terms, _number(_ub)))
+        file.write("".join(_lines))
+
+    # DEFAULT BOUNDS OF THE LP FORMAT: 0 <= x <= inf
+    file.write("bounds\n")
+    _lower, _upper = problem["column_lower"], problem["column_upper"]
+    for _start in range(0, len(columns), chunk_size):
+        _lines = []
+        for _j in range(_start, min(_start + chunk_size, len(columns))):
+            _lb, _ub = _lower[_j], _upper[_j]
+            if _lb == _ub:
+                _lines.append(" {} = {}\n".format(columns[_j], _number(_lb)))
+            elif _lb == -np.inf and _ub == np.inf:
+                _lines.append(" {} free\n".format(columns[_j]))
+            elif _lb != 0 or _ub != np.inf:
+                _lines.append(
+                    " {} <= {} <= {}\n".format(
+                        "-inf" if _lb == -np.inf else _number(_lb),
+                        columns[_j],
+                        "+inf" if _ub == np.inf else _number(_ub),
+                    )
+                )
+        file.write("".join(_lines))
+
+    _integer = np.flatnonzero(problem["integer"])
+    if len(_integer):
+        file.write("generals\n")
+        for _start in range(0, len(_integer), chunk_size):
+            file.write(
+                "".join(" {}\n".format(columns[_j]) for _j in _integer[_start : _start + chunk_size])
+            )
+    file.write("end\n")
+    return
+
+
+def _write_mps(file=None, problem=None, columns=None, rows=None, chunk_size=CHUNK_SIZE, name=None):
+    _matrix = problem["matrix"]
+    _lower, _upper = problem["row_lower"], problem["row_upper"]
+    _equal = _lower == _upper
+    _ranged = np.isfinite(_lower) & np.isfinite(_upper) & ~_equal
+    # ROWS WITHOUT FINITE BOUNDS ARE NOT WRITTEN
+    _written = np.isfinite(_lower) | np.isfinite(_upper)
+    _types = np.where(_equal, "E", np.where(np.isfinite(_lower), "G", "L"))
+
+    file.write("NAME {}\n".format(name))
+    if problem.get("sense") == "max":
+        file.write("OBJSENSE\n    MAX\n")
+    file.write("ROWS\n N obj\n")
+    for _start in range(0, len(rows), chunk_size):
+        file.write(
+            "".join(
+                " {} {}\n".format(_types[_i], rows[_i])
+                for _i in range(_start, min(_start + chunk_size, len(rows)))
+                if _written[_i]
+            )
+        )
+
+    file.write("COLUMNS\n")
+    _objective = problem["objective"]
+    _integer = problem["integer"]
+    _marker = False
+    # ONE CONVERSION TO CSC: A COLUMN SLICE OF THE CSR MATRIX SCANS ALL NONZEROS (PER CHUNK)
+    _csc = _matrix.tocsc()
+    for _start in range(0, len(columns), chunk_size):
+        _stop = min(_start + chunk_size, len(columns))
+        _lines = []
+        for _j in range(_start, _stop):
+            if _integer[_j] != _marker:
+                _marker = bool(_integer[_j])
+                _lines.append(" MARKER 'MARKER' '{}'\n".format("INTORG" if _marker else "INTEND"))
+            _slice = slice(_csc.indptr[_j], _csc.indptr[_j + 1])
+            _entries = [
+                " {} {} {}\n".format(columns[_j], rows[_i], _number(_value))
+                for _i, _value in zip(_csc.indices[_slice].tolist(), _csc.data[_slice].tolist())
+                if _written[_i]
+            ]
+            if _objective[_j] != 0 or not _entries:
+                _lines.append(" {} obj {}\n".format(columns[_j], _number(_objective[_j])))
+            _lines.extend(_entries)
+        file.write("".join(_lines))
+    if _marker:
+        file.write(" MARKER 'MARKER' 'INTEND'\n")
+
+    file.write("RHS\n")
+    if problem.get("offset"):
+        # THE RIGHT-HAND SIDE OF THE OBJECTIVE IS THE NEGATIVE CONSTANT
+        file.write(" RHS obj {}\n".format(_number(-problem["offset"])))
+    _rhs = np.where(np.isfinite(_lower), _lower, _upper)
+    for _start in range(0, len(rows), chunk_size):
+        file.write(
+            "".join(
+                " RHS {} {}\n".format(rows[_i], _number(_rhs[_i]))
+                for _i in range(_start, min(_start + chunk_size, len(rows)))
+                if _written[_i] and _rhs[_i] != 0
+            )
+        )
+    if _ranged.any():
+        file.write("RANGES\n")
+        file.write(
+            "".join(
+                " RNG {} {}\n".format(rows[_i], _number(_upper[_i] - _lower[_i]))
+                for _i in np.flatnonzero(_ranged)
+            )
+        )
+
+    # DEFAULT BOUNDS OF THE MPS FORMAT: 0 <= x <= inf (INTEGER COLUMNS ARE WRITTEN EXPLICITLY, SINCE
+    # SOME READERS TREAT INTEGER COLUMNS WITHOUT BOUNDS AS BINARY)
+    file.write("BOUNDS\n")
+    _lower, _upper = problem["column_lower"], problem["column_upper"]
+    for _start in range(0, len(columns), chunk_size):
+        _lines = []
+        for _j in range(_start, min(_start + chunk_size, len(columns))):
+            _lb, _ub = _lower[_j], _upper[_j]
+            if _lb == _ub:
+                _lines.append(" FX BND {} {}\n".format(columns[_j], _number(_lb)))
+                continue
+            if _lb == -np.inf and _ub == np.inf:
+                _lines.append(" FR BND {}\n".format(columns[_j]))
+                continue
+            if _lb == -np.inf:
+                _lines.append(" MI BND {}\n".format(columns[_j]))
+            elif _lb != 0 or _integer[_j]:
+                _lines.append(" LO BND {} {}\n".format(columns[_j], _number(_lb)))
+            if _ub != np.inf:
+                _lines.append(" UP BND {} {}\n".format(columns[_j], _number(_ub)))
+            elif _integer[_j]:
+                _lines.append(" PL BND {}\n".format(columns[_j]))
+        file.write("".join(_lines))
+    file.write("ENDATA\n")
+    return
+
+
+def write_names(problem=None, path=None, columns=None, rows=None):
+    """
+    Writes the map from the labels of the model file to the Pyomo names (CSV with the columns label
+    and name; the column labels come first).
+
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the names of the columns and rows (see get_names). The default is None.
+    path : String, required
+        Path of the map (e.g., solution/gg.names.csv.gz). The default is None.
+    columns : List, required
+        Labels of the columns (see get_labels). The default is None.
+    rows : List, required
+        Labels of the rows (see get_labels). The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    with _open(path) as _file:
+        _writer = csv.writer(_file, lineterminator="\n")
+        _writer.writerow(["label", "name"])
+        _writer.writerows(zip(columns, get_names(problem=problem, axis="columns")))
+        _writer.writerows(zip(rows, get_names(problem=problem, axis="rows")))
+    return
+
+
+def write_problem(problem=None, path=None, labels="integer", chunk_size=CHUNK_SIZE):
+    """
+    Writes the problem to an LP or free MPS file, optionally compressed (see FORMATS). The file is
+    written in chunks of rows or columns, so that only one chunk of lines is held in memory. With
+    integer labels, the map from the labels to the Pyomo names is written next to the model file
+    (<path without suffix>.names.csv.gz, see write_names).
+
+    Parameters
+    ----------
+    problem : Dict, required
+        Includes the coefficient matrix, bounds, and objective (see get_problem or
+        matrix.build_problem). The default is None.
+    path : String, required
+        Path of the model file; the format follows from the suffix (e.g., solution/gg.mps.gz). The
+        default is None.
+    labels : String, optional
+        "integer" or "symbolic" (see get_labels). The default is "integer".
+    chunk_size : int, optional
+        Number of rows or columns per write call. The default is CHUNK_SIZE.
+
+    Returns
+    -------
+    None.
+
+    """
+    _path = str(path)
+    _format = get_format(path=_path)
+    _stem = _path[: -len(_format) - 1]
+    _columns, _rows = get_labels(problem=problem, labels=labels)
+    with _open(_path) as _file:
+        if _format.startswith("lp"):
+            _write_lp(file=_file, problem=problem, columns=_columns, rows=_rows, chunk_size=chunk_size)
+        else:
+            _write_mps(
+                file=_file,
+                problem=problem,
+                columns=_columns,
+                rows=_rows,
+                chunk_size=chunk_size,
+                name=os.path.basename(_stem),
+            )
+    if labels == "integer":
+        write_names(problem=problem, path=_stem + ".names.csv.gz", columns=_columns, rows=_rows)
+    print(
+        "Model written to {} ({} rows, {} columns, {} nonzeros)".format(
+            _path, problem["matrix"].shape[0], problem["matrix"].shape[1], problem["matrix"].nnz
+        )
+    )
+    return
+
+
+def write_model(model=None, path=None, labels="integer", chunk_size=CHUNK_SIZE):
+    """
+    Writes the model to an LP or MPS file (see write_problem). The coefficient matrix of the matrix
+    builder (model.problem) is used if available, otherwise it is collected from the active constraints
+    (see get_problem). Replaces the Pyomo writers of utils.print_model for large instances.
+
+    Parameters
+    ----------
+    model : pyomo.ConcreteModel, required
+        Includes the model instance. The default is None.
+    path : String, required
+        Path of the model file (e.g., solution/gg.mps.gz). The default is None.
+    labels : String, optional
+        "integer" or "symbolic" (see get_labels). The default is "integer".
+    chunk_size : int, optional
+        Number of rows or columns per write call. The default is CHUNK_SIZE.
+
+    Returns
+    -------
+    None.
+
+    """
+    _problem = getattr(model, "problem", None)
+    if _problem is None:
+        _problem = get_problem(model=model)
+    write_problem(problem=_problem, path=path, labels=labels, chunk_size=chunk_size)
+    return